@@ -8,34 +8,86 @@ import random
 import json
 from utils.file_naming import FileNamingConvention
 from pacientes.pacientes import ExportadorBase
+from utils.plan_generacion import (
+    PlanGeneracion, elegir, enteros, fechas_relativas, fuentes_aleatorias,
+    generar_en_paralelo, textos_faker
+)
 
 class GeneradorBIO:
     """Clase para generar datos sintéticos de biografías"""
+
+    SITUACIONES = [
+        'Estable', 'En tratamiento', 'Mejoría significativa',
+        'Seguimiento periódico', 'Necesita atención'
+    ]
+    NIVELES_FUNCIONALIDAD = ['Alto', 'Medio-alto', 'Medio', 'Medio-bajo', 'Bajo']
+    APOYOS_FAMILIARES = ['Fuerte', 'Moderado', 'Limitado', 'Sin apoyo']
+    DETALLES = {
+        'antecedentes': [
+            "Sin antecedentes relevantes de enfermedades mentales en la familia.",
+            "Padre diagnosticado con depresión, en tratamiento desde hace 5 años.",
+            "Historial familiar de ansiedad en línea materna.",
+            "Hermano mayor con trastorno bipolar controlado."
+        ],
+        'historial': [
+            "Inicio de síntomas en adolescencia, primer tratamiento en 2019.",
+            "Múltiples episodios de ansiedad tratados con terapia cognitiva.",
+            "Tratamiento farmacológico previo con buenos resultados.",
+            "Sin hospitalizaciones previas, seguimiento ambulatorio."
+        ],
+        'objetivos': [
+            "Desarrollar habilidades de manejo del estrés y ansiedad.",
+            "Mejorar relaciones interpersonales y comunicación familiar.",
+            "Establecer rutina diaria saludable y hábitos positivos.",
+            "Fortalecer estrategias de afrontamiento."
+        ]
+    }
     
-    def __init__(self):
+    def __init__(self, semilla=None, fecha_referencia=None):
+        """
+        Args:
+            semilla: Semilla (int o numpy.random.SeedSequence) para reproducir los datos
+            fecha_referencia: Fecha usada como "hoy" en la generación por columnas
+        """
         self.fake = Faker(['es_ES'])
+        self.rng, self.random = fuentes_aleatorias(semilla, self.fake)
+        self.fecha_referencia = fecha_referencia
         self._configurar_generadores()
+        self._configurar_generadores_columna()
 
     def _configurar_generadores(self):
         """Configura los generadores específicos para campos BIO"""
         self.generadores = {
-            'id_paciente': lambda _: random.randint(1, 99999),
+            'id_paciente': lambda _: self.random.randint(1, 99999),
             'fecha_biografia': lambda _: self.fake.date_between(start_date='-1y', end_date='today'),
             'antecedentes_familiares': lambda _: self.generar_detalle_bio('antecedentes'),
             'historial_medico': lambda _: self.generar_detalle_bio('historial'),
-            'situacion_actual': lambda _: random.choice([
-                'Estable', 'En tratamiento', 'Mejoría significativa',
-                'Seguimiento periódico', 'Necesita atención'
-            ]),
-            'nivel_funcionalidad': lambda _: random.choice([
-                'Alto', 'Medio-alto', 'Medio', 'Medio-bajo', 'Bajo'
-            ]),
-            'apoyo_familiar': lambda _: random.choice([
-                'Fuerte', 'Moderado', 'Limitado', 'Sin apoyo'
-            ]),
+            'situacion_actual': lambda _: self.random.choice(self.SITUACIONES),
+            'nivel_funcionalidad': lambda _: self.random.choice(self.NIVELES_FUNCIONALIDAD),
+            'apoyo_familiar': lambda _: self.random.choice(self.APOYOS_FAMILIARES),
             'objetivos_terapeuticos': lambda _: self.generar_detalle_bio('objetivos')
         }
 
+    def _configurar_generadores_columna(self):
+        """Versión vectorizada de los generadores: cada función recibe n y devuelve n valores"""
+        self.generadores_columna = {
+            'id_paciente': lambda n: enteros(self.rng, 1, 99999, n),
+            'fecha_biografia': lambda n: fechas_relativas(self.rng, -365, 0, n, self.fecha_referencia),
+            'antecedentes_familiares': lambda n: elegir(self.rng, self.DETALLES['antecedentes'], n),
+            'historial_medico': lambda n: elegir(self.rng, self.DETALLES['historial'], n),
+            'situacion_actual': lambda n: elegir(self.rng, self.SITUACIONES, n),
+            'nivel_funcionalidad': lambda n: elegir(self.rng, self.NIVELES_FUNCIONALIDAD, n),
+            'apoyo_familiar': lambda n: elegir(self.rng, self.APOYOS_FAMILIARES, n),
+            'objetivos_terapeuticos': lambda n: elegir(self.rng, self.DETALLES['objetivos'], n)
+        }
+        self.generadores_tipo = [
+            (('int',), lambda n: enteros(self.rng, 1, 100, n)),
+            (('float',), lambda n: np.round(self.rng.uniform(0, 10, n), 2)),
+            (('datetime', 'date'), lambda n: fechas_relativas(self.rng, -365, 0, n, self.fecha_referencia)),
+            (('bool',), lambda n: self.rng.random(n) < 0.5)
+        ]
+        self.generador_texto = lambda n: textos_faker(self.rng, lambda: self.fake.text(max_nb_chars=100), n)
+
     def generar_detalle_bio(self, tipo_campo, use_api=False):
         """
         Genera texto detallado para campos biográficos
@@ -44,34 +96,13 @@ class GeneradorBIO:
         if use_api:
             return f"[Placeholder para API] Texto generado para {tipo_campo}"
         
-        detalles = {
-            'antecedentes': [
-                "Sin antecedentes relevantes de enfermedades mentales en la familia.",
-                "Padre diagnosticado con depresión, en tratamiento desde hace 5 años.",
-                "Historial familiar de ansiedad en línea materna.",
-                "Hermano mayor con trastorno bipolar controlado."
-            ],
-            'historial': [
-                "Inicio de síntomas en adolescencia, primer tratamiento en 2019.",
-                "Múltiples episodios de ansiedad tratados con terapia cognitiva.",
-                "Tratamiento farmacológico previo con buenos resultados.",
-                "Sin hospitalizaciones previas, seguimiento ambulatorio."
-            ],
-            'objetivos': [
-                "Desarrollar habilidades de manejo del estrés y ansiedad.",
-                "Mejorar relaciones interpersonales y comunicación familiar.",
-                "Establecer rutina diaria saludable y hábitos positivos.",
-                "Fortalecer estrategias de afrontamiento."
-            ]
-        }
-        
-        return random.choice(detalles.get(tipo_campo, ["No especificado"]))
+        return self.random.choice(self.DETALLES.get(tipo_campo, ["No especificado"]))
 
     def generar_valor(self, campo, tipo, ejemplo=None, valores_unicos=None):
         """Genera un valor sintético basado en el tipo de campo y ejemplo"""
         # Si tenemos valores únicos limitados, usar esos
         if valores_unicos and len(valores_unicos) <= 5:
-            return random.choice(valores_unicos)
+            return self.random.choice(valores_unicos)
 
         # Buscar generador específico
         campo_lower = campo.lower()
@@ -82,13 +113,13 @@ class GeneradorBIO:
         # Si no hay generador específico, usar generadores por tipo
         tipo = str(tipo).lower()
         if 'int' in tipo:
-            return random.randint(1, 100)
+            return self.random.randint(1, 100)
         elif 'float' in tipo:
-            return round(random.uniform(0, 10), 2)  # Escalas típicas de 0-10
+            return round(self.random.uniform(0, 10), 2)  # Escalas típicas de 0-10
         elif 'datetime' in tipo or 'date' in tipo:
             return self.fake.date_between(start_date='-1y', end_date='today')
         elif 'bool' in tipo:
-            return random.choice([True, False])
+            return self.random.choice([True, False])
         else:
             return ejemplo if pd.notna(ejemplo) else self.fake.text(max_nb_chars=100)
 
@@ -116,42 +147,19 @@ class ExportadorBIO(ExportadorBase):
             except ValueError:
                 print("Por favor ingrese un número válido")
 
-    def generar_datos_sinteticos(self, estructura, cantidad, use_api=False):
-        """Genera datos sintéticos basados en la estructura proporcionada"""
-        datos = {}
-        
-        for idx, row in estructura.iterrows():
-            campo = row['Campo'] if 'Campo' in row else row['nombre']
-            tipo = row['Tipo'] if 'Tipo' in row else row['tipo']
-            ejemplo = row.get('Ejemplo', None)
-            valores_unicos = row.get('Valores_Posibles', None)
-            
-            # Convertir string de valores posibles a lista si es necesario
-            if isinstance(valores_unicos, str):
-                try:
-                    valores_unicos = eval(valores_unicos)
-                except:
-                    valores_unicos = None
-            
-            # Generar valores manteniendo los tipos de datos
-            valores = []
-            for _ in range(cantidad):
-                valor = self.generador.generar_valor(campo, tipo, ejemplo, valores_unicos)
-                valores.append(valor)
-            
-            datos[campo] = valores
-        
-        # Crear DataFrame y convertir tipos según la estructura original
-        df = pd.DataFrame(datos)
-        for idx, row in estructura.iterrows():
-            campo = row['Campo'] if 'Campo' in row else row['nombre']
-            tipo = row['Tipo'] if 'Tipo' in row else row['tipo']
-            try:
-                df[campo] = df[campo].astype(tipo)
-            except:
-                print(f"Advertencia: No se pudo convertir la columna {campo} al tipo {tipo}")
-        
-        return df
+    def generar_datos_sinteticos(self, estructura, cantidad, use_api=False, semilla=None, shards=1, workers=None):
+        """
+        Genera datos sintéticos basados en la estructura proporcionada
+
+        Con semilla o varios shards se usa generar_en_paralelo, que produce
+        los mismos datos para la misma semilla sin importar workers.
+        """
+        if semilla is not None or shards > 1:
+            return generar_en_paralelo(type(self.generador), estructura, cantidad,
+                                       semilla=semilla, shards=shards, workers=workers)
+
+        plan = PlanGeneracion.compilar(estructura, self.generador)
+        return plan.generar(cantidad)
 
     def validar_datos_bios(self, datos):
         """Valida que cada registro de historia biográfica contenga los campos obligatorios."""
@@ -8,44 +8,69 @@ import random
 import json
 from utils.file_naming import FileNamingConvention
 from pacientes.pacientes import ExportadorBase
+from utils.plan_generacion import elegir, enteros, fechas_relativas, fuentes_aleatorias, textos_faker
 from typing import Any, Dict, Union
 
 class GeneradorFARC:
     """Clase para generar datos sintéticos de evaluaciones FARC"""
+
+    SUSTANCIAS = ['Alcohol', 'Cannabis', 'Cocaína', 'Heroína', 'Metanfetamina', 'Benzodiacepinas']
+    FRECUENCIAS_USO = ['Diario', 'Semanal', 'Mensual', 'Ocasional', 'En remisión']
+    NIVELES_RIESGO = ['Bajo', 'Moderado', 'Alto', 'Severo']
+    TRATAMIENTOS = [
+        'Ambulatorio', 'Hospitalización', 'Grupo de apoyo',
+        'Terapia individual', 'Programa residencial'
+    ]
+    ESTADOS = ['Activo', 'En progreso', 'Completado', 'Abandonado']
     
-    def __init__(self):
+    def __init__(self, semilla=None, fecha_referencia=None):
+        """
+        Args:
+            semilla: Semilla (int o numpy.random.SeedSequence) para reproducir los datos
+            fecha_referencia: Fecha usada como "hoy" en la generación por columnas
+        """
         self.fake = Faker(['es_ES'])
+        self.rng, self.random = fuentes_aleatorias(semilla, self.fake)
+        self.fecha_referencia = fecha_referencia
         self._configurar_generadores()
+        self._configurar_generadores_columna()
 
     def _configurar_generadores(self):
         """Configura los generadores específicos para campos FARC"""
         self.generadores = {
-            'id_paciente': lambda _: random.randint(1, 99999),
+            'id_paciente': lambda _: self.random.randint(1, 99999),
             'fecha_evaluacion': lambda _: self.fake.date_between(start_date='-1y', end_date='today'),
-            'sustancia': lambda _: random.choice([
-                'Alcohol', 'Cannabis', 'Cocaína', 'Heroína', 
-                'Metanfetamina', 'Benzodiacepinas'
-            ]),
-            'frecuencia_uso': lambda _: random.choice([
-                'Diario', 'Semanal', 'Mensual', 'Ocasional', 'En remisión'
-            ]),
-            'nivel_riesgo': lambda _: random.choice([
-                'Bajo', 'Moderado', 'Alto', 'Severo'
-            ]),
-            'tratamiento': lambda _: random.choice([
-                'Ambulatorio', 'Hospitalización', 'Grupo de apoyo',
-                'Terapia individual', 'Programa residencial'
-            ]),
-            'estado': lambda _: random.choice([
-                'Activo', 'En progreso', 'Completado', 'Abandonado'
-            ])
+            'sustancia': lambda _: self.random.choice(self.SUSTANCIAS),
+            'frecuencia_uso': lambda _: self.random.choice(self.FRECUENCIAS_USO),
+            'nivel_riesgo': lambda _: self.random.choice(self.NIVELES_RIESGO),
+            'tratamiento': lambda _: self.random.choice(self.TRATAMIENTOS),
+            'estado': lambda _: self.random.choice(self.ESTADOS)
+        }
+
+    def _configurar_generadores_columna(self):
+        """Versión vectorizada de los generadores: cada función recibe n y devuelve n valores"""
+        self.generadores_columna = {
+            'id_paciente': lambda n: enteros(self.rng, 1, 99999, n),
+            'fecha_evaluacion': lambda n: fechas_relativas(self.rng, -365, 0, n, self.fecha_referencia),
+            'sustancia': lambda n: elegir(self.rng, self.SUSTANCIAS, n),
+            'frecuencia_uso': lambda n: elegir(self.rng, self.FRECUENCIAS_USO, n),
+            'nivel_riesgo': lambda n: elegir(self.rng, self.NIVELES_RIESGO, n),
+            'tratamiento': lambda n: elegir(self.rng, self.TRATAMIENTOS, n),
+            'estado': lambda n: elegir(self.rng, self.ESTADOS, n)
         }
+        self.generadores_tipo = [
+            (('int',), lambda n: enteros(self.rng, 1, 100, n)),
+            (('float',), lambda n: np.round(self.rng.uniform(0, 10, n), 2)),
+            (('datetime', 'date'), lambda n: fechas_relativas(self.rng, -365, 0, n, self.fecha_referencia)),
+            (('bool',), lambda n: self.rng.random(n) < 0.5)
+        ]
+        self.generador_texto = lambda n: textos_faker(self.rng, self.fake.word, n)
 
     def generar_valor(self, campo, tipo, ejemplo=None, valores_unicos=None):
         """Genera un valor sintético basado en el tipo de campo y ejemplo"""
         # Si tenemos valores únicos limitados, usar esos
         if valores_unicos and len(valores_unicos) <= 5:
-            return random.choice(valores_unicos)
+            return self.random.choice(valores_unicos)
 
         # Buscar generador específico
         campo_lower = campo.lower()
@@ -56,13 +81,13 @@ class GeneradorFARC:
         # Si no hay generador específico, usar generadores por tipo
         tipo = str(tipo).lower()
         if 'int' in tipo:
-            return random.randint(1, 100)
+            return self.random.randint(1, 100)
         elif 'float' in tipo:
-            return round(random.uniform(0, 10), 2)  # Escalas típicas de 0-10
+            return round(self.random.uniform(0, 10), 2)  # Escalas típicas de 0-10
         elif 'datetime' in tipo or 'date' in tipo:
             return self.fake.date_between(start_date='-1y', end_date='today')
         elif 'bool' in tipo:
-            return random.choice([True, False])
+            return self.random.choice([True, False])
         else:
             return ejemplo if pd.notna(ejemplo) else self.fake.word()
 
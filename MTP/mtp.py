@@ -8,68 +8,101 @@ import random
 import json
 from utils.file_naming import FileNamingConvention
 from pacientes.pacientes import ExportadorBase, GestorMasterData  # Añadida importación de GestorMasterData
+from utils.plan_generacion import (
+    PlanGeneracion, elegir, enteros, fechas_relativas, fuentes_aleatorias,
+    generar_en_paralelo, textos_faker
+)
 
 class GeneradorMTP:
     """Clase para generar datos sintéticos de planes de entrenamiento"""
+
+    ESTADOS_PLAN = ['Activo', 'Completado', 'En revisión', 'Suspendido', 'Pendiente']
+    TIPOS_INTERVENCION = ['Individual', 'Grupal', 'Familiar', 'Mixta']
+    FRECUENCIAS_SESIONES = ['Semanal', 'Quincenal', 'Mensual', 'Bisemanal']
+    NIVELES_PRIORIDAD = ['Alta', 'Media', 'Baja']
+    DETALLES = {
+        'objetivos': [
+            "Reducir niveles de ansiedad mediante técnicas de relajación",
+            "Desarrollar habilidades sociales y comunicativas",
+            "Establecer rutinas diarias saludables",
+            "Mejorar adherencia al tratamiento farmacológico"
+        ],
+        'actividades': [
+            "Terapia cognitivo-conductual semanal",
+            "Ejercicios de mindfulness diarios",
+            "Participación en grupo de apoyo",
+            "Seguimiento médico mensual"
+        ],
+        'notas': [
+            "Muestra buena disposición y participación activa",
+            "Progreso consistente en objetivos establecidos",
+            "Necesita refuerzo en algunas áreas",
+            "Familia colaboradora con el tratamiento"
+        ]
+    }
     
-    def __init__(self):
+    def __init__(self, semilla=None, fecha_referencia=None):
+        """
+        Args:
+            semilla: Semilla (int o numpy.random.SeedSequence) para reproducir los datos
+            fecha_referencia: Fecha usada como "hoy" en la generación por columnas
+        """
         self.fake = Faker(['es_ES'])
+        self.rng, self.random = fuentes_aleatorias(semilla, self.fake)
+        self.fecha_referencia = fecha_referencia
         self._configurar_generadores()
+        self._configurar_generadores_columna()
 
     def _configurar_generadores(self):
         """Configura los generadores específicos para campos MTP"""
         self.generadores = {
-            'id_plan': lambda _: random.randint(1, 99999),
-            'id_paciente': lambda _: random.randint(1, 99999),
+            'id_plan': lambda _: self.random.randint(1, 99999),
+            'id_paciente': lambda _: self.random.randint(1, 99999),
             'fecha_inicio': lambda _: self.fake.date_between(start_date='-6m', end_date='today'),
             'fecha_revision': lambda _: self.fake.date_between(start_date='today', end_date='+6m'),
-            'estado_plan': lambda _: random.choice([
-                'Activo', 'Completado', 'En revisión', 'Suspendido', 'Pendiente'
-            ]),
-            'tipo_intervencion': lambda _: random.choice([
-                'Individual', 'Grupal', 'Familiar', 'Mixta'
-            ]),
-            'frecuencia_sesiones': lambda _: random.choice([
-                'Semanal', 'Quincenal', 'Mensual', 'Bisemanal'
-            ]),
-            'nivel_prioridad': lambda _: random.choice([
-                'Alta', 'Media', 'Baja'
-            ]),
+            'estado_plan': lambda _: self.random.choice(self.ESTADOS_PLAN),
+            'tipo_intervencion': lambda _: self.random.choice(self.TIPOS_INTERVENCION),
+            'frecuencia_sesiones': lambda _: self.random.choice(self.FRECUENCIAS_SESIONES),
+            'nivel_prioridad': lambda _: self.random.choice(self.NIVELES_PRIORIDAD),
             'objetivos': lambda _: self.generar_detalle_mtp('objetivos'),
             'actividades': lambda _: self.generar_detalle_mtp('actividades'),
-            'progreso': lambda _: random.randint(0, 100),
+            'progreso': lambda _: self.random.randint(0, 100),
             'notas_seguimiento': lambda _: self.generar_detalle_mtp('notas')
         }
 
+    def _configurar_generadores_columna(self):
+        """Versión vectorizada de los generadores: cada función recibe n y devuelve n valores"""
+        self.generadores_columna = {
+            'id_plan': lambda n: enteros(self.rng, 1, 99999, n),
+            'id_paciente': lambda n: enteros(self.rng, 1, 99999, n),
+            'fecha_inicio': lambda n: fechas_relativas(self.rng, -182, 0, n, self.fecha_referencia),
+            'fecha_revision': lambda n: fechas_relativas(self.rng, 0, 182, n, self.fecha_referencia),
+            'estado_plan': lambda n: elegir(self.rng, self.ESTADOS_PLAN, n),
+            'tipo_intervencion': lambda n: elegir(self.rng, self.TIPOS_INTERVENCION, n),
+            'frecuencia_sesiones': lambda n: elegir(self.rng, self.FRECUENCIAS_SESIONES, n),
+            'nivel_prioridad': lambda n: elegir(self.rng, self.NIVELES_PRIORIDAD, n),
+            'objetivos': lambda n: elegir(self.rng, self.DETALLES['objetivos'], n),
+            'actividades': lambda n: elegir(self.rng, self.DETALLES['actividades'], n),
+            'progreso': lambda n: enteros(self.rng, 0, 100, n),
+            'notas_seguimiento': lambda n: elegir(self.rng, self.DETALLES['notas'], n)
+        }
+        self.generadores_tipo = [
+            (('int',), lambda n: enteros(self.rng, 1, 100, n)),
+            (('float',), lambda n: np.round(self.rng.uniform(0, 10, n), 2)),
+            (('datetime', 'date'), lambda n: fechas_relativas(self.rng, -182, 182, n, self.fecha_referencia)),
+            (('bool',), lambda n: self.rng.random(n) < 0.5)
+        ]
+        self.generador_texto = lambda n: textos_faker(self.rng, lambda: self.fake.text(max_nb_chars=100), n)
+
     def generar_detalle_mtp(self, tipo_campo):
         """Genera texto detallado para campos del plan"""
-        detalles = {
-            'objetivos': [
-                "Reducir niveles de ansiedad mediante técnicas de relajación",
-                "Desarrollar habilidades sociales y comunicativas",
-                "Establecer rutinas diarias saludables",
-                "Mejorar adherencia al tratamiento farmacológico"
-            ],
-            'actividades': [
-                "Terapia cognitivo-conductual semanal",
-                "Ejercicios de mindfulness diarios",
-                "Participación en grupo de apoyo",
-                "Seguimiento médico mensual"
-            ],
-            'notas': [
-                "Muestra buena disposición y participación activa",
-                "Progreso consistente en objetivos establecidos",
-                "Necesita refuerzo en algunas áreas",
-                "Familia colaboradora con el tratamiento"
-            ]
-        }
-        return random.choice(detalles.get(tipo_campo, ["No especificado"]))
+        return self.random.choice(self.DETALLES.get(tipo_campo, ["No especificado"]))
 
     def generar_valor(self, campo, tipo, ejemplo=None, valores_unicos=None):
         """Genera un valor sintético basado en el tipo de campo y ejemplo"""
         # Si tenemos valores únicos limitados, usar esos
         if valores_unicos and len(valores_unicos) <= 5:
-            return random.choice(valores_unicos)
+            return self.random.choice(valores_unicos)
 
         # Buscar generador específico
         campo_lower = campo.lower()
@@ -80,13 +113,13 @@ class GeneradorMTP:
         # Si no hay generador específico, usar generadores por tipo
         tipo = str(tipo).lower()
         if 'int' in tipo:
-            return random.randint(1, 100)
+            return self.random.randint(1, 100)
         elif 'float' in tipo:
-            return round(random.uniform(0, 10), 2)  # Escalas típicas de 0-10
+            return round(self.random.uniform(0, 10), 2)  # Escalas típicas de 0-10
         elif 'datetime' in tipo or 'date' in tipo:
             return self.fake.date_between(start_date='-6m', end_date='+6m')
         elif 'bool' in tipo:
-            return random.choice([True, False])
+            return self.random.choice([True, False])
         else:
             return ejemplo if pd.notna(ejemplo) else self.fake.text(max_nb_chars=100)
 
@@ -107,42 +140,19 @@ class ExportadorMTP(ExportadorBase):
             except ValueError:
                 print("Por favor ingrese un número válido")
 
-    def generar_datos_sinteticos(self, estructura, cantidad):
-        """Genera datos sintéticos basados en la estructura proporcionada"""
-        datos = {}
-        
-        for idx, row in estructura.iterrows():
-            campo = row['Campo'] if 'Campo' in row else row['nombre']
-            tipo = row['Tipo'] if 'Tipo' in row else row['tipo']
-            ejemplo = row.get('Ejemplo', None)
-            valores_unicos = row.get('Valores_Posibles', None)
-            
-            # Convertir string de valores posibles a lista si es necesario
-            if isinstance(valores_unicos, str):
-                try:
-                    valores_unicos = eval(valores_unicos)
-                except:
-                    valores_unicos = None
-            
-            # Generar valores manteniendo los tipos de datos
-            valores = []
-            for _ in range(cantidad):
-                valor = self.generador.generar_valor(campo, tipo, ejemplo, valores_unicos)
-                valores.append(valor)
-            
-            datos[campo] = valores
-        
-        # Crear DataFrame y convertir tipos según la estructura original
-        df = pd.DataFrame(datos)
-        for idx, row in estructura.iterrows():
-            campo = row['Campo'] if 'Campo' in row else row['nombre']
-            tipo = row['Tipo'] if 'Tipo' in row else row['tipo']
-            try:
-                df[campo] = df[campo].astype(tipo)
-            except:
-                print(f"Advertencia: No se pudo convertir la columna {campo} al tipo {tipo}")
-        
-        return df
+    def generar_datos_sinteticos(self, estructura, cantidad, semilla=None, shards=1, workers=None):
+        """
+        Genera datos sintéticos basados en la estructura proporcionada
+
+        Con semilla o varios shards se usa generar_en_paralelo, que produce
+        los mismos datos para la misma semilla sin importar workers.
+        """
+        if semilla is not None or shards > 1:
+            return generar_en_paralelo(type(self.generador), estructura, cantidad,
+                                       semilla=semilla, shards=shards, workers=workers)
+
+        plan = PlanGeneracion.compilar(estructura, self.generador)
+        return plan.generar(cantidad)
 
     def exportar_mtp(self, df_estructura, clinic_initials, output_dir, cantidad=None):
         """Genera y exporta datos sintéticos de planes MTP"""
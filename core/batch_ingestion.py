@@ -0,0 +1,285 @@
+"""
+Ingesta de PDFs por lotes, sin interacción, para una clínica completa.
+
+Recorre <clinica>/<facilitador>/grupos/<turno>/pacientes/*/<tipo>/input,
+extrae cada PDF pendiente con un número acotado de procesos y guarda el
+resultado en la carpeta output correspondiente. El avance se registra en un
+diario (JSON Lines) para poder reanudar tras una interrupción.
+
+Uso:
+    python -m core.batch_ingestion mi_tierra --workers 4
+"""
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout
+from typing import Dict, Any, List, Optional
+import argparse
+import io
+import json
+import os
+import time
+
+from pdf_extractor.pdf_extractor import PDFExtractor
+from utils.data_formats import DataFormatHandler
+from utils.config_manager import ConfigManager
+from utils.menu_manager import MenuManager
+
+# Extractor reutilizado por cada proceso del pool
+_EXTRACTOR = None
+
+
+def _procesar_pdf(tarea: Dict[str, Any], modo: str, cache_dir: Optional[str]) -> Dict[str, Any]:
+    """
+    Extrae un PDF y guarda su informe JSON en la carpeta output.
+
+    Se define a nivel de módulo para poder ejecutarse en los procesos del
+    ProcessPoolExecutor usado por IngestaLotePDF.
+
+    Returns:
+        dict: Entrada del diario con el resultado del documento
+    """
+    global _EXTRACTOR
+    pdf = Path(tarea['pdf'])
+    inicio = time.perf_counter()
+    entrada = {
+        'pdf': str(pdf),
+        'tamano': tarea['tamano'],
+        'mtime_ns': tarea['mtime_ns'],
+        'fecha': datetime.now().isoformat()
+    }
+
+    try:
+        # La salida detallada del extractor no es útil en modo desatendido
+        with redirect_stdout(io.StringIO()):
+            if _EXTRACTOR is None:
+                _EXTRACTOR = PDFExtractor()
+                if cache_dir:
+                    _EXTRACTOR.usar_cache(cache_dir)
+            paginas = _EXTRACTOR._contar_paginas(pdf)
+            contenido, calidad = _EXTRACTOR.leer_pdf(pdf, use_ai=False, modo=modo)
+
+        if not contenido:
+            raise ValueError("No se pudo extraer contenido")
+
+        info_seleccion = {
+            'tipo_doc': tarea['tipo_doc'],
+            'facilitador': tarea['facilitador'],
+            'turno': tarea['turno'],
+            'paciente': tarea['paciente'],
+            'pdf': pdf
+        }
+        datos = MenuManager._preparar_datos_informe(info_seleccion, contenido, calidad)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        archivo_json = Path(tarea['output']) / f"{pdf.stem}_{timestamp}.json"
+        if not DataFormatHandler.save_data(datos, archivo_json, 'json'):
+            raise IOError(f"No se pudo guardar {archivo_json}")
+
+        entrada.update({
+            'estado': 'ok',
+            'salida': str(archivo_json),
+            'paginas': paginas,
+            'calidad': calidad
+        })
+    except Exception as e:
+        entrada.update({'estado': 'error', 'error': str(e), 'paginas': 0})
+
+    entrada['segundos'] = round(time.perf_counter() - inicio, 3)
+    return entrada
+
+
+class IngestaLotePDF:
+    """Procesa sin interacción todos los PDFs pendientes de una clínica"""
+
+    NOMBRE_DIARIO = "ingesta_lote.jsonl"
+
+    def __init__(self, clinica_path, workers: int = None, modo: str = 'costo',
+                 usar_cache: bool = True):
+        """
+        Args:
+            clinica_path: Carpeta de la clínica (Data/<clinica>)
+            workers: Procesos simultáneos (por defecto pdf_extractor.workers)
+            modo: Modo de extracción de PDFExtractor.leer_pdf
+            usar_cache: Si es True, usa la caché de extracciones de la clínica
+        """
+        self.clinica_path = Path(clinica_path)
+        self.workers = max(1, workers or ConfigManager().get('pdf_extractor.workers') or os.cpu_count() or 1)
+        self.modo = modo
+        self.cache_dir = self.clinica_path / '.cache'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.diario_path = self.cache_dir / self.NOMBRE_DIARIO
+        self.usar_cache = usar_cache
+
+    def _cargar_diario(self) -> Dict[str, Dict[str, Any]]:
+        """Lee el diario y retorna la última entrada de cada PDF"""
+        entradas = {}
+        if not self.diario_path.exists():
+            return entradas
+
+        with open(self.diario_path, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    continue  # Línea incompleta por una interrupción
+                entradas[entrada['pdf']] = entrada
+        return entradas
+
+    def _registrar(self, diario, entrada: Dict[str, Any]) -> None:
+        """Añade una entrada al diario asegurando que llegue al disco"""
+        diario.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        diario.flush()
+        os.fsync(diario.fileno())
+
+    @staticmethod
+    def _cargar_paciente(paciente_path: Path) -> Dict[str, Any]:
+        """Lee info_paciente.json o deduce los datos del nombre de la carpeta"""
+        info_path = paciente_path / 'info_paciente.json'
+        if info_path.exists():
+            try:
+                with open(info_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {'id': paciente_path.name, 'nombre': paciente_path.name.replace('_', ' ').title()}
+
+    def descubrir_pdfs(self) -> List[Dict[str, Any]]:
+        """Encuentra todos los PDFs en las carpetas input de la clínica"""
+        tareas = []
+        pacientes_cache = {}
+        patron = '*/grupos/*/pacientes/*/*/input/*'
+
+        for pdf in sorted(self.clinica_path.glob(patron)):
+            if pdf.suffix.lower() != '.pdf' or not pdf.is_file():
+                continue
+
+            input_dir = pdf.parent
+            tipo_path = input_dir.parent
+            paciente_path = tipo_path.parent
+            turno_path = paciente_path.parent.parent
+            facilitador_path = turno_path.parent.parent
+
+            if paciente_path not in pacientes_cache:
+                pacientes_cache[paciente_path] = self._cargar_paciente(paciente_path)
+
+            stat = pdf.stat()
+            tareas.append({
+                'pdf': str(pdf),
+                'output': str(tipo_path / 'output'),
+                'tipo_doc': tipo_path.name,
+                'facilitador': facilitador_path.name,
+                'turno': turno_path.name,
+                'paciente': pacientes_cache[paciente_path],
+                'tamano': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns
+            })
+        return tareas
+
+    def obtener_pendientes(self, reprocesar_errores: bool = True) -> List[Dict[str, Any]]:
+        """
+        Filtra los PDFs ya procesados según el diario
+
+        Un PDF se considera procesado si su última entrada es correcta y el
+        archivo no ha cambiado desde entonces.
+        """
+        diario = self._cargar_diario()
+        pendientes = []
+        for tarea in self.descubrir_pdfs():
+            previa = diario.get(tarea['pdf'])
+            if previa and previa['tamano'] == tarea['tamano'] and previa['mtime_ns'] == tarea['mtime_ns']:
+                if previa['estado'] == 'ok' or not reprocesar_errores:
+                    continue
+            pendientes.append(tarea)
+        return pendientes
+
+    def ejecutar(self, reprocesar_errores: bool = True) -> Dict[str, Any]:
+        """
+        Procesa todos los PDFs pendientes
+
+        Returns:
+            dict: Resumen con documentos, páginas, errores y rendimiento
+        """
+        pendientes = self.obtener_pendientes(reprocesar_errores)
+        print(f"\n=== INGESTA POR LOTES: {self.clinica_path.name} ===")
+        print(f"📄 PDFs pendientes: {len(pendientes)} (procesos: {self.workers})")
+
+        resumen = {'documentos': 0, 'paginas': 0, 'errores': 0, 'segundos': 0.0}
+        cache_dir = str(self.cache_dir) if self.usar_cache else None
+        inicio = time.perf_counter()
+
+        with open(self.diario_path, 'a', encoding='utf-8') as diario:
+            def registrar(entrada):
+                self._registrar(diario, entrada)
+                if entrada['estado'] == 'ok':
+                    resumen['documentos'] += 1
+                    resumen['paginas'] += entrada['paginas']
+                    print(f"✅ {Path(entrada['pdf']).name} ({entrada['paginas']} págs, {entrada['calidad']}%)")
+                else:
+                    resumen['errores'] += 1
+                    print(f"❌ {Path(entrada['pdf']).name}: {entrada['error']}")
+
+            if self.workers == 1:
+                for tarea in pendientes:
+                    registrar(_procesar_pdf(tarea, self.modo, cache_dir))
+            else:
+                # Se limita el número de tareas en vuelo para no encolar toda la clínica
+                cola = iter(pendientes)
+                en_vuelo = set()
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    for tarea in cola:
+                        en_vuelo.add(executor.submit(_procesar_pdf, tarea, self.modo, cache_dir))
+                        if len(en_vuelo) >= self.workers * 2:
+                            terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                            for futuro in terminados:
+                                registrar(futuro.result())
+                    for futuro in wait(en_vuelo).done:
+                        registrar(futuro.result())
+
+        resumen['segundos'] = round(time.perf_counter() - inicio, 2)
+        minutos = resumen['segundos'] / 60 if resumen['segundos'] else 0
+        resumen['docs_por_minuto'] = round(resumen['documentos'] / minutos, 2) if minutos else 0.0
+        resumen['paginas_por_minuto'] = round(resumen['paginas'] / minutos, 2) if minutos else 0.0
+
+        print("\n=== RESUMEN DE INGESTA ===")
+        print(f"Documentos procesados: {resumen['documentos']}")
+        print(f"Páginas procesadas: {resumen['paginas']}")
+        print(f"Errores: {resumen['errores']}")
+        print(f"Tiempo total: {resumen['segundos']} s")
+        print(f"Rendimiento: {resumen['docs_por_minuto']} docs/min, {resumen['paginas_por_minuto']} págs/min")
+        return resumen
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Ingesta desatendida de PDFs de una clínica"
+    )
+    parser.add_argument('clinica', type=str,
+                        help='Nombre de la clínica o ruta a su carpeta')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Número de procesos simultáneos')
+    parser.add_argument('--modo', '-m', type=str, default='costo',
+                        choices=['secuencial', 'paginado', 'costo'],
+                        help='Estrategia de extracción de PDFExtractor')
+    parser.add_argument('--sin-cache', action='store_true',
+                        help='No usar la caché de extracciones')
+    parser.add_argument('--omitir-errores', action='store_true',
+                        help='No reintentar los PDFs que fallaron en ejecuciones anteriores')
+    args = parser.parse_args(argv)
+
+    clinica_path = Path(args.clinica)
+    if not clinica_path.exists():
+        clinica_path = Path(ConfigManager().get_data_path()) / args.clinica
+    if not clinica_path.exists():
+        print(f"❌ No se encontró la clínica: {args.clinica}")
+        return 1
+
+    ingesta = IngestaLotePDF(clinica_path, workers=args.workers, modo=args.modo,
+                             usar_cache=not args.sin_cache)
+    resumen = ingesta.ejecutar(reprocesar_errores=not args.omitir_errores)
+    return 1 if resumen['errores'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
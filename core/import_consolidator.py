@@ -2,6 +2,8 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 from utils.template_manager import TemplateManager
+from utils.catalogo_plantillas import obtener_catalogo
+from utils.cache_plantillas import copiar_plantilla, obtener_plantilla
 from utils.data_validator import DataValidator
 from pdf_extractor.pdf_extractor import PDFExtractor
 from utils.data_formats import DataFormatHandler
@@ -52,23 +54,18 @@ class ImportConsolidator:
             print(f"\n❌ No se encontró el directorio de templates: {template_base}")
             return None
 
-        # Buscar todos los archivos JSON directamente en el directorio (sin recursión)
-        templates_encontrados = []
-        for template_path in template_base.glob('*.json'):
-            try:
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    templates_encontrados.append({
-                        'path': template_path,
-                        'nombre': template_path.name,
-                        'tipo': metadata.get('tipo_documento', 'desconocido'),
-                        'num_campos': len(metadata.get('campos', [])),
-                        'fecha': metadata.get('fecha_generacion', ''),
-                        'campos': metadata.get('campos', [])
-                    })
-            except Exception as e:
-                print(f"\n⚠️ Error leyendo template {template_path.name}: {str(e)}")
-                continue
+        # Plantillas JSON del directorio (sin recursión), desde el catálogo persistente
+        templates_encontrados = [
+            {
+                'path': plantilla['ruta'],
+                'nombre': plantilla['archivo'],
+                'tipo': plantilla['tipo'],
+                'num_campos': plantilla['num_campos'],
+                'fecha': plantilla['fecha_generacion'],
+                'campos': plantilla['campos']
+            }
+            for plantilla in obtener_catalogo(template_base).listar(extensiones=('.json',))
+        ]
 
         if not templates_encontrados:
             print("\n❌ No se encontraron templates disponibles")
@@ -103,11 +100,10 @@ class ImportConsolidator:
                     template_seleccionado = templates_encontrados[idx]
                     print(f"\n✅ Template seleccionado:")
                     print(f"   Nombre: {template_seleccionado['nombre']}")
-                    print(f"   Ubicación: {template_seleccionado['subcarpeta']}")
+                    print(f"   Ubicación: {template_seleccionado['path'].parent}")
                     
                     # Cargar template completo
-                    with open(template_seleccionado['path'], 'r', encoding='utf-8') as f:
-                        return json.load(f)
+                    return copiar_plantilla(template_seleccionado['path'])
                 else:
                     print("❌ Selección no válida")
             except ValueError:
@@ -298,8 +294,8 @@ class ImportConsolidator:
                     print("❌ Por favor ingrese un número válido")
 
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_structure = json.load(f)
+            # Solo se consulta: basta con la vista de solo lectura de la caché
+            template_structure = obtener_plantilla(template_path)
             print(f"\n✅ Template cargado: {template_path.name}")
         except Exception as e:
             print(f"\n❌ Error leyendo template: {str(e)}")
@@ -310,6 +306,9 @@ class ImportConsolidator:
         output_dir = self.base_path / "data" / clinic_code / "output" / "consolidaciones"
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Reutilizar extracciones previas de la clínica
+        self.pdf_extractor.usar_cache(self.base_path / "data" / clinic_code / ".cache")
+        
         # 3. Consolidar datos iniciales
         datos_base = {
             'paciente': patient_name,
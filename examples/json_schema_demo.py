@@ -16,6 +16,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Importar la clase LectorArchivos
 from lector_archivos.lector import LectorArchivos
+from utils.registro_validadores import REGISTRO_VALIDADORES, obtener_validador
 
 # Definir un esquema de ejemplo
 ESQUEMA_PACIENTES = {
@@ -156,6 +157,17 @@ def main():
     except Exception as e:
         print(f"❌ Error: {str(e)}")
     
+    print("\n=== Ejemplo 5: Validación Registro a Registro ===")
+    # El validador se compila una vez y se reutiliza para cada registro
+    validador = obtener_validador(ESQUEMA_PACIENTES["items"])
+    registros = (datos_validos + datos_invalidos) * 500
+    invalidos = sum(1 for registro in registros if not validador.is_valid(registro))
+    # Las siguientes búsquedas del mismo esquema son aciertos del registro
+    for _ in range(3):
+        lector.validar_datos_json(datos_validos, ESQUEMA_PACIENTES["items"], is_lines=True)
+    print(f"✅ {len(registros)} registros validados, {invalidos} inválidos")
+    print(f"📊 Registro de validadores: {REGISTRO_VALIDADORES.estadisticas()}")
+    
     # Limpiar archivos temporales
     archivo_valido.unlink()
     archivo_invalido.unlink()
@@ -0,0 +1,34 @@
+"""
+Lectores de archivos de LectorArchivos, registrados por extensión.
+
+Cada lector declara sus dependencias y se importa la primera vez que se lee
+un archivo de su formato (ver utils.registro_complementos).
+"""
+from utils.registro_complementos import RegistroComplementos
+
+
+def leer_tsv(ruta_archivo):
+    import pandas as pd
+    return pd.read_csv(ruta_archivo, sep='\t')
+
+
+def leer_yaml(ruta_archivo):
+    import pandas as pd
+    import yaml
+    with open(ruta_archivo, 'r', encoding='utf-8') as f:
+        return pd.DataFrame(yaml.safe_load(f))
+
+
+def leer_html(ruta_archivo):
+    import pandas as pd
+    return pd.read_html(ruta_archivo)[0]
+
+
+LECTORES = RegistroComplementos()
+LECTORES.registrar('csv', 'pandas:read_csv', ['pandas'], ['.csv'], 'CSV')
+LECTORES.registrar('excel', 'pandas:read_excel', ['pandas', 'openpyxl'], ['.xls', '.xlsx'], 'Excel')
+LECTORES.registrar('tsv', f'{__name__}:leer_tsv', ['pandas'], ['.tsv'], 'TSV')
+LECTORES.registrar('ods', 'pandas:read_excel', ['pandas', 'odf'], ['.ods'], 'OpenDocument')
+LECTORES.registrar('json', 'pandas:read_json', ['pandas'], ['.json'], 'JSON')
+LECTORES.registrar('yaml', f'{__name__}:leer_yaml', ['pandas', 'yaml'], ['.yml', '.yaml'], 'YAML')
+LECTORES.registrar('html', f'{__name__}:leer_html', ['pandas', 'lxml'], ['.html'], 'HTML')
@@ -1,30 +1,136 @@
 import pandas as pd
-import yaml
+import codecs
 import json
 import csv
-import jsonschema
-from jsonschema import validate, ValidationError, SchemaError
 from io import StringIO
 from datetime import datetime
 from pathlib import Path
-from tabulate import tabulate
 from utils.file_naming import FileNamingConvention
-import openpyxl
-from openpyxl.utils import get_column_letter, column_index_from_string
+from utils.registro_complementos import importar_diferido
+from utils.perfilado import PerfiladorColumnas
+from utils.registro_validadores import obtener_validador
+from utils.deteccion_formato import detectar_formato
+from .sesion_excel import SesionExcel
+from .normalizador_json import NormalizadorJSON
+from .formatos import LECTORES
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout
+import io
+import itertools
+import os
+import time
 import re
 import logging
 
+# Dependencias que solo necesitan algunos formatos: se importan en el primer uso
+yaml = importar_diferido('yaml')
+jsonschema = importar_diferido('jsonschema')
+openpyxl = importar_diferido('openpyxl')
+
+# orjson es opcional: acelera el parseo línea a línea de JSON Lines
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Lector reutilizado por cada proceso del pool de procesar_lote_paralelo
+_LECTOR = None
+
+
+# codecs no permite retirar manejadores: cada lectura con reemplazo registra uno con nombre propio
+_manejadores_reemplazo = itertools.count()
+
+
+def _registrar_reemplazo(contador):
+    """
+    Registra un manejador de errores de decodificación que sustituye cada
+    secuencia no válida por U+FFFD y suma sus bytes en contador['bytes']
+
+    Returns:
+        str: Nombre del manejador, para encoding_errors de pandas.read_csv
+    """
+    def reemplazar(error):
+        contador['bytes'] += error.end - error.start
+        return '\ufffd', error.end
+
+    nombre = f"lector_reemplazo_{next(_manejadores_reemplazo)}"
+    codecs.register_error(nombre, reemplazar)
+    return nombre
+
+
+def _procesar_archivo_lote(ruta, output_dir, clinic_initials, decision):
+    """
+    Lee, analiza y documenta un archivo sin interacción.
+
+    Se define a nivel de módulo para poder ejecutarse en los procesos del
+    ProcessPoolExecutor usado por LectorArchivos.procesar_lote_paralelo.
+
+    Returns:
+        dict: Estado, estructura, tiempos por fase y error del archivo
+    """
+    global _LECTOR
+    inicio = time.perf_counter()
+    resultado = {'archivo': str(ruta), 'tipo': LectorArchivos.tipo_archivo(ruta),
+                 'estado': None, 'error': None, 'tiempos': {}}
+    try:
+        # La salida por consola no es útil en modo desatendido
+        with redirect_stdout(io.StringIO()):
+            if _LECTOR is None:
+                _LECTOR = LectorArchivos()
+
+            df, extension = _LECTOR.leer_archivo(ruta)
+            resultado['tiempos']['lectura'] = round(time.perf_counter() - inicio, 3)
+            resultado.update({'extension': extension, 'filas': len(df), 'columnas': len(df.columns)})
+
+            marca = time.perf_counter()
+            estructura = _LECTOR.aplicar_decision_estructura(_LECTOR.analizar_estructura(df), decision)
+            resultado['tiempos']['analisis'] = round(time.perf_counter() - marca, 3)
+            resultado['estructura'] = estructura
+
+            if decision is None:
+                resultado['estado'] = 'sin_decision'
+            elif not decision.get('aceptar', True):
+                resultado['estado'] = 'rechazado'
+            else:
+                if clinic_initials and decision.get('formato'):
+                    marca = time.perf_counter()
+                    # Se usa el nombre del archivo para no pisar la documentación de otros del mismo tipo
+                    ruta_doc = _LECTOR.generar_documentacion(estructura, clinic_initials, Path(ruta).stem,
+                                                             output_dir, formato=decision['formato'])
+                    resultado['tiempos']['documentacion'] = round(time.perf_counter() - marca, 3)
+                    if ruta_doc is None:
+                        raise IOError("No se pudo guardar la documentación")
+                    resultado['documentacion'] = str(ruta_doc)
+                resultado['estado'] = 'ok'
+    except Exception as e:
+        resultado.update({'estado': 'error', 'error': str(e)})
+
+    resultado['tiempos']['total'] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+
 class LectorArchivos:
-    FORMATOS_SOPORTADOS = {
-        '.csv': pd.read_csv,
-        '.xls': pd.read_excel,
-        '.xlsx': pd.read_excel,
-        '.tsv': lambda f: pd.read_csv(f, sep='\t'),
-        '.ods': pd.read_excel,
-        '.json': pd.read_json,
-        '.yml': lambda f: pd.DataFrame(yaml.safe_load(open(f))),
-        '.yaml': lambda f: pd.DataFrame(yaml.safe_load(open(f))),
-        '.html': lambda f: pd.read_html(f)[0]
+    # Lectores por extensión; cada uno se importa al leer el primer archivo de su formato
+    FORMATOS_SOPORTADOS = LECTORES
+
+    # Bytes leídos del inicio de un CSV para detectar codificación y delimitador
+    TAMANO_MUESTRA_CSV = 64 * 1024
+
+    # Filas de la muestra usada por analizar_estructura
+    TAMANO_MUESTRA_PERFIL = 10_000
+
+    # Extensiones leídas línea a línea como JSON Lines
+    EXTENSIONES_JSONL = ('.jsonl', '.ndjson')
+
+    FORMATOS_SALIDA = {
+        '1': ('CSV', lambda df, p: df.to_csv(p, index=False), '.csv'),
+        '2': ('Excel', lambda df, p: df.to_excel(p, index=False), '.xlsx'),
+        '3': ('JSON', lambda df, p: df.to_json(p, orient='records', indent=2), '.json'),
+        '4': ('HTML', lambda df, p: df.to_html(p, index=False), '.html'),
+        '5': ('YAML', lambda df, p: yaml.dump(yaml.safe_load(df.to_json(orient='records')), open(p, 'w')), '.yaml'),
+        '6': ('TSV', lambda df, p: df.to_csv(p, sep='\t', index=False), '.tsv'),
+        '7': ('ODS', lambda df, p: df.to_excel(p, engine='odf', index=False), '.ods')
     }
 
     def __init__(self):
@@ -92,45 +198,131 @@ class LectorArchivos:
         except Exception as e:
             raise Exception(f"Error al leer archivo: {str(e)}")
 
-    def leer_xml(self, ruta_archivo):
-        import xml.etree.ElementTree as ET
+    def leer_xml(self, ruta_archivo, tag_registro=None, tamano_bloque=None):
+        """
+        Lee un archivo XML en streaming con iterparse.
+
+        Cada registro se convierte en un diccionario {etiqueta_hijo: texto} y
+        se elimina del árbol en cuanto se procesa, de modo que la memoria no
+        depende del tamaño del archivo.
+
+        Args:
+            ruta_archivo: Ruta del archivo XML
+            tag_registro (str, optional): Etiqueta de los registros (con o sin
+                espacio de nombres). Por defecto, cada hijo directo de la raíz
+            tamano_bloque (int, optional): Si se indica, retorna un iterador de
+                DataFrames de como máximo ese número de registros
+
+        Returns:
+            pandas.DataFrame: Registros del XML, o un iterador de DataFrames si
+                              se indicó tamano_bloque
+        """
+        if tamano_bloque:
+            return self._iterar_xml(ruta_archivo, tag_registro, tamano_bloque)
         try:
-            tree = ET.parse(ruta_archivo)
-            root = tree.getroot()
-            data = []
-            for child in root:
-                record = {}
-                for elem in child:
-                    record[elem.tag] = elem.text
-                data.append(record)
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(self._registros_xml(ruta_archivo, tag_registro)))
             self.logger.info(f"Archivo XML leído correctamente: {ruta_archivo}")
             return df
         except Exception as e:
             self.logger.error(f"Error al leer XML: {e}")
             raise e
 
+    def _iterar_xml(self, ruta_archivo, tag_registro, tamano_bloque):
+        """Genera bloques de DataFrame con índice continuo a partir de los registros del XML"""
+        bloque = []
+        inicio = 0
+        for registro in self._registros_xml(ruta_archivo, tag_registro):
+            bloque.append(registro)
+            if len(bloque) >= tamano_bloque:
+                yield pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+                inicio += len(bloque)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+
+    @staticmethod
+    def _registros_xml(ruta_archivo, tag_registro=None):
+        """
+        Recorre el XML con iterparse generando un diccionario por registro
+
+        Tras procesar un registro se vacía y se quita de su padre, para que el
+        árbol parcial que mantiene iterparse no crezca con el archivo.
+        """
+        pila = []
+        for evento, elem in ET.iterparse(ruta_archivo, events=('start', 'end')):
+            if evento == 'start':
+                pila.append(elem)
+                continue
+            pila.pop()
+
+            if tag_registro is None:
+                es_registro = len(pila) == 1  # Hijo directo de la raíz
+            else:
+                es_registro = elem.tag == tag_registro or elem.tag.endswith('}' + tag_registro)
+            if not es_registro:
+                continue
+
+            yield {hijo.tag: hijo.text for hijo in elem}
+            elem.clear()
+            if pila:
+                pila[-1].remove(elem)
+
     def leer_archivo_mixto(self, ruta_archivo):
+        """
+        Lee un archivo de formato desconocido con un único lector.
+
+        El formato se decide con detectar_formato a partir de los primeros
+        bytes (firmas, '<' / '{', dialecto CSV), sin probar a parsear el
+        archivo completo con cada lector.
+
+        Returns:
+            pandas.DataFrame: Datos del archivo
+
+        Raises:
+            ValueError: Si el formato no se reconoce o no se puede leer
+        """
         self.logger.info(f"Procesando archivo mixto: {ruta_archivo}")
+        deteccion = detectar_formato(ruta_archivo)
+        formato = deteccion['formato']
         try:
-            df = self.leer_json(ruta_archivo)
-            self.logger.info("Archivo procesado como JSON.")
-            return df
-        except Exception:
-            try:
+            if formato in ('csv', 'tsv'):
+                df = self.leer_csv(ruta_archivo, encoding=deteccion['encoding'] or 'utf-8',
+                                   delimiter=deteccion['delimitador'])
+            elif formato == 'json':
+                datos = self.leer_json(ruta_archivo)
+                if datos is None:
+                    raise ValueError("JSON no válido")
+                df = pd.DataFrame(datos) if isinstance(datos, list) else pd.json_normalize(datos)
+            elif formato == 'jsonl':
+                df = pd.DataFrame(list(self.iterar_jsonl(ruta_archivo)))
+            elif formato == 'xml':
                 df = self.leer_xml(ruta_archivo)
-                self.logger.info("Archivo procesado como XML.")
-                return df
-            except Exception:
-                try:
-                    df = pd.read_csv(ruta_archivo)
-                    self.logger.info("Archivo procesado como CSV.")
-                    return df
-                except Exception as e:
-                    self.logger.error(f"Error al procesar archivo mixto: {e}")
-                    raise e
+            elif formato == 'html':
+                df = pd.read_html(ruta_archivo)[0]
+            elif formato == 'yaml':
+                with open(ruta_archivo, 'r', encoding=deteccion['encoding'] or 'utf-8') as f:
+                    df = pd.DataFrame(yaml.safe_load(f))
+            elif formato in ('xlsx', 'xls'):
+                df = pd.read_excel(ruta_archivo)
+            elif formato == 'ods':
+                df = pd.read_excel(ruta_archivo, engine='odf')
+            elif formato == 'parquet':
+                df = pd.read_parquet(ruta_archivo)
+            elif formato == 'feather':
+                df = pd.read_feather(ruta_archivo)
+            else:
+                raise ValueError(f"Formato no reconocido: {formato}")
+        except Exception as e:
+            self.logger.error(f"Error al procesar archivo mixto: {e}")
+            raise
+        self.logger.info(f"Archivo procesado como {formato.upper()}.")
+        return df
 
     def procesar_lote(self, lista_archivos, output_dir, clinic_initials=None, pre_hooks=None, post_hooks=None):
+        """
+        Procesa los archivos uno a uno pidiendo confirmación de cada estructura.
+        Para lotes desatendidos usar procesar_lote_paralelo.
+        """
         resultados = []
         for ruta in lista_archivos:
             try:
@@ -141,6 +333,120 @@ class LectorArchivos:
                 self.logger.error(f"Error al procesar {ruta}: {e}")
         return resultados
 
+    def procesar_lote_paralelo(self, lista_archivos, output_dir, clinic_initials=None,
+                               decisiones=None, workers=None, pre_hooks=None, post_hooks=None):
+        """
+        Lee, analiza y documenta varios archivos a la vez sin interacción
+        
+        En lugar de preguntar por cada estructura se aplica la decisión
+        guardada para el tipo de archivo (prefijo del nombre antes del primer
+        '_', o '*' como decisión por defecto):
+        
+            {'pacientes': {'aceptar': True, 'renombrar': {'nom': 'nombre'}, 'formato': 'csv'}}
+        
+        Los archivos sin decisión se analizan pero quedan en estado
+        'sin_decision' y no se documentan.
+        
+        Args:
+            lista_archivos: Rutas de los archivos a procesar
+            output_dir: Carpeta donde guardar la documentación
+            clinic_initials: Iniciales de la clínica (sin ellas no se documenta)
+            decisiones: Diccionario de decisiones o ruta a un JSON/YAML con ellas
+            workers: Procesos simultáneos (por defecto os.cpu_count())
+            pre_hooks: Funciones hook(ruta) ejecutadas antes de procesar cada archivo
+            post_hooks: Funciones hook(ruta, estructura) para los archivos aceptados
+            
+        Returns:
+            dict: Resultado por archivo (en el orden de entrada) y totales
+        """
+        if decisiones is not None and not isinstance(decisiones, dict):
+            decisiones = self.cargar_decisiones_estructura(decisiones)
+        decisiones = decisiones or {}
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(lista_archivos) or 1))
+        inicio = time.perf_counter()
+        
+        tareas = []
+        for ruta in lista_archivos:
+            for hook in pre_hooks or []:
+                hook(ruta)
+            decision = decisiones.get(self.tipo_archivo(ruta), decisiones.get('*'))
+            tareas.append((ruta, str(output_dir), clinic_initials, decision))
+        
+        resultados = {}
+        
+        def registrar(resultado):
+            resultados[resultado['archivo']] = resultado
+            if resultado['estado'] == 'error':
+                self.logger.error(f"Error al procesar {resultado['archivo']}: {resultado['error']}")
+                return
+            self.logger.info(f"Procesado ({resultado['estado']}): {resultado['archivo']} "
+                             f"en {resultado['tiempos']['total']}s")
+            if resultado['estado'] == 'ok':
+                for hook in post_hooks or []:
+                    hook(resultado['archivo'], resultado['estructura'])
+        
+        if workers == 1:
+            for tarea in tareas:
+                registrar(_procesar_archivo_lote(*tarea))
+        else:
+            # Se limita el número de archivos en vuelo para no encolar toda la carpeta
+            en_vuelo = set()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for tarea in tareas:
+                    en_vuelo.add(executor.submit(_procesar_archivo_lote, *tarea))
+                    if len(en_vuelo) >= workers * 2:
+                        terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                        for futuro in terminados:
+                            registrar(futuro.result())
+                for futuro in wait(en_vuelo).done:
+                    registrar(futuro.result())
+        
+        archivos = [resultados[str(ruta)] for ruta in lista_archivos]
+        estados = [r['estado'] for r in archivos]
+        return {
+            'archivos': archivos,
+            'procesados': estados.count('ok'),
+            'sin_decision': estados.count('sin_decision'),
+            'rechazados': estados.count('rechazado'),
+            'errores': estados.count('error'),
+            'workers': workers,
+            'segundos': round(time.perf_counter() - inicio, 3)
+        }
+    
+    @staticmethod
+    def tipo_archivo(ruta):
+        """Tipo de un archivo según la convención de nombres (prefijo antes del primer '_')"""
+        return Path(ruta).stem.split('_')[0]
+    
+    @staticmethod
+    def aplicar_decision_estructura(estructura, decision):
+        """Aplica a la estructura detectada los renombrados de una decisión guardada"""
+        renombrar = (decision or {}).get('renombrar') or {}
+        for campo in estructura:
+            campo['nombre'] = renombrar.get(campo['nombre'], campo['nombre'])
+        return estructura
+    
+    @staticmethod
+    def cargar_decisiones_estructura(ruta):
+        """Lee las decisiones de estructura por tipo de archivo desde un JSON o YAML"""
+        ruta = Path(ruta)
+        with open(ruta, 'r', encoding='utf-8') as f:
+            if ruta.suffix.lower() in ('.yaml', '.yml'):
+                return yaml.safe_load(f) or {}
+            return json.load(f)
+    
+    @staticmethod
+    def guardar_decisiones_estructura(decisiones, ruta):
+        """Guarda las decisiones de estructura para reutilizarlas en próximos lotes"""
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            if ruta.suffix.lower() in ('.yaml', '.yml'):
+                yaml.safe_dump(decisiones, f, allow_unicode=True)
+            else:
+                json.dump(decisiones, f, ensure_ascii=False, indent=2)
+
     def validar_datos_genericos(self, df, reglas):
         # reglas es un dict: clave => función de validación (retorna True si es válido)
         errores = {}
@@ -152,27 +458,36 @@ class LectorArchivos:
                     self.logger.warning(f"Datos inválidos en columna {col}: {errores[col]}")
         return errores
 
-    def analizar_estructura(self, df):
-        """Analiza y retorna la estructura detallada del DataFrame"""
+    def analizar_estructura(self, df, tamano_muestra=None):
+        """
+        Analiza y retorna la estructura detallada del DataFrame
+        
+        Los tipos y la cardinalidad se calculan sobre una muestra (ver
+        utils.perfilado); las columnas con pocos valores distintos se
+        recorren completas para listar sus valores exactos.
+        
+        Args:
+            df: DataFrame o iterador de DataFrames (leer_csv con tamano_bloque)
+            tamano_muestra: Filas de la muestra (por defecto TAMANO_MUESTRA_PERFIL)
+        """
+        perfilador = PerfiladorColumnas(tamano_muestra or self.TAMANO_MUESTRA_PERFIL)
         estructura = []
-        for columna, tipo in df.dtypes.items():
-            # Mantener el valor exacto incluyendo nulos
-            ejemplo = df[columna].iloc[0]
-            # No convertir a string para mantener el tipo original
+        for columna, perfil in perfilador.perfilar(df).items():
             info_campo = {
                 'nombre': columna,
-                'tipo': str(tipo),
-                'ejemplo': ejemplo,
-                'n_unicos': df[columna].nunique(),
-                'tiene_nulos': df[columna].isnull().any(),
-                'tipo_nulos': 'NaN' if df[columna].dtype.kind in 'fc' else 
-                            'NULL' if df[columna].dtype.kind == 'O' else 
+                'tipo': perfil['dtype'],
+                # Mantener el valor exacto incluyendo nulos, sin convertir a string
+                'ejemplo': perfil['primer_valor'],
+                'n_unicos': perfil['n_unicos'],
+                'tiene_nulos': perfil['nulos'] > 0,
+                'tipo_nulos': 'NaN' if perfil['kind'] in 'fc' else 
+                            'NULL' if perfil['kind'] == 'O' else 
                             'Vacío'
             }
             
-            if info_campo['n_unicos'] <= 5:
+            if 'valores_unicos' in perfil:
                 # Mantener los valores exactos sin convertir
-                info_campo['valores_unicos'] = df[columna].unique().tolist()
+                info_campo['valores_unicos'] = perfil['valores_unicos']
             
             estructura.append(info_campo)
         
@@ -241,28 +556,31 @@ class LectorArchivos:
 
     def preguntar_formato_salida(self):
         """Permite al usuario seleccionar el formato de salida"""
-        FORMATOS_SALIDA = {
-            '1': ('CSV', lambda df, p: df.to_csv(p, index=False), '.csv'),
-            '2': ('Excel', lambda df, p: df.to_excel(p, index=False), '.xlsx'),
-            '3': ('JSON', lambda df, p: df.to_json(p, orient='records', indent=2), '.json'),
-            '4': ('HTML', lambda df, p: df.to_html(p, index=False), '.html'),
-            '5': ('YAML', lambda df, p: yaml.dump(yaml.safe_load(df.to_json(orient='records')), open(p, 'w')), '.yaml'),
-            '6': ('TSV', lambda df, p: df.to_csv(p, sep='\t', index=False), '.tsv'),
-            '7': ('ODS', lambda df, p: df.to_excel(p, engine='odf', index=False), '.ods')
-        }
-
         print("\n=== FORMATOS DE SALIDA DISPONIBLES ===")
-        for key, (nombre, _, _) in FORMATOS_SALIDA.items():
+        for key, (nombre, _, _) in self.FORMATOS_SALIDA.items():
             print(f"{key}. {nombre}")
         
         while True:
             opcion = input("\nSeleccione el formato de salida (1-7): ")
-            if opcion in FORMATOS_SALIDA:
-                return FORMATOS_SALIDA[opcion]
+            if opcion in self.FORMATOS_SALIDA:
+                return self.FORMATOS_SALIDA[opcion]
             print("Opción no válida")
 
-    def generar_documentacion(self, estructura, clinic_initials, tipo_archivo, output_dir):
-        """Genera archivo de documentación con la estructura validada"""
+    def _formato_salida(self, formato):
+        """Busca un formato de salida por su extensión (csv, xlsx, json...)"""
+        extension = '.' + formato.lower().lstrip('.')
+        for nombre, exportador, ext in self.FORMATOS_SALIDA.values():
+            if ext == extension:
+                return nombre, exportador, ext
+        raise ValueError(f"Formato de salida no soportado: {formato}")
+
+    def generar_documentacion(self, estructura, clinic_initials, tipo_archivo, output_dir, formato=None):
+        """
+        Genera archivo de documentación con la estructura validada
+        
+        Si se indica formato (extensión: csv, xlsx, json...), se guarda sin
+        preguntar al usuario.
+        """
         df_estructura = pd.DataFrame([{
             'Campo': campo['nombre'],
             'Tipo': campo['tipo'],
@@ -272,7 +590,10 @@ class LectorArchivos:
         } for campo in estructura])
 
         # Solicitar formato de salida
-        nombre_formato, exportador, extension = self.preguntar_formato_salida()
+        if formato:
+            nombre_formato, exportador, extension = self._formato_salida(formato)
+        else:
+            nombre_formato, exportador, extension = self.preguntar_formato_salida()
         
         # Usar la convención estándar para nombrar el archivo
         filename = FileNamingConvention.generate_filename(
@@ -287,7 +608,7 @@ class LectorArchivos:
             exportador(df_estructura, output_path)
             print(f"\nDocumentación guardada en: {output_path}")
             
-            if input("\n¿Desea exportar en otro formato? (S/N): ").upper() == 'S':
+            if not formato and input("\n¿Desea exportar en otro formato? (S/N): ").upper() == 'S':
                 self.generar_documentacion(estructura, clinic_initials, tipo_archivo, output_dir)
             
             return output_path
@@ -355,11 +676,16 @@ class LectorArchivos:
             raise Exception(f"Error al procesar archivo: {str(e)}")
     
     def leer_csv(self, ruta_archivo, encoding='utf-8', delimiter=None, 
-                 headers='auto', encoding_fallbacks=None, **kwargs):
+                 headers='auto', encoding_fallbacks=None, tamano_bloque=None,
+                 usecols=None, dtype=None, **kwargs):
         """
         Lee un archivo CSV con soporte para múltiples codificaciones, 
         detección automática de delimitadores y manejo de encabezados personalizados.
         
+        La codificación y el delimitador se detectan una sola vez a partir de
+        una muestra acotada del inicio del archivo, sin releerlo completo por
+        cada codificación alternativa.
+        
         Args:
             ruta_archivo (str): Ruta al archivo CSV a leer
             encoding (str, optional): Codificación del archivo. Por defecto 'utf-8'
@@ -370,94 +696,191 @@ class LectorArchivos:
                 - list: lista de strings con encabezados personalizados
             encoding_fallbacks (list, optional): Lista de codificaciones alternativas a intentar
                                                si la principal falla
+            tamano_bloque (int, optional): Si se indica, retorna un iterador de
+                                           DataFrames de como máximo ese número de filas
+            usecols (list, optional): Columnas a cargar
+            dtype (dict, optional): Tipos de las columnas, para evitar la inferencia
             **kwargs: Argumentos adicionales para pandas.read_csv
             
         Returns:
-            pandas.DataFrame: Datos del CSV convertidos a DataFrame
+            pandas.DataFrame: Datos del CSV convertidos a DataFrame, o un iterador
+                              de DataFrames si se indicó tamano_bloque
             
         Raises:
             ValueError: Si no se puede leer el archivo con ninguna de las codificaciones
         """
-        # Lista de codificaciones a intentar
-        if encoding_fallbacks is None:
-            encoding_fallbacks = ['latin-1', 'iso-8859-1', 'cp1252']
+        encodings_to_try = self._codificaciones_a_probar(encoding, encoding_fallbacks)
+        enc, delimitador_detectado = self.detectar_formato_csv(ruta_archivo, encodings_to_try)
+        if enc not in encodings_to_try:
+            # utf-8-sig (archivo con BOM) no está entre las candidatas: se prueba primero
+            encodings_to_try.insert(0, enc)
+        delimiter = delimiter or delimitador_detectado
         
-        # Asegurar que la codificación principal está al inicio
-        encodings_to_try = [encoding]
-        for enc in encoding_fallbacks:
-            if enc != encoding:
-                encodings_to_try.append(enc)
+        self._configurar_encabezados(headers, kwargs)
+        kwargs.update({'usecols': usecols, 'dtype': dtype})
+        
+        if tamano_bloque:
+            return self._iterar_csv(ruta_archivo, encodings_to_try[encodings_to_try.index(enc):],
+                                    delimiter, tamano_bloque, kwargs)
         
-        # Intentar diferentes codificaciones
+        # La muestra puede no contener el byte problemático: solo en ese caso
+        # se vuelve a leer con las codificaciones siguientes
         last_error = None
-        for enc in encodings_to_try:
+        for enc in encodings_to_try[encodings_to_try.index(enc):]:
             try:
-                # Si el delimitador no está especificado, detectarlo automáticamente
-                if delimiter is None:
-                    delimiter = self._detectar_delimitador(ruta_archivo, enc)
-                
-                # Configurar manejo de encabezados
-                if headers == 'auto':
-                    header = 0  # Primera fila como encabezados
-                elif headers == 'none':
-                    header = None  # Sin encabezados
-                elif isinstance(headers, list):
-                    # Usar nombres de columnas personalizados
-                    kwargs['names'] = headers
-                    # Si se proporcionan nombres personalizados, saltamos la primera fila
-                    # solo si no hemos especificado explícitamente header en kwargs
-                    if 'header' not in kwargs:
-                        header = 0
-                    else:
-                        header = kwargs.pop('header')
-                else:
-                    raise ValueError("El parámetro 'headers' debe ser 'auto', 'none' o una lista")
-                
-                # Aplicar header si no está en kwargs
-                if 'header' not in kwargs:
-                    kwargs['header'] = header
-                
-                # Leer el CSV con pandas
                 return pd.read_csv(ruta_archivo, encoding=enc, sep=delimiter, **kwargs)
-            
-            except Exception as e:
+            except UnicodeDecodeError as e:
+                self.logger.warning(f"Codificación {enc} no válida para {ruta_archivo}: {e}")
                 last_error = e
-                continue
+            except Exception as e:
+                raise ValueError(f"No se pudo leer el archivo CSV: {str(e)}") from e
         
         # Si llegamos aquí, ninguna codificación funcionó
         raise ValueError(f"No se pudo leer el archivo CSV con ninguna codificación. "
                          f"Último error: {str(last_error)}")
     
-    def _detectar_delimitador(self, ruta_archivo, encoding='utf-8'):
+    def _iterar_csv(self, ruta_archivo, encodings, delimiter, tamano_bloque, kwargs):
         """
-        Detecta automáticamente el delimitador de un archivo CSV.
+        Genera los bloques de un CSV manteniendo abierto un único lector
+
+        La codificación se detectó sobre la muestra inicial, así que un byte no
+        válido puede aparecer más adelante. En ese caso se vuelve a abrir el
+        archivo con la siguiente codificación y se descartan las filas ya
+        entregadas; solo el archivo que falla paga la relectura. Con
+        encoding_errors='replace' no se relee: los bytes no válidos se
+        sustituyen y se registra cuántos fueron.
+        """
+        if kwargs.get('encoding_errors') == 'replace':
+            reemplazos = {'bytes': 0}
+            kwargs = dict(kwargs, encoding_errors=_registrar_reemplazo(reemplazos))
+            with pd.read_csv(ruta_archivo, encoding=encodings[0], sep=delimiter,
+                             chunksize=tamano_bloque, **kwargs) as lector:
+                yield from lector
+            if reemplazos['bytes']:
+                self.logger.warning(f"{reemplazos['bytes']} bytes no válidos en {encodings[0]} "
+                                    f"reemplazados al leer {ruta_archivo}")
+            return
+
+        entregadas = 0
+        last_error = None
+        for enc in encodings:
+            omitir = entregadas
+            try:
+                with pd.read_csv(ruta_archivo, encoding=enc, sep=delimiter,
+                                 chunksize=tamano_bloque, **kwargs) as lector:
+                    for bloque in lector:
+                        if omitir >= len(bloque):
+                            omitir -= len(bloque)
+                            continue
+                        bloque, omitir = bloque.iloc[omitir:], 0
+                        entregadas += len(bloque)
+                        yield bloque
+                return
+            except UnicodeDecodeError as e:
+                self.logger.warning(f"Codificación {enc} no válida para {ruta_archivo} "
+                                    f"tras {entregadas} filas: {e}")
+                last_error = e
+
+        raise ValueError(f"No se pudo leer el archivo CSV con ninguna codificación. "
+                         f"Último error: {str(last_error)}")
+    
+    @staticmethod
+    def _codificaciones_a_probar(encoding='utf-8', encoding_fallbacks=None):
+        """Retorna la codificación principal seguida de las alternativas, sin repetir"""
+        if encoding_fallbacks is None:
+            encoding_fallbacks = ['latin-1', 'iso-8859-1', 'cp1252']
+        
+        encodings_to_try = [encoding]
+        for enc in encoding_fallbacks:
+            if enc not in encodings_to_try:
+                encodings_to_try.append(enc)
+        return encodings_to_try
+    
+    @staticmethod
+    def _configurar_encabezados(headers, kwargs):
+        """Traduce el parámetro headers a los argumentos de pandas.read_csv"""
+        if headers == 'auto':
+            header = 0  # Primera fila como encabezados
+        elif headers == 'none':
+            header = None  # Sin encabezados
+        elif isinstance(headers, list):
+            # Usar nombres de columnas personalizados
+            kwargs['names'] = headers
+            # Si se proporcionan nombres personalizados, saltamos la primera fila
+            # solo si no hemos especificado explícitamente header en kwargs
+            header = kwargs.pop('header', 0)
+        else:
+            raise ValueError("El parámetro 'headers' debe ser 'auto', 'none' o una lista")
+        
+        # Aplicar header si no está en kwargs
+        kwargs.setdefault('header', header)
+    
+    def detectar_formato_csv(self, ruta_archivo, encodings=None):
+        """
+        Detecta la codificación y el delimitador de un CSV leyendo una sola
+        muestra de como máximo TAMANO_MUESTRA_CSV bytes.
         
         Args:
             ruta_archivo (str): Ruta al archivo CSV
-            encoding (str): Codificación del archivo
+            encodings (list, optional): Codificaciones candidatas, en orden de preferencia
+            
+        Returns:
+            tuple: (codificación, delimitador)
+        """
+        encodings = encodings or self._codificaciones_a_probar()
+        with open(ruta_archivo, 'rb') as archivo:
+            muestra = archivo.read(self.TAMANO_MUESTRA_CSV)
+        
+        encoding = encodings[-1]
+        texto = ''
+        if muestra.startswith(codecs.BOM_UTF8) and encodings[0].lower().replace('_', '-') in ('utf-8', 'utf8'):
+            encoding = 'utf-8-sig'
+            texto = muestra[len(codecs.BOM_UTF8):].decode('utf-8', errors='replace')
+        else:
+            for enc in encodings:
+                try:
+                    # Decodificador incremental: tolera un carácter cortado al final de la muestra
+                    texto = codecs.getincrementaldecoder(enc)().decode(muestra, final=False)
+                    encoding = enc
+                    break
+                except (UnicodeDecodeError, LookupError):
+                    continue
+        
+        return encoding, self._detectar_delimitador(texto)
+    
+    def _detectar_delimitador(self, muestra):
+        """
+        Detecta automáticamente el delimitador de un archivo CSV.
+        
+        Args:
+            muestra (str): Texto del inicio del archivo
             
         Returns:
             str: Delimitador detectado, ',' por defecto si no se puede detectar
         """
         try:
-            with open(ruta_archivo, 'r', encoding=encoding) as archivo:
-                # Leer las primeras 5 líneas para la detección
-                sample = ''.join(archivo.readline() for _ in range(5))
-                
-                if sample.strip():
-                    dialect = csv.Sniffer().sniff(sample)
-                    return dialect.delimiter
-                return ','  # Valor predeterminado si no se puede detectar
+            # Usar las primeras 5 líneas para la detección
+            sample = ''.join(muestra.splitlines(keepends=True)[:5])
+            
+            if sample.strip():
+                dialect = csv.Sniffer().sniff(sample)
+                return dialect.delimiter
+            return ','  # Valor predeterminado si no se puede detectar
         except Exception:
             return ','  # Valor predeterminado en caso de error
 
     def leer_excel(self, ruta_archivo, sheet_name=0, range_spec=None, 
                    calc_formulas=True, parse_formats=True, ignore_hidden=False, 
-                   **kwargs):
+                   read_only=False, **kwargs):
         """
         Lee un archivo Excel con soporte avanzado para selección de hojas,
         rangos específicos de datos y manejo de formatos/fórmulas.
         
+        El libro se abre una sola vez (SesionExcel) y de esa misma carga se
+        obtienen los formatos, los elementos ocultos y los valores. Solo se
+        hace la carga completa cuando hay que detectar filas/columnas ocultas;
+        en otro caso se lee en modo streaming.
+        
         Args:
             ruta_archivo (str): Ruta al archivo Excel a leer
             sheet_name (str/int/list, optional): 
@@ -471,6 +894,9 @@ class LectorArchivos:
             calc_formulas (bool, optional): Si es True, evalúa las fórmulas en las celdas
             parse_formats (bool, optional): Si es True, interpreta los formatos de celda
             ignore_hidden (bool, optional): Si es True, ignora filas/columnas ocultas
+            read_only (bool, optional): Vía rápida: lee en streaming sin inspeccionar
+                                        estilos ni dimensiones (ignora parse_formats
+                                        e ignore_hidden)
             **kwargs: Argumentos adicionales para pandas.read_excel
         
         Returns:
@@ -497,15 +923,15 @@ class LectorArchivos:
                 # Para columnas, usamos usecols
                 if 'usecols' not in kwargs:
                     # Convertir índices numéricos de columna a letras de Excel
-                    start_col_letter = get_column_letter(range_dict['start_col'] + 1)  # +1 porque es 1-based
-                    end_col_letter = get_column_letter(range_dict['end_col'] + 1)
+                    start_col_letter = openpyxl.utils.get_column_letter(range_dict['start_col'] + 1)  # +1 porque es 1-based
+                    end_col_letter = openpyxl.utils.get_column_letter(range_dict['end_col'] + 1)
                     
                     # Crear una función que filtre columnas en el rango especificado
                     def filtro_columnas(col):
                         if isinstance(col, int):
                             return range_dict['start_col'] <= col <= range_dict['end_col']
                         elif isinstance(col, str):
-                            col_idx = column_index_from_string(col) - 1  # -1 porque es 0-based
+                            col_idx = openpyxl.utils.column_index_from_string(col) - 1  # -1 porque es 0-based
                             return range_dict['start_col'] <= col_idx <= range_dict['end_col']
                         return False
                     
@@ -528,7 +954,7 @@ class LectorArchivos:
                         if isinstance(col, int):
                             return start_col <= col <= end_col
                         elif isinstance(col, str):
-                            col_idx = column_index_from_string(col) - 1
+                            col_idx = openpyxl.utils.column_index_from_string(col) - 1
                             return start_col <= col_idx <= end_col
                         return False
                     
@@ -538,56 +964,63 @@ class LectorArchivos:
             if 'engine' not in kwargs:
                 kwargs['engine'] = 'openpyxl'  # openpyxl tiene mejor soporte para formatos
             
-            converters = kwargs.get('converters', {})
-            
-            # Si se solicita evaluar fórmulas
-            if calc_formulas:
-                kwargs['engine_kwargs'] = kwargs.get('engine_kwargs', {})
-                kwargs['engine_kwargs']['data_only'] = True
+            # Otros motores (odf, xlrd) no admiten la inspección con openpyxl
+            if kwargs['engine'] != 'openpyxl':
+                return pd.read_excel(ruta_archivo, sheet_name=sheet_name, **kwargs)
             
-            # Manejar formatos de celda específicos si se ha solicitado
-            if parse_formats:
-                # Este pre-procesamiento nos permite detectar y manejar formatos específicos
-                formatos = self._obtener_formatos_excel(ruta_archivo, sheet_name)
-                # Añadimos los converters basados en los formatos detectados
-                converters.update(self._crear_converters_por_formato(formatos))
-                kwargs['converters'] = converters
+            if read_only:
+                parse_formats = ignore_hidden = False
             
-            # Manejar elementos ocultos
-            if ignore_hidden:
-                filas_ocultas, cols_ocultas = self._detectar_elementos_ocultos(ruta_archivo, sheet_name)
+            with SesionExcel(ruta_archivo, data_only=calc_formulas,
+                             read_only=not ignore_hidden) as sesion:
+                # Manejar formatos de celda específicos si se ha solicitado
+                if parse_formats:
+                    # Este pre-procesamiento nos permite detectar y manejar formatos específicos
+                    formatos = sesion.obtener_formatos(sheet_name)
+                    # Añadimos los converters basados en los formatos detectados
+                    converters = kwargs.get('converters', {})
+                    converters.update(self._crear_converters_por_formato(formatos))
+                    kwargs['converters'] = converters
                 
-                # Ignorar filas ocultas
-                if filas_ocultas and 'skiprows' not in kwargs:
-                    original_skiprows = kwargs.get('skiprows', None)
-                    if original_skiprows is None:
-                        kwargs['skiprows'] = filas_ocultas
-                    elif callable(original_skiprows):
-                        # Si skiprows es una función, la envolvemos
-                        original_func = original_skiprows
-                        kwargs['skiprows'] = lambda x: x in filas_ocultas or original_func(x)
-                    elif isinstance(original_skiprows, int):
-                        # Si es un entero, convertirlo a lista
-                        kwargs['skiprows'] = list(range(original_skiprows)) + filas_ocultas
-                    elif isinstance(original_skiprows, list):
-                        kwargs['skiprows'] = original_skiprows + filas_ocultas
+                # Manejar elementos ocultos
+                if ignore_hidden:
+                    filas_ocultas, cols_ocultas = sesion.detectar_elementos_ocultos(sheet_name)
+                    
+                    # Ignorar filas ocultas
+                    if filas_ocultas and 'skiprows' not in kwargs:
+                        original_skiprows = kwargs.get('skiprows', None)
+                        if original_skiprows is None:
+                            kwargs['skiprows'] = filas_ocultas
+                        elif callable(original_skiprows):
+                            # Si skiprows es una función, la envolvemos
+                            original_func = original_skiprows
+                            kwargs['skiprows'] = lambda x: x in filas_ocultas or original_func(x)
+                        elif isinstance(original_skiprows, int):
+                            # Si es un entero, convertirlo a lista
+                            kwargs['skiprows'] = list(range(original_skiprows)) + filas_ocultas
+                        elif isinstance(original_skiprows, list):
+                            kwargs['skiprows'] = original_skiprows + filas_ocultas
+                    
+                    # Ignorar columnas ocultas
+                    if cols_ocultas and 'usecols' not in kwargs:
+                        original_usecols = kwargs.get('usecols', None)
+                        if original_usecols is None:
+                            # pandas acepta las letras de Excel de las columnas visibles
+                            max_col = sesion.hoja(sheet_name).max_column
+                            kwargs['usecols'] = ','.join(
+                                openpyxl.utils.get_column_letter(i) for i in range(1, max_col + 1)
+                                if i - 1 not in cols_ocultas
+                            )
+                        elif callable(original_usecols):
+                            # Si usecols es una función, la envolvemos
+                            original_func = original_usecols
+                            kwargs['usecols'] = lambda col: col not in cols_ocultas and original_func(col)
+                        elif isinstance(original_usecols, list):
+                            # Si es una lista, filtrar las columnas ocultas
+                            kwargs['usecols'] = [col for col in original_usecols if col not in cols_ocultas]
                 
-                # Ignorar columnas ocultas
-                if cols_ocultas and 'usecols' not in kwargs:
-                    original_usecols = kwargs.get('usecols', None)
-                    if original_usecols is None:
-                        # Crear una función que filtre columnas no ocultas
-                        kwargs['usecols'] = lambda col: col not in cols_ocultas
-                    elif callable(original_usecols):
-                        # Si usecols es una función, la envolvemos
-                        original_func = original_usecols
-                        kwargs['usecols'] = lambda col: col not in cols_ocultas and original_func(col)
-                    elif isinstance(original_usecols, list):
-                        # Si es una lista, filtrar las columnas ocultas
-                        kwargs['usecols'] = [col for col in original_usecols if col not in cols_ocultas]
-            
-            # Leer el archivo con pandas
-            return pd.read_excel(ruta_archivo, sheet_name=sheet_name, **kwargs)
+                # Leer los valores del mismo libro ya cargado
+                return sesion.leer(sheet_name, **kwargs)
         
         except Exception as e:
             raise ValueError(f"Error al leer archivo Excel: {str(e)}")
@@ -616,8 +1049,8 @@ class LectorArchivos:
         end_row_str = ''.join(c for c in end_cell if c.isdigit())
         
         # Convertir letras de columna a índices (0-based)
-        start_col = column_index_from_string(start_col_str) - 1
-        end_col = column_index_from_string(end_col_str) - 1
+        start_col = openpyxl.utils.column_index_from_string(start_col_str) - 1
+        end_col = openpyxl.utils.column_index_from_string(end_col_str) - 1
         
         # Convertir filas a índices (0-based)
         start_row = int(start_row_str) - 1
@@ -641,57 +1074,10 @@ class LectorArchivos:
         Returns:
             dict: Diccionario con información de formatos por columna
         """
-        formatos = {}
         try:
-            # Abrir el libro con openpyxl para acceder a los formatos
-            workbook = openpyxl.load_workbook(ruta_archivo, data_only=False)
-            
-            # Obtener la hoja correcta
-            if isinstance(sheet_name, int):
-                # Si es un índice
-                sheet = workbook.worksheets[sheet_name]
-            elif isinstance(sheet_name, str):
-                # Si es un nombre
-                sheet = workbook[sheet_name]
-            else:
-                # Si es None o una lista, usar la primera hoja
-                sheet = workbook.active
-            
-            # Analizar la primera fila con datos para detectar formatos
-            # (asumiendo que la primera fila puede ser encabezados)
-            for row in sheet.iter_rows(min_row=2, max_row=10):  # Examinar algunas filas
-                for cell in row:
-                    col_idx = cell.column - 1  # Convertir a 0-based
-                    
-                    # Inicializar la entrada para esta columna si no existe
-                    if col_idx not in formatos:
-                        formatos[col_idx] = {'tipo': None, 'formato': None}
-                    
-                    # Detectar tipo de dato y formato
-                    if cell.data_type == 'n':  # Número
-                        if cell.number_format and ('/' in cell.number_format or 
-                                                  'y' in cell.number_format.lower() or 
-                                                  'm' in cell.number_format.lower() or 
-                                                  'd' in cell.number_format.lower()):
-                            formatos[col_idx] = {'tipo': 'fecha', 'formato': cell.number_format}
-                        elif cell.number_format and '%' in cell.number_format:
-                            formatos[col_idx] = {'tipo': 'porcentaje', 'formato': cell.number_format}
-                        elif cell.number_format and ('$' in cell.number_format or 
-                                                   '€' in cell.number_format or 
-                                                   '£' in cell.number_format):
-                            formatos[col_idx] = {'tipo': 'moneda', 'formato': cell.number_format}
-                        else:
-                            formatos[col_idx] = {'tipo': 'numero', 'formato': cell.number_format}
-                    elif cell.data_type == 'd':  # Fecha
-                        formatos[col_idx] = {'tipo': 'fecha', 'formato': cell.number_format}
-                    elif cell.data_type == 'f':  # Fórmula
-                        formatos[col_idx] = {'tipo': 'formula', 'formato': None}
-                    elif cell.data_type == 'b':  # Booleano
-                        formatos[col_idx] = {'tipo': 'booleano', 'formato': None}
-            
-            return formatos
-            
-        except Exception as e:
+            with SesionExcel(ruta_archivo, data_only=False) as sesion:
+                return sesion.obtener_formatos(sheet_name)
+        except Exception:
             # Si hay error, retornar un diccionario vacío
             return {}
     
@@ -737,34 +1123,9 @@ class LectorArchivos:
         Returns:
             tuple: (filas_ocultas, columnas_ocultas)
         """
-        filas_ocultas = []
-        columnas_ocultas = []
-        
         try:
-            workbook = openpyxl.load_workbook(ruta_archivo)
-            
-            # Obtener la hoja correcta
-            if isinstance(sheet_name, int):
-                sheet = workbook.worksheets[sheet_name]
-            elif isinstance(sheet_name, str):
-                sheet = workbook[sheet_name]
-            else:
-                sheet = workbook.active
-            
-            # Detectar filas ocultas
-            for i, row in enumerate(sheet.rows):
-                if sheet.row_dimensions[i + 1].hidden:
-                    filas_ocultas.append(i)
-            
-            # Detectar columnas ocultas
-            for i in range(1, sheet.max_column + 1):
-                col_letter = get_column_letter(i)
-                if sheet.column_dimensions[col_letter].hidden:
-                    columnas_ocultas.append(i - 1)  # Convertir a 0-based
-                    columnas_ocultas.append(col_letter)
-            
-            return filas_ocultas, columnas_ocultas
-            
+            with SesionExcel(ruta_archivo, read_only=False) as sesion:
+                return sesion.detectar_elementos_ocultos(sheet_name)
         except Exception:
             # Si hay error, retornar listas vacías
             return [], []
@@ -801,8 +1162,8 @@ class LectorArchivos:
                 max_col = sheet.max_column
                 
                 # Calcular rango en notación de Excel
-                min_col_letter = get_column_letter(min_col)
-                max_col_letter = get_column_letter(max_col)
+                min_col_letter = openpyxl.utils.get_column_letter(min_col)
+                max_col_letter = openpyxl.utils.get_column_letter(max_col)
                 rango_usado = f"{min_col_letter}{min_row}:{max_col_letter}{max_row}"
                 
                 # Guardar información de la hoja
@@ -828,6 +1189,9 @@ class LectorArchivos:
     
     def leer_json(self, ruta_archivo, schema=None):
         import json, os
+        if Path(ruta_archivo).suffix.lower() in self.EXTENSIONES_JSONL:
+            # JSON Lines: cada línea se valida por separado y los errores van al archivo lateral
+            return list(self.iterar_jsonl(ruta_archivo, schema))
         try:
             with open(ruta_archivo, 'r', encoding='utf-8') as f:
                 # Si el archivo es mayor a 1MB, usar procesamiento en streaming
@@ -850,6 +1214,139 @@ class LectorArchivos:
             print("Error al leer el JSON:", e)
             return None
 
+    def iterar_jsonl(self, ruta_archivo, schema=None, ruta_errores=None, resumen=None):
+        """
+        Recorre un archivo JSON Lines registro a registro sin cargarlo entero.
+
+        Cada línea se parsea (con orjson si está instalado) y se valida con un
+        Draft7Validator reutilizado para todo el archivo. Las líneas que no
+        son JSON válido, que no son un objeto o que no cumplen el esquema se
+        escriben en un archivo lateral JSON Lines con su número de línea, el
+        error y el texto original; ese archivo solo se crea si hay errores.
+
+        Args:
+            ruta_archivo: Ruta del archivo .jsonl / .ndjson
+            schema (dict, optional): Esquema que debe cumplir cada registro
+            ruta_errores (optional): Archivo de errores; por defecto <nombre>.errores.jsonl
+            resumen (dict, optional): Se actualiza con lineas, validos, errores y ruta_errores
+
+        Yields:
+            dict: Registros válidos en el orden del archivo
+        """
+        ruta_archivo = Path(ruta_archivo)
+        ruta_errores = Path(ruta_errores) if ruta_errores else ruta_archivo.with_suffix('.errores.jsonl')
+        validador = self._validador_esquema(schema) if schema else None
+        cargar = orjson.loads if orjson is not None else json.loads
+        if resumen is None:
+            resumen = {}
+        resumen.update({'lineas': 0, 'validos': 0, 'errores': 0, 'ruta_errores': None})
+
+        archivo_errores = None
+        try:
+            with open(ruta_archivo, 'rb') as f:
+                for numero, linea in enumerate(f, 1):
+                    if numero == 1:
+                        linea = linea.removeprefix(codecs.BOM_UTF8)
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    resumen['lineas'] += 1
+
+                    try:
+                        registro = cargar(linea)
+                        if not isinstance(registro, dict):
+                            error = "El registro no es un objeto JSON"
+                        elif validador is not None:
+                            fallo = jsonschema.exceptions.best_match(validador.iter_errors(registro))
+                            error = None if fallo is None else (
+                                f"{'/'.join(str(p) for p in fallo.absolute_path) or '(raíz)'}: {fallo.message}"
+                            )
+                        else:
+                            error = None
+                    except ValueError as e:
+                        error = f"JSON inválido: {str(e)}"
+
+                    if error is None:
+                        resumen['validos'] += 1
+                        yield registro
+                        continue
+
+                    if archivo_errores is None:
+                        archivo_errores = open(ruta_errores, 'w', encoding='utf-8')
+                        resumen['ruta_errores'] = str(ruta_errores)
+                    resumen['errores'] += 1
+                    archivo_errores.write(json.dumps({
+                        'linea': numero,
+                        'error': error,
+                        'registro': linea.decode('utf-8', errors='replace')
+                    }, ensure_ascii=False) + '\n')
+        finally:
+            if archivo_errores is not None:
+                archivo_errores.close()
+                self.logger.warning(f"{resumen['errores']} registros con errores en {ruta_archivo}: {ruta_errores}")
+
+    def leer_jsonl(self, ruta_archivo, schema=None, tamano_bloque=10_000, ruta_errores=None, resumen=None):
+        """
+        Lee un archivo JSON Lines como bloques de DataFrame validados.
+
+        Solo se mantiene en memoria un bloque de registros cada vez, por lo
+        que sirve para exportaciones de varios GB.
+
+        Args:
+            ruta_archivo: Ruta del archivo .jsonl / .ndjson
+            schema (dict, optional): Esquema que debe cumplir cada registro
+            tamano_bloque (int): Registros válidos por DataFrame
+            ruta_errores (optional): Archivo lateral de errores (ver iterar_jsonl)
+            resumen (dict, optional): Se actualiza con lineas, validos, errores y ruta_errores
+
+        Yields:
+            pandas.DataFrame: Bloques de registros válidos con índice continuo
+        """
+        bloque = []
+        inicio = 0
+        for registro in self.iterar_jsonl(ruta_archivo, schema, ruta_errores, resumen):
+            bloque.append(registro)
+            if len(bloque) >= tamano_bloque:
+                yield pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+                inicio += len(bloque)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+
+    @staticmethod
+    def _validador_esquema(schema, format_check=True):
+        """
+        Retorna el Draft7Validator del esquema desde el registro compartido del proceso
+
+        Args:
+            schema (dict): Esquema JSON
+            format_check (bool): Si es True, valida también los 'format' (date, email...)
+
+        Returns:
+            jsonschema.Draft7Validator: Validador reutilizable
+        """
+        return obtener_validador(schema, format_check)
+
+    def _validar_json_contra_esquema(self, datos, schema, is_lines=False, options=None):
+        """
+        Valida datos JSON contra un esquema con el validador cacheado
+
+        Args:
+            datos: Documento JSON o, con is_lines, iterable de registros
+            schema (dict): Esquema para validación
+            is_lines (bool): Si es True, valida cada registro por separado
+            options (dict, optional): 'format_check' activa la validación de formatos
+
+        Raises:
+            ValidationError: Con el error más relevante del primer registro inválido
+        """
+        options = options or {}
+        validador = self._validador_esquema(schema, options.get('format_check', True))
+        for registro in (datos if is_lines else [datos]):
+            error = jsonschema.exceptions.best_match(validador.iter_errors(registro))
+            if error is not None:
+                raise error
+
     def cargar_esquema_json(self, ruta_esquema=None, esquema_dict=None):
         """
         Carga un esquema JSON desde un archivo o diccionario.
@@ -870,21 +1367,21 @@ class LectorArchivos:
         
         try:
             if esquema_dict is not None:
-                # Validar que el esquema proporcionado sea válido
-                jsonschema.Draft7Validator.check_schema(esquema_dict)
+                # Validar que el esquema proporcionado sea válido (solo la primera vez que se ve)
+                self._validador_esquema(esquema_dict)
                 return esquema_dict
             
             # Cargar desde archivo
             with open(ruta_esquema, 'r') as f:
                 schema = json.load(f)
                 
-            # Validar que el esquema sea válido
-            jsonschema.Draft7Validator.check_schema(schema)
+            # Validar que el esquema sea válido; el validador queda listo en el registro
+            self._validador_esquema(schema)
             return schema
             
         except json.JSONDecodeError as e:
             raise ValueError(f"El archivo de esquema no contiene JSON válido: {str(e)}")
-        except SchemaError as e:
+        except jsonschema.SchemaError as e:
             raise ValueError(f"El esquema JSON no es válido: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error al cargar el esquema JSON: {str(e)}")
@@ -913,176 +1410,59 @@ class LectorArchivos:
         try:
             self._validar_json_contra_esquema(datos, schema, is_lines, options)
             return True
-        except ValidationError as e:
+        except jsonschema.ValidationError as e:
             if options['strict']:
                 raise
             print(f"Advertencia: Datos no válidos según el esquema: {str(e)}")
             return False
 
+    def normalizar_json_tablas(self, datos, config=None):
+        """
+        Normaliza registros JSON anidados en una tabla principal y sus tablas hijas.
+
+        Los registros se recorren una sola vez (ver NormalizadorJSON); cada
+        lista de diccionarios produce una tabla hija cuyas filas enlazan con
+        la tabla padre mediante '__original_index'.
+
+        Args:
+            datos: DataFrame, lista o iterable (por ejemplo un generador) de diccionarios
+            config (dict, optional): Misma configuración que _normalizar_dataframe_json_avanzado
+
+        Returns:
+            dict: {'main': DataFrame, 'expanded': {ruta: DataFrame}}
+        """
+        normalizador = NormalizadorJSON(config)
+        if isinstance(datos, pd.DataFrame):
+            return normalizador.normalizar_dataframe(datos)
+        if isinstance(datos, dict):
+            datos = [datos]
+        return normalizador.normalizar(enumerate(datos))
+
     def _normalizar_dataframe_json_avanzado(self, df, config=None):
         """
-        Normaliza estructuras JSON anidadas en un DataFrame de forma recursiva.
+        Normaliza estructuras JSON anidadas en un DataFrame en una sola pasada.
         
         Args:
             df (pandas.DataFrame): DataFrame a normalizar
             config (dict, optional): Configuración para la normalización:
                 - max_depth (int): Profundidad máxima de normalización recursiva, por defecto 10
-                - explode_arrays (bool): Si es True, expande arrays en múltiples filas, por defecto True
+                - explode_arrays (bool): Si es True, expande arrays en tablas hijas, por defecto True
                 - sep (str): Separador para nombres de columnas anidadas, por defecto '.'
                 - meta_prefix (str): Prefijo para columnas de metadatos, por defecto 'meta_'
                 - handle_errors (str): Cómo manejar errores ('ignore', 'warn', 'raise'), por defecto 'warn'
                 - ignore_columns (list): Lista de columnas a ignorar
                 - only_columns (list): Lista de columnas a procesar (exclusiva con ignore_columns)
+                - return_expanded (bool): Si es True, retorna también las tablas hijas
                 
         Returns:
-            pandas.DataFrame: DataFrame con estructuras anidadas normalizadas
+            pandas.DataFrame: DataFrame con estructuras anidadas normalizadas, o
+            dict {'main': DataFrame, 'expanded': {ruta: DataFrame}} con return_expanded
         
         Raises:
             ValueError: Si hay un error en la configuración o en el proceso de normalización
         """
-        if config is None:
-            config = {}
-        
-        # Valores predeterminados de configuración
-        max_depth = config.get('max_depth', 10)
-        explode_arrays = config.get('explode_arrays', True)
-        separator = config.get('sep', '.')
-        meta_prefix = config.get('meta_prefix', 'meta_')
-        error_handling = config.get('handle_errors', 'warn')
-        ignore_columns = config.get('ignore_columns', [])
-        only_columns = config.get('only_columns', [])
-        
-        # Verificar configuración contradictoria
-        if ignore_columns and only_columns:
-            raise ValueError("No puede especificar tanto 'ignore_columns' como 'only_columns'")
-        
-        # Función recursiva interna para normalizar estructuras anidadas
-        def normalizar_recursivo(df, nivel=0, parent_key=''):
-            if nivel >= max_depth:
-                return df
-            
-            # Copia para no modificar el original durante la iteración
-            df_result = df.copy()
-            
-            # Columnas a procesar
-            cols_to_process = df_result.columns
-            if only_columns:
-                cols_to_process = [c for c in cols_to_process if c in only_columns]
-            if ignore_columns:
-                cols_to_process = [c for c in cols_to_process if c not in ignore_columns]
-            
-            # Para registrar columnas a expandir (evitar modificar durante la iteración)
-            columns_to_expand = {}
-            
-            # Primera pasada para identificar columnas a expandir
-            for col in cols_to_process:
-                # Saltar si ya tiene un prefijo especificado (para evitar múltiple procesamiento)
-                if parent_key and col.startswith(f"{parent_key}{separator}"):
-                    continue
-                    
-                # Verificar si la columna contiene objetos anidados o arrays
-                if df_result[col].dtype == 'object':
-                    # Muestra no nula para examinar
-                    sample = df_result[col].dropna().iloc[0] if not df_result[col].dropna().empty else None
-                    
-                    if sample is not None:
-                        if isinstance(sample, dict):
-                            columns_to_expand[col] = 'dict'
-                        elif isinstance(sample, list) and explode_arrays:
-                            # Verificar si es lista de diccionarios o valores simples
-                            if sample and all(isinstance(item, dict) for item in sample):
-                                columns_to_expand[col] = 'list_dict'
-                            else:
-                                columns_to_expand[col] = 'list_simple'
-            
-            # Segunda pasada para expandir columnas identificadas
-            for col, tipo in columns_to_expand.items():
-                try:
-                    if tipo == 'dict':
-                        # Normalizar columnas de tipo diccionario
-                        prefix = f"{col}{separator}" if not parent_key else f"{parent_key}{separator}{col}{separator}"
-                        
-                        # Extraer cada campo del diccionario como una nueva columna
-                        json_expanded = pd.json_normalize(
-                            df_result[col].dropna(),
-                            sep=separator
-                        )
-                        
-                        if not json_expanded.empty:
-                            # Crear índice para unir correctamente los datos
-                            json_expanded.index = df_result[col].dropna().index
-                            
-                            # Renombrar columnas con prefijo adecuado
-                            json_expanded = json_expanded.add_prefix(prefix)
-                            
-                            # Unir con el dataframe original
-                            df_result = pd.concat([df_result.drop(columns=[col]), json_expanded], axis=1)
-                            
-                    elif tipo == 'list_dict':
-                        # Para listas de diccionarios, explotar la columna
-                        prefix = f"{col}{separator}" if not parent_key else f"{parent_key}{separator}{col}{separator}"
-                        
-                        # Expandir la lista, creando una fila por cada elemento
-                        # Necesitamos manejar índices para reconstruir correctamente
-                        expanded_rows = []
-                        
-                        for idx, value in df_result[col].items():
-                            if isinstance(value, list) and value:
-                                # Crear un DataFrame para cada item en la lista
-                                for item in value:
-                                    if isinstance(item, dict):
-                                        # Añadir una columna con el índice original
-                                        item_df = pd.DataFrame([item])
-                                        item_df['__original_index'] = idx
-                                        expanded_rows.append(item_df)
-                        
-                        if expanded_rows:
-                            # Combinar todos los DataFrames expandidos
-                            all_expanded = pd.concat(expanded_rows, ignore_index=True)
-                            
-                            # Añadir metadatos útiles
-                            all_expanded[f"{meta_prefix}source_column"] = col
-                            
-                            # Normalizar recursivamente esta estructura expandida
-                            normalized_expanded = normalizar_recursivo(all_expanded, nivel + 1, prefix.rstrip(separator))
-                            
-                            # Crear una columna con los datos originales en formato JSON string
-                            df_result[f"{meta_prefix}{col}_json"] = df_result[col].apply(
-                                lambda x: json.dumps(x) if isinstance(x, list) else None
-                            )
-                            
-                            # Eliminar la columna original que contenía la lista
-                            df_result = df_result.drop(columns=[col])
-                            
-                            # Devolver resultado expandido en una estructura secundaria
-                            # Esto evita mezclar filas con diferentes niveles de expansión
-                            return {
-                                'main': df_result,
-                                'expanded': {col: normalized_expanded}
-                            }
-                    
-                    elif tipo == 'list_simple':
-                        # Para listas de valores simples, convertir a string JSON
-                        df_result[col] = df_result[col].apply(
-                            lambda x: json.dumps(x) if isinstance(x, list) else x
-                        )
-                
-                except Exception as e:
-                    if error_handling == 'raise':
-                        raise ValueError(f"Error al normalizar columna {col}: {str(e)}")
-                    elif error_handling == 'warn':
-                        print(f"Advertencia: Error al normalizar columna {col}: {str(e)}")
-                    # Si es 'ignore', continuamos sin hacer nada
-            
-            return df_result
-        
-        # Iniciar normalización recursiva
-        resultado = normalizar_recursivo(df)
-        
-        # Si el resultado es un diccionario con expansiones, procesar y retornar
-        if isinstance(resultado, dict):
-            # Aquí podríamos retornar múltiples DataFrames o consolidar de alguna forma
-            # Por defecto retornamos el DataFrame principal
-            return resultado['main']
-        
-        return resultado
+        config = config or {}
+        resultado = self.normalizar_json_tablas(df, config)
+        if config.get('return_expanded', False):
+            return resultado
+        return resultado['main']
@@ -0,0 +1,150 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import pandas as pd
+
+
+class _BufferTabla:
+    """Columnas de una tabla en construcción, como listas de valores"""
+
+    def __init__(self):
+        self.columnas: Dict[str, List[Any]] = {}
+        self.indice: List[Any] = []
+
+    def agregar(self, indice, fila: Dict[str, Any]) -> None:
+        """Añade una fila; las columnas ausentes quedan a None"""
+        n = len(self.indice)
+        for nombre, valores in self.columnas.items():
+            valores.append(fila.pop(nombre, None))
+        for nombre, valor in fila.items():
+            # Columna nueva: rellenar las filas anteriores
+            self.columnas[nombre] = [None] * n + [valor]
+        self.indice.append(indice)
+
+    def __len__(self):
+        return len(self.indice)
+
+    def a_dataframe(self, nombre_indice: Optional[str] = None) -> pd.DataFrame:
+        indice = pd.Index(self.indice, name=nombre_indice)
+        return pd.DataFrame(self.columnas, index=indice)
+
+
+class NormalizadorJSON:
+    """
+    Aplana registros JSON anidados en una sola pasada.
+
+    Cada registro se recorre una vez y sus valores se escriben directamente en
+    buffers por columna:
+
+    - los diccionarios se aplanan con el separador (``direccion.ciudad``);
+    - las listas de diccionarios generan una tabla hija por ruta, cuyas filas
+      llevan ``__original_index`` con el índice de la fila padre y
+      ``meta_source_column`` con la columna de origen; en la tabla padre queda
+      ``meta_<columna>_json`` con la lista original serializada;
+    - las listas de valores simples se serializan como texto JSON.
+
+    Las tablas hijas de otras tablas hijas (por ejemplo
+    ``visitas.diagnosticos``) apuntan al índice de la fila de su tabla padre.
+    Solo al final se construye un DataFrame por tabla.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: Misma configuración que _normalizar_dataframe_json_avanzado
+                (max_depth, explode_arrays, sep, meta_prefix, handle_errors,
+                ignore_columns, only_columns)
+        """
+        config = config or {}
+        self.max_depth = config.get('max_depth', 10)
+        self.explode_arrays = config.get('explode_arrays', True)
+        self.sep = config.get('sep', '.')
+        self.meta_prefix = config.get('meta_prefix', 'meta_')
+        self.handle_errors = config.get('handle_errors', 'warn')
+        self.ignore_columns = set(config.get('ignore_columns', []))
+        self.only_columns = set(config.get('only_columns', []))
+
+        if self.ignore_columns and self.only_columns:
+            raise ValueError("No puede especificar tanto 'ignore_columns' como 'only_columns'")
+
+    def normalizar(self, registros: Iterable[Tuple[Any, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Normaliza una secuencia de (índice, registro)
+
+        Args:
+            registros: Iterable de tuplas (índice, diccionario); puede ser un
+                       generador para no tener todos los registros en memoria
+
+        Returns:
+            dict: {'main': DataFrame, 'expanded': {ruta: DataFrame}}
+        """
+        principal = _BufferTabla()
+        hijas: Dict[str, _BufferTabla] = {}
+
+        for indice, registro in registros:
+            fila = {}
+            self._aplanar(registro, '', fila, hijas, '', indice, 0)
+            principal.agregar(indice, fila)
+
+        return {
+            'main': principal.a_dataframe(),
+            'expanded': {ruta: buffer.a_dataframe() for ruta, buffer in hijas.items()}
+        }
+
+    def normalizar_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Normaliza las filas de un DataFrame conservando su índice"""
+        columnas = list(df.columns)
+        registros = (
+            (indice, dict(zip(columnas, valores)))
+            for indice, valores in zip(df.index, zip(*(df[c] for c in columnas)))
+        )
+        resultado = self.normalizar(registros)
+        resultado['main'].index.name = df.index.name
+        return resultado
+
+    def _procesar(self, clave: str) -> bool:
+        """Indica si una clave debe normalizarse según only_columns/ignore_columns"""
+        if self.only_columns:
+            return clave in self.only_columns
+        return clave not in self.ignore_columns
+
+    def _aplanar(self, registro: Dict[str, Any], prefijo: str, fila: Dict[str, Any],
+                 hijas: Dict[str, '_BufferTabla'], ruta: str, indice: Any, nivel: int) -> None:
+        """Escribe en fila los valores de registro y envía las listas de diccionarios a sus tablas hijas"""
+        for clave, valor in registro.items():
+            columna = f"{prefijo}{clave}"
+            if nivel >= self.max_depth or not self._procesar(clave):
+                fila[columna] = valor
+                continue
+            try:
+                if isinstance(valor, dict):
+                    if valor:
+                        self._aplanar(valor, f"{columna}{self.sep}", fila, hijas, ruta, indice, nivel + 1)
+                    else:
+                        fila[columna] = None
+                elif isinstance(valor, list) and self.explode_arrays:
+                    if valor and all(isinstance(item, dict) for item in valor):
+                        ruta_hija = f"{ruta}{self.sep}{columna}" if ruta else columna
+                        self._expandir_lista(valor, columna, ruta_hija, hijas, indice, nivel)
+                        fila[f"{self.meta_prefix}{columna}_json"] = json.dumps(valor, default=str)
+                    else:
+                        fila[columna] = json.dumps(valor, default=str)
+                else:
+                    fila[columna] = valor
+            except Exception as e:
+                if self.handle_errors == 'raise':
+                    raise ValueError(f"Error al normalizar columna {columna}: {str(e)}")
+                if self.handle_errors == 'warn':
+                    print(f"Advertencia: Error al normalizar columna {columna}: {str(e)}")
+                fila[columna] = valor
+
+    def _expandir_lista(self, items: List[Dict[str, Any]], columna: str, ruta: str,
+                        hijas: Dict[str, '_BufferTabla'], indice_padre: Any, nivel: int) -> None:
+        """Añade cada elemento de la lista como fila de la tabla hija de la ruta"""
+        buffer = hijas.setdefault(ruta, _BufferTabla())
+        for item in items:
+            # El índice de la fila hija se asigna antes para que sus propias hijas puedan apuntarle
+            indice_hijo = len(buffer)
+            fila = {'__original_index': indice_padre}
+            self._aplanar(item, '', fila, hijas, ruta, indice_hijo, nivel + 1)
+            fila[f"{self.meta_prefix}source_column"] = columna
+            buffer.agregar(indice_hijo, fila)
@@ -0,0 +1,131 @@
+from pathlib import Path
+import pandas as pd
+from utils.registro_complementos import importar_diferido
+
+# openpyxl se importa al abrir el primer libro
+openpyxl = importar_diferido('openpyxl')
+
+
+class SesionExcel:
+    """
+    Libro de Excel abierto una sola vez para obtener formatos, filas/columnas
+    ocultas y valores.
+
+    En modo read_only openpyxl lee las hojas en streaming bajo demanda; solo
+    la detección de elementos ocultos necesita la carga completa, porque las
+    dimensiones de filas y columnas no están disponibles en ese modo.
+    """
+
+    def __init__(self, ruta_archivo, data_only: bool = True, read_only: bool = True):
+        """
+        Args:
+            ruta_archivo: Ruta del archivo Excel
+            data_only: Si es True, las fórmulas se leen con su último valor calculado
+            read_only: Si es True, carga el libro en modo streaming
+        """
+        self.ruta_archivo = Path(ruta_archivo)
+        self.read_only = read_only
+        self.workbook = openpyxl.load_workbook(
+            self.ruta_archivo, read_only=read_only, data_only=data_only, keep_links=False
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libera el archivo (solo el modo read_only lo mantiene abierto)"""
+        if self.read_only:
+            self.workbook.close()
+
+    def hoja(self, sheet_name=0):
+        """Retorna la hoja por índice o nombre; para None o listas, la hoja activa"""
+        if isinstance(sheet_name, int):
+            return self.workbook.worksheets[sheet_name]
+        if isinstance(sheet_name, str):
+            return self.workbook[sheet_name]
+        return self.workbook.active
+
+    def obtener_formatos(self, sheet_name=0, max_fila: int = 10):
+        """
+        Detecta el tipo y formato de cada columna a partir de las primeras filas
+
+        Args:
+            sheet_name: Nombre o índice de la hoja
+            max_fila: Última fila examinada (la primera se asume de encabezados)
+
+        Returns:
+            dict: {indice_columna (0-based): {'tipo': ..., 'formato': ...}}
+        """
+        formatos = {}
+        for row in self.hoja(sheet_name).iter_rows(min_row=2, max_row=max_fila):
+            for cell in row:
+                # Las celdas vacías en modo read_only no tienen coordenadas
+                if getattr(cell, 'column', None) is None:
+                    continue
+                col_idx = cell.column - 1  # Convertir a 0-based
+
+                if col_idx not in formatos:
+                    formatos[col_idx] = {'tipo': None, 'formato': None}
+
+                # Las celdas vacías no deben pisar el formato de las que tienen datos
+                tipo = self._tipo_celda(cell) if cell.value is not None else None
+                if tipo:
+                    formatos[col_idx] = tipo
+        return formatos
+
+    @staticmethod
+    def _tipo_celda(cell):
+        """Clasifica una celda según su tipo de dato y formato numérico"""
+        formato = cell.number_format
+        if cell.data_type == 'n':  # Número
+            if formato and ('/' in formato or
+                            'y' in formato.lower() or
+                            'm' in formato.lower() or
+                            'd' in formato.lower()):
+                return {'tipo': 'fecha', 'formato': formato}
+            if formato and '%' in formato:
+                return {'tipo': 'porcentaje', 'formato': formato}
+            if formato and ('$' in formato or '€' in formato or '£' in formato):
+                return {'tipo': 'moneda', 'formato': formato}
+            return {'tipo': 'numero', 'formato': formato}
+        if cell.data_type == 'd':  # Fecha
+            return {'tipo': 'fecha', 'formato': formato}
+        if cell.data_type == 'f':  # Fórmula
+            return {'tipo': 'formula', 'formato': None}
+        if cell.data_type == 'b':  # Booleano
+            return {'tipo': 'booleano', 'formato': None}
+        return None
+
+    def detectar_elementos_ocultos(self, sheet_name=0):
+        """
+        Detecta filas y columnas ocultas leyendo solo las dimensiones definidas
+
+        Returns:
+            tuple: (filas_ocultas 0-based, columnas_ocultas como índice 0-based y letra)
+        """
+        if self.read_only:
+            raise ValueError("La detección de elementos ocultos requiere read_only=False")
+
+        sheet = self.hoja(sheet_name)
+        filas_ocultas = sorted(
+            fila - 1 for fila, dimension in sheet.row_dimensions.items() if dimension.hidden
+        )
+
+        columnas_ocultas = []
+        for dimension in sheet.column_dimensions.values():
+            if not dimension.hidden:
+                continue
+            # Una dimensión puede agrupar un rango de columnas (min..max)
+            for i in range(dimension.min, dimension.max + 1):
+                columnas_ocultas.append(i - 1)
+                columnas_ocultas.append(openpyxl.utils.get_column_letter(i))
+        return filas_ocultas, columnas_ocultas
+
+    def leer(self, sheet_name=0, **kwargs):
+        """Lee la hoja (u hojas) con pandas.read_excel reutilizando el libro abierto"""
+        kwargs.pop('engine_kwargs', None)
+        kwargs['engine'] = 'openpyxl'
+        return pd.read_excel(self.workbook, sheet_name=sheet_name, **kwargs)
@@ -6,46 +6,131 @@ from datetime import datetime, timedelta
 import yaml
 import random
 import json  # Añadimos la importación de json
+import unicodedata
 from utils.file_naming import FileNamingConvention
-from utils.exportador_base import ExportadorBase
-from typing import Dict, List, Any, Optional, Union
+from utils import exportador_base
+from utils.data_formats import DataFormatHandler
+from utils.plan_generacion import (
+    digitos_por_formato, elegir, enteros, fechas_relativas, fuentes_aleatorias, textos_faker
+)
+from typing import Dict, List, Any, Optional, Union, Iterator
+
+# pyarrow es opcional: solo se usa para tablas Arrow y archivos Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
 
 class GeneradorPacientes:
     """Clase para generar datos sintéticos de pacientes"""
+
+    GENEROS = ['Masculino', 'Femenino']
+    ESTADOS_CIVILES = ['Single', 'Married', 'Divorced', 'Widowed', 'Separated', 'Cohabitating']
+    NIVELES_EDUCACION = [
+        'Ninguno', 'Asociado (Carrera técnica)', 'Doctorado', 
+        'Maestría', 'Postdoctorado'
+    ]
+    # Probabilidad de dejar vacío un campo cuyo ejemplo es nulo
+    probabilidad_nulo = 0.2
+    # Piezas con las que se construyen por columnas los datos de contacto
+    FORMATO_TELEFONO = '+34 6XX XXX XXX'
+    DOMINIOS_EMAIL = ['gmail.com', 'yahoo.com', 'hotmail.com']
     
-    def __init__(self):
+    def __init__(self, semilla=None, fecha_referencia=None):
+        """
+        Args:
+            semilla: Semilla (int o numpy.random.SeedSequence) para reproducir los datos
+            fecha_referencia: Fecha usada como "hoy" en la generación por columnas
+        """
         self.fake = Faker(['es_ES'])  # Configurado para español
+        self.rng, self.random = fuentes_aleatorias(semilla, self.fake)
+        self.fecha_referencia = fecha_referencia
         self._configurar_generadores()
+        self._configurar_generadores_columna()
 
     def _configurar_generadores(self):
         """Configura los generadores específicos para cada tipo de campo"""
         self.generadores = {
-            'id': lambda x: random.randint(1, 99999),  # Cambiado para no depender del valor anterior
+            'id': lambda x: self.random.randint(1, 99999),  # Cambiado para no depender del valor anterior
             'nombre': lambda _: self.fake.first_name(),
             'apellido': lambda _: self.fake.last_name(),
-            'genero': lambda _: random.choice(['Masculino', 'Femenino']),
+            'genero': lambda _: self.random.choice(self.GENEROS),
             'fecha_nacimiento': lambda _: self.fake.date_of_birth(minimum_age=18, maximum_age=90),
             'telefono': lambda _: self.fake.phone_number(),
             'email': lambda _: self.fake.email(),
             'direccion': lambda _: self.fake.address(),
             'pais': lambda _: 'Cuba',
             'ciudad': lambda _: 'Miami, FL',
-            'estado_civil': lambda _: random.choice(['Single', 'Married', 'Divorced', 'Widowed', 'Separated', 'Cohabitating']),
-            'educacion': lambda _: random.choice([
-                'Ninguno', 'Asociado (Carrera técnica)', 'Doctorado', 
-                'Maestría', 'Postdoctorado'
-            ])
+            'estado_civil': lambda _: self.random.choice(self.ESTADOS_CIVILES),
+            'educacion': lambda _: self.random.choice(self.NIVELES_EDUCACION)
+        }
+
+    def _configurar_generadores_columna(self):
+        """Versión vectorizada de los generadores: cada función recibe n y devuelve n valores"""
+        self.generadores_columna = {
+            'id': lambda n: enteros(self.rng, 1, 99999, n),
+            'nombre': lambda n: textos_faker(self.rng, self.fake.first_name, n),
+            'apellido': lambda n: textos_faker(self.rng, self.fake.last_name, n),
+            'genero': lambda n: elegir(self.rng, self.GENEROS, n),
+            'fecha_nacimiento': lambda n: fechas_relativas(self.rng, -90 * 365, -18 * 365, n, self.fecha_referencia),
+            'telefono': lambda n: digitos_por_formato(self.rng, self.FORMATO_TELEFONO, n),
+            'email': self._emails,
+            'direccion': self._direcciones,
+            'pais': lambda n: np.full(n, 'Cuba', dtype=object),
+            'ciudad': lambda n: np.full(n, 'Miami, FL', dtype=object),
+            'estado_civil': lambda n: elegir(self.rng, self.ESTADOS_CIVILES, n),
+            'educacion': lambda n: elegir(self.rng, self.NIVELES_EDUCACION, n)
         }
+        self.generadores_tipo = [
+            (('int',), lambda n: enteros(self.rng, 1, 1000, n)),
+            (('float',), lambda n: np.round(self.rng.uniform(0, 1000, n), 2)),
+            (('datetime', 'date', 'time'), lambda n: fechas_relativas(self.rng, -30 * 365, 0, n, self.fecha_referencia)),
+            (('bool',), lambda n: self.rng.random(n) < 0.5)
+        ]
+        self.generador_texto = lambda n: textos_faker(self.rng, self.fake.word, n)
+
+    def _emails(self, n: int) -> np.ndarray:
+        """
+        Emails nombre.apellidoNNNN@dominio: a diferencia de sortearlos de un
+        pool de Faker, prácticamente no se repiten aunque n sea grande
+        """
+        nombres = self._como_usuario(textos_faker(self.rng, self.fake.first_name, n))
+        apellidos = self._como_usuario(textos_faker(self.rng, self.fake.last_name, n))
+        numeros = pd.Series(enteros(self.rng, 1, 9999, n)).astype(str)
+        dominios = elegir(self.rng, self.DOMINIOS_EMAIL, n)
+        return (nombres + '.' + apellidos + numeros + '@' + dominios).to_numpy(dtype=object)
+
+    def _direcciones(self, n: int) -> np.ndarray:
+        """Direcciones con el formato de Faker (calle número, ciudad y código postal)"""
+        calles = pd.Series(textos_faker(self.rng, self.fake.street_name, n))
+        numeros = pd.Series(enteros(self.rng, 1, 999, n)).astype(str)
+        ciudades = textos_faker(self.rng, self.fake.city, n)
+        postales = pd.Series(enteros(self.rng, 1000, 52999, n)).astype(str).str.zfill(5)
+        return (calles + ' ' + numeros + '\n' + ciudades + ', ' + postales).to_numpy(dtype=object)
+
+    @staticmethod
+    def _como_usuario(valores: np.ndarray) -> pd.Series:
+        """Minúsculas sin acentos ni espacios; se calcula una vez por valor distinto"""
+        codigos, unicos = pd.factorize(valores)
+        limpios = np.array([
+            unicodedata.normalize('NFKD', str(v)).encode('ascii', 'ignore').decode('ascii').lower().replace(' ', '')
+            for v in unicos
+        ], dtype=object)
+        return pd.Series(limpios[codigos] if len(limpios) else np.empty(0, dtype=object))
 
     def generar_valor(self, campo, tipo, ejemplo=None, valores_unicos=None):
         """Genera un valor sintético basado en el tipo de campo y ejemplo"""
         # Si el ejemplo es nulo y el campo permite nulos, retornar nulo ocasionalmente
-        if pd.isna(ejemplo) and random.random() < 0.2:  # 20% de probabilidad de nulo
+        if pd.isna(ejemplo) and self.random.random() < self.probabilidad_nulo:  # 20% de probabilidad de nulo
             return None
 
         # Si tenemos valores únicos limitados, usar esos
         if valores_unicos and len(valores_unicos) <= 5:
-            valor = random.choice(valores_unicos)
+            valor = self.random.choice(valores_unicos)
             return None if pd.isna(valor) else valor
 
         # Buscar generador específico
@@ -57,17 +142,17 @@ class GeneradorPacientes:
         # Si no hay generador específico, usar generadores por tipo
         tipo = str(tipo).lower()
         if 'int' in tipo:
-            return random.randint(1, 1000)
+            return self.random.randint(1, 1000)
         elif 'float' in tipo:
-            return round(random.uniform(0, 1000), 2)
+            return round(self.random.uniform(0, 1000), 2)
         elif 'datetime' in tipo or 'date' in tipo or 'time' in tipo:
             return self.fake.date_between(start_date='-30y', end_date='today')
         elif 'bool' in tipo:
-            return random.choice([True, False])
+            return self.random.choice([True, False])
         else:
             return ejemplo if pd.notna(ejemplo) else self.fake.word()
 
-class ExportadorBase:
+class ExportadorBase(exportador_base.ExportadorBase):
     FORMATOS_SOPORTADOS = {
         'csv': ('CSV', lambda df, path: df.to_csv(path, index=False)),
         'xlsx': ('Excel (XLSX)', lambda df, path: df.to_excel(path, index=False)),
@@ -75,7 +160,9 @@ class ExportadorBase:
         'html': ('HTML', lambda df, path: df.to_html(path, index=False)),
         'yaml': ('YAML', lambda df, path: yaml.dump(df.to_dict('records'), open(path, 'w'))),
         'tsv': ('TSV', lambda df, path: df.to_csv(path, sep='\t', index=False)),
-        'ods': ('ODS', lambda df, path: df.to_excel(path, engine='odf', index=False))
+        'ods': ('ODS', lambda df, path: df.to_excel(path, engine='odf', index=False)),
+        'parquet': ('Parquet', lambda df, path: DataFormatHandler.write_columnar(df, path, 'parquet')),
+        'feather': ('Feather (Arrow IPC)', lambda df, path: DataFormatHandler.write_columnar(df, path, 'feather'))
     }
 
     def preguntar_formato(self):
@@ -295,6 +382,155 @@ class ExportadorPacientes(ExportadorBase):
         
         return pacientes
     
+    def generar_pacientes_masivo(self, cantidad: int, opciones: Dict[str, Any] = None,
+                                 semilla: Optional[int] = None, como: str = 'dataframe',
+                                 tamano_bloque: int = 500_000):
+        """
+        Genera pacientes en bloque con NumPy, pensado para millones de registros
+
+        Produce las mismas columnas que generar_pacientes y respeta las mismas
+        opciones (porcentaje_femenino, edad_min, edad_max, formatos_fecha,
+        formato_telefono), pero cada columna se sortea como un arreglo completo.
+
+        Args:
+            cantidad: Número de pacientes a generar
+            opciones: Opciones para personalizar la generación
+            semilla: Semilla del numpy.random.Generator (None para aleatoria)
+            como: 'dataframe' para pandas.DataFrame o 'arrow' para pyarrow.Table
+            tamano_bloque: Filas generadas por bloque
+
+        Returns:
+            pandas.DataFrame o pyarrow.Table con los pacientes
+        """
+        if como == 'arrow' and not PYARROW_AVAILABLE:
+            raise ImportError("Se requiere pyarrow para generar tablas Arrow: pip install pyarrow")
+
+        bloques = list(self.iterar_pacientes_masivo(cantidad, opciones, semilla, tamano_bloque))
+        if not bloques:
+            bloques = [self._generar_bloque_pacientes(np.random.default_rng(semilla), 0,
+                                                      self._combinar_opciones(opciones), datetime.now())]
+        df = bloques[0] if len(bloques) == 1 else pd.concat(bloques, ignore_index=True)
+
+        if como == 'arrow':
+            return pa.Table.from_pandas(df, preserve_index=False)
+        return df
+
+    def iterar_pacientes_masivo(self, cantidad: int, opciones: Dict[str, Any] = None,
+                                semilla: Optional[int] = None,
+                                tamano_bloque: int = 500_000) -> Iterator[pd.DataFrame]:
+        """
+        Genera los pacientes en DataFrames de como máximo tamano_bloque filas,
+        para no tener toda la población en memoria a la vez
+
+        Args:
+            cantidad: Número total de pacientes
+            opciones: Opciones para personalizar la generación
+            semilla: Semilla del numpy.random.Generator
+            tamano_bloque: Filas por DataFrame
+        """
+        opciones_finales = self._combinar_opciones(opciones)
+        rng = np.random.default_rng(semilla)
+        ahora = datetime.now()
+        tamano_bloque = max(1, tamano_bloque)
+
+        for inicio in range(0, cantidad, tamano_bloque):
+            n = min(tamano_bloque, cantidad - inicio)
+            df = self._generar_bloque_pacientes(rng, n, opciones_finales, ahora)
+            df.index = pd.RangeIndex(inicio, inicio + n)
+            yield df
+
+    def _combinar_opciones(self, opciones: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Combina las opciones predeterminadas con las proporcionadas"""
+        opciones_finales = self.opciones.copy()
+        if opciones:
+            opciones_finales.update(opciones)
+        return opciones_finales
+
+    def _generar_bloque_pacientes(self, rng: np.random.Generator, n: int,
+                                  opciones: Dict[str, Any], ahora: datetime) -> pd.DataFrame:
+        """Genera un bloque de n pacientes con operaciones vectorizadas"""
+        nombres_f = np.array(self.nombres_femeninos, dtype=object)
+        nombres_m = np.array(self.nombres_masculinos, dtype=object)
+        apellidos = np.array(self.apellidos, dtype=object)
+
+        # Género con la misma regla que generar_pacientes: randint(1, 100) <= porcentaje
+        femenino = rng.integers(1, 101, n) <= opciones["porcentaje_femenino"]
+        nombre = np.where(
+            femenino,
+            nombres_f[rng.integers(0, len(nombres_f), n)],
+            nombres_m[rng.integers(0, len(nombres_m), n)]
+        )
+        apellido1 = apellidos[rng.integers(0, len(apellidos), n)]
+        apellido2 = apellidos[rng.integers(0, len(apellidos), n)]
+
+        # Fechas: solo hay un valor posible por edad y por día del último año,
+        # así que se formatean esos valores una vez y se indexan
+        edad = rng.integers(opciones["edad_min"], opciones["edad_max"] + 1, n)
+        dias_registro = rng.integers(0, 366, n)
+        formatos = list(opciones["formatos_fecha"])
+        formato_idx = rng.integers(0, len(formatos), n)
+
+        edades_posibles = np.arange(opciones["edad_min"], opciones["edad_max"] + 1)
+        tabla_nacimiento = np.array([
+            [(ahora - timedelta(days=365.25 * int(e))).strftime(f) for f in formatos]
+            for e in edades_posibles
+        ], dtype=object).reshape(len(edades_posibles), len(formatos))
+        tabla_registro = np.array([
+            [(ahora - timedelta(days=int(d))).strftime(f) for f in formatos]
+            for d in range(366)
+        ], dtype=object)
+
+        fecha_nacimiento = tabla_nacimiento[edad - opciones["edad_min"], formato_idx]
+        fecha_registro = tabla_registro[dias_registro, formato_idx]
+
+        ids = rng.integers(10000, 100000, n)
+        telefono = self._generar_telefonos(rng, n, opciones["formato_telefono"])
+        activo = rng.random(n) < 0.75  # 75% activos
+
+        nombre_s = pd.Series(nombre, dtype=object)
+        apellido1_s = pd.Series(apellido1, dtype=object)
+        apellido2_s = pd.Series(apellido2, dtype=object)
+
+        return pd.DataFrame({
+            "id": "P" + pd.Series(ids).astype(str),
+            "nombre": nombre_s,
+            "apellido1": apellido1_s,
+            "apellido2": apellido2_s,
+            "nombre_completo": nombre_s + " " + apellido1_s + " " + apellido2_s,
+            "genero": np.where(femenino, "F", "M").astype(object),
+            "fecha_nacimiento": fecha_nacimiento,
+            "edad": edad,
+            "telefono": telefono,
+            "activo": activo,
+            "fecha_registro": fecha_registro
+        })
+
+    def _generar_telefonos(self, rng: np.random.Generator, n: int, formato: str) -> np.ndarray:
+        """Versión vectorizada de _generar_telefono (ver digitos_por_formato)"""
+        return digitos_por_formato(rng, formato, n)
+
+    def exportar_masivo(self, cantidad: int, ruta_salida: Union[str, Path], formato: str = 'csv',
+                        opciones: Dict[str, Any] = None, semilla: Optional[int] = None,
+                        tamano_bloque: int = 500_000, compresion: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Genera y exporta pacientes por bloques sin tenerlos todos en memoria
+
+        Args:
+            cantidad: Número de pacientes
+            ruta_salida: Archivo de destino
+            formato: csv, tsv, jsonl o parquet
+            opciones: Opciones de generación
+            semilla: Semilla del generador
+            tamano_bloque: Filas por bloque
+            compresion: Códec de Parquet (por defecto zstd)
+
+        Returns:
+            dict: Resumen de exportar_por_bloques
+        """
+        bloques = self.iterar_pacientes_masivo(cantidad, opciones, semilla, tamano_bloque)
+        return self.exportar_por_bloques(bloques, ruta_salida, formato, total=cantidad,
+                                         compresion=compresion)
+
     def _generar_telefono(self, formato: str) -> str:
         """
         Genera un número de teléfono según el formato especificado
@@ -1,3 +1,4 @@
 from .pdf_extractor import PDFExtractor
+from .extraction_cache import ExtractionCache
 
-__all__ = ['PDFExtractor']
+__all__ = ['PDFExtractor', 'ExtractionCache']
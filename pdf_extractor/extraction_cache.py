@@ -0,0 +1,214 @@
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+
+
+class ExtractionCache:
+    """
+    Caché persistente de extracciones de PDF direccionada por contenido.
+
+    Cada entrada se identifica por el SHA-256 del archivo más el método de
+    extracción y sus parámetros (LAParams, OCR, etc.), por lo que un archivo
+    modificado nunca reutiliza un resultado anterior. El hash de cada ruta se
+    memoriza junto con su tamaño y fecha de modificación para no releer
+    archivos que no han cambiado.
+    """
+
+    NOMBRE_DB = "extracciones.db"
+
+    def __init__(self, cache_dir, max_mb: float = 256):
+        """
+        Args:
+            cache_dir: Carpeta de la caché (normalmente <clinica>/.cache)
+            max_mb: Tamaño máximo del texto almacenado antes de desalojar
+                    las entradas usadas hace más tiempo (LRU)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / self.NOMBRE_DB
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión que confirma (o deshace) la transacción y se cierra al salir"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Crea las tablas de la caché si no existen"""
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS archivos (
+                    ruta TEXT PRIMARY KEY,
+                    tamano INTEGER,
+                    mtime_ns INTEGER,
+                    sha256 TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extracciones (
+                    clave TEXT PRIMARY KEY,
+                    sha256 TEXT,
+                    metodo TEXT,
+                    parametros TEXT,
+                    texto TEXT,
+                    calidad INTEGER,
+                    metodo_ganador TEXT,
+                    bytes INTEGER,
+                    creado TEXT,
+                    ultimo_acceso REAL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_extracciones_acceso
+                ON extracciones(ultimo_acceso)
+            """)
+
+    @staticmethod
+    def calcular_sha256(file_path) -> str:
+        """Calcula el SHA-256 de un archivo leyéndolo por bloques"""
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    def _hash_archivo(self, conn, file_path: Path) -> str:
+        """
+        Retorna el SHA-256 del archivo, reutilizando el memorizado si el tamaño
+        y la fecha de modificación no han cambiado. Si el archivo cambió, se
+        eliminan las extracciones del contenido anterior.
+        """
+        ruta = str(Path(file_path).resolve())
+        stat = Path(file_path).stat()
+
+        fila = conn.execute(
+            "SELECT tamano, mtime_ns, sha256 FROM archivos WHERE ruta = ?", (ruta,)
+        ).fetchone()
+        if fila and fila[0] == stat.st_size and fila[1] == stat.st_mtime_ns:
+            return fila[2]
+
+        sha256 = self.calcular_sha256(file_path)
+        if fila and fila[2] != sha256:
+            # El archivo cambió: invalidar el contenido anterior si ninguna otra ruta lo usa
+            otras = conn.execute(
+                "SELECT COUNT(*) FROM archivos WHERE sha256 = ? AND ruta != ?", (fila[2], ruta)
+            ).fetchone()[0]
+            if not otras:
+                conn.execute("DELETE FROM extracciones WHERE sha256 = ?", (fila[2],))
+
+        conn.execute(
+            "INSERT OR REPLACE INTO archivos (ruta, tamano, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+            (ruta, stat.st_size, stat.st_mtime_ns, sha256)
+        )
+        return sha256
+
+    @staticmethod
+    def _generar_clave(sha256: str, metodo: str, parametros: Dict[str, Any]) -> str:
+        """Genera la clave de una extracción a partir del contenido y la configuración"""
+        parametros_str = json.dumps(parametros or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{sha256}|{metodo}|{parametros_str}".encode('utf-8')).hexdigest()
+
+    def obtener(self, file_path, metodo: str, parametros: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Busca una extracción previa del archivo con la misma configuración
+
+        Returns:
+            dict con 'texto', 'calidad' y 'metodo', o None si no existe
+        """
+        with self._lock, self._conectar() as conn:
+            sha256 = self._hash_archivo(conn, file_path)
+            clave = self._generar_clave(sha256, metodo, parametros)
+            fila = conn.execute(
+                "SELECT texto, calidad, metodo_ganador FROM extracciones WHERE clave = ?", (clave,)
+            ).fetchone()
+
+            if not fila:
+                self.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE extracciones SET ultimo_acceso = ? WHERE clave = ?",
+                (datetime.now().timestamp(), clave)
+            )
+            self.hits += 1
+            return {'texto': fila[0], 'calidad': fila[1], 'metodo': fila[2], 'sha256': sha256}
+
+    def guardar(self, file_path, metodo: str, parametros: Dict[str, Any],
+                texto: str, calidad: int, metodo_ganador: str) -> None:
+        """Almacena el resultado de una extracción y aplica el límite de tamaño"""
+        if texto is None:
+            return
+
+        with self._lock, self._conectar() as conn:
+            sha256 = self._hash_archivo(conn, file_path)
+            clave = self._generar_clave(sha256, metodo, parametros)
+            ahora = datetime.now()
+            conn.execute("""
+                INSERT OR REPLACE INTO extracciones
+                (clave, sha256, metodo, parametros, texto, calidad, metodo_ganador, bytes, creado, ultimo_acceso)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                clave,
+                sha256,
+                metodo,
+                json.dumps(parametros or {}, sort_keys=True, default=str),
+                texto,
+                calidad,
+                metodo_ganador,
+                len(texto.encode('utf-8')),
+                ahora.isoformat(),
+                ahora.timestamp()
+            ))
+            self._desalojar(conn)
+
+    def _desalojar(self, conn) -> int:
+        """Elimina las entradas usadas hace más tiempo hasta respetar max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM extracciones").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        eliminadas = 0
+        for clave, tamano in conn.execute(
+            "SELECT clave, bytes FROM extracciones ORDER BY ultimo_acceso ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM extracciones WHERE clave = ?", (clave,))
+            total -= tamano
+            eliminadas += 1
+        return eliminadas
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas de la caché"""
+        with self._lock, self._conectar() as conn:
+            conn.execute("DELETE FROM extracciones")
+            conn.execute("DELETE FROM archivos")
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Retorna el número de entradas, el tamaño ocupado y los aciertos de la caché"""
+        with self._conectar() as conn:
+            entradas, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM extracciones"
+            ).fetchone()
+        return {
+            'entradas': entradas,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
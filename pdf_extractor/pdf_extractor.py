@@ -2,6 +2,7 @@ from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
 from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
 import tempfile  # Añadido para manejar archivos temporales
 
 # Verificación de dependencias e importación condicional
@@ -12,16 +13,11 @@ except ImportError:
     YAML_AVAILABLE = False
     yaml = None
 
-# Importar Google Cloud Vision
-try:
-    from google.cloud import vision
-    CLOUD_VISION_AVAILABLE = True
-except ImportError:
-    CLOUD_VISION_AVAILABLE = False
-    vision = None
+from utils.registro_complementos import RegistroComplementos, importar_diferido
 
-# Importar pdfminer de forma condicional
-try:
+
+def _importar_pdfminer():
+    """Importa PDFMiner y publica en el módulo las clases usadas por el extractor"""
     from pdfminer.high_level import extract_text, extract_pages
     from pdfminer.pdfdocument import PDFDocument
     from pdfminer.pdfparser import PDFParser
@@ -30,32 +26,37 @@ try:
     from pdfminer.layout import LAParams, LTTextBox, LTTextLine, LTChar, LTFigure
     from pdfminer.converter import TextConverter, PDFPageAggregator
     from pdfminer.pdfdevice import PDFDevice
-    PDFMINER_AVAILABLE = True
-except ImportError:
-    PDFMINER_AVAILABLE = False
+    nombres = {nombre: valor for nombre, valor in locals().items()}
+    globals().update(nombres)
+    return nombres
 
-# Importar PyPDF2
-try:
-    import PyPDF2
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
 
-# Importar OCR y herramientas de imagen
-try:
-    from PIL import Image
-    import pytesseract
-    from pdf2image import convert_from_path
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+# Motores de extracción: se comprueba su disponibilidad sin importarlos y se
+# cargan al crear el primer PDFExtractor (o en los procesos de extracción paginada)
+EXTRACTORES = RegistroComplementos()
+EXTRACTORES.registrar('pdfminer', _importar_pdfminer, ['pdfminer'], ['.pdf'], 'PDFMiner')
+EXTRACTORES.registrar('pypdf2', 'PyPDF2', ['PyPDF2'], descripcion='PyPDF2')
+EXTRACTORES.registrar('ocr', 'pytesseract', ['PIL', 'pytesseract', 'pdf2image'], descripcion='OCR (Tesseract)')
+EXTRACTORES.registrar('vision', 'google.cloud.vision', ['google.cloud.vision'], descripcion='Google Cloud Vision')
+
+PDFMINER_AVAILABLE = EXTRACTORES.complemento('pdfminer').disponible
+PYPDF2_AVAILABLE = EXTRACTORES.complemento('pypdf2').disponible
+OCR_AVAILABLE = EXTRACTORES.complemento('ocr').disponible
+CLOUD_VISION_AVAILABLE = EXTRACTORES.complemento('vision').disponible
+
+PyPDF2 = importar_diferido('PyPDF2') if PYPDF2_AVAILABLE else None
+pytesseract = importar_diferido('pytesseract')
+pdf2image = importar_diferido('pdf2image')
+vision = importar_diferido('google.cloud.vision') if CLOUD_VISION_AVAILABLE else None
 
 import os
+import time
 import warnings
 import sys
 from utils.file_naming import FileNamingConvention
 from utils.data_formats import DataFormatHandler
 from utils.config_manager import ConfigManager
+from pdf_extractor.extraction_cache import ExtractionCache
 
 missing_dependencies = []
 optional_dependencies = []
@@ -80,6 +81,75 @@ if optional_dependencies:
     print("ℹ️ Información: Algunas funcionalidades opcionales no estarán disponibles.")
     print(f"Para funcionalidad completa, instale: pip install {' '.join(optional_dependencies)}")
 
+def _extraer_rango_paginas(pdf_path, paginas, laparams, usar_ocr):
+    """
+    Extrae un bloque de páginas con cada método disponible.
+
+    Se define a nivel de módulo para poder ejecutarse en los procesos del
+    ProcessPoolExecutor usado por PDFExtractor._extraer_por_paginas.
+
+    Args:
+        pdf_path: Ruta al archivo PDF
+        paginas: Lista de índices de página (0-based) a procesar
+        laparams: Parámetros de layout de PDFMiner
+        usar_ocr: Si es True, también aplica OCR a cada página
+
+    Returns:
+        list: Un diccionario por página con sus candidatos {metodo: (texto, calidad_base)}
+    """
+    candidatos = {pagina: {} for pagina in paginas}
+
+    if PYPDF2_AVAILABLE:
+        try:
+            with open(pdf_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for pagina in paginas:
+                    texto = reader.pages[pagina].extract_text()
+                    if texto and texto.strip():
+                        candidatos[pagina]['pypdf2'] = (texto, 50)
+        except Exception:
+            pass
+
+    if PDFMINER_AVAILABLE:
+        try:
+            EXTRACTORES.obtener('pdfminer')
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=UserWarning)
+                with open(pdf_path, 'rb') as file:
+                    document = PDFDocument(PDFParser(file))
+                    base_quality = 100 if document.is_extractable else 70
+                    rsrcmgr = PDFResourceManager(caching=True)
+                    pdf_pages = PDFPage.get_pages(file, pagenos=set(paginas), check_extractable=False)
+                    for pagina, page in zip(sorted(paginas), pdf_pages):
+                        output = StringIO()
+                        converter = TextConverter(rsrcmgr, output, laparams=laparams)
+                        PDFPageInterpreter(rsrcmgr, converter).process_page(page)
+                        texto = output.getvalue()
+                        converter.close()
+                        output.close()
+                        if texto.strip():
+                            candidatos[pagina]['pdfminer'] = (texto, base_quality)
+        except Exception:
+            pass
+
+    if usar_ocr and OCR_AVAILABLE:
+        for pagina in paginas:
+            try:
+                # Rasterizar solo la página actual en lugar del documento completo
+                imagenes = pdf2image.convert_from_path(pdf_path, first_page=pagina + 1, last_page=pagina + 1)
+                if imagenes:
+                    texto = pytesseract.image_to_string(
+                        imagenes[0].convert('L'),
+                        lang='spa+eng',
+                        config='--psm 1'
+                    )
+                    if texto.strip():
+                        candidatos[pagina]['ocr'] = (texto, 90)
+            except Exception:
+                continue
+
+    return [{'pagina': pagina, 'candidatos': candidatos[pagina]} for pagina in paginas]
+
 class PDFExtractor:
     """Clase para extraer y procesar contenido de archivos PDF"""
     
@@ -88,6 +158,8 @@ class PDFExtractor:
         if missing_dependencies:
             print("\n⚠️ El procesador de PDF no funcionará correctamente sin las dependencias requeridas.")
             print(f"Instale: pip install {' '.join(missing_dependencies)}")
+        else:
+            EXTRACTORES.obtener('pdfminer')
         
         self.current_content = None
         self.content_quality = 0
@@ -123,6 +195,48 @@ class PDFExtractor:
         self.min_quality_threshold = 50  # Umbral mínimo de calidad (%)
         self.ideal_quality_threshold = 80  # Umbral ideal de calidad (%)
 
+        # Procesos para la extracción paginada (modo='paginado' en leer_pdf)
+        self.max_workers = ConfigManager().get('pdf_extractor.workers') or os.cpu_count() or 1
+        self.metodos_por_pagina = {}
+
+        # Caché persistente de extracciones (se activa con usar_cache)
+        self.cache = None
+
+        # Modo por costo: umbral "suficientemente bueno" y estadísticas por método
+        self.umbral_suficiente = ConfigManager().get('pdf_extractor.umbral_suficiente') or self.ideal_quality_threshold
+        self.estadisticas_metodos = {}
+
+    def usar_cache(self, cache_dir, max_mb=None):
+        """
+        Activa la caché de extracciones en la carpeta indicada
+
+        Args:
+            cache_dir: Carpeta de la caché (normalmente <clinica>/.cache)
+            max_mb: Tamaño máximo en MB (por defecto pdf_extractor.cache_max_mb)
+
+        Returns:
+            ExtractionCache activa, o None si la caché está desactivada en config
+        """
+        config = ConfigManager()
+        if not config.get('pdf_extractor.cache_results', True):
+            self.cache = None
+            return None
+
+        if max_mb is None:
+            max_mb = config.get('pdf_extractor.cache_max_mb') or 256
+        self.cache = ExtractionCache(cache_dir, max_mb=max_mb)
+        return self.cache
+
+    def _parametros_cache(self, modo, use_ocr):
+        """Parámetros que distinguen una extracción en la caché"""
+        parametros = {
+            'ocr': bool(use_ocr and self.ocr_enabled),
+            'laparams': {k: v for k, v in sorted(vars(self.laparams).items())}
+        }
+        if modo == 'costo':
+            parametros['umbral'] = self.umbral_suficiente
+        return parametros
+
     @contextmanager
     def warning_handler(self):
         """Maneja las advertencias de PDFMiner"""
@@ -303,6 +417,100 @@ class PDFExtractor:
             print(f"\nError en extracción página por página: {str(e)}")
             return None
 
+    def _contar_paginas(self, pdf_path):
+        """Retorna el número de páginas del PDF o 0 si no se puede determinar"""
+        try:
+            if PYPDF2_AVAILABLE:
+                with open(pdf_path, 'rb') as file:
+                    return len(PyPDF2.PdfReader(file).pages)
+            if PDFMINER_AVAILABLE:
+                with open(pdf_path, 'rb') as file:
+                    return sum(1 for _ in PDFPage.get_pages(file, check_extractable=False))
+        except Exception as e:
+            print(f"\nError al contar páginas: {str(e)}")
+        return 0
+
+    def _extraer_por_paginas(self, file_path, use_ocr=True, workers=None):
+        """
+        Extrae el texto página a página repartiendo las páginas entre procesos.
+
+        Cada página se extrae con PyPDF2, PDFMiner y OCR (si está habilitado) y se
+        conserva el candidato de mayor calidad. Las páginas se reensamblan en su
+        orden original, por lo que el texto no depende del número de workers.
+
+        Returns:
+            tuple: (contenido, calidad, metodo) del resultado ensamblado
+        """
+        print("\n=== PROCESAMIENTO PAGINADO DE PDF ===")
+
+        total_paginas = self._contar_paginas(file_path)
+        if not total_paginas:
+            print("❌ No se pudo determinar el número de páginas")
+            return None, 0, None
+
+        workers = max(1, min(int(workers or self.max_workers), total_paginas))
+        usar_ocr = self.ocr_enabled and use_ocr
+
+        # Bloques contiguos pequeños: cada bloque abre el PDF una sola vez y
+        # varios bloques por proceso reparten mejor las páginas lentas (OCR)
+        tamano_bloque = max(1, -(-total_paginas // (workers * 4)))
+        bloques = [
+            list(range(inicio, min(inicio + tamano_bloque, total_paginas)))
+            for inicio in range(0, total_paginas, tamano_bloque)
+        ]
+        print(f"Procesando {total_paginas} páginas en {len(bloques)} bloques con {workers} proceso(s)...")
+
+        resultados = []
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futuros = [
+                        executor.submit(_extraer_rango_paginas, str(file_path), bloque, self.laparams, usar_ocr)
+                        for bloque in bloques
+                    ]
+                    for futuro in futuros:
+                        resultados.extend(futuro.result())
+            except Exception as e:
+                print(f"⚠️ Error en el pool de procesos: {str(e)}. Continuando en el proceso actual...")
+                resultados = []
+
+        if not resultados:
+            for bloque in bloques:
+                resultados.extend(_extraer_rango_paginas(str(file_path), bloque, self.laparams, usar_ocr))
+
+        # Elegir el mejor candidato de cada página y reensamblar en orden
+        textos = []
+        calidades_base = []
+        self.metodos_por_pagina = {}
+        for resultado in sorted(resultados, key=lambda r: r['pagina']):
+            mejor = None
+            for metodo, (texto, base_quality) in resultado['candidatos'].items():
+                calidad = self._evaluate_content_quality(texto, base_quality)
+                if mejor is None or calidad > mejor['calidad']:
+                    mejor = {'texto': texto, 'metodo': metodo, 'calidad': calidad, 'base': base_quality}
+
+            numero = resultado['pagina'] + 1
+            if mejor is None:
+                print(f"❌ Página {numero}: sin contenido")
+                self.metodos_por_pagina[numero] = None
+                continue
+
+            print(f"📄 Página {numero}: {mejor['metodo']} ({mejor['calidad']}%)")
+            self.metodos_por_pagina[numero] = mejor['metodo']
+            textos.append(mejor['texto'])
+            calidades_base.append(mejor['base'])
+
+        if not textos:
+            return None, 0, None
+
+        contenido = "\n".join(textos)
+        calidad = self._evaluate_content_quality(contenido, sum(calidades_base) / len(calidades_base))
+        metodos = sorted({m for m in self.metodos_por_pagina.values() if m})
+        metodo = f"paginado ({', '.join(metodos)})"
+
+        self._mostrar_barra_calidad(calidad, "PAGINADO")
+        return contenido, calidad, metodo
+
     def extract_text_with_ocr(self, pdf_path):
         """Extrae texto usando OCR (Tesseract)"""
         if not self.ocr_enabled:
@@ -313,7 +521,7 @@ class PDFExtractor:
             print("\nConvirtiendo PDF a imágenes...")
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Convertir PDF a imágenes
-                images = convert_from_path(pdf_path)
+                images = pdf2image.convert_from_path(pdf_path)
                 text_parts = []
 
                 print(f"Procesando {len(images)} páginas con OCR...")
@@ -335,12 +543,144 @@ class PDFExtractor:
             print(f"\nError en OCR: {str(e)}")
             return None
 
-    def leer_pdf(self, file_path, use_ocr=True, max_intentos_ai=1, use_ai=False):
-        """Lee un PDF y extrae su texto utilizando diferentes métodos de forma secuencial"""
+    def leer_pdf(self, file_path, use_ocr=True, max_intentos_ai=1, use_ai=False,
+                 modo='secuencial', workers=None):
+        """
+        Lee un PDF y extrae su texto utilizando diferentes métodos
+
+        Args:
+            file_path: Ruta al archivo PDF
+            use_ocr: Si es True, incluye OCR entre los métodos disponibles
+            max_intentos_ai: Número máximo de intentos de mejora con IA
+            use_ai: Si es True, ofrece mejorar el resultado con servicios de IA
+            modo: Estrategia de extracción
+                - 'secuencial': prueba cada método sobre el documento completo
+                - 'paginado': reparte las páginas entre procesos y elige el
+                  mejor método para cada página. En PDFs con capa de texto
+                  devuelve el mismo texto que 'secuencial', pero la calidad
+                  no es comparable: se evalúa el texto ensamblado con la
+                  media de las calidades base de PyPDF2 y PDFMiner, mientras
+                  que 'secuencial' toma la mejor puntuación de todos sus
+                  métodos sobre el documento completo, con otras bases (p.ej.
+                  85 para la extracción página por página). Por eso la
+                  calidad paginada puede quedar unos puntos por debajo
+                - 'costo': sondea la capa de texto, omite el OCR en PDFs digitales
+                  y se detiene al alcanzar self.umbral_suficiente, probando
+                  primero los métodos más baratos según documentos anteriores
+            workers: Número de procesos para el modo paginado
+                     (por defecto self.max_workers)
+        """
         if PyPDF2 is None and not self.extraction_methods:
             print("No se puede procesar PDF. No hay métodos de extracción disponibles.")
             return "", 0
 
+        parametros_cache = self._parametros_cache(modo, use_ocr)
+        entrada_cache = self.cache.obtener(file_path, modo, parametros_cache) if self.cache else None
+
+        if entrada_cache:
+            print(f"\n♻️ Extracción recuperada de la caché ({entrada_cache['sha256'][:12]})")
+            mejor_contenido = entrada_cache['texto']
+            mejor_calidad = entrada_cache['calidad']
+            mejor_metodo = entrada_cache['metodo']
+        elif modo == 'paginado':
+            mejor_contenido, mejor_calidad, mejor_metodo = self._extraer_por_paginas(
+                file_path, use_ocr=use_ocr, workers=workers
+            )
+        elif modo == 'costo':
+            mejor_contenido, mejor_calidad, mejor_metodo = self._extraer_por_costo(
+                file_path, use_ocr=use_ocr
+            )
+        else:
+            mejor_contenido, mejor_calidad, mejor_metodo = self._extraer_secuencial(
+                file_path, use_ocr=use_ocr
+            )
+
+        if self.cache and not entrada_cache and mejor_contenido is not None:
+            self.cache.guardar(file_path, modo, parametros_cache,
+                               mejor_contenido, mejor_calidad, mejor_metodo)
+
+        # Verificar si se obtuvo algún resultado
+        if mejor_contenido is None:
+            print("\n❌ No se pudo extraer contenido con ningún método.")
+            return None, 0
+
+        # Mostrar resultado final
+        print("\n=== RESULTADO FINAL DE EXTRACCIÓN ===")
+        print(f"Método más efectivo: {mejor_metodo}")
+        self._mostrar_barra_calidad(mejor_calidad, "CALIDAD FINAL")
+        
+        # Actualizar la calidad en la instancia
+        self.content_quality = mejor_calidad
+        
+        # Aplicar procesamiento de texto para mejorar aún más la calidad
+        if mejor_calidad < 100:
+            print("\n🔍 Aplicando mejoras adicionales de texto...")
+            contenido_mejorado = self._mejorar_texto(mejor_contenido)
+            nueva_calidad = min(mejor_calidad + 5, 99)  # Mejora limitada al 99%
+            
+            if nueva_calidad > mejor_calidad:
+                self._mostrar_barra_calidad(nueva_calidad, "DESPUÉS DE MEJORAS")
+                mejor_contenido = contenido_mejorado
+                mejor_calidad = nueva_calidad
+                self.content_quality = nueva_calidad
+        
+        # Verificar si la calidad es muy baja y podemos mejorarla con IA
+        if mejor_calidad < 100 and self.use_ai and use_ai:
+            print(f"\nLa extracción ha alcanzado {mejor_calidad}% de calidad.")
+            print("Se pueden obtener mejores resultados usando servicios de IA.")
+            
+            if input("\n¿Desea intentar mejorar la extracción usando IA? (S/N): ").upper() == 'S':
+                intentos_ai = 0
+                while mejor_calidad < 100 and intentos_ai < max_intentos_ai:
+                    # Seleccionar API
+                    print("\nSeleccione la API de IA a usar:")
+                    print("1) Google Cloud Vision")
+                    print("2) Amazon Textract")
+                    
+                    api_seleccion = input("\nIngrese opción (0 para cancelar): ")
+                    
+                    if api_seleccion == '0':
+                        break
+                        
+                    if api_seleccion == '1':
+                        # Google Cloud Vision
+                        contenido_mejorado, nueva_calidad = self.usar_api_pdf_cloud_vision(file_path)
+                    elif api_seleccion == '2':
+                        # Amazon Textract
+                        contenido_mejorado, nueva_calidad = self.usar_api_pdf_textract(file_path)
+                    else:
+                        print("Opción no válida")
+                        continue
+                        
+                    # Si la calidad mejoró, actualizamos el resultado
+                    if contenido_mejorado and nueva_calidad > mejor_calidad:
+                        print(f"\n🚀 Calidad mejorada: {nueva_calidad}% (anterior: {mejor_calidad}%)")
+                        self._mostrar_barra_calidad(nueva_calidad, "CON IA")
+                        mejor_calidad = nueva_calidad
+                        mejor_contenido = contenido_mejorado
+                        self.content_quality = mejor_calidad
+                        
+                        # Mostrar vista previa
+                        print("\nVista previa del contenido extraído:")
+                        print("-" * 80)
+                        preview = mejor_contenido[:500] + "..." if len(mejor_contenido) > 500 else mejor_contenido
+                        print(preview)
+                        print("-" * 80)
+                    else:
+                        print(f"\n❌ No se logró mejorar la calidad de extracción con IA")
+                        
+                    intentos_ai += 1
+        
+        print(f"\nCalidad final de extracción: {mejor_calidad}%")
+        return mejor_contenido, mejor_calidad
+
+    def _extraer_secuencial(self, file_path, use_ocr=True):
+        """
+        Prueba cada método de extracción sobre el documento completo
+
+        Returns:
+            tuple: (contenido, calidad, metodo) del mejor resultado obtenido
+        """
         print("\n=== PROCESAMIENTO SECUENCIAL DE PDF ===")
         print("Utilizando métodos de extracción en orden de complejidad...\n")
         
@@ -367,17 +707,7 @@ class PDFExtractor:
             print("✓ Se ha implementado un método de evaluación de calidad básico como respaldo.")
         
         # Ordenar métodos por complejidad y calidad esperada
-        metodos_ordenados = [
-            ('básico', lambda x: (self._basic_text_extraction(x), 'basic', 30)),
-            ('PyPDF2', lambda x: (self.extract_text_with_pypdf2(x), 'pypdf2', 50)),
-            ('PDFMiner', lambda x: self.extract_with_pdfminer(x)),
-            ('PDFMiner avanzado', lambda x: (self.extract_pdfminer_advanced(x), 'pdfminer_advanced', 75)),
-            ('Extracción página por página', lambda x: (self.extract_page_by_page(x), 'page_by_page', 85)),
-        ]
-        
-        # Añadir OCR si está disponible
-        if self.ocr_enabled and use_ocr:
-            metodos_ordenados.append(('OCR (Tesseract)', lambda x: (self.extract_text_with_ocr(x), 'ocr', 90)))
+        metodos_ordenados = self._metodos_extraccion(use_ocr)
         
         # Variables para seguimiento del mejor resultado
         mejor_contenido = None
@@ -396,20 +726,11 @@ class PDFExtractor:
                     print(f"❌ No se pudo extraer contenido con {nombre_metodo}")
                     continue
                     
-                if isinstance(resultado, tuple):
-                    if len(resultado) == 3:
-                        contenido, metodo, base_quality = resultado
-                    elif len(resultado) == 2:
-                        contenido, metodo = resultado
-                        base_quality = 70  # Valor por defecto
-                    else:
-                        print(f"❌ Formato de resultado no válido para {nombre_metodo}")
-                        continue
-                else:
-                    # Si es solo texto, usar valores por defecto
-                    contenido = resultado
-                    metodo = nombre_metodo
-                    base_quality = 60
+                resultado = self._normalizar_resultado(resultado, nombre_metodo)
+                if resultado is None:
+                    print(f"❌ Formato de resultado no válido para {nombre_metodo}")
+                    continue
+                contenido, metodo, base_quality = resultado
                 
                 # Si se obtuvo contenido, evaluar calidad
                 if contenido and contenido.strip():
@@ -446,80 +767,161 @@ class PDFExtractor:
                 print(f"❌ Error al procesar archivo con {nombre_metodo}: {str(e)}")
                 continue
         
-        # Verificar si se obtuvo algún resultado
-        if mejor_contenido is None:
-            print("\n❌ No se pudo extraer contenido con ningún método.")
-            return None, 0
+        return mejor_contenido, mejor_calidad, mejor_metodo
 
-        # Mostrar resultado final
-        print("\n=== RESULTADO FINAL DE EXTRACCIÓN ===")
-        print(f"Método más efectivo: {mejor_metodo}")
-        self._mostrar_barra_calidad(mejor_calidad, "CALIDAD FINAL")
+    def _metodos_extraccion(self, use_ocr=True):
+        """
+        Lista de métodos de extracción ordenados por complejidad
+
+        Returns:
+            list: Tuplas (nombre, función) donde la función recibe la ruta del PDF
+        """
+        metodos = [
+            ('básico', lambda x: (self._basic_text_extraction(x), 'basic', 30)),
+            ('PyPDF2', lambda x: (self.extract_text_with_pypdf2(x), 'pypdf2', 50)),
+            ('PDFMiner', lambda x: self.extract_with_pdfminer(x)),
+            ('PDFMiner avanzado', lambda x: (self.extract_pdfminer_advanced(x), 'pdfminer_advanced', 75)),
+            ('Extracción página por página', lambda x: (self.extract_page_by_page(x), 'page_by_page', 85)),
+        ]
         
-        # Actualizar la calidad en la instancia
-        self.content_quality = mejor_calidad
+        # Añadir OCR si está disponible
+        if self.ocr_enabled and use_ocr:
+            metodos.append(('OCR (Tesseract)', lambda x: (self.extract_text_with_ocr(x), 'ocr', 90)))
         
-        # Aplicar procesamiento de texto para mejorar aún más la calidad
-        if mejor_calidad < 100:
-            print("\n🔍 Aplicando mejoras adicionales de texto...")
-            contenido_mejorado = self._mejorar_texto(mejor_contenido)
-            nueva_calidad = min(mejor_calidad + 5, 99)  # Mejora limitada al 99%
-            
-            if nueva_calidad > mejor_calidad:
-                self._mostrar_barra_calidad(nueva_calidad, "DESPUÉS DE MEJORAS")
-                mejor_contenido = contenido_mejorado
-                mejor_calidad = nueva_calidad
-                self.content_quality = nueva_calidad
+        return metodos
+
+    def _normalizar_resultado(self, resultado, nombre_metodo):
+        """
+        Convierte el resultado de un método al formato (contenido, metodo, calidad_base)
+
+        Returns:
+            tuple o None si el formato no es válido
+        """
+        if isinstance(resultado, tuple):
+            if len(resultado) == 3:
+                return resultado
+            if len(resultado) == 2:
+                return resultado[0], resultado[1], 70  # Valor por defecto
+            return None
+        # Si es solo texto, usar valores por defecto
+        return resultado, nombre_metodo, 60
+
+    def _tiene_capa_texto(self, pdf_path, max_paginas=3, min_caracteres=25):
+        """
+        Sondeo rápido para saber si el PDF tiene texto digital
+
+        Solo lee las primeras páginas; un PDF escaneado no devuelve texto aquí.
+
+        Args:
+            pdf_path: Ruta al archivo PDF
+            max_paginas: Páginas a revisar
+            min_caracteres: Caracteres mínimos por página para considerarlo digital
+        """
+        try:
+            if PyPDF2 is not None:
+                with open(pdf_path, 'rb') as file:
+                    reader = PyPDF2.PdfReader(file)
+                    total = min(max_paginas, len(reader.pages))
+                    textos = [reader.pages[i].extract_text() or "" for i in range(total)]
+            else:
+                texto = extract_text(str(pdf_path), maxpages=max_paginas, laparams=self.laparams)
+                textos = texto.split('\f')[:max_paginas]
+                total = len(textos)
+        except Exception:
+            return False
+
+        if not total:
+            return False
+        caracteres = sum(len(t.strip()) for t in textos)
+        return caracteres / total >= min_caracteres
+
+    def _ordenar_por_costo(self, metodos):
+        """
+        Ordena los métodos según las estadísticas de documentos anteriores
+
+        Primero los que ya alcanzaron el umbral, del más rápido al más lento;
+        después los que aún no tienen estadísticas, en su orden original;
+        al final los que no suelen alcanzar el umbral, por calidad media.
+        """
+        def clave(item):
+            posicion, (nombre, _) = item
+            stats = self.estadisticas_metodos.get(nombre)
+            if not stats or not stats['usos']:
+                return (1, posicion)
+            calidad_media = stats['calidad_total'] / stats['usos']
+            tiempo_medio = stats['tiempo_total'] / stats['usos']
+            if calidad_media >= self.umbral_suficiente:
+                return (0, tiempo_medio)
+            return (2, -calidad_media)
+
+        return [metodo for _, metodo in sorted(enumerate(metodos), key=clave)]
+
+    def _registrar_estadistica(self, nombre_metodo, segundos, calidad):
+        """Acumula tiempo y calidad obtenidos por un método"""
+        stats = self.estadisticas_metodos.setdefault(
+            nombre_metodo, {'usos': 0, 'tiempo_total': 0.0, 'calidad_total': 0}
+        )
+        stats['usos'] += 1
+        stats['tiempo_total'] += segundos
+        stats['calidad_total'] += calidad
+
+    def _extraer_por_costo(self, file_path, use_ocr=True):
+        """
+        Cascada con salida temprana: prueba los métodos más baratos primero y
+        se detiene en cuanto uno alcanza self.umbral_suficiente
+
+        Returns:
+            tuple: (contenido, calidad, metodo) del mejor resultado obtenido
+        """
+        print("\n=== PROCESAMIENTO POR COSTO DE PDF ===")
         
-        # Verificar si la calidad es muy baja y podemos mejorarla con IA
-        if mejor_calidad < 100 and self.use_ai and use_ai:
-            print(f"\nLa extracción ha alcanzado {mejor_calidad}% de calidad.")
-            print("Se pueden obtener mejores resultados usando servicios de IA.")
+        capa_texto = self._tiene_capa_texto(file_path)
+        metodos = self._metodos_extraccion(use_ocr)
+        ocr = [m for m in metodos if m[0] == 'OCR (Tesseract)']
+        texto = [m for m in metodos if m[0] != 'OCR (Tesseract)']
+        
+        if capa_texto:
+            print("📄 PDF digital: se omite el OCR")
+            metodos = self._ordenar_por_costo(texto)
+        elif ocr:
+            print("🖼️ Sin capa de texto: se usa OCR directamente")
+            metodos = ocr + self._ordenar_por_costo(texto)
+        else:
+            metodos = self._ordenar_por_costo(texto)
+        
+        mejor_contenido = None
+        mejor_calidad = 0
+        mejor_metodo = None
+        
+        for nombre_metodo, extractor in metodos:
+            print(f"\n📄 Intentando extracción con método: {nombre_metodo}...")
+            inicio = time.perf_counter()
+            try:
+                resultado = extractor(file_path)
+                resultado = self._normalizar_resultado(resultado, nombre_metodo) if resultado is not None else None
+            except Exception as e:
+                print(f"❌ Error al procesar archivo con {nombre_metodo}: {str(e)}")
+                resultado = None
             
-            if input("\n¿Desea intentar mejorar la extracción usando IA? (S/N): ").upper() == 'S':
-                intentos_ai = 0
-                while mejor_calidad < 100 and intentos_ai < max_intentos_ai:
-                    # Seleccionar API
-                    print("\nSeleccione la API de IA a usar:")
-                    print("1) Google Cloud Vision")
-                    print("2) Amazon Textract")
-                    
-                    api_seleccion = input("\nIngrese opción (0 para cancelar): ")
-                    
-                    if api_seleccion == '0':
-                        break
-                        
-                    if api_seleccion == '1':
-                        # Google Cloud Vision
-                        contenido_mejorado, nueva_calidad = self.usar_api_pdf_cloud_vision(file_path)
-                    elif api_seleccion == '2':
-                        # Amazon Textract
-                        contenido_mejorado, nueva_calidad = self.usar_api_pdf_textract(file_path)
-                    else:
-                        print("Opción no válida")
-                        continue
-                        
-                    # Si la calidad mejoró, actualizamos el resultado
-                    if contenido_mejorado and nueva_calidad > mejor_calidad:
-                        print(f"\n🚀 Calidad mejorada: {nueva_calidad}% (anterior: {mejor_calidad}%)")
-                        self._mostrar_barra_calidad(nueva_calidad, "CON IA")
-                        mejor_calidad = nueva_calidad
-                        mejor_contenido = contenido_mejorado
-                        self.content_quality = mejor_calidad
-                        
-                        # Mostrar vista previa
-                        print("\nVista previa del contenido extraído:")
-                        print("-" * 80)
-                        preview = mejor_contenido[:500] + "..." if len(mejor_contenido) > 500 else mejor_contenido
-                        print(preview)
-                        print("-" * 80)
-                    else:
-                        print(f"\n❌ No se logró mejorar la calidad de extracción con IA")
-                        
-                    intentos_ai += 1
+            calidad_actual = 0
+            if resultado and resultado[0] and resultado[0].strip():
+                contenido, metodo, base_quality = resultado
+                calidad_actual = self._evaluate_content_quality(contenido, base_quality)
+                self._mostrar_barra_calidad(calidad_actual, nombre_metodo)
+                if calidad_actual > mejor_calidad:
+                    mejor_contenido = contenido
+                    mejor_calidad = calidad_actual
+                    mejor_metodo = metodo
+            else:
+                print(f"❌ No se pudo extraer contenido con {nombre_metodo}")
+            
+            self._registrar_estadistica(nombre_metodo, time.perf_counter() - inicio, calidad_actual)
+            
+            if mejor_calidad >= self.umbral_suficiente:
+                print(f"\n✅ Calidad suficiente ({mejor_calidad}% >= {self.umbral_suficiente}%), se omiten los demás métodos")
+                break
         
-        print(f"\nCalidad final de extracción: {mejor_calidad}%")
-        return mejor_contenido, mejor_calidad
+        return mejor_contenido, mejor_calidad, mejor_metodo
 
     # Asegurar que el método _evaluate_content_quality esté correctamente definido
     def _evaluate_content_quality(self, content, base_quality):
@@ -804,7 +1206,7 @@ class PDFExtractor:
             text_parts = []
             with tempfile.TemporaryDirectory() as temp_dir:
                 print("\nConvirtiendo PDF a imágenes para procesamiento con Google Cloud Vision...")
-                images = convert_from_path(file_path)
+                images = pdf2image.convert_from_path(file_path)
                 
                 for i, image in enumerate(images, 1):
                     print(f"\nEnviando página {i}/{len(images)} a Google Cloud Vision API...")
@@ -5,6 +5,7 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from utils.advanced_content_analyzer import AdvancedContentAnalyzer
+from utils.catalogo_plantillas import obtener_catalogo
 from google.cloud import vision
 from google.oauth2 import service_account
 
@@ -55,10 +56,10 @@ class TemplateGenerator:
                 '.yml': 'YAML'
             }
             
-            # Buscar en la carpeta y subcarpetas
-            for ext, desc in extensiones.items():
-                found = list(codigos_path.rglob(f"*{ext}"))
-                archivos.extend((f, desc) for f in found)
+            # Buscar en la carpeta y subcarpetas (el catálogo evita releer archivos sin cambios)
+            catalogo = obtener_catalogo(codigos_path, recursivo=True)
+            for registro in catalogo.listar(extensiones=extensiones, incluir_errores=True):
+                archivos.append((registro['ruta'], extensiones[registro['extension']]))
 
             if not archivos:
                 print("\n❌ No se encontraron archivos en la carpeta de códigos")
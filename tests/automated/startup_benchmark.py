@@ -0,0 +1,102 @@
+"""
+Benchmark del arranque en frío de los puntos de entrada.
+
+Cada medición lanza un intérprete nuevo que solo importa el módulo de
+entrada (sin abrir el menú), de modo que se mide lo que tarda el usuario en
+llegar al menú. Además se listan las dependencias pesadas que se cargaron,
+para detectar importaciones que deberían diferirse.
+
+Uso:
+    python tests/automated/startup_benchmark.py [--repeticiones 5] [--json salida.json]
+"""
+from typing import Dict, Any, List
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+PUNTOS_DE_ENTRADA = ['main', 'unified_main', 'notefy', 'run']
+
+# Módulos que no deberían cargarse solo por arrancar
+DEPENDENCIAS_DIFERIDAS = [
+    'openpyxl', 'jsonschema', 'odf', 'pdfminer', 'PyPDF2', 'pytesseract',
+    'pdf2image', 'google.cloud.vision', 'tabulate', 'pyarrow.parquet'
+]
+
+# Un módulo diferido sigue siendo un _LazyModule hasta su primer uso (type() no lo carga)
+_SONDA = """
+import sys, time, importlib, json
+inicio = time.perf_counter()
+importlib.import_module({modulo!r})
+segundos = time.perf_counter() - inicio
+cargadas = [m for m in {diferidas!r}
+            if m in sys.modules and type(sys.modules[m]).__name__ == 'module']
+print(json.dumps({{'segundos': segundos, 'cargadas': cargadas}}))
+"""
+
+
+def medir_arranque(modulo: str, repeticiones: int = 5) -> Dict[str, Any]:
+    """
+    Mide el arranque en frío de un módulo de entrada
+
+    Returns:
+        dict: Tiempos de importación (mediana, mínimo, máximo), tiempo total
+              del proceso y dependencias pesadas cargadas
+    """
+    importaciones, procesos, cargadas = [], [], []
+    with tempfile.TemporaryDirectory() as cwd:  # Algunos módulos crean logs al importarse
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = subprocess.run(
+                [sys.executable, '-c', _SONDA.format(modulo=modulo, diferidas=DEPENDENCIAS_DIFERIDAS)],
+                cwd=cwd, capture_output=True, text=True,
+                env={**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)}
+            )
+            procesos.append(time.perf_counter() - inicio)
+            if resultado.returncode != 0:
+                return {'modulo': modulo, 'error': resultado.stderr.strip().splitlines()[-1:]}
+            datos = json.loads(resultado.stdout.strip().splitlines()[-1])
+            importaciones.append(datos['segundos'])
+            cargadas = datos['cargadas']
+
+    return {
+        'modulo': modulo,
+        'importacion_mediana': round(statistics.median(importaciones), 3),
+        'importacion_min': round(min(importaciones), 3),
+        'importacion_max': round(max(importaciones), 3),
+        'proceso_mediana': round(statistics.median(procesos), 3),
+        'dependencias_cargadas': cargadas
+    }
+
+
+def main(argv: List[str] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--json', type=Path, help='Guardar los resultados en un archivo JSON')
+    parser.add_argument('modulos', nargs='*', default=PUNTOS_DE_ENTRADA)
+    args = parser.parse_args(argv)
+
+    resultados = [medir_arranque(modulo, args.repeticiones) for modulo in args.modulos]
+
+    print(f"\n{'Entrada':<15}{'Import (s)':>12}{'Proceso (s)':>13}  Dependencias pesadas cargadas")
+    for r in resultados:
+        if 'error' in r:
+            print(f"{r['modulo']:<15}{'error':>12}{'':>13}  {r['error']}")
+            continue
+        print(f"{r['modulo']:<15}{r['importacion_mediana']:>12}{r['proceso_mediana']:>13}  "
+              f"{', '.join(r['dependencias_cargadas']) or '-'}")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2), encoding='utf-8')
+    return resultados
+
+
+if __name__ == '__main__':
+    main()
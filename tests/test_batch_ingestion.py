@@ -0,0 +1,48 @@
+import unittest
+import tempfile
+from pathlib import Path
+from ..core.batch_ingestion import IngestaLotePDF
+from .test_pdf_extractor import crear_pdf_prueba
+
+
+class TestIngestaLotePDF(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clinica = Path(self.temp_dir.name) / "clinica_prueba"
+        self.pacientes = self.clinica / "Facilitador" / "grupos" / "manana" / "pacientes"
+        self.pdfs = []
+        for paciente, tipo in [("ana_perez", "FARC"), ("luis_gomez", "BIO")]:
+            input_dir = self.pacientes / paciente / tipo / "input"
+            input_dir.mkdir(parents=True)
+            self.pdfs.append(crear_pdf_prueba(
+                input_dir / f"{tipo}.pdf",
+                [f"Documento {tipo} del paciente {paciente}", "Segunda pagina del documento"]
+            ))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_procesa_y_reanuda(self):
+        """Prueba que se generan las salidas y que una segunda ejecución no repite trabajo"""
+        ingesta = IngestaLotePDF(self.clinica, workers=2, usar_cache=False)
+        resumen = ingesta.ejecutar()
+
+        self.assertEqual(resumen['documentos'], 2)
+        self.assertEqual(resumen['paginas'], 4)
+        self.assertEqual(resumen['errores'], 0)
+        for pdf in self.pdfs:
+            self.assertEqual(len(list((pdf.parent.parent / "output").glob("*.json"))), 1)
+
+        self.assertEqual(IngestaLotePDF(self.clinica, workers=1).obtener_pendientes(), [])
+
+    def test_reprocesa_archivo_modificado(self):
+        """Prueba que un PDF modificado tras procesarse vuelve a quedar pendiente"""
+        IngestaLotePDF(self.clinica, workers=1, usar_cache=False).ejecutar()
+        crear_pdf_prueba(self.pdfs[0], ["Version corregida del documento con mas texto"])
+
+        pendientes = IngestaLotePDF(self.clinica, workers=1).obtener_pendientes()
+        self.assertEqual([p['pdf'] for p in pendientes], [str(self.pdfs[0])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import asyncio
+import time
+from pathlib import Path
+from ..utils.template_management.batch_processor import BatchProcessor
+
+
+def procesar_prueba(file_path, template_id):
+    """Procesador de prueba: 'lento' tarda, 'fallo' devuelve un error"""
+    nombre = Path(file_path).stem
+    if nombre.startswith('lento'):
+        time.sleep(2)
+    if nombre.startswith('medio'):
+        time.sleep(1)
+    if nombre.startswith('fallo'):
+        return {'error': 'documento ilegible'}
+    return {'nombre': nombre, 'template': template_id}
+
+
+class TestBatchProcessor(unittest.TestCase):
+    def test_resultados_en_streaming(self):
+        """Prueba que cada resultado se entrega a on_result y no se acumula"""
+        processor = BatchProcessor(batch_size=2, max_workers=2, procesador=procesar_prueba)
+        archivos = [Path(f"doc_{i}.pdf") for i in range(5)] + [Path("fallo_1.pdf")]
+        recibidos = []
+
+        resumen = asyncio.run(processor.process_batch(archivos, 'plantilla', on_result=recibidos.append))
+
+        self.assertEqual(resumen['processed'], 6)
+        self.assertEqual(resumen['successful'], 5)
+        self.assertEqual(resumen['errors'], [{'file': 'fallo_1.pdf', 'error': 'documento ilegible'}])
+        self.assertNotIn('results', resumen)
+        self.assertEqual(sorted(r['file'] for r in recibidos), sorted(str(a) for a in archivos))
+
+    def test_timeout_por_archivo(self):
+        """Prueba que un archivo lento se marca como timeout sin bloquear al resto"""
+        processor = BatchProcessor(batch_size=2, max_workers=2, timeout=0.5, procesador=procesar_prueba)
+
+        resumen = asyncio.run(processor.process_batch([Path("lento.pdf"), Path("doc.pdf")], 'plantilla'))
+
+        self.assertEqual(resumen['successful'], 1)
+        self.assertEqual(resumen['stats']['timeouts'], 1)
+        self.assertEqual(resumen['errors'][0]['file'], 'lento.pdf')
+
+    def test_timeout_no_cuenta_la_espera_en_el_pool(self):
+        """Prueba que con batch_size mayor que el pool los archivos en cola no agotan el tiempo"""
+        processor = BatchProcessor(batch_size=6, max_workers=2, timeout=1.6, procesador=procesar_prueba)
+        archivos = [Path(f"medio_{i}.pdf") for i in range(6)]
+
+        resumen = asyncio.run(processor.process_batch(archivos, 'plantilla'))
+
+        self.assertEqual(resumen['stats']['timeouts'], 0)
+        self.assertEqual(resumen['successful'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+from pathlib import Path
+import json
+import os
+import tempfile
+from ..utils import cache_plantillas
+from ..utils.cache_plantillas import CachePlantillas, descongelar
+from ..utils.template_management.storage_manager import StorageManager
+
+
+class TestCachePlantillas(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.cache = CachePlantillas(capacidad=2)
+        self.ruta = self._escribir('alta.json', {'nombre': 'alta', 'campos': [{'nombre': 'id'}]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _escribir(self, nombre, data):
+        ruta = self.dir / nombre
+        ruta.write_text(json.dumps(data), encoding='utf-8')
+        return ruta
+
+    def test_aciertos_sin_reanalizar(self):
+        """Prueba que la segunda lectura reutiliza la plantilla analizada"""
+        primera = self.cache.obtener(self.ruta)
+        with mock.patch.object(cache_plantillas, 'leer_plantilla') as leer:
+            segunda = self.cache.obtener(self.ruta)
+
+        leer.assert_not_called()
+        self.assertIs(primera, segunda)
+        self.assertEqual((self.cache.aciertos, self.cache.fallos), (1, 1))
+
+    def test_vista_inmutable(self):
+        """Prueba que los llamadores no pueden alterar la entrada compartida"""
+        vista = self.cache.obtener(self.ruta)
+        with self.assertRaises(TypeError):
+            vista['nombre'] = 'otra'
+        with self.assertRaises(TypeError):
+            vista['campos'][0]['nombre'] = 'otro'
+
+        copia = self.cache.obtener_copia(self.ruta)
+        copia['campos'].append({'nombre': 'fecha'})
+        self.assertEqual(len(self.cache.obtener(self.ruta)['campos']), 1)
+        self.assertEqual(descongelar(vista), {'nombre': 'alta', 'campos': [{'nombre': 'id'}]})
+
+    def test_invalidacion_por_cambio_en_disco(self):
+        """Prueba que editar el archivo invalida la entrada y un touch no"""
+        self.cache.obtener(self.ruta)
+        stat = self.ruta.stat()
+        os.utime(self.ruta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.cache.obtener(self.ruta)
+        self.assertEqual(self.cache.invalidaciones, 0)
+
+        self._escribir('alta.json', {'nombre': 'alta v2', 'campos': []})
+        self.assertEqual(self.cache.obtener(self.ruta)['nombre'], 'alta v2')
+        self.assertEqual(self.cache.invalidaciones, 1)
+
+    def test_expulsion_lru(self):
+        """Prueba que se expulsa la plantilla menos usada"""
+        otra = self._escribir('otra.json', {})
+        tercera = self._escribir('tercera.json', {})
+        self.cache.obtener(self.ruta)
+        self.cache.obtener(otra)
+        self.cache.obtener(self.ruta)
+        self.cache.obtener(tercera)
+
+        estadisticas = self.cache.estadisticas()
+        self.assertEqual((estadisticas['plantillas'], estadisticas['expulsiones']), (2, 1))
+        self.cache.obtener(self.ruta)
+        self.assertEqual(self.cache.estadisticas()['aciertos'], 2)
+
+    def test_storage_manager_ve_cambios(self):
+        """Prueba que StorageManager.retrieve no devuelve datos obsoletos tras store"""
+        storage = StorageManager(self.dir / 'storage')
+        storage.store('t1', {'name': 'uno'})
+        self.assertEqual(storage.retrieve('t1')['name'], 'uno')
+
+        storage.store('t1', {'name': 'dos'})
+        self.assertEqual(storage.retrieve('t1')['name'], 'dos')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+from pathlib import Path
+import json
+import os
+import sqlite3
+import tempfile
+from ..utils import catalogo_plantillas
+from ..utils.catalogo_plantillas import CatalogoPlantillas
+
+
+class TestCatalogoPlantillas(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self._escribir('alta.json', {'tipo': 'paciente', 'descripcion': 'Alta',
+                                     'campos': [{'nombre': 'id'}, {'nombre': 'fecha'}]})
+        (self.dir / 'notas.yaml').write_text("type: nota\ncampos:\n  texto: {}\n", encoding='utf-8')
+        self.catalogo = CatalogoPlantillas(self.dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _escribir(self, nombre, data):
+        (self.dir / nombre).write_text(json.dumps(data), encoding='utf-8')
+
+    def test_listado_con_metadatos(self):
+        """Prueba que el listado incluye tipo, campos y descripción de cada plantilla"""
+        plantillas = {p['archivo']: p for p in self.catalogo.listar()}
+
+        self.assertEqual(set(plantillas), {'alta.json', 'notas.yaml'})
+        self.assertEqual(plantillas['alta.json']['campos'], ['id', 'fecha'])
+        self.assertEqual(plantillas['alta.json']['tipo'], 'paciente')
+        self.assertEqual((plantillas['notas.yaml']['tipo'], plantillas['notas.yaml']['num_campos']), ('nota', 1))
+
+    def test_conexiones_cerradas(self):
+        """Prueba que actualizar y listar cierran su conexión a la base de datos"""
+        conexiones = []
+        conectar_original = sqlite3.connect
+
+        def conectar(*args, **kwargs):
+            conexiones.append(conectar_original(*args, **kwargs))
+            return conexiones[-1]
+
+        with mock.patch.object(catalogo_plantillas.sqlite3, 'connect', side_effect=conectar):
+            self.catalogo.listar()
+
+        self.assertEqual(len(conexiones), 2)
+        for conn in conexiones:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_segundo_listado_no_analiza(self):
+        """Prueba que un listado sin cambios no vuelve a leer ninguna plantilla"""
+        self.catalogo.listar()
+        with mock.patch.object(catalogo_plantillas, 'leer_plantilla') as leer:
+            plantillas = CatalogoPlantillas(self.dir).listar()
+
+        leer.assert_not_called()
+        self.assertEqual(len(plantillas), 2)
+        self.assertEqual(self.catalogo.ultima_actualizacion['nuevas'], 2)
+
+    def test_actualizacion_incremental(self):
+        """Prueba que solo se reindexan los archivos nuevos, modificados o eliminados"""
+        self.catalogo.actualizar()
+        self._escribir('alta.json', {'tipo': 'paciente', 'campos': ['id']})
+        self._escribir('baja.json', {'campos': {}})
+        (self.dir / 'notas.yaml').unlink()
+
+        resumen = self.catalogo.actualizar()
+
+        self.assertEqual(resumen, {'nuevas': 1, 'actualizadas': 1, 'sin_cambios': 0, 'eliminadas': 1})
+        alta = next(p for p in self.catalogo.listar() if p['nombre'] == 'alta')
+        self.assertEqual(alta['num_campos'], 1)
+
+    def test_mismo_contenido_no_reanaliza(self):
+        """Prueba que si cambia la fecha pero no el contenido se reutiliza el hash"""
+        self.catalogo.actualizar()
+        ruta = self.dir / 'alta.json'
+        os.utime(ruta, ns=(ruta.stat().st_atime_ns, ruta.stat().st_mtime_ns + 10**9))
+
+        with mock.patch.object(catalogo_plantillas, 'leer_plantilla') as leer:
+            resumen = self.catalogo.actualizar()
+
+        leer.assert_not_called()
+        self.assertEqual(resumen['sin_cambios'], 2)
+
+    def test_plantilla_invalida_se_omite(self):
+        """Prueba que un archivo corrupto no aparece en el listado pero queda registrado"""
+        (self.dir / 'rota.json').write_text('{no es json', encoding='utf-8')
+
+        self.assertNotIn('rota', [p['nombre'] for p in self.catalogo.listar()])
+        rota = [p for p in self.catalogo.listar(incluir_errores=True) if p['nombre'] == 'rota']
+        self.assertTrue(rota[0]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
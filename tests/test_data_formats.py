@@ -0,0 +1,52 @@
+import unittest
+import tempfile
+from pathlib import Path
+import pandas as pd
+from ..utils.data_formats import DataFormatHandler, pa
+
+
+@unittest.skipIf(pa is None, "pyarrow no está instalado")
+class TestFormatosColumnares(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.df = pd.DataFrame({
+            'id': [f"P{i:03d}" for i in range(6)],
+            'edad': [30, 41, 52, 63, 74, 85],
+            'genero': ['Masculino', 'Femenino'] * 3,
+            'estado_civil': ['Soltero', 'Casado', 'Viudo'] * 2,
+            'educacion': ['Primaria'] * 6
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_ida_y_vuelta(self):
+        """Prueba que Parquet y Feather conservan los valores y las columnas categóricas"""
+        for formato in DataFormatHandler.COLUMNAR_FORMATS:
+            ruta = self.base / f"pacientes{DataFormatHandler.SUPPORTED_FORMATS[formato]['ext']}"
+            self.assertTrue(DataFormatHandler.save_data(self.df, ruta, formato, compression='lz4'))
+
+            leido = DataFormatHandler.read_data(ruta)
+            self.assertIsInstance(leido['genero'].dtype, pd.CategoricalDtype)
+            self.assertEqual(leido.astype(str).values.tolist(), self.df.astype(str).values.tolist())
+
+    def test_codificacion_diccionario(self):
+        """Prueba que solo las columnas categóricas se guardan como diccionario"""
+        tabla = DataFormatHandler.to_arrow_table(self.df)
+
+        self.assertTrue(pa.types.is_dictionary(tabla.schema.field('estado_civil').type))
+        self.assertFalse(pa.types.is_dictionary(tabla.schema.field('id').type))
+
+    def test_proyeccion_columnas(self):
+        """Prueba que read_data carga solo las columnas pedidas"""
+        ruta = self.base / "pacientes.parquet"
+        DataFormatHandler.save_data(self.df, ruta, 'parquet')
+
+        leido = DataFormatHandler.read_data(ruta, columns=['id', 'edad'])
+        self.assertEqual(list(leido.columns), ['id', 'edad'])
+        self.assertEqual(len(leido), len(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import random
+import pandas as pd
+from ..utils.template_management.data_normalizer import DataNormalizer
+
+FECHAS = ['2024-03-05', '05/03/2024', '2024/03/05', '2024-3-5', '5/3/2024', ' 2024-03-05',
+          '2024-02-30', '0999-01-01', '01/02/2024', 'no es fecha', '', '2500-01-01']
+NUMEROS = ['1.234', '$ 1,500.50', '-7', '.5', '5.', '1.2.3', 'abc', '1-2', '٣', '']
+TEXTOS = ['  Ana   Pérez ', 'Luis\tGómez\n', 'x y', '', '   ']
+TIPOS = {'fecha': 'date', 'monto': 'number', 'nombre': 'text', 'codigo': 'code'}
+
+
+class TestNormalizacionTabular(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = DataNormalizer()
+        rng = random.Random(11)
+        filas = 400
+        self.df = pd.DataFrame({
+            'fecha': [rng.choice(FECHAS + [None, 20240305]) for _ in range(filas)],
+            'monto': [rng.choice(NUMEROS + [None, 3, 2.5, True]) for _ in range(filas)],
+            'nombre': [rng.choice(TEXTOS + [None, 12, 1.0]) for _ in range(filas)],
+            'codigo': [rng.choice(['ab 12', ' x-1 ', None, 7]) for _ in range(filas)],
+            'extra': [rng.choice(['  a  b ', 3]) for _ in range(filas)]
+        }, dtype=object)
+
+    def _escalar(self, columna, tipo):
+        return [self.normalizer.normalize_field(v, tipo) for v in self.df[columna].tolist()]
+
+    def test_igual_que_ruta_escalar(self):
+        """Prueba que la normalización por columnas coincide celda a celda con normalize_field"""
+        resultado = self.normalizer.normalize_document(self.df, TIPOS)['data']
+
+        for columna in self.df.columns:
+            esperado = self._escalar(columna, TIPOS.get(columna, 'text'))
+            obtenido = resultado[columna].tolist()
+            for e, o in zip(esperado, obtenido):
+                if e is None or e != e:
+                    self.assertTrue(pd.isna(o), (columna, e, o))
+                else:
+                    self.assertEqual(e, o, columna)
+
+    def test_conteo_de_fallos(self):
+        """Prueba que se cuentan los valores no nulos que no se pudieron normalizar"""
+        resultado = self.normalizer.normalize_dataframe(self.df, TIPOS)
+
+        fallos_fecha = sum(1 for v in self.df['fecha'] if v is not None and
+                           self.normalizer.normalize_field(v, 'date') is None)
+        self.assertEqual(resultado['failures']['fecha'], fallos_fecha)
+        self.assertEqual(resultado['failures']['nombre'], 0)
+        self.assertGreater(resultado['failures']['monto'], 0)
+
+    def test_prioridad_de_formatos(self):
+        """Prueba que se respeta el orden de date_formats cuando varios aplican"""
+        self.normalizer.date_formats = ['%m/%d/%Y', '%d/%m/%Y']
+        df = pd.DataFrame({'fecha': ['03/04/2024', '25/04/2024']})
+
+        resultado = self.normalizer.normalize_dataframe(df, {'fecha': 'date'})['data']
+
+        self.assertEqual(resultado['fecha'].tolist(), ['2024-03-04', '2024-04-25'])
+
+    def test_columnas_numericas(self):
+        """Prueba columnas ya numéricas y de tipo str de pandas"""
+        df = pd.DataFrame({'n': [1, 2, 3], 's': pd.Series(['a  b', None, 'c'], dtype='str')})
+
+        resultado = self.normalizer.normalize_dataframe(df, {'n': 'number', 's': 'code'})['data']
+
+        self.assertEqual(resultado['n'].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(resultado['s'].tolist(), ['AB', 'NAN', 'C'])
+
+
+if __name__ == '__main__':
+    unittest.main()
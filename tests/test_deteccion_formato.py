@@ -0,0 +1,101 @@
+import unittest
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+import openpyxl
+import pandas as pd
+from ..utils import deteccion_formato
+from ..utils.deteccion_formato import detectar_formato, info_cache, limpiar_cache
+from ..utils.data_formats import DataFormatHandler, pa
+from ..lector_archivos.lector import LectorArchivos
+
+
+class TestDeteccionFormato(unittest.TestCase):
+    def setUp(self):
+        limpiar_cache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _archivo(self, nombre, contenido):
+        ruta = self.base / nombre
+        if isinstance(contenido, str):
+            contenido = contenido.encode('utf-8')
+        ruta.write_bytes(contenido)
+        return ruta
+
+    def test_contenido_sobre_extension(self):
+        """Prueba que el formato sale del contenido aunque la extensión no ayude"""
+        casos = {
+            'datos.dat': ("id;nombre\n1;Ana\n2;Luis\n", 'csv', ';'),
+            'datos.txt': ("id\tnombre\n1\tAna\n2\tLuis\n", 'tsv', '\t'),
+            'export.txt': ('{"id": 1}\n{"id": 2}\n', 'jsonl', None),
+            'lista.data': ('[{"id": 1},\n {"id": 2}]', 'json', None),
+            'hce.csv': ('<?xml version="1.0"?><datos><fila/></datos>', 'xml', None),
+            'informe.bin': (b'%PDF-1.7\n', 'pdf', None),
+        }
+        for nombre, (contenido, formato, delimitador) in casos.items():
+            deteccion = detectar_formato(self._archivo(nombre, contenido))
+            self.assertEqual((deteccion['formato'], deteccion['delimitador']), (formato, delimitador), nombre)
+
+    def test_firmas_binarias(self):
+        """Prueba Excel y Parquet por su firma"""
+        libro = openpyxl.Workbook()
+        libro.active.append(['id'])
+        libro.save(self.base / "libro.bin")
+        self.assertEqual(detectar_formato(self.base / "libro.bin")['formato'], 'xlsx')
+
+        if pa is not None:
+            pd.DataFrame({'id': [1]}).to_parquet(self.base / "tabla.bin")
+            self.assertEqual(detectar_formato(self.base / "tabla.bin")['origen'], 'firma')
+
+    def test_cache_por_mtime(self):
+        """Prueba que la detección se reutiliza hasta que el archivo cambia"""
+        ruta = self._archivo("datos.csv", "a,b\n1,2\n")
+        detectar_formato(ruta)
+        detectar_formato(ruta)
+        self.assertEqual((info_cache().hits, info_cache().misses), (1, 1))
+
+        ruta.write_text("a;b\n1;2\n", encoding='utf-8')
+        os.utime(ruta, ns=(0, ruta.stat().st_mtime_ns + 10**9))
+        self.assertEqual(detectar_formato(ruta)['delimitador'], ';')
+
+    def test_muestra_acotada(self):
+        """Prueba que solo se lee el inicio de un archivo grande"""
+        ruta = self._archivo("grande.csv", "id,nombre\n" + "".join(f"{i},P{i}\n" for i in range(200_000)))
+        with mock.patch.object(deteccion_formato, 'TAMANO_MUESTRA', 4096):
+            deteccion = detectar_formato(ruta)
+        self.assertEqual((deteccion['formato'], deteccion['delimitador']), ('csv', ','))
+
+
+class TestLecturaConDeteccion(unittest.TestCase):
+    def setUp(self):
+        limpiar_cache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ruta = Path(self.temp_dir.name) / "pacientes.txt"
+        self.ruta.write_text("id,nombre,notas\n1,Ana,alergia; polen\n2,Luis,\n", encoding='utf-8')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_archivo_mixto_un_solo_lector(self):
+        """Prueba que un CSV se lee sin intentar antes JSON ni XML"""
+        lector = LectorArchivos()
+        with mock.patch.object(LectorArchivos, 'leer_json') as leer_json, \
+             mock.patch.object(LectorArchivos, 'leer_xml') as leer_xml:
+            df = lector.leer_archivo_mixto(self.ruta)
+        leer_json.assert_not_called()
+        leer_xml.assert_not_called()
+        self.assertEqual(list(df.columns), ['id', 'nombre', 'notas'])
+
+    def test_read_data_delimitador(self):
+        """Prueba que un ';' dentro de un campo no cambia el delimitador"""
+        df = DataFormatHandler.read_data(self.ruta, columns=['id', 'notas'])
+        self.assertEqual(df['notas'].iloc[0], 'alergia; polen')
+
+
+if __name__ == '__main__':
+    unittest.main()
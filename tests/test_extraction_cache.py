@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+import sqlite3
+import tempfile
+from pathlib import Path
+from ..pdf_extractor import extraction_cache
+from ..pdf_extractor.extraction_cache import ExtractionCache
+from ..pdf_extractor.pdf_extractor import PDFExtractor
+from .test_pdf_extractor import crear_pdf_prueba
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.pdf = crear_pdf_prueba(self.base / "documento.pdf", ["Texto original del documento"])
+        self.cache = ExtractionCache(self.base / ".cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_guardar_y_obtener(self):
+        """Prueba que una extracción guardada se recupera con la misma configuración"""
+        self.assertIsNone(self.cache.obtener(self.pdf, 'secuencial', {'ocr': False}))
+        self.cache.guardar(self.pdf, 'secuencial', {'ocr': False}, "texto", 85, "PDFMiner")
+
+        entrada = self.cache.obtener(self.pdf, 'secuencial', {'ocr': False})
+        self.assertEqual((entrada['texto'], entrada['calidad'], entrada['metodo']), ("texto", 85, "PDFMiner"))
+        self.assertIsNone(self.cache.obtener(self.pdf, 'secuencial', {'ocr': True}))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_conexiones_cerradas(self):
+        """Prueba que cada operación cierra su conexión a la base de datos"""
+        conexiones = []
+        conectar_original = sqlite3.connect
+
+        def conectar(*args, **kwargs):
+            conexiones.append(conectar_original(*args, **kwargs))
+            return conexiones[-1]
+
+        with mock.patch.object(extraction_cache.sqlite3, 'connect', side_effect=conectar):
+            cache = ExtractionCache(self.base / ".cache_conexiones")
+            cache.guardar(self.pdf, 'secuencial', {}, "texto", 85, "PDFMiner")
+            cache.obtener(self.pdf, 'secuencial', {})
+            cache.estadisticas()
+            cache.limpiar()
+
+        self.assertEqual(len(conexiones), 5)
+        for conn in conexiones:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_invalidacion_al_cambiar_archivo(self):
+        """Prueba que modificar el PDF invalida las extracciones anteriores"""
+        self.cache.guardar(self.pdf, 'secuencial', {}, "texto", 85, "PDFMiner")
+        crear_pdf_prueba(self.pdf, ["Contenido distinto tras la edicion"])
+
+        self.assertIsNone(self.cache.obtener(self.pdf, 'secuencial', {}))
+        self.assertEqual(self.cache.estadisticas()['entradas'], 0)
+
+    def test_desalojo_lru(self):
+        """Prueba que al superar el tamaño máximo se elimina la entrada menos usada"""
+        cache = ExtractionCache(self.base / ".cache_lru", max_mb=2500 / (1024 * 1024))
+        cache.guardar(self.pdf, 'a', {}, "x" * 1000, 80, "a")
+        cache.guardar(self.pdf, 'b', {}, "x" * 1000, 80, "b")
+        cache.obtener(self.pdf, 'a', {})  # 'a' pasa a ser la más reciente
+        cache.guardar(self.pdf, 'c', {}, "x" * 1000, 80, "c")
+
+        self.assertIsNotNone(cache.obtener(self.pdf, 'a', {}))
+        self.assertIsNone(cache.obtener(self.pdf, 'b', {}))
+        self.assertIsNotNone(cache.obtener(self.pdf, 'c', {}))
+
+    def test_leer_pdf_reutiliza_cache(self):
+        """Prueba que leer_pdf no vuelve a extraer un PDF ya procesado"""
+        extractor = PDFExtractor()
+        extractor.ocr_enabled = False
+        extractor.usar_cache(self.base / ".cache")
+        primero = extractor.leer_pdf(self.pdf)
+
+        extractor._extraer_secuencial = lambda *args, **kwargs: self.fail("Se volvió a extraer el PDF")
+        segundo = extractor.leer_pdf(self.pdf)
+
+        self.assertEqual(primero, segundo)
+        self.assertEqual(extractor.cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+import random
+from ..utils.template_management.field_index import FieldIndex
+from ..utils.template_management import field_matcher, pdf_template_mapper
+
+PALABRAS = ['first', 'last', 'name', 'date', 'birth', 'fecha', 'codigo', 'id',
+            'direccion', 'telefono', 'paciente', 'ingreso', 'alta', 'dx', 'a']
+TIPOS = ['string', 'date', 'number', None]
+
+
+def _campos(rng, cantidad):
+    campos = {}
+    while len(campos) < cantidad:
+        nombre = '_'.join(rng.sample(PALABRAS, rng.randint(1, 3)))
+        if rng.random() < 0.2:
+            nombre = nombre.replace('_', '')
+        campos[nombre] = {
+            'type': rng.choice(TIPOS),
+            'format': rng.choice([None, 'YYYY-MM-DD']),
+            'validators': rng.sample(['required', 'max:50', 'min:1'], rng.randint(0, 2)),
+            'value': nombre.upper()
+        }
+    return campos
+
+
+class TestFieldIndex(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(7)
+        # FieldAnalyzer no interviene en el emparejamiento
+        patcher_matcher = mock.patch.object(field_matcher, 'FieldAnalyzer')
+        patcher_mapper = mock.patch.object(pdf_template_mapper, 'FieldAnalyzer')
+        patcher_matcher.start()
+        patcher_mapper.start()
+        self.addCleanup(patcher_matcher.stop)
+        self.addCleanup(patcher_mapper.stop)
+        self.matcher = field_matcher.FieldMatcher()
+        self.mapper = pdf_template_mapper.PDFTemplateMapper()
+
+    def test_candidatos_por_palabra_y_contencion(self):
+        """Prueba que solo se proponen campos con palabras o texto en común"""
+        index = FieldIndex({'fecha_alta': {}, 'codigo': {}, 'fechanacimiento': {}, 'id': {}},
+                           lambda n: n.replace('_', ' '))
+
+        self.assertEqual(index.candidates('fecha ingreso'), [0])
+        self.assertEqual(index.candidates('nacimiento', containment=True), [2, 3])
+        self.assertEqual(index.candidates('id', containment=True), [3])
+
+    def test_find_matches_igual_que_fuerza_bruta(self):
+        """Prueba que FieldMatcher elige las mismas coincidencias que comparando todo"""
+        for _ in range(5):
+            pdf_fields = _campos(self.rng, 60)
+            template_fields = _campos(self.rng, 30)
+
+            resultado = self.matcher.find_matches(pdf_fields, template_fields)
+
+            for template_name, template_info in template_fields.items():
+                scores = [(self.matcher._calculate_field_similarity(template_name, template_info, p, info), p)
+                          for p, info in pdf_fields.items()]
+                mejor = max(scores, key=lambda x: x[0])
+                if mejor[0] >= 0.5:
+                    self.assertEqual(resultado['matches'][template_name]['pdf_field'], mejor[1])
+                    self.assertEqual(resultado['matches'][template_name]['confidence'], round(mejor[0] * 100, 2))
+                else:
+                    self.assertIn(template_name, resultado['unmatched_template_fields'])
+
+    def test_mapper_igual_que_fuerza_bruta(self):
+        """Prueba que PDFTemplateMapper elige la misma correspondencia que comparando todo"""
+        for _ in range(5):
+            pdf_fields = _campos(self.rng, 60)
+            template_fields = _campos(self.rng, 30)
+
+            resultado = self.mapper.analyze_correspondence({'fields': pdf_fields}, {'campos': template_fields})
+
+            for template_name, template_info in template_fields.items():
+                mejor, mejor_score = None, 0.0
+                for p, info in pdf_fields.items():
+                    score = self.mapper._calculate_field_similarity(template_name, template_info, p, info)
+                    if score > mejor_score:
+                        mejor, mejor_score = p, score
+                esperado = resultado['mapping_result'].get(template_name, {}).get('pdf_field')
+                self.assertEqual(esperado, mejor)
+
+    def test_alternativas_top_k(self):
+        """Prueba que se conservan las alternativas ordenadas por confianza"""
+        pdf_fields = {'fecha': {'type': 'date'}, 'fecha_alta': {'type': 'date'}, 'codigo': {}}
+        resultado = self.matcher.find_matches(pdf_fields, {'fecha_alta': {'type': 'date'}}, top_k=2)
+
+        match = resultado['matches']['fecha_alta']
+        self.assertEqual(match['pdf_field'], 'fecha_alta')
+        self.assertEqual([a['pdf_field'] for a in match['alternatives']], ['fecha'])
+
+
+if __name__ == '__main__':
+    unittest.main()
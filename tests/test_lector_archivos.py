@@ -0,0 +1,338 @@
+import unittest
+import tempfile
+import json
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+import openpyxl
+import pandas as pd
+from jsonschema import ValidationError
+from ..lector_archivos import lector as lector_modulo
+from ..lector_archivos.lector import LectorArchivos
+
+
+class TestLecturaCSV(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+
+        filas = [f"P{i:04d};Paciente {i};{20 + i % 60};Peña" for i in range(2500)]
+        self.ruta = self.base / "pacientes.csv"
+        self.ruta.write_bytes(("id;nombre;edad;apellido\n" + "\n".join(filas) + "\n").encode('latin-1'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_detecta_codificacion_y_delimitador(self):
+        """Prueba que la muestra basta para detectar latin-1 y el punto y coma"""
+        self.assertEqual(self.lector.detectar_formato_csv(self.ruta), ('latin-1', ';'))
+
+        df = self.lector.leer_csv(self.ruta)
+        self.assertEqual(len(df), 2500)
+        self.assertEqual(df['apellido'].iloc[0], 'Peña')
+
+    def test_lectura_por_bloques(self):
+        """Prueba que los bloques respetan el tamaño, usecols y dtype"""
+        bloques = list(self.lector.leer_csv(self.ruta, tamano_bloque=1000,
+                                            usecols=['id', 'edad'], dtype={'edad': 'int16'}))
+
+        self.assertEqual([len(b) for b in bloques], [1000, 1000, 500])
+        self.assertEqual(list(bloques[0].columns), ['id', 'edad'])
+        self.assertEqual(bloques[0]['edad'].dtype, 'int16')
+        completo = pd.concat(bloques, ignore_index=True)
+        self.assertEqual(completo['id'].iloc[-1], 'P2499')
+
+    def test_byte_invalido_fuera_de_la_muestra(self):
+        """Prueba que un byte inválido tras la muestra no impide leer el archivo"""
+        ruta = self.base / "grande.csv"
+        relleno = "".join(f"{i},Paciente {i}\n" for i in range(10000))
+        ruta.write_bytes(("id,nombre\n" + relleno).encode('utf-8') + "99999,Peña\n".encode('latin-1'))
+        self.assertGreater(ruta.stat().st_size, LectorArchivos.TAMANO_MUESTRA_CSV)
+
+        df = self.lector.leer_csv(ruta)
+        self.assertEqual(df['nombre'].iloc[-1], 'Peña')
+        bloques = list(self.lector.leer_csv(ruta, tamano_bloque=4000))
+        self.assertEqual(sum(len(b) for b in bloques), 10001)
+
+    def test_codificacion_distinta_tras_la_muestra_por_bloques(self):
+        """Prueba que los bloques se releen con otra codificación en vez de reemplazar bytes"""
+        ruta = self.base / "cp1252.csv"
+        relleno = "".join(f"{i},Paciente {i}\n" for i in range(10000))
+        ruta.write_bytes(("id,nombre\n" + relleno + "99999,José Pérez\n").encode('cp1252'))
+        self.assertGreater(len(relleno), LectorArchivos.TAMANO_MUESTRA_CSV)
+
+        bloques = list(self.lector.leer_csv(ruta, tamano_bloque=5000))
+        completo = pd.concat(bloques)
+        self.assertEqual(len(completo), 10001)
+        self.assertEqual(completo['nombre'].iloc[-1], 'José Pérez')
+        self.assertEqual(completo.index.tolist(), list(range(10001)))
+
+        with self.assertLogs(lector_modulo.__name__, level='WARNING') as registro:
+            bloques = list(self.lector.leer_csv(ruta, tamano_bloque=5000, encoding_errors='replace'))
+        self.assertEqual(bloques[-1]['nombre'].iloc[-1], 'Jos\ufffd P\ufffdrez')
+        self.assertIn('2 bytes', registro.output[-1])
+
+    def test_csv_con_bom(self):
+        """Prueba que un CSV exportado con BOM UTF-8 se lee completo y por bloques"""
+        ruta = self.base / "bom.csv"
+        ruta.write_bytes(b'\xef\xbb\xbfa,b\n1,2\n3,4\n')
+
+        df = self.lector.leer_csv(ruta)
+        self.assertEqual(list(df.columns), ['a', 'b'])
+        self.assertEqual(df['b'].tolist(), [2, 4])
+        bloques = list(self.lector.leer_csv(ruta, tamano_bloque=1))
+        self.assertEqual([list(b.columns) for b in bloques], [['a', 'b'], ['a', 'b']])
+        self.assertEqual(pd.concat(bloques)['a'].tolist(), [1, 3])
+
+
+class TestLecturaExcel(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ruta = Path(self.temp_dir.name) / "centro.xlsx"
+
+        workbook = openpyxl.Workbook()
+        hoja = workbook.active
+        hoja.append(['id', 'adherencia', 'notas'])
+        for i in range(1, 6):
+            hoja.append([i, i * 10, f"nota {i}"])
+            hoja.cell(row=i + 1, column=2).number_format = '0%'
+        hoja.row_dimensions[3].hidden = True
+        hoja.column_dimensions['C'].hidden = True
+        workbook.save(self.ruta)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _leer_contando_cargas(self, **kwargs):
+        with mock.patch('openpyxl.load_workbook', wraps=openpyxl.load_workbook) as carga:
+            df = self.lector.leer_excel(self.ruta, **kwargs)
+        return df, carga.call_count
+
+    def test_una_sola_carga(self):
+        """Prueba que formatos, ocultos y valores salen de una única carga del libro"""
+        df, cargas = self._leer_contando_cargas(parse_formats=True, ignore_hidden=True)
+
+        self.assertEqual(cargas, 1)
+        self.assertEqual(list(df['id']), [1, 3, 4, 5])
+        self.assertNotIn('notas', df.columns)
+        self.assertAlmostEqual(df['adherencia'].iloc[0], 0.1)
+
+    def test_via_rapida_read_only(self):
+        """Prueba que read_only no aplica formatos ni filtra ocultos"""
+        df, cargas = self._leer_contando_cargas(read_only=True, ignore_hidden=True)
+
+        self.assertEqual(cargas, 1)
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df['adherencia'].iloc[0], 10)
+
+
+class TestNormalizacionJSON(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.registros = [
+            {'id': 1, 'contacto': {'ciudad': 'Lima', 'telefono': {'movil': '999'}},
+             'alergias': ['polen', 'nueces'],
+             'visitas': [{'fecha': '2024-01-02', 'diagnosticos': [{'codigo': 'J01'}, {'codigo': 'R05'}]},
+                         {'fecha': '2024-02-10'}],
+             'recetas': [{'farmaco': 'Ibuprofeno'}]},
+            {'id': 2, 'contacto': {'ciudad': 'Quito'}, 'alergias': [],
+             'visitas': [{'fecha': '2024-03-05', 'diagnosticos': [{'codigo': 'E11'}]}]}
+        ]
+
+    def test_todas_las_tablas_hijas(self):
+        """Prueba que cada lista de diccionarios, a cualquier nivel, genera su tabla hija"""
+        resultado = self.lector.normalizar_json_tablas(self.registros)
+        principal, hijas = resultado['main'], resultado['expanded']
+
+        self.assertEqual(sorted(hijas), ['recetas', 'visitas', 'visitas.diagnosticos'])
+        self.assertEqual(principal['contacto.telefono.movil'].iloc[0], '999')
+        self.assertTrue(pd.isna(principal['contacto.telefono.movil'].iloc[1]))
+        self.assertEqual(principal['alergias'].iloc[0], '["polen", "nueces"]')
+        self.assertNotIn('visitas', principal.columns)
+        self.assertTrue(pd.isna(principal['meta_recetas_json'].iloc[1]))
+
+        visitas = hijas['visitas']
+        self.assertEqual(list(visitas['__original_index']), [0, 0, 1])
+        self.assertEqual(list(visitas['meta_source_column']), ['visitas'] * 3)
+        diagnosticos = hijas['visitas.diagnosticos']
+        # Los diagnósticos enlazan con la fila de su visita, no con el paciente
+        self.assertEqual(list(diagnosticos['__original_index']), [0, 0, 2])
+        self.assertEqual(list(diagnosticos['codigo']), ['J01', 'R05', 'E11'])
+
+    def test_dataframe_conserva_indice(self):
+        """Prueba que desde un DataFrame se conserva su índice y se respeta ignore_columns"""
+        df = pd.DataFrame(self.registros, index=[10, 20])
+        resultado = self.lector._normalizar_dataframe_json_avanzado(
+            df, {'ignore_columns': ['contacto'], 'return_expanded': True}
+        )
+
+        self.assertEqual(list(resultado['main'].index), [10, 20])
+        self.assertEqual(resultado['main']['contacto'].iloc[1], {'ciudad': 'Quito'})
+        self.assertEqual(list(resultado['expanded']['recetas']['__original_index']), [10])
+
+        principal = self.lector._normalizar_dataframe_json_avanzado(df, {'max_depth': 1})
+        self.assertEqual(principal['contacto.telefono'].iloc[0], {'movil': '999'})
+
+
+class TestLecturaJSONL(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ruta = Path(self.temp_dir.name) / "recetas.jsonl"
+        self.schema = {
+            'type': 'object',
+            'properties': {'id': {'type': 'integer'}, 'farmaco': {'type': 'string'}},
+            'required': ['id', 'farmaco']
+        }
+
+        lineas = [json.dumps({'id': i, 'farmaco': f"Fármaco {i}"}, ensure_ascii=False) for i in range(25)]
+        lineas[7] = '{"id": 7, "farmaco": '       # JSON truncado
+        lineas[12] = '{"id": "doce", "farmaco": "X"}'  # No cumple el esquema
+        lineas.insert(3, '')
+        self.ruta.write_text("\n".join(lineas) + "\n", encoding='utf-8')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _leer(self):
+        resumen = {}
+        bloques = list(self.lector.leer_jsonl(self.ruta, self.schema, tamano_bloque=10, resumen=resumen))
+        return bloques, resumen
+
+    def test_bloques_y_archivo_de_errores(self):
+        """Prueba que los registros válidos salen en bloques y los inválidos van al archivo lateral"""
+        bloques, resumen = self._leer()
+
+        self.assertEqual([len(b) for b in bloques], [10, 10, 3])
+        self.assertEqual(list(bloques[2].index), [20, 21, 22])
+        self.assertEqual(bloques[0]['farmaco'].iloc[0], 'Fármaco 0')
+        self.assertEqual((resumen['lineas'], resumen['validos'], resumen['errores']), (25, 23, 2))
+
+        errores = [json.loads(l) for l in Path(resumen['ruta_errores']).read_text(encoding='utf-8').splitlines()]
+        self.assertEqual([e['linea'] for e in errores], [9, 14])
+        self.assertIn('JSON inválido', errores[0]['error'])
+        self.assertTrue(errores[1]['error'].startswith('id:'))
+
+    def test_sin_orjson_y_validador_cacheado(self):
+        """Prueba que el parser estándar da el mismo resultado y el validador se reutiliza"""
+        con_orjson, _ = self._leer()
+        with mock.patch('jsonschema.Draft7Validator.check_schema') as compilar:
+            with mock.patch.object(lector_modulo, 'orjson', None):
+                sin_orjson, resumen = self._leer()
+        self.assertEqual(compilar.call_count, 0)
+        pd.testing.assert_frame_equal(pd.concat(con_orjson), pd.concat(sin_orjson))
+        self.assertEqual(resumen['errores'], 2)
+
+    def test_leer_json_y_validar_lineas(self):
+        """Prueba la ruta JSON Lines de leer_json y la validación por líneas"""
+        registros = self.lector.leer_json(self.ruta, self.schema)
+        self.assertEqual(len(registros), 23)
+        self.assertTrue(self.lector.validar_datos_json(registros, self.schema, is_lines=True))
+        with self.assertRaises(ValidationError):
+            self.lector.validar_datos_json([{'id': 'x'}], self.schema, is_lines=True)
+
+
+class TestLecturaXML(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _escribir(self, nombre, registros, envoltorio=True):
+        ruta = self.base / nombre
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write('<export xmlns="urn:hce"><cabecera><fecha>2024-05-01</fecha></cabecera>')
+            if envoltorio:
+                f.write('<pacientes>')
+            for i in range(registros):
+                f.write(f'<paciente><id>P{i}</id><nombre>Paciente {i}</nombre><edad>{i % 90}</edad></paciente>')
+            if envoltorio:
+                f.write('</pacientes>')
+            f.write('</export>')
+        return ruta
+
+    def test_bloques_por_etiqueta(self):
+        """Prueba que la etiqueta elegida ignora el espacio de nombres y otras secciones"""
+        ruta = self._escribir("export.xml", 2500)
+        bloques = list(self.lector.leer_xml(ruta, tag_registro='paciente', tamano_bloque=1000))
+
+        self.assertEqual([len(b) for b in bloques], [1000, 1000, 500])
+        self.assertEqual(list(bloques[2].index[[0, -1]]), [2000, 2499])
+        self.assertEqual(bloques[2]['{urn:hce}id'].iloc[-1], 'P2499')
+
+    def test_hijos_de_la_raiz_por_defecto(self):
+        """Prueba que sin etiqueta cada hijo directo de la raíz es un registro"""
+        ruta = self.base / "simple.xml"
+        ruta.write_text('<datos><fila><a>1</a><b>x</b></fila><fila><a>2</a></fila></datos>', encoding='utf-8')
+
+        df = self.lector.leer_xml(ruta)
+        self.assertEqual(list(df['a']), ['1', '2'])
+        self.assertTrue(pd.isna(df['b'].iloc[1]))
+
+    def test_memoria_constante(self):
+        """Prueba que la memoria máxima no crece con el número de registros"""
+        def pico(registros):
+            ruta = self._escribir(f"export_{registros}.xml", registros)
+            tracemalloc.start()
+            for _ in self.lector.leer_xml(ruta, tag_registro='paciente', tamano_bloque=500):
+                pass
+            _, maximo = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return maximo
+
+        self.assertLess(pico(40_000), pico(4_000) * 2)
+
+
+class TestProcesarLoteParalelo(unittest.TestCase):
+    def setUp(self):
+        self.lector = LectorArchivos()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.output = self.base / "output"
+
+        self.archivos = []
+        for nombre in ["pacientes_norte.csv", "pacientes_sur.csv", "FARC_enero.csv"]:
+            ruta = self.base / nombre
+            ruta.write_text("id,nom\n1,Ana\n2,Luis\n", encoding='utf-8')
+            self.archivos.append(ruta)
+        roto = self.base / "pacientes_roto.xlsx"
+        roto.write_text("no es un excel", encoding='utf-8')
+        self.archivos.append(roto)
+
+        self.ruta_decisiones = self.base / "decisiones.json"
+        LectorArchivos.guardar_decisiones_estructura(
+            {'pacientes': {'aceptar': True, 'renombrar': {'nom': 'nombre'}, 'formato': 'json'}},
+            self.ruta_decisiones
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lote_desatendido(self):
+        """Prueba que se aplican las decisiones guardadas y se informan tiempos y errores"""
+        aceptados = []
+        resumen = self.lector.procesar_lote_paralelo(
+            self.archivos, self.output, clinic_initials='CMT', decisiones=self.ruta_decisiones,
+            workers=2, post_hooks=[lambda ruta, estructura: aceptados.append(ruta)]
+        )
+
+        estados = [r['estado'] for r in resumen['archivos']]
+        self.assertEqual(estados, ['ok', 'ok', 'sin_decision', 'error'])
+        self.assertEqual((resumen['procesados'], resumen['errores']), (2, 1))
+        self.assertEqual(len(aceptados), 2)
+
+        primero = resumen['archivos'][0]
+        self.assertEqual([c['nombre'] for c in primero['estructura']], ['id', 'nombre'])
+        self.assertTrue(Path(primero['documentacion']).exists())
+        self.assertNotEqual(primero['documentacion'], resumen['archivos'][1]['documentacion'])
+        self.assertIn('total', resumen['archivos'][3]['tiempos'])
+        self.assertTrue(resumen['archivos'][3]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
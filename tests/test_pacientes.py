@@ -0,0 +1,150 @@
+import unittest
+import json
+import tempfile
+from pathlib import Path
+import pandas as pd
+from ..pacientes.pacientes import ExportadorPacientes, GeneradorPacientes, PYARROW_AVAILABLE, pq
+from ..utils.plan_generacion import PlanGeneracion
+from ..BIO.bios import ExportadorBIO, GeneradorBIO
+
+
+class TestGeneracionMasiva(unittest.TestCase):
+    def setUp(self):
+        self.exportador = ExportadorPacientes()
+
+    def test_mismo_esquema_que_generar_pacientes(self):
+        """Prueba que el modo masivo produce las mismas columnas que el modo por registro"""
+        df = self.exportador.generar_pacientes_masivo(50, semilla=1)
+        columnas = list(self.exportador.generar_pacientes(1)[0].keys())
+
+        self.assertEqual(list(df.columns), columnas)
+        self.assertEqual(len(df), 50)
+        self.assertTrue(df['telefono'].str.fullmatch(r"\d{3}-\d{3}-\d{4}").all())
+        self.assertTrue((df['nombre_completo'] == df['nombre'] + " " + df['apellido1'] + " " + df['apellido2']).all())
+
+    def test_semilla_reproducible(self):
+        """Prueba que la misma semilla genera los mismos pacientes y que los bloques suman el total"""
+        completo = self.exportador.generar_pacientes_masivo(1000, semilla=7)
+        repetido = self.exportador.generar_pacientes_masivo(1000, semilla=7)
+
+        self.assertTrue(completo.equals(repetido))
+        self.assertEqual(sum(len(b) for b in self.exportador.iterar_pacientes_masivo(1000, semilla=7, tamano_bloque=300)), 1000)
+
+    def test_respeta_opciones(self):
+        """Prueba porcentaje_femenino y el rango de edades"""
+        opciones = {'porcentaje_femenino': 100, 'edad_min': 30, 'edad_max': 35}
+        df = self.exportador.generar_pacientes_masivo(2000, opciones, semilla=3)
+
+        self.assertTrue((df['genero'] == 'F').all())
+        self.assertTrue(df['nombre'].isin(self.exportador.nombres_femeninos).all())
+        self.assertEqual((df['edad'].min(), df['edad'].max()), (30, 35))
+
+
+class TestPlanPacientes(unittest.TestCase):
+    def test_datos_de_contacto_unicos(self):
+        """Prueba que el plan por columnas no repite teléfonos, emails ni direcciones"""
+        estructura = pd.DataFrame({
+            'Campo': ['nombre', 'telefono', 'email', 'direccion'],
+            'Tipo': ['object'] * 4,
+            'Ejemplo': ['Ana', '600 000 000', 'ana@example.com', 'Calle Mayor 1']
+        })
+        n = 20_000
+        df = PlanGeneracion.compilar(estructura, GeneradorPacientes(semilla=3)).generar(n)
+
+        for columna in ('telefono', 'email', 'direccion'):
+            self.assertGreater(df[columna].nunique(), 0.99 * n, columna)
+        # Los nombres de pila de Faker son unos mil: deben aparecer casi todos
+        self.assertGreater(df['nombre'].nunique(), 800)
+        self.assertTrue(df['email'].str.fullmatch(r'[a-z]+\.[a-z]+\d+@[a-z.]+').all())
+
+
+class TestExportacionPorBloques(unittest.TestCase):
+    def setUp(self):
+        self.exportador = ExportadorPacientes()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.esperado = self.exportador.generar_pacientes_masivo(1000, semilla=11, tamano_bloque=300)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _bloques(self):
+        return self.exportador.iterar_pacientes_masivo(1000, semilla=11, tamano_bloque=300)
+
+    def test_csv_por_bloques(self):
+        """Prueba que el CSV por bloques tiene una sola cabecera y todas las filas"""
+        avances = []
+        ruta = self.base / "pacientes.csv"
+        resumen = self.exportador.exportar_por_bloques(self._bloques(), ruta, 'csv', total=1000,
+                                                       progreso=avances.append)
+
+        leido = pd.read_csv(ruta, dtype={'telefono': str})
+        self.assertEqual(resumen['filas'], 1000)
+        self.assertEqual([a['filas'] for a in avances], [300, 600, 900, 1000])
+        self.assertEqual(list(leido['id']), list(self.esperado['id']))
+
+    def test_jsonl_por_bloques(self):
+        """Prueba que cada fila es un objeto JSON independiente"""
+        ruta = self.base / "pacientes.jsonl"
+        self.exportador.exportar_por_bloques(self._bloques(), ruta, 'jsonl', progreso=lambda _: None)
+
+        lineas = ruta.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(len(lineas), 1000)
+        self.assertEqual(json.loads(lineas[-1])['id'], self.esperado['id'].iloc[-1])
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow no está instalado")
+    def test_parquet_por_bloques(self):
+        """Prueba la escritura incremental de Parquet"""
+        ruta = self.base / "pacientes.parquet"
+        self.exportador.exportar_por_bloques(self._bloques(), ruta, 'parquet', progreso=lambda _: None)
+
+        self.assertEqual(len(pd.read_parquet(ruta)), 1000)
+
+    def test_exportador_bio_por_bloques(self):
+        """Prueba que los exportadores de los demás módulos también escriben por bloques"""
+        estructura = pd.DataFrame({'Campo': ['id_paciente', 'situacion_actual', 'notas'],
+                                   'Tipo': ['int64', 'object', 'object'],
+                                   'Ejemplo': [None, None, 'Sin novedades']})
+        plan = PlanGeneracion.compilar(estructura, GeneradorBIO(semilla=4))
+        ruta = self.base / "bio.csv"
+
+        resumen = ExportadorBIO().exportar_por_bloques(plan.iterar(1000, tamano_bloque=300), ruta, 'csv',
+                                                       progreso=lambda _: None)
+
+        self.assertEqual(resumen['bloques'], 4)
+        self.assertEqual(list(pd.read_csv(ruta).columns), ['id_paciente', 'situacion_actual', 'notas'])
+        self.assertEqual(len(pd.read_csv(ruta)), 1000)
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow no está instalado")
+    def test_parquet_columna_nula_en_el_primer_bloque(self):
+        """Prueba que una columna vacía en el primer bloque toma el tipo de los siguientes"""
+        def bloques():
+            for i, df in enumerate(self._bloques()):
+                yield df.assign(notas=pd.Series(None if i == 0 else 'ok', index=df.index, dtype='str'),
+                                visitas=None if i < 2 else 3)
+
+        ruta = self.base / "pacientes.parquet"
+        self.exportador.exportar_por_bloques(bloques(), ruta, 'parquet', progreso=lambda _: None)
+
+        leido = pd.read_parquet(ruta)
+        self.assertEqual(len(leido), 1000)
+        self.assertEqual(leido['notas'].notna().sum(), 700)
+        self.assertEqual(leido['visitas'].sum(), 3 * 400)
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow no está instalado")
+    def test_parquet_tipos_declarados(self):
+        """Prueba que los tipos declarados fijan el esquema de las columnas nulas"""
+        def bloques():
+            for df in self._bloques():
+                yield df.assign(peso=None)
+
+        ruta = self.base / "pacientes.parquet"
+        self.exportador.exportar_por_bloques(bloques(), ruta, 'parquet', progreso=lambda _: None,
+                                             tipos={'peso': 'float64'})
+
+        self.assertEqual(str(pq.read_schema(ruta).field('peso').type), 'double')
+        self.assertEqual(len(pd.read_parquet(ruta)), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
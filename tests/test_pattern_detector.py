@@ -0,0 +1,68 @@
+import unittest
+import random
+import re
+from ..utils.template_management.pattern_detector import PatternDetector, PatternBank
+
+LINEAS = ['Nombre: Ana Pérez', 'Paciente: Luis Gómez', 'Fecha_nac: 1990-01-01', 'DOB: 02/03/1985',
+          'Hotel: Central', 'Teléfono: 555-123-4567', 'Tel: 555 000 1111', 'Email: ana@example.com',
+          'Diagnóstico: Ansiedad', 'Medicación: Sertralina', 'Documento: X123', 'nombre: paciente: Eva',
+          'Notas sin etiqueta', 'código: 77']
+
+
+class TestPatternDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = PatternDetector()
+
+    def _primeras_por_busqueda(self, contenido):
+        """Primera coincidencia de cada patrón con re.search (comportamiento original)"""
+        esperado = {}
+        for categoria, tipos in self.detector.known_patterns.items():
+            for patrones in tipos.values():
+                for patron in patrones:
+                    if found := re.search(patron, contenido, re.IGNORECASE):
+                        esperado.setdefault(categoria, []).append((patron, found.group(1).strip(), found.start()))
+        return esperado
+
+    def test_banco_igual_que_busqueda_por_patron(self):
+        """Prueba que una sola pasada da la misma primera coincidencia de cada patrón"""
+        rng = random.Random(3)
+        for _ in range(20):
+            contenido = '\n'.join(rng.choice(LINEAS) for _ in range(30))
+            obtenido = {
+                categoria: [(m['pattern'], m['value'], m['start']) for m in matches]
+                for categoria, matches in self.detector._pattern_bank().first_matches(contenido).items()
+            }
+            self.assertEqual(obtenido, self._primeras_por_busqueda(contenido))
+
+    def test_coincidencias_solapadas_y_offsets(self):
+        """Prueba que se reportan coincidencias solapadas con su posición"""
+        contenido = 'x\nnombre: paciente: Eva'
+        candidatos = [(m['field_type'], m['start'], m['value']) for m in self.detector.scan_document(contenido)]
+
+        self.assertIn(('name', 2, 'paciente: Eva'), candidatos)
+        self.assertIn(('name', 10, 'Eva'), candidatos)
+        self.assertEqual(contenido[2:], next(m['text'] for m in self.detector.scan_document(contenido)))
+
+    def test_detect_patterns(self):
+        """Prueba la detección por campo con confianza y offset"""
+        contenido = 'Paciente: Ana\nEmail: ana@example.com\n'
+        resultado = self.detector.detect_patterns(contenido, {
+            'patient_name': {'type': 'string'},
+            'contact_email': {'type': 'email'}
+        })['detected_fields']
+
+        self.assertEqual(resultado['patient_name']['value'], 'Ana')
+        self.assertEqual(resultado['contact_email']['value'], 'ana@example.com')
+        self.assertEqual(resultado['contact_email']['offset'][0], contenido.index('Email'))
+
+    def test_patron_sin_etiqueta_y_recompilacion(self):
+        """Prueba patrones sin etiqueta inicial y que el banco sigue a known_patterns"""
+        self.detector.known_patterns['general'] = {'code': [r'\b([A-Z]\d{3})\b']}
+        matches = self.detector._pattern_bank().first_matches('Documento: X123')
+
+        self.assertEqual(matches['general'][0]['value'], 'X123')
+        self.assertEqual(PatternBank({'c': {'f': [r'(\d+)']}}).scan('a1b22')[1]['value'], '22')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+from pathlib import Path
+from ..pdf_extractor.pdf_extractor import PDFExtractor
+
+
+def crear_pdf_prueba(ruta, textos):
+    """Genera un PDF mínimo con una página de texto por cada elemento de textos"""
+    objetos = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Se completa cuando se conocen las páginas
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    for texto in textos:
+        stream = f"BT /F1 12 Tf 72 720 Td ({texto}) Tj ET"
+        objetos.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        contenido_id = len(objetos)
+        objetos.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contenido_id} 0 R >>"
+        )
+        kids.append(f"{len(objetos)} 0 R")
+    objetos[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(textos)} >>"
+
+    datos = "%PDF-1.4\n"
+    offsets = []
+    for numero, objeto in enumerate(objetos, 1):
+        offsets.append(len(datos))
+        datos += f"{numero} 0 obj\n{objeto}\nendobj\n"
+    inicio_xref = len(datos)
+    datos += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n"
+    datos += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    datos += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n"
+
+    Path(ruta).write_bytes(datos.encode('latin-1'))
+    return Path(ruta)
+
+
+class TestPDFExtractorPaginado(unittest.TestCase):
+    def setUp(self):
+        self.extractor = PDFExtractor()
+        self.extractor.ocr_enabled = False
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.textos = [f"Pagina {i} contenido del formulario clinico numero {i}" for i in range(1, 6)]
+        self.pdf = crear_pdf_prueba(Path(self.temp_dir.name) / "multipagina.pdf", self.textos)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_paginas_en_orden(self):
+        """Prueba que las páginas se reensamblan en su orden original"""
+        contenido, calidad, metodo = self.extractor._extraer_por_paginas(self.pdf, workers=1)
+
+        posiciones = [contenido.index(texto) for texto in self.textos]
+        self.assertEqual(posiciones, sorted(posiciones))
+        self.assertEqual(len(self.extractor.metodos_por_pagina), len(self.textos))
+        self.assertTrue(metodo.startswith('paginado'))
+        self.assertGreater(calidad, 0)
+
+    def test_resultado_independiente_de_workers(self):
+        """Prueba que el pool de procesos produce el mismo texto que el modo en un solo proceso"""
+        serial = self.extractor.leer_pdf(self.pdf, modo='paginado', workers=1)
+        paralelo = self.extractor.leer_pdf(self.pdf, modo='paginado', workers=3)
+
+        self.assertEqual(serial, paralelo)
+
+    def test_mismo_texto_que_secuencial(self):
+        """Prueba que el modo paginado extrae el mismo texto que el secuencial"""
+        secuencial, calidad_secuencial = self.extractor.leer_pdf(self.pdf, modo='secuencial')
+        paginado, calidad_paginado = self.extractor.leer_pdf(self.pdf, modo='paginado', workers=3)
+
+        self.assertEqual(paginado, secuencial)
+        # La calidad se calcula de otra forma (ver leer_pdf): solo se exige que sea válida
+        self.assertGreater(calidad_paginado, 0)
+        self.assertLessEqual(calidad_paginado, 100)
+        self.assertGreater(calidad_secuencial, 0)
+
+
+class TestPDFExtractorCosto(unittest.TestCase):
+    def setUp(self):
+        self.extractor = PDFExtractor()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf = crear_pdf_prueba(
+            Path(self.temp_dir.name) / "digital.pdf",
+            ["Evaluacion inicial del paciente con texto digital suficiente"]
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_omite_ocr_en_pdf_digital(self):
+        """Prueba que un PDF con capa de texto nunca pasa por OCR"""
+        self.extractor.ocr_enabled = True
+        self.extractor.extract_text_with_ocr = lambda *args: self.fail("Se ejecutó OCR en un PDF digital")
+        self.extractor.umbral_suficiente = 101  # Obliga a recorrer todos los métodos
+
+        contenido, calidad, _ = self.extractor._extraer_por_costo(self.pdf)
+
+        self.assertIn("Evaluacion inicial", contenido)
+        self.assertNotIn('OCR (Tesseract)', self.extractor.estadisticas_metodos)
+
+    def test_salida_temprana_y_orden_por_estadisticas(self):
+        """Prueba que se detiene al alcanzar el umbral y reordena con las estadísticas"""
+        self.extractor.ocr_enabled = False
+        self.extractor.umbral_suficiente = 1
+
+        self.extractor._extraer_por_costo(self.pdf)
+        self.assertEqual(list(self.extractor.estadisticas_metodos), ['básico'])
+
+        self.extractor.estadisticas_metodos = {
+            'básico': {'usos': 1, 'tiempo_total': 0.5, 'calidad_total': 40},
+            'PyPDF2': {'usos': 1, 'tiempo_total': 0.1, 'calidad_total': 60},
+        }
+        self.extractor.umbral_suficiente = 50
+        orden = [nombre for nombre, _ in self.extractor._ordenar_por_costo(self.extractor._metodos_extraccion(False))]
+        self.assertEqual(orden[0], 'PyPDF2')
+        self.assertEqual(orden[-1], 'básico')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+import pandas as pd
+from ..utils.perfilado import PerfiladorColumnas, muestra_reservorio
+from ..utils.advanced_content_analyzer import AdvancedContentAnalyzer
+
+
+class TestMuestraReservorio(unittest.TestCase):
+    def test_bloques(self):
+        """Prueba que el reservorio tiene el tamaño pedido y filas de todo el archivo"""
+        bloques = (pd.DataFrame({'n': np.arange(i, i + 1000)}) for i in range(0, 50_000, 1000))
+        muestra, filas = muestra_reservorio(bloques, 500, semilla=3)
+
+        self.assertEqual(filas, 50_000)
+        self.assertEqual(len(muestra), 500)
+        self.assertEqual(muestra['n'].nunique(), 500)
+        # Una muestra uniforme no se queda en los primeros bloques
+        self.assertGreater(muestra['n'].median(), 15_000)
+        self.assertLess(muestra['n'].median(), 35_000)
+
+
+class TestPerfiladorColumnas(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 200_000
+        fechas = np.where(rng.random(n) < 0.95, '2024-03-01', 'pendiente')
+        genero = rng.choice(['Masculino', 'Femenino'], n).astype(object)
+        genero[n - 1] = 'No binario'  # Valor raro que la muestra casi nunca ve
+        self.df = pd.DataFrame({
+            'edad': rng.integers(0, 100, n),
+            'codigo': rng.integers(10_000, 99_999, n).astype(str),
+            'fecha': fechas,
+            'genero': genero
+        })
+        self.perfilador = PerfiladorColumnas(tamano_muestra=2000)
+
+    def test_escala_solo_columnas_ambiguas(self):
+        """Prueba que solo se recorren completas las columnas que la muestra no decide"""
+        perfiles = self.perfilador.perfilar(self.df)
+
+        self.assertEqual(perfiles['codigo']['tipo_inferido'], 'number')
+        self.assertFalse(perfiles['codigo']['escalado'])
+        self.assertFalse(perfiles['edad']['escalado'])
+        self.assertTrue(perfiles['fecha']['escalado'])
+        exacta = (self.df['fecha'] == '2024-03-01').mean()
+        self.assertAlmostEqual(perfiles['fecha']['confianza'], exacta, places=4)
+
+    def test_valores_unicos_exactos(self):
+        """Prueba que las columnas categóricas listan también los valores raros"""
+        perfil = self.perfilador.perfilar(self.df)['genero']
+
+        self.assertIn('No binario', perfil['valores_unicos'])
+        self.assertEqual(perfil['n_unicos'], 3)
+
+    def test_muchos_valores_raros_no_se_listan(self):
+        """Prueba que no se listan valores si la columna completa supera el límite"""
+        codigos = np.full(len(self.df), 'A', dtype=object)
+        codigos[-300:] = [f'R{i}' for i in range(300)]
+        perfil = self.perfilador.perfilar(self.df.assign(codigo=codigos))['codigo']
+
+        self.assertNotIn('valores_unicos', perfil)
+        self.assertEqual(perfil['n_unicos'], 301)
+        self.assertTrue(perfil['n_unicos_exacto'])
+
+    def test_texto_numerico(self):
+        """Prueba los límites de los números en texto y que los códigos con ceros siguen siendo texto"""
+        df = pd.DataFrame({'codigo': ['0100', '0200', '0900'] * 10, 'monto': ['15', '7.5', '120'] * 10})
+        perfiles = self.perfilador.perfilar(df)
+
+        self.assertEqual(perfiles['codigo']['tipo_inferido'], 'string')
+        self.assertEqual(perfiles['monto']['tipo_inferido'], 'number')
+        self.assertEqual((perfiles['monto']['estadisticas']['min'], perfiles['monto']['estadisticas']['max']),
+                         (7.5, 120.0))
+
+        analizador = AdvancedContentAnalyzer(tamano_muestra=2000)
+        plantilla = analizador.suggest_template_structure(analizador._analyze_dataframe(df))
+        self.assertEqual(plantilla['fields']['codigo']['type'], 'string')
+        self.assertEqual(plantilla['validation_rules']['monto']['maximum'], 120.0)
+
+    def test_dataframe_pequeno_exacto(self):
+        """Prueba que con menos filas que la muestra el resultado es exacto"""
+        df = pd.DataFrame({'estado': ['Activo', None, 'Alta', 'Activo'], 'n': [1, 2, 3, 4]})
+        perfiles = self.perfilador.perfilar(df)
+
+        self.assertEqual(perfiles['estado']['valores_unicos'], df['estado'].unique().tolist())
+        self.assertEqual(perfiles['estado']['nulos'], 1)
+        self.assertEqual(perfiles['n']['estadisticas']['mean'], 2.5)
+
+    def test_analizador_usa_tipo_inferido(self):
+        """Prueba que AdvancedContentAnalyzer toma el tipo del perfil vectorizado"""
+        analizador = AdvancedContentAnalyzer(tamano_muestra=2000)
+        plantilla = analizador.suggest_template_structure(analizador._analyze_dataframe(self.df))
+
+        self.assertEqual(plantilla['fields']['edad']['type'], 'number')
+        self.assertEqual(plantilla['fields']['genero']['type'], 'string')
+
+
+if __name__ == '__main__':
+    unittest.main()
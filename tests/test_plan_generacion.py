@@ -0,0 +1,89 @@
+import unittest
+import pandas as pd
+from datetime import date
+from ..utils.plan_generacion import (
+    PlanGeneracion, parsear_valores_posibles, generar_en_paralelo, tamano_pool_texto,
+    TAMANO_POOL_TEXTO_MAX
+)
+from ..BIO.bios import GeneradorBIO
+from ..pacientes.pacientes import GeneradorPacientes
+
+
+class TestPlanGeneracion(unittest.TestCase):
+    def setUp(self):
+        self.estructura = pd.DataFrame({
+            'Campo': ['id_paciente', 'fecha_biografia', 'situacion_actual', 'respuesta', 'puntaje', 'notas'],
+            'Tipo': ['int64', 'datetime64[ns]', 'object', 'object', 'float64', 'object'],
+            'Ejemplo': [None, None, None, None, None, 'Sin novedades'],
+            'Valores_Posibles': [None, None, None, '["Si", "No"]', None, None]
+        })
+
+    def test_parseo_seguro_de_valores_posibles(self):
+        """Prueba que las listas se interpretan sin ejecutar código"""
+        self.assertEqual(parsear_valores_posibles("['A', 'B']"), ['A', 'B'])
+        self.assertEqual(parsear_valores_posibles('["A", "B"]'), ['A', 'B'])
+        self.assertIsNone(parsear_valores_posibles("__import__('os').getcwd()"))
+        self.assertIsNone(parsear_valores_posibles("texto libre"))
+        self.assertIsNone(parsear_valores_posibles(None))
+
+    def test_columnas_y_tipos(self):
+        """Prueba que cada columna usa su generador y recibe el tipo de la estructura"""
+        df = PlanGeneracion.compilar(self.estructura, GeneradorBIO(semilla=1)).generar(500)
+
+        self.assertEqual(list(df.columns), list(self.estructura['Campo']))
+        self.assertEqual(str(df['id_paciente'].dtype), 'int64')
+        self.assertEqual(str(df['fecha_biografia'].dtype), 'datetime64[ns]')
+        self.assertTrue(df['situacion_actual'].isin(GeneradorBIO.SITUACIONES).all())
+        self.assertTrue(df['respuesta'].isin(['Si', 'No']).all())
+        self.assertTrue(df['puntaje'].between(0, 10).all())
+        self.assertTrue((df['notas'] == 'Sin novedades').all())
+
+    def test_pool_de_texto_crece_con_la_cantidad(self):
+        """Prueba que el texto libre no se limita a un número fijo de valores"""
+        estructura = pd.DataFrame({'Campo': ['observaciones'], 'Tipo': ['object'], 'Ejemplo': [None]})
+        df = PlanGeneracion.compilar(estructura, GeneradorBIO(semilla=2)).generar(4000)
+
+        # Se sortea con reemplazo entre 1000 textos: casi todos aparecen
+        self.assertEqual(tamano_pool_texto(4000), 1000)
+        self.assertGreater(df['observaciones'].nunique(), 900)
+        self.assertEqual(tamano_pool_texto(100), 100)
+        self.assertEqual(tamano_pool_texto(10 ** 8), TAMANO_POOL_TEXTO_MAX)
+
+    def test_semilla_reproducible(self):
+        """Prueba que la misma semilla produce los mismos datos"""
+        primero = PlanGeneracion.compilar(self.estructura, GeneradorBIO(semilla=5)).generar(100)
+        segundo = PlanGeneracion.compilar(self.estructura, GeneradorBIO(semilla=5)).generar(100)
+
+        self.assertTrue(primero.equals(segundo))
+
+
+class TestGeneracionPorShards(unittest.TestCase):
+    def setUp(self):
+        self.estructura = pd.DataFrame({
+            'Campo': ['id', 'nombre', 'genero', 'fecha_nacimiento', 'estado_civil', 'comentario'],
+            'Tipo': ['object', 'object', 'object', 'datetime64[ns]', 'object', 'object'],
+            'Ejemplo': ['1', 'Ana', 'Femenino', '1980-01-01', 'Single', None]
+        })
+        self.fecha = date(2024, 1, 1)
+
+    def test_identico_sin_importar_workers(self):
+        """Prueba que los shards concatenados no dependen del número de procesos"""
+        serie = generar_en_paralelo(GeneradorPacientes, self.estructura, 1001, semilla=42,
+                                    shards=4, workers=1, fecha_referencia=self.fecha)
+        paralelo = generar_en_paralelo(GeneradorPacientes, self.estructura, 1001, semilla=42,
+                                       shards=4, workers=3, fecha_referencia=self.fecha)
+
+        self.assertEqual(len(serie), 1001)
+        pd.testing.assert_frame_equal(serie, paralelo)
+
+    def test_semillas_distintas_por_shard(self):
+        """Prueba que cada shard usa su propio flujo aleatorio"""
+        df = generar_en_paralelo(GeneradorPacientes, self.estructura, 200, semilla=1,
+                                 shards=2, fecha_referencia=self.fecha)
+
+        self.assertFalse(df['id'].iloc[:100].reset_index(drop=True).equals(df['id'].iloc[100:].reset_index(drop=True)))
+        self.assertGreater(df['comentario'].isna().sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
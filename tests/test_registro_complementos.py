@@ -0,0 +1,88 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from ..utils.registro_complementos import RegistroComplementos, ModuloFaltante, importar_diferido
+from ..lector_archivos.lector import LectorArchivos
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class TestImportacionDiferida(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        Path(self.temp_dir.name, "complemento_prueba.py").write_text(
+            "import builtins\nbuiltins.CARGAS_COMPLEMENTO = getattr(builtins, 'CARGAS_COMPLEMENTO', 0) + 1\n"
+            "def leer(ruta):\n    return f'leido {ruta}'\n",
+            encoding='utf-8'
+        )
+        sys.path.insert(0, self.temp_dir.name)
+
+    def tearDown(self):
+        sys.path.remove(self.temp_dir.name)
+        sys.modules.pop('complemento_prueba', None)
+        import builtins
+        builtins.__dict__.pop('CARGAS_COMPLEMENTO', None)
+        self.temp_dir.cleanup()
+
+    def test_modulo_se_ejecuta_en_el_primer_uso(self):
+        """Prueba que el módulo no se ejecuta hasta acceder a un atributo"""
+        import builtins
+        modulo = importar_diferido('complemento_prueba')
+        self.assertFalse(hasattr(builtins, 'CARGAS_COMPLEMENTO'))
+        self.assertEqual(modulo.leer('x'), 'leido x')
+        self.assertEqual(builtins.CARGAS_COMPLEMENTO, 1)
+
+    def test_modulo_faltante(self):
+        """Prueba que un módulo no instalado falla al usarse indicando qué instalar"""
+        modulo = importar_diferido('paquete_que_no_existe')
+        self.assertIsInstance(modulo, ModuloFaltante)
+        self.assertFalse(modulo)
+        with self.assertRaisesRegex(ImportError, 'pip install paquete_que_no_existe'):
+            modulo.algo
+
+    def test_registro_por_extension(self):
+        """Prueba que consultar el registro no carga nada y leer sí"""
+        import builtins
+        registro = RegistroComplementos()
+        registro.registrar('prueba', 'complemento_prueba:leer', ['complemento_prueba'], ['.prb'])
+        registro.registrar('roto', 'no_existe:leer', ['no_existe'], ['.rot'])
+
+        self.assertIn('.PRB', registro)
+        self.assertEqual(sorted(registro.keys()), ['.prb', '.rot'])
+        self.assertEqual(registro.disponibilidad(), {'prueba': True, 'roto': False})
+        self.assertFalse(hasattr(builtins, 'CARGAS_COMPLEMENTO'))
+
+        self.assertEqual(registro['.prb']('a.prb'), 'leido a.prb')
+        self.assertEqual(registro.cargados(), ['prueba'])
+        with self.assertRaisesRegex(ImportError, 'pip install no_existe'):
+            registro['.rot']
+
+    def test_formatos_soportados(self):
+        """Prueba que LectorArchivos sigue leyendo por extensión a través del registro"""
+        ruta = Path(self.temp_dir.name) / "datos.tsv"
+        ruta.write_text("a\tb\n1\t2\n", encoding='utf-8')
+        df, extension = LectorArchivos().leer_archivo(ruta)
+        self.assertEqual((extension, list(df.columns)), ('.tsv', ['a', 'b']))
+
+
+class TestArranque(unittest.TestCase):
+    def test_dependencias_pesadas_no_se_cargan(self):
+        """Prueba que importar los lectores y extractores no importa sus dependencias opcionales"""
+        sonda = (
+            "import sys\n"
+            "import lector_archivos.lector, pdf_extractor.pdf_extractor, utils.template_manager\n"
+            "pesadas = ['openpyxl', 'jsonschema', 'pdfminer.high_level', 'google.cloud.vision', 'pytesseract']\n"
+            "print([m for m in pesadas if m in sys.modules and type(sys.modules[m]).__name__ == 'module'])\n"
+        )
+        with tempfile.TemporaryDirectory() as cwd:
+            resultado = subprocess.run([sys.executable, '-c', sonda], cwd=cwd, capture_output=True, text=True,
+                                       env={**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)})
+        self.assertEqual(resultado.returncode, 0, resultado.stderr)
+        self.assertEqual(resultado.stdout.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
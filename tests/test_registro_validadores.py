@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+import jsonschema
+from jsonschema import SchemaError
+from ..utils.registro_validadores import RegistroValidadores, REGISTRO_VALIDADORES
+from ..utils.data_validator import DataValidator
+
+
+class TestRegistroValidadores(unittest.TestCase):
+    def setUp(self):
+        self.registro = RegistroValidadores(capacidad=2)
+
+    def test_aciertos_por_hash(self):
+        """Prueba que esquemas iguales con distinto orden de claves comparten validador"""
+        a = self.registro.obtener({'type': 'object', 'required': ['id']})
+        b = self.registro.obtener({'required': ['id'], 'type': 'object'})
+
+        self.assertIs(a, b)
+        self.assertEqual((self.registro.aciertos, self.registro.fallos), (1, 1))
+        self.assertIsNot(a, self.registro.obtener({'type': 'object', 'required': ['id']}, format_check=False))
+
+    def test_expulsion_lru(self):
+        """Prueba que se expulsa el validador menos usado"""
+        primero = self.registro.obtener({'type': 'string'})
+        self.registro.obtener({'type': 'number'})
+        self.registro.obtener({'type': 'string'})
+        self.registro.obtener({'type': 'boolean'})
+
+        estadisticas = self.registro.estadisticas()
+        self.assertEqual((estadisticas['validadores'], estadisticas['expulsiones']), (2, 1))
+        self.assertIs(self.registro.obtener({'type': 'string'}), primero)
+        self.registro.obtener({'type': 'number'})
+        self.assertEqual(self.registro.fallos, 4)
+
+    def test_esquema_invalido(self):
+        """Prueba que un esquema inválido lanza SchemaError y no queda registrado"""
+        with self.assertRaises(SchemaError):
+            self.registro.obtener({'type': 'entero'})
+        self.assertEqual(self.registro.estadisticas()['validadores'], 0)
+
+
+class TestDataValidator(unittest.TestCase):
+    def setUp(self):
+        REGISTRO_VALIDADORES.limpiar()
+        self.validator = DataValidator()
+        self.validator.validation_rules = {
+            'nombre': {'type': 'string', 'required': True, 'min_length': 1},
+            'edad': {'type': 'number', 'min_value': 0, 'max_value': 120},
+            'email': {'type': 'email'},
+            'alta': {'type': 'date'}
+        }
+
+    def test_reglas_compiladas_una_vez(self):
+        """Prueba que validar muchos registros no vuelve a compilar el esquema"""
+        registros = [{'nombre': f"P{i}", 'edad': i % 100, 'email': 'a@b.c', 'alta': '2024-01-31'}
+                     for i in range(2000)]
+        with mock.patch.object(jsonschema.Draft7Validator, 'check_schema',
+                               wraps=jsonschema.Draft7Validator.check_schema) as compilar:
+            self.assertTrue(all(self.validator.validate_data(r) for r in registros))
+        self.assertEqual(compilar.call_count, 1)
+        self.assertEqual(self.validator.get_errors(), [])
+
+    def test_errores_por_campo(self):
+        """Prueba los mensajes de campo requerido, rango, formato y tipo no soportado"""
+        self.assertFalse(self.validator.validate_data({'edad': 130, 'email': 'sin-arroba', 'alta': '31/01/2024'}))
+        errores = self.validator.get_errors()
+        self.assertEqual(len(errores), 4)
+        self.assertTrue(any(e.startswith('Campo requerido faltante') for e in errores))
+        self.assertTrue(any(e.startswith('edad:') for e in errores))
+
+        self.validator.clear_errors()
+        self.validator.validation_rules = {'foto': {'type': 'imagen'}, 'nota': {'type': 'string'}}
+        self.assertFalse(self.validator.validate_data({'nota': None}))
+        self.assertEqual(self.validator.get_errors(), ['Tipo de campo no soportado: imagen (foto)'])
+
+
+if __name__ == '__main__':
+    unittest.main()
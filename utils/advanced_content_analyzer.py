@@ -4,11 +4,17 @@ import pandas as pd
 import json
 import yaml
 import re
+from .perfilado import PerfiladorColumnas
 
 class AdvancedContentAnalyzer:
     """Analizador avanzado de contenido para generación de plantillas"""
 
-    def __init__(self):
+    def __init__(self, tamano_muestra: int = 10_000):
+        """
+        Args:
+            tamano_muestra: Filas de la muestra usada para perfilar DataFrames
+        """
+        self.perfilador = PerfiladorColumnas(tamano_muestra)
         self.supported_extensions = {
             '.txt': self._analyze_text,  # Agregar soporte para TXT
             '.csv': self._analyze_csv,
@@ -113,15 +119,16 @@ class AdvancedContentAnalyzer:
         return fields
 
     def _analyze_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analiza un DataFrame y extrae información relevante"""
+        """Analiza un DataFrame y extrae información relevante (sobre una muestra)"""
         analysis = {}
         
-        for column in df.columns:
+        for column, perfil in self.perfilador.perfilar(df).items():
             analysis[column] = {
-                'sample_values': df[column].dropna().head(5).tolist(),
-                'unique_values': df[column].nunique(),
-                'null_count': df[column].isnull().sum(),
-                'stats': self._get_column_stats(df[column])
+                'sample_values': perfil['ejemplos'],
+                'unique_values': perfil['n_unicos'],
+                'null_count': perfil['nulos'],
+                'inferred_type': perfil['tipo_inferido'],
+                'stats': perfil['estadisticas']
             }
 
         return analysis
@@ -143,6 +150,10 @@ class AdvancedContentAnalyzer:
 
     def _infer_field_type(self, field_data: Dict[str, Any]) -> str:
         """Infiere el tipo de campo basado en los datos"""
+        # Tipo ya inferido de forma vectorizada al perfilar un DataFrame
+        if field_data.get('inferred_type'):
+            return field_data['inferred_type']
+
         sample_values = field_data.get('sample_values', [])
         if not sample_values:
             return 'string'
@@ -194,12 +205,8 @@ class AdvancedContentAnalyzer:
     def _get_column_stats(self, series: pd.Series) -> Dict[str, Any]:
         """Obtiene estadísticas básicas de una columna"""
         try:
-            return {
-                'min': series.min(),
-                'max': series.max(),
-                'mean': series.mean() if pd.api.types.is_numeric_dtype(series) else None,
-                'unique': series.nunique()
-            }
+            perfil = self.perfilador.perfilar(series.to_frame('columna'))['columna']
+            return perfil['estadisticas']
         except:
             return {}
 
@@ -0,0 +1,183 @@
+"""
+Caché de plantillas ya analizadas compartida por todos los cargadores.
+
+TemplateManager, StorageManager, ImportConsolidator y ProcessingCoordinator
+leían y analizaban el mismo JSON/YAML cada vez que lo necesitaban, y la caché
+de StorageManager nunca expulsaba entradas ni detectaba ediciones en disco.
+Esta caché guarda cada plantilla por ruta con expulsión LRU y la revalida
+con el tamaño y la fecha de modificación del archivo; si cambian, se compara
+el SHA-256 antes de volver a analizarla. Las entradas se entregan como vistas
+inmutables (MappingProxyType y tuplas) para que ningún llamador altere la
+copia compartida; quien necesite modificar la plantilla pide una copia.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+import copy
+import hashlib
+import os
+import threading
+import time
+from .catalogo_plantillas import leer_plantilla
+
+
+def congelar(valor: Any) -> Any:
+    """Convierte dicts en MappingProxyType y listas en tuplas, recursivamente"""
+    if isinstance(valor, dict):
+        return MappingProxyType({clave: congelar(v) for clave, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    if isinstance(valor, set):
+        return frozenset(congelar(v) for v in valor)
+    return valor
+
+
+def descongelar(valor: Any) -> Any:
+    """Inversa de congelar: retorna dicts y listas modificables (p. ej. para json.dump)"""
+    if isinstance(valor, Mapping):
+        return {clave: descongelar(v) for clave, v in valor.items()}
+    if isinstance(valor, tuple):
+        return [descongelar(v) for v in valor]
+    if isinstance(valor, frozenset):
+        return {descongelar(v) for v in valor}
+    return valor
+
+
+class _Entrada:
+    __slots__ = ('datos', 'vista', 'mtime_ns', 'tamano', 'sha256', 'cargada')
+
+    def __init__(self, datos, mtime_ns: int, tamano: int, sha256: str):
+        self.datos = datos
+        self.vista = congelar(datos)
+        self.mtime_ns = mtime_ns
+        self.tamano = tamano
+        self.sha256 = sha256
+        self.cargada = time.time()
+
+
+class CachePlantillas:
+    """Caché LRU de plantillas analizadas, invalidada por tamaño/fecha/hash"""
+
+    def __init__(self, capacidad: int = 256):
+        """
+        Args:
+            capacidad: Plantillas distintas que se mantienen antes de expulsar la menos usada
+        """
+        self.capacidad = max(1, capacidad)
+        self._entradas: "OrderedDict[str, _Entrada]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+
+    @staticmethod
+    def _clave(ruta) -> str:
+        return os.path.abspath(ruta)
+
+    def _entrada(self, ruta) -> _Entrada:
+        """Retorna la entrada vigente de la ruta, analizando el archivo solo si cambió"""
+        clave = self._clave(ruta)
+        stat = os.stat(clave)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada and entrada.mtime_ns == stat.st_mtime_ns and entrada.tamano == stat.st_size:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada
+
+        contenido = Path(clave).read_bytes()
+        sha256 = hashlib.sha256(contenido).hexdigest()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada and entrada.sha256 == sha256:
+                # Mismo contenido con otra fecha: basta con actualizar el stat
+                entrada.mtime_ns, entrada.tamano = stat.st_mtime_ns, stat.st_size
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada
+            if entrada:
+                self.invalidaciones += 1
+            self.fallos += 1
+
+        entrada = _Entrada(leer_plantilla(Path(clave), contenido), stat.st_mtime_ns, stat.st_size, sha256)
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+        return entrada
+
+    def obtener(self, ruta) -> Any:
+        """
+        Retorna la plantilla como vista inmutable
+
+        Args:
+            ruta: Archivo JSON o YAML de la plantilla
+
+        Returns:
+            Mapping de solo lectura (las listas se entregan como tuplas)
+
+        Raises:
+            OSError: Si el archivo no existe o no se puede leer
+            ValueError: Si el contenido no es JSON/YAML válido
+        """
+        return self._entrada(ruta).vista
+
+    def obtener_copia(self, ruta) -> Any:
+        """Retorna una copia modificable de la plantilla (para editarla o guardarla)"""
+        return copy.deepcopy(self._entrada(ruta).datos)
+
+    def invalidar(self, ruta) -> None:
+        """Descarta la plantilla de la caché (p. ej. tras sobrescribir el archivo)"""
+        with self._lock:
+            if self._entradas.pop(self._clave(ruta), None) is not None:
+                self.invalidaciones += 1
+
+    def expirar(self, max_edad: float) -> int:
+        """
+        Descarta las plantillas cargadas hace más de max_edad segundos
+
+        Returns:
+            int: Número de entradas descartadas
+        """
+        limite = time.time() - max_edad
+        with self._lock:
+            viejas = [clave for clave, entrada in self._entradas.items() if entrada.cargada < limite]
+            for clave in viejas:
+                del self._entradas[clave]
+        return len(viejas)
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'expulsiones': self.expulsiones,
+                'invalidaciones': self.invalidaciones,
+                'plantillas': len(self._entradas),
+                'capacidad': self.capacidad
+            }
+
+    def limpiar(self) -> None:
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = self.fallos = self.expulsiones = self.invalidaciones = 0
+
+
+# Caché única del proceso
+CACHE_PLANTILLAS = CachePlantillas()
+
+
+def obtener_plantilla(ruta) -> Any:
+    """Retorna la plantilla como vista inmutable desde la caché del proceso"""
+    return CACHE_PLANTILLAS.obtener(ruta)
+
+
+def copiar_plantilla(ruta) -> Any:
+    """Retorna una copia modificable de la plantilla desde la caché del proceso"""
+    return CACHE_PLANTILLAS.obtener_copia(ruta)
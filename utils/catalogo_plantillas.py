@@ -0,0 +1,264 @@
+"""
+Catálogo persistente de plantillas para listarlas sin abrirlas.
+
+Los menús de selección de plantillas (TemplateManager, ImportConsolidator,
+TemplateGenerator) necesitan solo el nombre, tipo, número de campos y
+descripción de cada archivo, pero antes los obtenían cargando cada JSON/YAML
+en cada visita. El catálogo guarda esos metadatos en SQLite junto con el
+tamaño, la fecha de modificación y el SHA-256 de cada archivo; al listar solo
+se hace stat() del directorio y se vuelven a leer los archivos nuevos o cuyo
+tamaño/fecha cambió.
+"""
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from .registro_complementos import importar_diferido
+
+# yaml solo se importa si el catálogo contiene plantillas YAML que releer
+yaml = importar_diferido('yaml')
+
+EXTENSIONES_PLANTILLA = ('.json', '.yaml', '.yml')
+
+
+def _nombres_campos(campos: Any) -> List[str]:
+    """Nombres de los campos de una plantilla (dict por nombre o lista de definiciones)"""
+    if isinstance(campos, dict):
+        return [str(nombre) for nombre in campos]
+    if isinstance(campos, list):
+        return [str(c.get('nombre', f'campo_{i}')) if isinstance(c, dict) else str(c)
+                for i, c in enumerate(campos)]
+    return []
+
+
+def leer_plantilla(ruta: Path, contenido: Optional[bytes] = None) -> Any:
+    """
+    Carga una plantilla JSON o YAML
+
+    Args:
+        ruta: Archivo de la plantilla
+        contenido: Bytes ya leídos del archivo (evita volver a abrirlo)
+    """
+    if contenido is None:
+        contenido = Path(ruta).read_bytes()
+    if Path(ruta).suffix.lower() == '.json':
+        return json.loads(contenido)
+    return yaml.safe_load(contenido.decode('utf-8'))
+
+
+class CatalogoPlantillas:
+    """Índice SQLite de los archivos de un directorio de plantillas"""
+
+    NOMBRE_DB = ".catalogo_plantillas.db"
+
+    def __init__(self, directorio, recursivo: bool = False, ruta_db=None):
+        """
+        Args:
+            directorio: Carpeta de plantillas a catalogar
+            recursivo: Si es True, incluye las subcarpetas
+            ruta_db: Archivo SQLite del catálogo (por defecto dentro de la carpeta)
+        """
+        self.directorio = Path(directorio)
+        self.recursivo = recursivo
+        self.db_path = Path(ruta_db) if ruta_db else self.directorio / self.NOMBRE_DB
+        self.ultima_actualizacion: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._db_lista = False
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión que confirma (o deshace) la transacción y se cierra al salir"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self, conn):
+        """Crea la tabla del catálogo si no existe"""
+        if self._db_lista:
+            return
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS plantillas (
+                ruta TEXT PRIMARY KEY,
+                nombre TEXT,
+                archivo TEXT,
+                extension TEXT,
+                tipo TEXT,
+                num_campos INTEGER,
+                campos TEXT,
+                descripcion TEXT,
+                fecha_generacion TEXT,
+                ctime REAL,
+                mtime_ns INTEGER,
+                tamano INTEGER,
+                sha256 TEXT,
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_plantillas_nombre ON plantillas(nombre)")
+        self._db_lista = True
+
+    def _archivos(self, extensiones: Tuple[str, ...]) -> Dict[str, os.stat_result]:
+        """{ruta: stat} de los archivos del directorio con las extensiones indicadas"""
+        archivos = {}
+        pendientes = [self.directorio]
+        while pendientes:
+            with os.scandir(pendientes.pop()) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir():
+                        if self.recursivo:
+                            pendientes.append(entrada.path)
+                    elif os.path.splitext(entrada.name)[1].lower() in extensiones:
+                        archivos[str(Path(entrada.path))] = entrada.stat()
+        return archivos
+
+    @staticmethod
+    def _metadatos(ruta: Path, contenido: bytes) -> Dict[str, Any]:
+        """Extrae los datos que muestran los menús; solo se llama si el archivo cambió"""
+        metadatos = {'tipo': None, 'num_campos': None, 'campos': [], 'descripcion': None,
+                     'fecha_generacion': None, 'error': None}
+        if ruta.suffix.lower() not in EXTENSIONES_PLANTILLA:
+            return metadatos
+        try:
+            data = leer_plantilla(ruta, contenido)
+        except Exception as e:
+            metadatos['error'] = str(e)
+            return metadatos
+        if not isinstance(data, dict):
+            metadatos['error'] = 'La plantilla no es un objeto'
+            return metadatos
+
+        campos = _nombres_campos(data.get('campos', {}))
+        metadatos.update({
+            'tipo': data.get('tipo', data.get('tipo_documento', data.get('type', 'desconocido'))),
+            'num_campos': len(campos),
+            'campos': campos,
+            'descripcion': data.get('descripcion', 'Sin descripción'),
+            'fecha_generacion': str(data.get('fecha_generacion', '') or '')
+        })
+        return metadatos
+
+    def actualizar(self, extensiones: Iterable[str] = EXTENSIONES_PLANTILLA) -> Dict[str, int]:
+        """
+        Sincroniza el catálogo con el directorio
+
+        Solo se leen los archivos nuevos o con tamaño/fecha distintos a los
+        registrados; si su SHA-256 no cambió (p. ej. un archivo copiado encima
+        de sí mismo) tampoco se vuelven a analizar.
+
+        Returns:
+            dict: Número de plantillas nuevas, actualizadas, sin cambios y eliminadas
+        """
+        extensiones = tuple(ext.lower() for ext in extensiones)
+        resumen = {'nuevas': 0, 'actualizadas': 0, 'sin_cambios': 0, 'eliminadas': 0}
+        if not self.directorio.is_dir():
+            self.ultima_actualizacion = resumen
+            return resumen
+
+        archivos = self._archivos(extensiones)
+        with self._lock, self._conectar() as conn:
+            self._init_db(conn)
+            marcadores = ','.join('?' * len(extensiones))
+            registradas = {
+                fila['ruta']: fila for fila in conn.execute(
+                    f"SELECT ruta, mtime_ns, tamano, sha256 FROM plantillas WHERE extension IN ({marcadores})",
+                    extensiones
+                )
+            }
+
+            for ruta, stat in archivos.items():
+                fila = registradas.get(ruta)
+                if fila and fila['mtime_ns'] == stat.st_mtime_ns and fila['tamano'] == stat.st_size:
+                    resumen['sin_cambios'] += 1
+                    continue
+
+                try:
+                    contenido = Path(ruta).read_bytes()
+                except OSError:
+                    continue
+                sha256 = hashlib.sha256(contenido).hexdigest()
+                if fila and fila['sha256'] == sha256:
+                    conn.execute(
+                        "UPDATE plantillas SET mtime_ns = ?, tamano = ? WHERE ruta = ?",
+                        (stat.st_mtime_ns, stat.st_size, ruta)
+                    )
+                    resumen['sin_cambios'] += 1
+                    continue
+
+                metadatos = self._metadatos(Path(ruta), contenido)
+                conn.execute(
+                    """INSERT OR REPLACE INTO plantillas
+                       (ruta, nombre, archivo, extension, tipo, num_campos, campos, descripcion,
+                        fecha_generacion, ctime, mtime_ns, tamano, sha256, error)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (ruta, Path(ruta).stem, Path(ruta).name, Path(ruta).suffix.lower(),
+                     metadatos['tipo'], metadatos['num_campos'],
+                     json.dumps(metadatos['campos'], ensure_ascii=False),
+                     metadatos['descripcion'], metadatos['fecha_generacion'],
+                     stat.st_ctime, stat.st_mtime_ns, stat.st_size, sha256, metadatos['error'])
+                )
+                resumen['actualizadas' if fila else 'nuevas'] += 1
+
+            eliminadas = [ruta for ruta in registradas if ruta not in archivos]
+            conn.executemany("DELETE FROM plantillas WHERE ruta = ?", [(ruta,) for ruta in eliminadas])
+            resumen['eliminadas'] = len(eliminadas)
+
+        self.ultima_actualizacion = resumen
+        return resumen
+
+    def listar(self, extensiones: Iterable[str] = EXTENSIONES_PLANTILLA,
+               incluir_errores: bool = False) -> List[Dict[str, Any]]:
+        """
+        Lista las plantillas del directorio sin abrir ninguna que no haya cambiado
+
+        Args:
+            extensiones: Extensiones a incluir (con punto)
+            incluir_errores: Si es True, incluye los archivos que no se pudieron analizar
+
+        Returns:
+            list: Un dict por archivo con ruta (Path), nombre, archivo, extension,
+                  tipo, num_campos, campos, descripcion, fecha_generacion,
+                  fecha_creacion, mtime_ns, tamano, sha256 y error
+        """
+        extensiones = tuple(ext.lower() for ext in extensiones)
+        self.actualizar(extensiones)
+        if not self.directorio.is_dir():
+            return []
+
+        marcadores = ','.join('?' * len(extensiones))
+        consulta = f"SELECT * FROM plantillas WHERE extension IN ({marcadores})"
+        if not incluir_errores:
+            consulta += " AND error IS NULL"
+        with self._lock, self._conectar() as conn:
+            filas = conn.execute(consulta + " ORDER BY archivo, ruta", extensiones).fetchall()
+
+        plantillas = []
+        for fila in filas:
+            plantilla = dict(fila)
+            plantilla['ruta'] = Path(fila['ruta'])
+            plantilla['campos'] = json.loads(fila['campos'] or '[]')
+            plantilla['fecha_creacion'] = datetime.fromtimestamp(fila['ctime']).strftime('%Y-%m-%d %H:%M')
+            plantillas.append(plantilla)
+        return plantillas
+
+
+_CATALOGOS: Dict[Tuple[str, bool], CatalogoPlantillas] = {}
+_CATALOGOS_LOCK = threading.Lock()
+
+
+def obtener_catalogo(directorio, recursivo: bool = False) -> CatalogoPlantillas:
+    """Retorna el catálogo del directorio, compartido por todo el proceso"""
+    clave = (str(Path(directorio).resolve()), recursivo)
+    with _CATALOGOS_LOCK:
+        if clave not in _CATALOGOS:
+            _CATALOGOS[clave] = CatalogoPlantillas(directorio, recursivo=recursivo)
+        return _CATALOGOS[clave]
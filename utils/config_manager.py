@@ -132,7 +132,10 @@ class ConfigManager:
                 'min_quality_threshold': 80,
                 'ocr_language': 'spa+eng',
                 'ocr_config': '--psm 1 --oem 3',
-                'cache_results': True
+                'cache_results': True,
+                'cache_max_mb': 256,
+                'umbral_suficiente': 80,
+                'workers': os.cpu_count() or 1
             },
             'data_generation': {
                 'default_records': 10,
@@ -3,6 +3,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Union, List
 from datetime import datetime
 import csv
+from .deteccion_formato import detectar_formato
+from .registro_complementos import dependencia_disponible, importar_diferido
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -27,18 +29,31 @@ except ImportError:
     logger.error("json no está disponible en Python")
     json = None
 
-try:
-    import openpyxl
-except ImportError:
+# Excel, ODS y los formatos columnares solo se necesitan al exportar o leer esos
+# formatos: se comprueba que estén instalados y se importan en el primer uso
+if dependencia_disponible('openpyxl'):
+    openpyxl = importar_diferido('openpyxl')
+else:
     logger.error("openpyxl no está instalado. Ejecute: pip install openpyxl")
     openpyxl = None
 
-try:
-    import odf
-except ImportError:
+if dependencia_disponible('odf'):
+    odf = importar_diferido('odf')
+else:
     logger.error("odfpy no está instalado. Ejecute: pip install odfpy")
     odf = None
 
+# pyarrow es opcional: solo lo necesitan los formatos columnares (Parquet y Feather)
+if dependencia_disponible('pyarrow'):
+    pa = importar_diferido('pyarrow')
+    feather = importar_diferido('pyarrow.feather')
+    pq = importar_diferido('pyarrow.parquet')
+else:
+    logger.warning("pyarrow no está instalado. Parquet y Feather no estarán disponibles. Ejecute: pip install pyarrow")
+    pa = None
+    feather = None
+    pq = None
+
 class DataFormatHandler:
     """Manejador de formatos de datos para exportación e importación"""
     
@@ -98,8 +113,27 @@ class DataFormatHandler:
             'ext': '.ods',
             'desc': 'Open Document Spreadsheet',
             'dependencies': ['odfpy', 'pandas']
+        },
+        'parquet': {
+            'ext': '.parquet',
+            'desc': 'Apache Parquet (columnar, comprimido)',
+            'dependencies': ['pyarrow', 'pandas']
+        },
+        'feather': {
+            'ext': '.feather',
+            'desc': 'Apache Arrow IPC / Feather (columnar)',
+            'dependencies': ['pyarrow', 'pandas']
         }
     }
+
+    # Formatos columnares escritos directamente desde un DataFrame con pyarrow
+    COLUMNAR_FORMATS = ('parquet', 'feather')
+
+    # Columnas de baja cardinalidad que se guardan con codificación de diccionario
+    CATEGORICAL_COLUMNS = ('genero', 'estado_civil', 'educacion')
+
+    # Compresión por defecto de los formatos columnares
+    DEFAULT_COMPRESSION = {'parquet': 'zstd', 'feather': 'zstd'}
     
     @classmethod
     def prompt_format_selection(cls) -> Optional[str]:
@@ -155,6 +189,8 @@ class DataFormatHandler:
                         import pandas
                     elif dep == 'odfpy':
                         import odf
+                    elif dep == 'pyarrow':
+                        import pyarrow
                 except ImportError:
                     dependencies_available = False
                     break
@@ -166,14 +202,16 @@ class DataFormatHandler:
         return available_formats
     
     @classmethod
-    def save_data(cls, data: Dict[str, Any], output_path: Union[str, Path], format_key: str) -> bool:
+    def save_data(cls, data: Dict[str, Any], output_path: Union[str, Path], format_key: str,
+                  compression: Optional[str] = None) -> bool:
         """
         Guarda los datos en el formato especificado
         
         Args:
-            data: Diccionario de datos a guardar
+            data: Diccionario de datos a guardar (o DataFrame para Parquet/Feather)
             output_path: Ruta completa donde guardar el archivo (incluyendo el nombre)
             format_key: Clave del formato (json, yaml, txt, etc.)
+            compression: Compresión de los formatos columnares (por defecto zstd)
             
         Returns:
             bool: True si se guardó correctamente, False en caso contrario
@@ -185,6 +223,10 @@ class DataFormatHandler:
             # Asegurar que el directorio padre existe
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
+            # Los formatos columnares trabajan sobre el DataFrame completo
+            if format_key in cls.COLUMNAR_FORMATS:
+                return cls._save_columnar(data, output_path, format_key, compression)
+            
             # Preparar datos antes de guardar (para manejar tipos no serializables como datetime)
             prepared_data = cls._prepare_data_for_export(data)
             
@@ -378,6 +420,77 @@ class DataFormatHandler:
             logger.error(f"Error al guardar ODS: {str(e)}")
             return False
     
+    @classmethod
+    def _save_columnar(cls, data, output_path: Path, format_key: str,
+                       compression: Optional[str] = None) -> bool:
+        """Guarda los datos en Parquet o Feather"""
+        try:
+            if isinstance(data, pd.DataFrame):
+                df = data
+            else:
+                df = pd.DataFrame(cls._flatten_data_for_tabular(cls._prepare_data_for_export(data)))
+            cls.write_columnar(df, output_path, format_key, compression)
+            return True
+        except Exception as e:
+            logger.error(f"Error al guardar {format_key.capitalize()}: {str(e)}")
+            return False
+    
+    @classmethod
+    def to_arrow_table(cls, df, categorical_columns=None):
+        """
+        Convierte un DataFrame en una tabla Arrow
+        
+        Las columnas categóricas presentes (por defecto CATEGORICAL_COLUMNS) se
+        convierten a diccionario: cada valor distinto se guarda una sola vez y
+        las filas solo almacenan su índice.
+        
+        Args:
+            df: DataFrame a convertir
+            categorical_columns: Columnas a codificar con diccionario
+            
+        Returns:
+            pyarrow.Table sin el índice del DataFrame
+        """
+        if pa is None:
+            raise ImportError("Se requiere pyarrow para los formatos columnares: pip install pyarrow")
+        
+        if categorical_columns is None:
+            categorical_columns = cls.CATEGORICAL_COLUMNS
+        categorias = {
+            col: df[col].astype('category')
+            for col in categorical_columns
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)
+        }
+        if categorias:
+            df = df.assign(**categorias)
+        return pa.Table.from_pandas(df, preserve_index=False)
+    
+    @classmethod
+    def write_columnar(cls, df, output_path: Union[str, Path], format_key: str,
+                       compression: Optional[str] = None, categorical_columns=None) -> None:
+        """
+        Escribe un DataFrame en Parquet o Feather (Arrow IPC)
+        
+        A diferencia de save_data, propaga los errores.
+        
+        Args:
+            df: DataFrame a guardar
+            output_path: Archivo de destino
+            format_key: 'parquet' o 'feather'
+            compression: Códec (zstd, lz4, snappy, gzip...) o 'none'
+            categorical_columns: Columnas a codificar con diccionario
+        """
+        if format_key not in cls.COLUMNAR_FORMATS:
+            raise ValueError(f"Formato columnar no soportado: {format_key}")
+        
+        table = cls.to_arrow_table(df, categorical_columns)
+        compression = compression or cls.DEFAULT_COMPRESSION[format_key]
+        if format_key == 'parquet':
+            pq.write_table(table, output_path, compression=compression, use_dictionary=True)
+        else:
+            feather.write_feather(table, output_path,
+                                  compression='uncompressed' if compression == 'none' else compression)
+    
     @classmethod
     def _save_html(cls, data: Dict[str, Any], output_path: Path) -> bool:
         """Guarda los datos en formato HTML"""
@@ -496,12 +609,14 @@ class DataFormatHandler:
         return result
 
     @classmethod
-    def read_data(cls, file_path):
+    def read_data(cls, file_path, columns: Optional[List[str]] = None):
         """
-        Lee datos desde diferentes formatos de archivo (CSV, Excel, etc.)
+        Lee datos desde diferentes formatos de archivo (CSV, Excel, Parquet, etc.)
         
         Args:
             file_path: Ruta al archivo a leer
+            columns: Columnas a cargar (None para todas). En Parquet y Feather
+                     solo se leen del disco las columnas pedidas
             
         Returns:
             DataFrame de pandas con los datos del archivo, o None si hay error
@@ -514,8 +629,10 @@ class DataFormatHandler:
                 logger.error(f"Archivo no encontrado: {file_path}")
                 return None
                 
-            # Determinar el formato basado en la extensión
-            extension = file_path.suffix.lower()
+            # Determinar el formato a partir del contenido (con la extensión como respaldo)
+            deteccion = detectar_formato(file_path)
+            formato = deteccion['formato']
+            encoding = deteccion['encoding'] or 'utf-8'
             
             # Importar pandas para leer los datos
             try:
@@ -526,41 +643,40 @@ class DataFormatHandler:
                 return None
                 
             # Leer según el formato
-            if extension in ['.csv', '.txt']:
-                # Intentar detectar el delimitador
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sample = f.read(1024)
-                    if '\t' in sample:
-                        delimiter = '\t'
-                    elif ';' in sample:
-                        delimiter = ';'
-                    else:
-                        delimiter = ','
+            if formato in ['csv', 'tsv']:
+                return pd.read_csv(file_path, delimiter=deteccion['delimitador'],
+                                   encoding=encoding, usecols=columns)
+                
+            elif formato == 'parquet':
+                return pd.read_parquet(file_path, columns=columns)
+                
+            elif formato == 'feather':
+                return pd.read_feather(file_path, columns=columns)
                 
-                return pd.read_csv(file_path, delimiter=delimiter)
+            elif formato in ['xlsx', 'xls']:
+                df = pd.read_excel(file_path)
                 
-            elif extension in ['.xlsx', '.xls']:
-                return pd.read_excel(file_path)
+            elif formato == 'json':
+                df = pd.read_json(file_path)
                 
-            elif extension == '.json':
-                return pd.read_json(file_path)
+            elif formato == 'jsonl':
+                df = pd.read_json(file_path, lines=True)
                 
-            elif extension in ['.yaml', '.yml']:
-                with open(file_path, 'r', encoding='utf-8') as f:
+            elif formato == 'yaml':
+                with open(file_path, 'r', encoding=encoding) as f:
                     import yaml
                     data = yaml.safe_load(f)
-                return pd.DataFrame(data)
+                df = pd.DataFrame(data)
                 
-            elif extension == '.ods':
-                return pd.read_excel(file_path, engine='odf')
-                
-            elif extension == '.tsv':
-                return pd.read_csv(file_path, delimiter='\t')
+            elif formato == 'ods':
+                df = pd.read_excel(file_path, engine='odf')
                 
             else:
-                logger.error(f"Formato de archivo no soportado: {extension}")
-                print(f"Error: El formato {extension} no está soportado")
+                logger.error(f"Formato de archivo no soportado: {formato} ({file_path.suffix})")
+                print(f"Error: El formato {file_path.suffix} no está soportado")
                 return None
+            
+            return df[columns] if columns is not None else df
                 
         except Exception as e:
             logger.error(f"Error al leer archivo {file_path}: {str(e)}")
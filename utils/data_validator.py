@@ -1,14 +1,36 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import json
 import yaml
+from .registro_validadores import obtener_validador
 
 class DataValidator:
     """Validador de datos y estructuras"""
+
+    # Tipos de campo de las plantillas y su equivalente en JSON Schema
+    FIELD_TYPES = {
+        'string': {'type': 'string'},
+        'number': {'type': 'number'},
+        'date': {'type': 'string', 'format': 'date'},
+        'boolean': {'type': 'boolean'},
+        'email': {'type': 'string', 'format': 'email'}
+    }
+
+    # Reglas de las plantillas que tienen palabra clave en JSON Schema
+    RULE_KEYWORDS = {
+        'min_length': 'minLength', 'minLength': 'minLength',
+        'max_length': 'maxLength', 'maxLength': 'maxLength',
+        'min_value': 'minimum', 'minimum': 'minimum',
+        'max_value': 'maximum', 'maximum': 'maximum',
+        'pattern': 'pattern',
+        'enum': 'enum'
+    }
     
     def __init__(self):
         self.validation_rules = {}
         self.error_messages = []
+        # (reglas, validador, tipos no soportados) de la última traducción
+        self._compiled = None
 
     def load_validation_rules(self, template_path: Path) -> bool:
         """Carga reglas de validación desde una plantilla"""
@@ -35,34 +57,66 @@ class DataValidator:
             self.error_messages.append("No hay reglas de validación cargadas")
             return False
 
+        validator, unsupported = self._compiled_rules()
         is_valid = True
-        for field_name, field_rules in self.validation_rules.items():
-            if not self._validate_field(data.get(field_name), field_rules):
-                is_valid = False
+        for field_name, field_type in unsupported.items():
+            self.error_messages.append(f"Tipo de campo no soportado: {field_type} ({field_name})")
+            is_valid = False
+
+        for error in validator.iter_errors(data):
+            if error.validator == 'required':
+                self.error_messages.append(f"Campo requerido faltante: {error.message}")
+            else:
+                field_name = error.absolute_path[0] if error.absolute_path else ''
+                self.error_messages.append(f"{field_name}: {error.message}")
+            is_valid = False
 
         return is_valid
 
-    def _validate_field(self, value: Any, rules: Dict[str, Any]) -> bool:
-        """Valida un campo individual contra sus reglas"""
-        if rules.get('required', False) and value is None:
-            self.error_messages.append(f"Campo requerido faltante")
-            return False
+    def _compiled_rules(self) -> Tuple[Any, Dict[str, str]]:
+        """
+        Retorna el validador de las reglas actuales, traduciéndolas a JSON Schema
+        solo cuando cambian; el validador sale del registro compartido del proceso
+        """
+        if self._compiled is None or self._compiled[0] is not self.validation_rules:
+            schema, unsupported = self.rules_to_schema(self.validation_rules)
+            self._compiled = (self.validation_rules, obtener_validador(schema), unsupported)
+        return self._compiled[1], self._compiled[2]
 
-        field_type = rules.get('type', 'string')
-        validators = {
-            'string': self._validate_string,
-            'number': self._validate_number,
-            'date': self._validate_date,
-            'boolean': self._validate_boolean,
-            'email': self._validate_email
-        }
-
-        validator = validators.get(field_type)
-        if not validator:
-            self.error_messages.append(f"Tipo de campo no soportado: {field_type}")
-            return False
+    @classmethod
+    def rules_to_schema(cls, validation_rules: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Traduce las reglas de una plantilla a un esquema JSON Draft 7
+
+        Returns:
+            tuple: (esquema, {campo: tipo} de los campos con tipo no soportado)
+        """
+        properties = {}
+        required = []
+        unsupported = {}
+        for field_name, rules in validation_rules.items():
+            rules = rules or {}
+            field_type = rules.get('type', 'string')
+            if field_type not in cls.FIELD_TYPES:
+                unsupported[field_name] = field_type
+                continue
+
+            field_schema = dict(cls.FIELD_TYPES[field_type])
+            for rule, keyword in cls.RULE_KEYWORDS.items():
+                if rule in rules:
+                    field_schema[keyword] = rules[rule]
+
+            if rules.get('required', False):
+                required.append(field_name)
+            else:
+                # Los campos opcionales admiten None
+                field_schema['type'] = [field_schema['type'], 'null']
+            properties[field_name] = field_schema
 
-        return validator(value, rules)
+        schema = {'type': 'object', 'properties': properties}
+        if required:
+            schema['required'] = required
+        return schema, unsupported
 
     def get_errors(self) -> List[str]:
         """Retorna lista de errores de validación"""
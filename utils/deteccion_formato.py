@@ -0,0 +1,222 @@
+"""
+Detección del formato de un archivo a partir de sus primeros bytes.
+
+En lugar de intentar parsear el archivo completo con cada lector hasta que
+uno funcione, se examina una muestra del inicio:
+
+- firmas binarias (Parquet, Feather/Arrow, Excel, ODS, PDF);
+- el primer carácter significativo del texto ('<' para XML/HTML, '{' o '['
+  para JSON o JSON Lines);
+- para texto delimitado, el dialecto (delimitador) con csv.Sniffer y, si
+  falla, con el recuento de separadores por línea.
+
+El resultado se guarda en caché por ruta, fecha de modificación y tamaño,
+de modo que un archivo que no cambia solo se examina una vez.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import codecs
+import csv
+import json
+import zipfile
+
+# Bytes examinados del inicio del archivo
+TAMANO_MUESTRA = 8 * 1024
+
+# Delimitadores considerados para texto tabular
+DELIMITADORES = [',', ';', '\t', '|']
+
+# Firmas binarias al inicio del archivo
+FIRMAS = [
+    (b'PAR1', 'parquet'),
+    (b'ARROW1', 'feather'),
+    (b'FEA1', 'feather'),
+    (b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1', 'xls'),
+    (b'%PDF', 'pdf'),
+]
+
+# Formato sugerido por la extensión cuando el contenido no basta para decidir
+FORMATO_POR_EXTENSION = {
+    '.csv': 'csv', '.txt': 'csv', '.tsv': 'tsv',
+    '.json': 'json', '.jsonl': 'jsonl', '.ndjson': 'jsonl',
+    '.xml': 'xml', '.html': 'html', '.htm': 'html',
+    '.yaml': 'yaml', '.yml': 'yaml',
+    '.xlsx': 'xlsx', '.xls': 'xls', '.ods': 'ods',
+    '.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.ipc': 'feather',
+    '.pdf': 'pdf'
+}
+
+
+def detectar_formato(ruta_archivo: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Detecta el formato de un archivo examinando solo su inicio
+
+    Args:
+        ruta_archivo: Ruta del archivo
+
+    Returns:
+        dict: 'formato' (csv, tsv, json, jsonl, xml, html, yaml, xlsx, xls,
+              ods, parquet, feather, pdf o 'desconocido'), 'encoding' y
+              'delimitador' (solo para texto) y 'origen' ('firma',
+              'contenido' o 'extension')
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    ruta = Path(ruta_archivo).resolve()
+    estado = ruta.stat()
+    return dict(_detectar_en_cache(str(ruta), estado.st_mtime_ns, estado.st_size))
+
+
+def info_cache() -> Any:
+    """Aciertos, fallos y tamaño de la caché de detección"""
+    return _detectar_en_cache.cache_info()
+
+
+def limpiar_cache() -> None:
+    """Vacía la caché de detección"""
+    _detectar_en_cache.cache_clear()
+
+
+@lru_cache(maxsize=512)
+def _detectar_en_cache(ruta: str, mtime_ns: int, tamano: int) -> Dict[str, Any]:
+    """Detección real; mtime_ns y tamano solo forman parte de la clave de caché"""
+    ruta = Path(ruta)
+    with open(ruta, 'rb') as f:
+        muestra = f.read(TAMANO_MUESTRA)
+    truncada = tamano > len(muestra)
+    extension = ruta.suffix.lower()
+
+    for firma, formato in FIRMAS:
+        if muestra.startswith(firma):
+            return _resultado(formato, 'firma')
+    if muestra.startswith(b'PK\x03\x04'):
+        return _resultado(_formato_zip(ruta, muestra, extension), 'firma')
+
+    encoding, texto = _decodificar(muestra, truncada)
+    if texto is None:
+        return _resultado(FORMATO_POR_EXTENSION.get(extension, 'desconocido'), 'extension')
+
+    contenido = texto.lstrip()
+    if not contenido:
+        return _resultado(FORMATO_POR_EXTENSION.get(extension, 'desconocido'), 'extension', encoding)
+
+    if contenido.startswith('<'):
+        cabecera = contenido[:1024].lower()
+        formato = 'html' if ('<!doctype html' in cabecera or '<html' in cabecera) else 'xml'
+        return _resultado(formato, 'contenido', encoding)
+
+    if contenido[0] in '{[':
+        return _resultado(_formato_json(contenido, extension, truncada), 'contenido', encoding)
+
+    if contenido.startswith('---') or (extension in ('.yaml', '.yml')):
+        return _resultado('yaml', 'contenido' if contenido.startswith('---') else 'extension', encoding)
+
+    delimitador = detectar_delimitador(texto, truncada)
+    if delimitador is None:
+        formato = FORMATO_POR_EXTENSION.get(extension, 'csv')
+        if formato == 'tsv':
+            delimitador = '\t'
+        elif formato == 'csv':
+            delimitador = ','
+        return _resultado(formato, 'extension', encoding, delimitador)
+    return _resultado('tsv' if delimitador == '\t' else 'csv', 'contenido', encoding, delimitador)
+
+
+def detectar_delimitador(texto: str, truncada: bool = False) -> Optional[str]:
+    """
+    Detecta el delimitador de una muestra de texto tabular
+
+    Args:
+        texto: Muestra del inicio del archivo
+        truncada: Si es True, se descarta la última línea por estar incompleta
+
+    Returns:
+        str: Delimitador detectado, o None si la muestra no parece tabular
+    """
+    lineas = texto.splitlines()
+    if truncada and len(lineas) > 1:
+        lineas = lineas[:-1]
+    lineas = [linea for linea in lineas[:50] if linea.strip()]
+    if not lineas:
+        return None
+
+    try:
+        return csv.Sniffer().sniff('\n'.join(lineas), delimiters=''.join(DELIMITADORES)).delimiter
+    except csv.Error:
+        pass
+
+    # Delimitador presente en todas las líneas con el mismo número de apariciones
+    mejor, mejor_cuenta = None, 0
+    for delimitador in DELIMITADORES:
+        cuentas = [linea.count(delimitador) for linea in lineas]
+        if min(cuentas) > 0 and min(cuentas) == max(cuentas) and cuentas[0] > mejor_cuenta:
+            mejor, mejor_cuenta = delimitador, cuentas[0]
+    return mejor
+
+
+def _resultado(formato: str, origen: str, encoding: Optional[str] = None,
+               delimitador: Optional[str] = None) -> Dict[str, Any]:
+    return {'formato': formato, 'encoding': encoding, 'delimitador': delimitador, 'origen': origen}
+
+
+def _decodificar(muestra: bytes, truncada: bool):
+    """
+    Decodifica la muestra detectando BOM, UTF-8 o cp1252/latin-1
+
+    Returns:
+        tuple: (encoding, texto), o (None, None) si parece binario
+    """
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'),
+                          (codecs.BOM_UTF16_BE, 'utf-16')):
+        if muestra.startswith(bom):
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            return encoding, decoder.decode(muestra, final=not truncada)
+
+    if b'\x00' in muestra:
+        return None, None
+
+    for encoding in ('utf-8', 'cp1252', 'latin-1'):
+        try:
+            # El decodificador incremental tolera un carácter multibyte cortado al final de la muestra
+            decoder = codecs.getincrementaldecoder(encoding)()
+            return encoding, decoder.decode(muestra, final=not truncada)
+        except UnicodeDecodeError:
+            continue
+    return None, None
+
+
+def _formato_json(contenido: str, extension: str, truncada: bool) -> str:
+    """Distingue un documento JSON de JSON Lines mirando las primeras líneas"""
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    lineas = [linea.strip() for linea in contenido.splitlines() if linea.strip()]
+    if truncada and len(lineas) > 1:
+        lineas = lineas[:-1]
+    if len(lineas) < 2 or not lineas[1].startswith('{'):
+        return 'json'
+    try:
+        json.loads(lineas[0])
+        return 'jsonl'
+    except ValueError:
+        return 'json'
+
+
+def _formato_zip(ruta: Path, muestra: bytes, extension: str) -> str:
+    """Distingue los formatos basados en ZIP (xlsx, ods)"""
+    # En ODS el primer miembro es 'mimetype', sin comprimir, con el tipo del documento
+    if b'mimetype' in muestra[:64] and b'opendocument.spreadsheet' in muestra[:128]:
+        return 'ods'
+    if b'xl/' in muestra:
+        return 'xlsx'
+    try:
+        with zipfile.ZipFile(ruta) as zf:
+            nombres = zf.namelist()
+    except zipfile.BadZipFile:
+        return FORMATO_POR_EXTENSION.get(extension, 'desconocido')
+    if any(nombre.startswith('xl/') for nombre in nombres):
+        return 'xlsx'
+    if 'mimetype' in nombres and 'content.xml' in nombres:
+        return 'ods'
+    return FORMATO_POR_EXTENSION.get(extension, 'desconocido')
@@ -1,11 +1,210 @@
 from pathlib import Path
 from datetime import datetime  # Añadida importación
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import time
+import pandas as pd
 from utils.file_naming import FileNamingConvention
 from utils.data_formats import DataFormatHandler
 
+# pyarrow es opcional: solo se usa para exportar a Parquet por bloques
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
 class ExportadorBase:
     """Clase base para todos los exportadores de datos"""
     
+    # Formatos que admiten escritura incremental por bloques (exportar_por_bloques)
+    FORMATOS_STREAMING = {
+        'csv': 'CSV',
+        'tsv': 'TSV',
+        'jsonl': 'JSON Lines',
+        'parquet': 'Parquet'
+    }
+
+    # Bloques Parquet que se retienen esperando el tipo de una columna nula
+    BLOQUES_PENDIENTES_MAX = 8
+
+    def __init__(self, carpeta_base=None, modulo=None):
+        """
+        Args:
+            carpeta_base: Carpeta base para guardar los archivos exportados
+            modulo: Nombre del módulo que exporta (FARC, BIO, ...)
+        """
+        self.carpeta_base = Path(carpeta_base) if carpeta_base else None
+        self.modulo = modulo
+
+    def exportar_por_bloques(self, bloques: Iterable[pd.DataFrame], ruta_salida: Union[str, Path],
+                             formato: str, total: Optional[int] = None,
+                             progreso: Callable[[Dict[str, Any]], None] = None,
+                             compresion: Optional[str] = None,
+                             tipos: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Escribe un iterador de DataFrames en un archivo, bloque a bloque
+
+        Solo hay un bloque en memoria a la vez, así que el consumo no depende
+        del número total de filas (en Parquet, salvo mientras alguna columna
+        siga sin tipo conocido; ver _abrir_escritor).
+
+        Args:
+            bloques: Iterador de DataFrames con las mismas columnas
+            ruta_salida: Archivo de destino
+            formato: Clave de FORMATOS_STREAMING (csv, tsv, jsonl, parquet)
+            total: Filas esperadas, solo para mostrar el avance
+            progreso: Función que recibe el avance tras cada bloque; por
+                      defecto se imprime una línea por bloque
+            compresion: Códec de Parquet (por defecto zstd)
+            tipos: Tipos declarados {columna: dtype de pandas o tipo Arrow}
+                   para las columnas que lleguen completamente nulas (Parquet)
+
+        Returns:
+            dict: filas, bloques y segundos empleados
+        """
+        if formato not in self.FORMATOS_STREAMING:
+            raise ValueError(f"Formato no soportado para exportación por bloques: {formato}")
+        if formato == 'parquet' and not PYARROW_AVAILABLE:
+            raise ImportError("Se requiere pyarrow para exportar a Parquet: pip install pyarrow")
+
+        ruta_salida = Path(ruta_salida)
+        ruta_salida.parent.mkdir(parents=True, exist_ok=True)
+        inicio = time.perf_counter()
+        estado = {'filas': 0, 'bloques': 0, 'segundos': 0.0}
+
+        escribir, cerrar = self._abrir_escritor(formato, ruta_salida, compresion, tipos)
+        try:
+            for bloque in bloques:
+                escribir(bloque)
+                estado['filas'] += len(bloque)
+                estado['bloques'] += 1
+                estado['segundos'] = round(time.perf_counter() - inicio, 3)
+
+                avance = dict(estado, total=total, ruta=str(ruta_salida))
+                if progreso:
+                    progreso(avance)
+                else:
+                    self._mostrar_avance_bloque(avance)
+        finally:
+            cerrar()
+
+        print(f"Archivo exportado exitosamente: {ruta_salida} ({estado['filas']} filas)")
+        return estado
+
+    def _abrir_escritor(self, formato: str, ruta: Path, compresion: Optional[str] = None,
+                        tipos: Optional[Dict[str, Any]] = None):
+        """
+        Prepara la escritura incremental de un formato
+
+        En Parquet cada bloque es un row group y las columnas categóricas se
+        codifican con diccionario (DataFormatHandler.CATEGORICAL_COLUMNS).
+        El esquema del archivo no puede cambiar una vez abierto, así que una
+        columna que llega completamente nula (tipo null de Arrow) toma el tipo
+        declarado en tipos o, si no lo hay, el del primer bloque posterior que
+        traiga valores; mientras tanto los bloques se retienen (como mucho
+        BLOQUES_PENDIENTES_MAX, después esas columnas se escriben como texto).
+
+        Returns:
+            tuple: (escribir(df), cerrar())
+        """
+        if formato == 'parquet':
+            estado = {'escritor': None, 'esquema': None, 'pendientes': []}
+            declarados = {col: self._tipo_arrow(tipo) for col, tipo in (tipos or {}).items()}
+
+            def abrir(esquema):
+                estado['escritor'] = pq.ParquetWriter(
+                    ruta, esquema,
+                    compression=compresion or DataFormatHandler.DEFAULT_COMPRESSION['parquet']
+                )
+                for tabla in estado['pendientes']:
+                    estado['escritor'].write_table(tabla.cast(esquema))
+                estado['pendientes'] = []
+
+            def escribir(df):
+                tabla = DataFormatHandler.to_arrow_table(df)
+                if estado['escritor'] is not None:
+                    estado['escritor'].write_table(tabla.cast(estado['escritor'].schema))
+                    return
+
+                estado['esquema'] = self._completar_esquema(estado['esquema'] or tabla.schema,
+                                                            tabla.schema, declarados)
+                estado['pendientes'].append(tabla)
+                if not self._columnas_nulas(estado['esquema']):
+                    abrir(estado['esquema'])
+                elif len(estado['pendientes']) >= self.BLOQUES_PENDIENTES_MAX:
+                    texto = {col: pa.large_string() for col in self._columnas_nulas(estado['esquema'])}
+                    abrir(self._completar_esquema(estado['esquema'], estado['esquema'], texto))
+
+            def cerrar():
+                # Columnas nulas en todos los bloques: se conservan como null
+                if estado['escritor'] is None and estado['pendientes']:
+                    abrir(estado['esquema'])
+                if estado['escritor'] is not None:
+                    estado['escritor'].close()
+
+            return escribir, cerrar
+
+        archivo = open(ruta, 'w', encoding='utf-8', newline='')
+        primero = {'valor': True}
+
+        if formato in ('csv', 'tsv'):
+            separador = '\t' if formato == 'tsv' else ','
+
+            def escribir(df):
+                df.to_csv(archivo, sep=separador, index=False, header=primero['valor'])
+                primero['valor'] = False
+        else:
+            def escribir(df):
+                texto = df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+                archivo.write(texto if texto.endswith('\n') or not texto else texto + '\n')
+
+        return escribir, archivo.close
+
+    @staticmethod
+    def _tipo_arrow(tipo: Any):
+        """Convierte un dtype de pandas (o un tipo Arrow) al tipo Arrow de sus columnas"""
+        if isinstance(tipo, pa.DataType):
+            return tipo
+        tipo_arrow = pa.Array.from_pandas(pd.Series([], dtype=pd.api.types.pandas_dtype(tipo))).type
+        # object y category sin valores no dicen nada del contenido: se asume texto
+        if pa.types.is_dictionary(tipo_arrow) and pa.types.is_null(tipo_arrow.value_type):
+            return pa.dictionary(tipo_arrow.index_type, pa.large_string())
+        return pa.large_string() if pa.types.is_null(tipo_arrow) else tipo_arrow
+
+    @staticmethod
+    def _columnas_nulas(esquema) -> List[str]:
+        """Columnas de un esquema Arrow que aún tienen el tipo null"""
+        return [campo.name for campo in esquema if pa.types.is_null(campo.type)]
+
+    @staticmethod
+    def _completar_esquema(esquema, otro, declarados: Dict[str, Any]):
+        """
+        Sustituye los campos null de esquema por el tipo declarado o, si no
+        hay declaración, por el tipo que tenga la misma columna en otro
+        """
+        campos = []
+        for campo in esquema:
+            if pa.types.is_null(campo.type):
+                if campo.name in declarados:
+                    campo = campo.with_type(declarados[campo.name])
+                elif campo.name in otro.names:
+                    campo = campo.with_type(otro.field(campo.name).type)
+            campos.append(campo)
+        return pa.schema(campos, metadata=esquema.metadata)
+
+    def _mostrar_avance_bloque(self, avance: Dict[str, Any]) -> None:
+        """Imprime el avance de una exportación por bloques"""
+        velocidad = avance['filas'] / avance['segundos'] if avance['segundos'] else 0
+        if avance.get('total'):
+            porcentaje = avance['filas'] / avance['total'] * 100
+            print(f"📦 Bloque {avance['bloques']}: {avance['filas']}/{avance['total']} filas "
+                  f"({porcentaje:.1f}%, {velocidad:,.0f} filas/s)")
+        else:
+            print(f"📦 Bloque {avance['bloques']}: {avance['filas']} filas ({velocidad:,.0f} filas/s)")
+
     def exportar(self, df, clinic_initials, output_dir, module_name):
         """
         Exporta datos en múltiples formatos
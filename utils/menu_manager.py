@@ -1070,6 +1070,10 @@ class MenuManager:
                 }
             }
             
+            # Un único extractor con la caché de extracciones de la clínica
+            extractor = PDFExtractor()
+            extractor.usar_cache(MenuManager.base_path / MenuManager.clinica_actual / '.cache')
+            
             # Tipos de documentos a buscar
             tipos_docs = ['FARC', 'BIO', 'MTP', 'notas_progreso', 'Internal_Referral', 'Intake']
             
@@ -1109,9 +1113,6 @@ class MenuManager:
                     
                     # Procesar el PDF
                     try:
-                        # Inicializar el extractor
-                        extractor = PDFExtractor()
-                        
                         # Extraer el texto
                         contenido, calidad = extractor.leer_pdf(pdf, use_ai=usar_ia)  # Pasar el parámetro de IA
                         if not contenido:
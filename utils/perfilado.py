@@ -0,0 +1,259 @@
+"""
+Perfilado de columnas sobre una muestra para DataFrames muy grandes.
+
+Las comprobaciones baratas (nulos, estadísticas numéricas) se hacen sobre
+la columna completa con operaciones vectorizadas; la inferencia de tipo y la
+cardinalidad se calculan sobre una muestra de reservorio. Solo se vuelve a
+recorrer la columna completa cuando la muestra no basta para decidir:
+
+- el porcentaje de valores que encajan con el tipo dominante está tan cerca
+  del umbral que el error de muestreo podría cambiar la decisión, o
+- la columna tiene pocos valores distintos y se necesita la lista exacta.
+"""
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+import math
+import numpy as np
+import pandas as pd
+
+# Patrones de fecha reconocidos (equivalentes a AdvancedContentAnalyzer._looks_like_date)
+PATRON_FECHA = r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}\.\d{2}\.\d{4}'
+# Números escritos con ceros a la izquierda (códigos como '0100'): se tratan como texto
+PATRON_CERO_INICIAL = r'[+-]?0\d'
+
+
+def muestra_reservorio(datos: Union[pd.DataFrame, Iterable[pd.DataFrame]], tamano: int,
+                       semilla: Optional[int] = 0) -> Tuple[pd.DataFrame, int]:
+    """
+    Obtiene una muestra uniforme de como máximo tamano filas
+
+    Acepta un DataFrame o un iterador de bloques (por ejemplo
+    LectorArchivos.leer_csv con tamano_bloque); en ese caso se aplica el
+    algoritmo R de muestreo de reservorio, vectorizado por bloque, de modo que
+    la memoria usada no depende del tamaño del archivo.
+
+    Args:
+        datos: DataFrame o iterador de DataFrames con las mismas columnas
+        tamano: Filas máximas de la muestra
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        tuple: (muestra, filas totales vistas)
+    """
+    rng = np.random.default_rng(semilla)
+    if isinstance(datos, pd.DataFrame):
+        if len(datos) <= tamano:
+            return datos, len(datos)
+        posiciones = np.sort(rng.choice(len(datos), tamano, replace=False))
+        return datos.take(posiciones), len(datos)
+
+    reservorio = None
+    vistos = 0
+    for bloque in datos:
+        bloque = bloque.reset_index(drop=True)
+        llenado = 0 if reservorio is None else len(reservorio)
+        if llenado < tamano:
+            inicial = bloque.iloc[:tamano - llenado]
+            reservorio = inicial if reservorio is None else pd.concat([reservorio, inicial], ignore_index=True)
+            vistos += len(inicial)
+            bloque = bloque.iloc[len(inicial):].reset_index(drop=True)
+        if bloque.empty:
+            continue
+
+        # La fila t-ésima (0-based) entra en el reservorio con probabilidad tamano / (t + 1)
+        destinos = rng.integers(0, vistos + np.arange(len(bloque)) + 1)
+        filas = np.flatnonzero(destinos < tamano)
+        if len(filas):
+            huecos = destinos[filas]
+            # Si varias filas caen en el mismo hueco gana la última, como en el algoritmo secuencial
+            ultimas = ~pd.Series(huecos).duplicated(keep='last').to_numpy()
+            filas, huecos = filas[ultimas], huecos[ultimas]
+            conservar = np.ones(len(reservorio), dtype=bool)
+            conservar[huecos] = False
+            nuevas = bloque.iloc[filas].set_axis(huecos)
+            reservorio = pd.concat([reservorio[conservar], nuevas]).sort_index()
+        vistos += len(bloque)
+
+    if reservorio is None:
+        return pd.DataFrame(), 0
+    return reservorio.reset_index(drop=True), vistos
+
+
+def fracciones_tipo(valores: pd.Series) -> Dict[str, float]:
+    """
+    Calcula, de forma vectorizada, qué fracción de los valores no nulos
+    encaja con cada tipo (boolean, number, date, time, object)
+    """
+    valores = valores.dropna()
+    if valores.empty:
+        return {}
+
+    fracciones = {}
+    if valores.dtype == object:
+        fracciones['object'] = valores.map(lambda v: isinstance(v, (dict, list))).mean()
+    texto = valores.astype(str).str.strip()
+    fracciones['boolean'] = texto.str.lower().isin(['true', 'false']).mean()
+    fracciones['number'] = pd.to_numeric(texto, errors='coerce').notna().mean()
+    fracciones['date'] = texto.str.match(PATRON_FECHA).mean()
+    fracciones['time'] = texto.str.count(':').eq(2).mean()
+    return {tipo: float(fraccion) for tipo, fraccion in fracciones.items()}
+
+
+class PerfiladorColumnas:
+    """Calcula el perfil de cada columna de un DataFrame a partir de una muestra"""
+
+    def __init__(self, tamano_muestra: int = 10_000, umbral_tipo: float = 0.95,
+                 limite_categorias: int = 5, semilla: Optional[int] = 0):
+        """
+        Args:
+            tamano_muestra: Filas de la muestra de reservorio
+            umbral_tipo: Fracción mínima de valores que deben encajar con un tipo
+                         para asignarlo a una columna de texto
+            limite_categorias: Columnas con como mucho estos valores distintos
+                               se listan de forma exacta
+            semilla: Semilla del muestreo
+        """
+        self.tamano_muestra = max(1, tamano_muestra)
+        self.umbral_tipo = umbral_tipo
+        self.limite_categorias = limite_categorias
+        self.semilla = semilla
+
+    def perfilar(self, datos: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Perfila las columnas de un DataFrame o de un iterador de bloques
+
+        Con un iterador los nulos se cuentan de forma exacta mientras se
+        muestrea, pero no es posible volver a recorrer las columnas ambiguas.
+
+        Returns:
+            dict: {columna: perfil} con dtype, filas, nulos, n_unicos,
+                  tipo_inferido, confianza, ejemplos, estadísticas y si
+                  hubo que recorrer la columna completa ('escalado')
+        """
+        if isinstance(datos, pd.DataFrame):
+            muestra, filas = muestra_reservorio(datos, self.tamano_muestra, self.semilla)
+            nulos = datos.isna().sum()
+            primeros = datos.head(1)
+            completo = datos
+        else:
+            contadores = {'nulos': None, 'primeros': None}
+            muestra, filas = muestra_reservorio(self._contar_nulos(datos, contadores),
+                                                self.tamano_muestra, self.semilla)
+            nulos = contadores['nulos'] if contadores['nulos'] is not None else pd.Series(dtype=int)
+            primeros = contadores['primeros'] if contadores['primeros'] is not None else muestra.head(1)
+            completo = None
+
+        exacta = completo is not None and len(muestra) == filas
+        perfiles = {}
+        for columna in muestra.columns:
+            columna_completa = completo[columna] if completo is not None else None
+            perfiles[columna] = self._perfilar_columna(
+                muestra[columna], columna_completa, filas, int(nulos.get(columna, 0)),
+                primeros[columna].iloc[0] if len(primeros) else None, exacta
+            )
+        return perfiles
+
+    @staticmethod
+    def _contar_nulos(bloques: Iterable[pd.DataFrame], contadores: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+        """Deja pasar los bloques acumulando sus nulos y guardando la primera fila"""
+        for bloque in bloques:
+            if contadores['primeros'] is None:
+                contadores['primeros'] = bloque.head(1)
+            nulos = bloque.isna().sum()
+            contadores['nulos'] = nulos if contadores['nulos'] is None else contadores['nulos'].add(nulos, fill_value=0)
+            yield bloque
+
+    def _perfilar_columna(self, muestra: pd.Series, completa: Optional[pd.Series], filas: int,
+                          nulos: int, primer_valor: Any, exacta: bool) -> Dict[str, Any]:
+        """Perfila una columna a partir de su muestra y, si hace falta, de la columna completa"""
+        validos = muestra.dropna()
+        perfil = {
+            'dtype': str(muestra.dtype),
+            'kind': muestra.dtype.kind,
+            'filas': filas,
+            'muestra': len(muestra),
+            'nulos': nulos,
+            'ratio_nulos': nulos / filas if filas else 0.0,
+            'primer_valor': primer_valor,
+            'escalado': False
+        }
+
+        # Tipo: directo para dtypes no textuales; sobre la muestra para texto
+        tipo, confianza = self._tipo_por_dtype(muestra)
+        if tipo is None:
+            fracciones = fracciones_tipo(muestra)
+            tipo, confianza = max(fracciones.items(), key=lambda x: x[1]) if fracciones else ('string', 0.0)
+            if not exacta and completa is not None and self._es_ambiguo(confianza, len(validos)):
+                confianza = fracciones_tipo(completa).get(tipo, 0.0)
+                perfil['escalado'] = True
+            if confianza < self.umbral_tipo:
+                tipo = 'string'
+            elif tipo == 'number' and validos.astype(str).str.strip().str.match(PATRON_CERO_INICIAL).any():
+                tipo = 'string'
+        perfil.update({'tipo_inferido': tipo, 'confianza': round(confianza, 4)})
+
+        # Cardinalidad: exacta si la muestra es la columna completa o si hay pocos valores.
+        # La muestra puede no ver valores raros, así que la lista solo se emite
+        # si la columna completa sigue dentro del límite
+        n_unicos = validos.nunique()
+        perfil['n_unicos_exacto'] = exacta
+        if n_unicos <= self.limite_categorias:
+            origen = muestra if exacta or completa is None else completa
+            if origen is completa:
+                perfil['escalado'] = True
+                n_unicos = completa.nunique()
+            perfil['n_unicos_exacto'] = origen is not muestra or exacta
+            if n_unicos <= self.limite_categorias:
+                perfil['valores_unicos'] = origen.unique().tolist()
+        elif not exacta and n_unicos == len(validos):
+            # Todos distintos en la muestra: probablemente un identificador
+            n_unicos = filas - nulos
+        perfil['n_unicos'] = int(n_unicos)
+
+        perfil['ejemplos'] = self._ejemplos(completa if completa is not None else muestra, validos)
+        perfil['estadisticas'] = self._estadisticas(completa if completa is not None else muestra,
+                                                    validos, perfil['n_unicos'], tipo)
+        return perfil
+
+    @staticmethod
+    def _tipo_por_dtype(serie: pd.Series) -> Tuple[Optional[str], float]:
+        """Tipo decidido por el dtype, o (None, 0) si hay que mirar los valores"""
+        if pd.api.types.is_bool_dtype(serie):
+            return 'boolean', 1.0
+        if pd.api.types.is_numeric_dtype(serie):
+            return 'number', 1.0
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return 'date', 1.0
+        return None, 0.0
+
+    def _es_ambiguo(self, fraccion: float, n: int) -> bool:
+        """True si la fracción está dentro del error de muestreo (3 sigmas) del umbral"""
+        if n == 0:
+            return False
+        margen = 3 * math.sqrt(self.umbral_tipo * (1 - self.umbral_tipo) / n) + 1 / n
+        return abs(fraccion - self.umbral_tipo) <= margen
+
+    @staticmethod
+    def _ejemplos(serie: pd.Series, validos_muestra: pd.Series, cantidad: int = 5) -> list:
+        """Primeros valores no nulos, buscándolos solo al principio de la columna"""
+        ejemplos = serie.head(1000).dropna().head(cantidad)
+        if len(ejemplos) < cantidad:
+            ejemplos = validos_muestra.head(cantidad)
+        return ejemplos.tolist()
+
+    @staticmethod
+    def _estadisticas(serie: pd.Series, validos_muestra: pd.Series, n_unicos: int,
+                      tipo: Optional[str] = None) -> Dict[str, Any]:
+        """
+        min/max/mean: exactos para columnas numéricas, sobre la muestra para el resto
+
+        Un texto inferido como número se convierte antes, para que los límites
+        sean números y no cadenas.
+        """
+        try:
+            if tipo == 'number' and not pd.api.types.is_numeric_dtype(serie):
+                serie = pd.to_numeric(serie, errors='coerce')
+            if pd.api.types.is_numeric_dtype(serie):
+                return {'min': serie.min(), 'max': serie.max(), 'mean': serie.mean(), 'unique': n_unicos}
+            return {'min': validos_muestra.min(), 'max': validos_muestra.max(), 'mean': None, 'unique': n_unicos}
+        except Exception:
+            return {'unique': n_unicos}
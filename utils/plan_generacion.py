@@ -0,0 +1,379 @@
+"""
+Generación columnar de datos sintéticos a partir de una estructura.
+
+La estructura (DataFrame con Campo/Tipo/Ejemplo/Valores_Posibles) se compila
+una sola vez en un PlanGeneracion: cada fila se resuelve a una función que
+produce todos los valores de la columna de una vez, en lugar de llamar a
+generar_valor registro por registro.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import ast
+import json
+import random
+
+import numpy as np
+import pandas as pd
+
+# Textos distintos que se piden a Faker para rellenar una columna libre (ver
+# tamano_pool_texto): como mínimo TAMANO_POOL_TEXTO, uno por cada
+# PROPORCION_POOL_TEXTO registros y nunca más de TAMANO_POOL_TEXTO_MAX
+TAMANO_POOL_TEXTO = 256
+PROPORCION_POOL_TEXTO = 4
+TAMANO_POOL_TEXTO_MAX = 20_000
+
+
+def parsear_valores_posibles(valor: Any) -> Optional[List[Any]]:
+    """
+    Convierte Valores_Posibles en lista sin usar eval()
+
+    Acepta listas/tuplas/conjuntos, literales de Python ("['A', 'B']") y JSON.
+
+    Returns:
+        list o None si el valor no representa una lista de opciones
+    """
+    if isinstance(valor, (list, tuple, set, np.ndarray)):
+        return list(valor)
+    if not isinstance(valor, str) or not valor.strip():
+        return None
+
+    for parser in (ast.literal_eval, json.loads):
+        try:
+            resultado = parser(valor)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+        if isinstance(resultado, (list, tuple, set)):
+            return list(resultado)
+        return None
+    return None
+
+
+def fuentes_aleatorias(semilla: Union[int, np.random.SeedSequence, None],
+                       fake=None) -> Tuple[np.random.Generator, random.Random]:
+    """
+    Crea las fuentes aleatorias propias de un generador a partir de una semilla
+
+    Con la misma semilla se obtienen los mismos datos, sin depender del módulo
+    global random ni del estado compartido de Faker.
+
+    Args:
+        semilla: int, numpy.random.SeedSequence o None (aleatoria)
+        fake: Instancia de Faker a sembrar (opcional)
+
+    Returns:
+        tuple: (numpy.random.Generator, random.Random)
+    """
+    if semilla is None:
+        return np.random.default_rng(), random.Random()
+
+    if isinstance(semilla, np.random.SeedSequence):
+        entero = int(semilla.generate_state(1)[0])
+    else:
+        entero = int(semilla)
+    if fake is not None:
+        fake.seed_instance(entero)
+    return np.random.default_rng(semilla), random.Random(entero)
+
+
+def elegir(rng: np.random.Generator, opciones: List[Any], n: int) -> np.ndarray:
+    """Equivalente vectorizado de random.choice(opciones) repetido n veces"""
+    valores = np.empty(len(opciones), dtype=object)
+    valores[:] = list(opciones)
+    return valores[rng.integers(0, len(valores), n)]
+
+
+def enteros(rng: np.random.Generator, minimo: int, maximo: int, n: int) -> np.ndarray:
+    """Equivalente vectorizado de random.randint(minimo, maximo)"""
+    return rng.integers(minimo, maximo + 1, n)
+
+
+def fechas_entre(rng: np.random.Generator, inicio: date, fin: date, n: int) -> np.ndarray:
+    """Fechas uniformes entre inicio y fin (ambas incluidas), como datetime64[D]"""
+    dias = (fin - inicio).days
+    return np.datetime64(inicio, 'D') + rng.integers(0, dias + 1, n).astype('timedelta64[D]')
+
+
+def fechas_relativas(rng: np.random.Generator, dias_desde: int, dias_hasta: int, n: int,
+                     hoy: Optional[date] = None) -> np.ndarray:
+    """
+    Fechas entre hoy + dias_desde y hoy + dias_hasta (p.ej. -365, 0 para el último año)
+
+    hoy puede fijarse para regenerar exactamente los mismos datos otro día.
+    """
+    hoy = hoy or date.today()
+    return fechas_entre(rng, hoy + timedelta(days=dias_desde), hoy + timedelta(days=dias_hasta), n)
+
+
+def digitos_por_formato(rng: np.random.Generator, formato: str, n: int) -> np.ndarray:
+    """
+    Textos con la forma de formato en los que cada 'X' es un dígito aleatorio
+    (p.ej. teléfonos 'XXX-XXX-XXXX')
+
+    Todos los valores se construyen como una matriz de bytes y se convierten
+    a texto de una sola vez.
+    """
+    plantilla = np.frombuffer(formato.encode('utf-8'), dtype=np.uint8)
+    posiciones = np.flatnonzero(plantilla == ord('X'))
+
+    matriz = np.tile(plantilla, (n, 1))
+    matriz[:, posiciones] = rng.integers(0, 10, (n, len(posiciones)), dtype=np.uint8) + ord('0')
+
+    textos = matriz.view(f'S{len(plantilla)}').ravel()
+    return np.char.decode(textos, 'utf-8').astype(object)
+
+
+def tamano_pool_texto(n: int, proporcion: int = PROPORCION_POOL_TEXTO,
+                      maximo: int = TAMANO_POOL_TEXTO_MAX) -> int:
+    """
+    Número de valores de Faker para una columna de n registros
+
+    Crece con n (un valor por cada proporcion registros, al menos
+    TAMANO_POOL_TEXTO) hasta maximo, y nunca supera n.
+    """
+    return min(n, max(TAMANO_POOL_TEXTO, n // max(1, proporcion)), maximo)
+
+
+def textos_faker(rng: np.random.Generator, funcion: Callable[[], Any], n: int,
+                 tamano_pool: Optional[int] = None) -> np.ndarray:
+    """
+    Rellena una columna con valores de Faker llamando a Faker solo
+    tamano_pool veces y sorteando entre ellos
+
+    Cada llamada a Faker cuesta decenas de microsegundos, que es justo lo que
+    el plan evita. A cambio, la columna tiene como mucho tamano_pool valores
+    distintos y cada uno se repite unas n / tamano_pool veces, mientras que
+    generar_valor produce un texto nuevo por registro. Por defecto el pool
+    crece con n (tamano_pool_texto): hasta TAMANO_POOL_TEXTO registros el
+    resultado tiene la misma variedad que la ruta por registro, y para
+    columnas muy grandes el coste queda acotado en TAMANO_POOL_TEXTO_MAX
+    llamadas a costa de repetir valores.
+
+    Args:
+        rng: Generador aleatorio de NumPy
+        funcion: Llamada de Faker que produce un valor
+        n: Número de valores
+        tamano_pool: Valores distintos a pedir a Faker (None para tamano_pool_texto(n))
+    """
+    if tamano_pool is None:
+        tamano_pool = tamano_pool_texto(n)
+    pool = [funcion() for _ in range(min(n, tamano_pool))]
+    return elegir(rng, pool, n) if pool else np.empty(0, dtype=object)
+
+
+class PlanGeneracion:
+    """Plan compilado de generación: una función vectorizada por columna"""
+
+    def __init__(self, columnas: List[Tuple[str, Any, Callable[[int], Any]]]):
+        """
+        Args:
+            columnas: Tuplas (campo, tipo, generador) donde generador(n) devuelve n valores
+        """
+        self.columnas = columnas
+
+    @staticmethod
+    def _leer_fila(row: pd.Series) -> Tuple[str, Any, Any, Any]:
+        """Obtiene campo, tipo, ejemplo y valores posibles de una fila de la estructura"""
+        campo = row['Campo'] if 'Campo' in row else row['nombre']
+        tipo = row['Tipo'] if 'Tipo' in row else row['tipo']
+        ejemplo = row.get('Ejemplo', None)
+        valores = parsear_valores_posibles(row.get('Valores_Posibles', None))
+        return campo, tipo, ejemplo, valores
+
+    @classmethod
+    def compilar(cls, estructura: pd.DataFrame, generador) -> 'PlanGeneracion':
+        """
+        Resuelve cada fila de la estructura a un generador de columna
+
+        Sigue el mismo orden de decisión que generar_valor: valores posibles
+        (si son 5 o menos), generador específico por nombre de campo,
+        generador por tipo y, por último, el ejemplo o texto de Faker.
+
+        Args:
+            estructura: DataFrame con la estructura master
+            generador: Instancia de GeneradorBIO/MTP/FARC/Pacientes con
+                       generadores_columna y generadores_tipo
+        """
+        columnas = []
+        for _, row in estructura.iterrows():
+            campo, tipo, ejemplo, valores = cls._leer_fila(row)
+            columnas.append((campo, tipo, cls._resolver(generador, campo, tipo, ejemplo, valores)))
+        return cls(columnas)
+
+    @staticmethod
+    def _resolver(generador, campo: str, tipo: Any, ejemplo: Any,
+                  valores: Optional[List[Any]]) -> Callable[[int], Any]:
+        """Elige el generador vectorizado de una columna"""
+        gen = PlanGeneracion._resolver_base(generador, campo, tipo, ejemplo, valores)
+
+        # Generadores que dejan vacíos algunos campos sin ejemplo (p.ej. pacientes)
+        probabilidad_nulo = getattr(generador, 'probabilidad_nulo', 0)
+        if probabilidad_nulo and pd.isna(ejemplo):
+            return lambda n, gen=gen: anular(generador.rng, gen(n), probabilidad_nulo)
+        return gen
+
+    @staticmethod
+    def _resolver_base(generador, campo: str, tipo: Any, ejemplo: Any,
+                       valores: Optional[List[Any]]) -> Callable[[int], Any]:
+        """Generador de la columna sin tener en cuenta los valores nulos"""
+        if valores and len(valores) <= 5:
+            return lambda n, valores=valores: elegir(generador.rng, valores, n)
+
+        campo_lower = str(campo).lower()
+        for key, gen in generador.generadores_columna.items():
+            if key in campo_lower:
+                return gen
+
+        tipo_lower = str(tipo).lower()
+        for claves, gen in generador.generadores_tipo:
+            if any(clave in tipo_lower for clave in claves):
+                return gen
+
+        if pd.notna(ejemplo):
+            return lambda n, ejemplo=ejemplo: np.full(n, ejemplo, dtype=object)
+        return generador.generador_texto
+
+    def generar(self, cantidad: int) -> pd.DataFrame:
+        """Genera cantidad registros, una llamada por columna"""
+        datos = {campo: gen(cantidad) for campo, _, gen in self.columnas}
+        df = pd.DataFrame(datos, index=pd.RangeIndex(cantidad))
+        return convertir_tipos(df, {campo: tipo for campo, tipo, _ in self.columnas})
+
+    def iterar(self, cantidad: int, tamano_bloque: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Genera cantidad registros en DataFrames de como máximo tamano_bloque filas"""
+        tamano_bloque = max(1, tamano_bloque)
+        for inicio in range(0, cantidad, tamano_bloque):
+            n = min(tamano_bloque, cantidad - inicio)
+            df = self.generar(n)
+            df.index = pd.RangeIndex(inicio, inicio + n)
+            yield df
+
+
+def anular(rng: np.random.Generator, valores: Any, probabilidad: float) -> np.ndarray:
+    """Reemplaza por None cada valor con la probabilidad indicada"""
+    mascara = rng.random(len(valores)) < probabilidad
+    if not mascara.any():
+        return valores
+    resultado = np.asarray(valores).astype(object)
+    resultado[mascara] = None
+    return resultado
+
+
+def dividir_en_shards(cantidad: int, shards: int) -> List[int]:
+    """Reparte cantidad registros en shards bloques (los primeros reciben el resto)"""
+    shards = max(1, shards)
+    base, resto = divmod(cantidad, shards)
+    return [base + (1 if i < resto else 0) for i in range(shards)]
+
+
+def _generar_shard(clase_generador, estructura: pd.DataFrame, cantidad: int,
+                   semilla: np.random.SeedSequence, fecha_referencia: date) -> pd.DataFrame:
+    """
+    Genera un shard con su propio generador sembrado.
+
+    Se define a nivel de módulo para poder ejecutarse en los procesos del
+    ProcessPoolExecutor usado por generar_en_paralelo.
+    """
+    generador = clase_generador(semilla=semilla, fecha_referencia=fecha_referencia)
+    return PlanGeneracion.compilar(estructura, generador).generar(cantidad)
+
+
+def iterar_en_paralelo(clase_generador, estructura: pd.DataFrame, cantidad: int,
+                       semilla: Optional[int] = None, shards: int = 1,
+                       workers: Optional[int] = None,
+                       fecha_referencia: Optional[date] = None) -> Iterator[pd.DataFrame]:
+    """
+    Genera datos sintéticos reproducibles repartidos en shards, entregando
+    cada shard en orden en cuanto está listo
+
+    Cada shard recibe una semilla independiente derivada de la semilla
+    maestra (SeedSequence.spawn), por lo que el resultado concatenado solo
+    depende de (semilla, shards, cantidad, fecha_referencia) y es idéntico
+    sea cual sea el número de procesos usados. Como mucho hay 2 * workers
+    shards generados o en curso, así que puede combinarse con
+    ExportadorBase.exportar_por_bloques para exportar en memoria constante.
+
+    Args:
+        clase_generador: GeneradorPacientes, GeneradorFARC, GeneradorBIO o GeneradorMTP
+        estructura: DataFrame con la estructura master
+        cantidad: Número total de registros
+        semilla: Semilla maestra (None para una aleatoria, que se informa)
+        shards: Número de bloques independientes
+        workers: Procesos simultáneos (1 genera en el proceso actual)
+        fecha_referencia: Fecha usada como "hoy" (por defecto la actual)
+    """
+    secuencia = np.random.SeedSequence(semilla)
+    if semilla is None:
+        print(f"Semilla maestra generada: {secuencia.entropy}")
+    fecha_referencia = fecha_referencia or date.today()
+    tamanos = dividir_en_shards(cantidad, shards)
+    semillas = secuencia.spawn(len(tamanos))
+    workers = max(1, min(workers or 1, len(tamanos)))
+
+    argumentos = [(clase_generador, estructura, tamano, semilla_shard, fecha_referencia)
+                  for tamano, semilla_shard in zip(tamanos, semillas)]
+    if workers == 1:
+        for args in argumentos:
+            yield _generar_shard(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendientes = deque()
+        for args in argumentos:
+            pendientes.append(executor.submit(_generar_shard, *args))
+            if len(pendientes) >= workers * 2:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def generar_en_paralelo(clase_generador, estructura: pd.DataFrame, cantidad: int,
+                        semilla: Optional[int] = None, shards: int = 1,
+                        workers: Optional[int] = None,
+                        fecha_referencia: Optional[date] = None) -> pd.DataFrame:
+    """
+    Igual que iterar_en_paralelo, pero devuelve los shards concatenados en
+    un único DataFrame
+    """
+    partes = list(iterar_en_paralelo(clase_generador, estructura, cantidad, semilla,
+                                     shards, workers, fecha_referencia))
+    return pd.concat(partes, ignore_index=True)
+
+
+def convertir_tipos(df: pd.DataFrame, tipos: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Convierte las columnas a los tipos de la estructura en una sola pasada
+
+    Los tipos que pandas no reconoce se descartan antes de convertir; solo si
+    la conversión conjunta falla se reintenta columna a columna para avisar
+    cuál no pudo convertirse.
+    """
+    validos = {}
+    for campo, tipo in tipos.items():
+        if campo not in df.columns or pd.isna(tipo):
+            continue
+        try:
+            validos[campo] = pd.api.types.pandas_dtype(tipo)
+        except TypeError:
+            print(f"Advertencia: No se pudo convertir la columna {campo} al tipo {tipo}")
+
+    # Las fechas en columnas 'object' se entregan como datetime.date, igual que Faker
+    for campo, tipo in list(validos.items()):
+        if tipo == object and pd.api.types.is_datetime64_any_dtype(df[campo]):
+            df[campo] = df[campo].dt.date
+            del validos[campo]
+
+    pendientes = {campo: tipo for campo, tipo in validos.items() if df[campo].dtype != tipo}
+    if not pendientes:
+        return df
+
+    try:
+        return df.astype(pendientes)
+    except (ValueError, TypeError):
+        for campo, tipo in pendientes.items():
+            try:
+                df[campo] = df[campo].astype(tipo)
+            except (ValueError, TypeError):
+                print(f"Advertencia: No se pudo convertir la columna {campo} al tipo {tipo}")
+        return df
@@ -0,0 +1,210 @@
+"""
+Registro de lectores y extractores que se importan solo al usarse.
+
+Varios módulos del sistema dependen de paquetes pesados (openpyxl,
+jsonschema, pdfminer, Google Cloud Vision...) que solo se necesitan para
+ciertas operaciones. Importarlos al cargar el módulo hace que llegar al menú
+principal tarde segundos. Con este registro cada lector o extractor declara
+sus dependencias y su punto de carga; comprobar si está disponible no importa
+nada (importlib.util.find_spec) y la importación real ocurre en el primer uso.
+"""
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import importlib
+import importlib.util
+import sys
+
+
+# Nombre del paquete de pip cuando no coincide con el del módulo
+PAQUETES_PIP = {
+    'yaml': 'pyyaml',
+    'PIL': 'Pillow',
+    'pdfminer': 'pdfminer.six',
+    'odf': 'odfpy',
+    'google.cloud.vision': 'google-cloud-vision',
+    'google.oauth2': 'google-auth',
+}
+
+
+@lru_cache(maxsize=None)
+def dependencia_disponible(modulo: str) -> bool:
+    """
+    Indica si un módulo puede importarse, sin importarlo
+
+    Para submódulos (paquete.modulo) se importa el paquete padre, por lo que
+    conviene declarar como dependencia el paquete de primer nivel.
+    """
+    if modulo in sys.modules:
+        return sys.modules[modulo] is not None
+    try:
+        return importlib.util.find_spec(modulo) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def nombre_pip(modulo: str) -> str:
+    """Nombre del paquete a instalar con pip para un módulo"""
+    for prefijo, paquete in PAQUETES_PIP.items():
+        if modulo == prefijo or modulo.startswith(prefijo + '.'):
+            return paquete
+    return modulo.split('.')[0]
+
+
+class ModuloFaltante:
+    """Sustituto de un módulo no instalado que falla solo cuando se usa"""
+
+    def __init__(self, nombre: str):
+        self.__nombre = nombre
+
+    def __getattr__(self, atributo):
+        raise ImportError(f"{self.__nombre} no está instalado. Ejecute: pip install {nombre_pip(self.__nombre)}")
+
+    def __bool__(self):
+        return False
+
+
+def importar_diferido(nombre: str):
+    """
+    Retorna el módulo sin ejecutarlo hasta que se accede a uno de sus atributos
+
+    Usa importlib.util.LazyLoader: el módulo queda registrado en sys.modules y
+    se ejecuta en el primer acceso. Si ya estaba importado se retorna tal cual;
+    si no está instalado se retorna un ModuloFaltante (que se evalúa como False).
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    try:
+        spec = importlib.util.find_spec(nombre)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.loader is None:
+        return ModuloFaltante(nombre)
+
+    cargador = importlib.util.LazyLoader(spec.loader)
+    spec.loader = cargador
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    cargador.exec_module(modulo)
+    # Como hace la importación normal, el submódulo queda accesible desde su paquete
+    padre, _, hijo = nombre.rpartition('.')
+    if padre:
+        setattr(sys.modules[padre], hijo, modulo)
+    return modulo
+
+
+class Complemento:
+    """Lector o extractor registrado, con sus dependencias y su punto de carga"""
+
+    def __init__(self, nombre: str, cargador: Union[str, Callable[[], Any]],
+                 dependencias: Iterable[str] = (), extensiones: Iterable[str] = (),
+                 descripcion: str = ''):
+        """
+        Args:
+            nombre: Identificador del complemento
+            cargador: 'modulo:atributo' a importar, o función sin argumentos que
+                      realiza la importación y retorna el objeto
+            dependencias: Módulos que deben estar instalados
+            extensiones: Extensiones de archivo que atiende (con punto)
+            descripcion: Texto para los menús
+        """
+        self.nombre = nombre
+        self.cargador = cargador
+        self.dependencias = tuple(dependencias)
+        self.extensiones = tuple(ext.lower() for ext in extensiones)
+        self.descripcion = descripcion
+        self._objeto = None
+        self._cargado = False
+
+    @property
+    def disponible(self) -> bool:
+        """True si todas las dependencias están instaladas (sin importarlas)"""
+        return not self.dependencias_faltantes()
+
+    @property
+    def cargado(self) -> bool:
+        return self._cargado
+
+    def dependencias_faltantes(self) -> List[str]:
+        return [dep for dep in self.dependencias if not dependencia_disponible(dep)]
+
+    def cargar(self) -> Any:
+        """
+        Importa el complemento la primera vez y retorna el objeto cargado
+
+        Raises:
+            ImportError: Si faltan dependencias, indicando qué instalar
+        """
+        if self._cargado:
+            return self._objeto
+
+        faltantes = self.dependencias_faltantes()
+        if faltantes:
+            paquetes = ' '.join(nombre_pip(dep) for dep in faltantes)
+            raise ImportError(f"'{self.nombre}' requiere dependencias no instaladas. Ejecute: pip install {paquetes}")
+
+        if callable(self.cargador):
+            self._objeto = self.cargador()
+        else:
+            modulo, _, atributo = self.cargador.partition(':')
+            self._objeto = importlib.import_module(modulo)
+            if atributo:
+                self._objeto = getattr(self._objeto, atributo)
+        self._cargado = True
+        return self._objeto
+
+
+class RegistroComplementos(Mapping):
+    """
+    Conjunto de complementos consultable como diccionario {extensión: objeto}
+
+    El acceso por extensión (registro['.csv']) carga el complemento en ese
+    momento; 'in', keys() e iterar no cargan nada.
+    """
+
+    def __init__(self):
+        self._complementos: Dict[str, Complemento] = {}
+        self._por_extension: Dict[str, str] = {}
+
+    def registrar(self, nombre: str, cargador: Union[str, Callable[[], Any]],
+                  dependencias: Iterable[str] = (), extensiones: Iterable[str] = (),
+                  descripcion: str = '') -> Complemento:
+        """Registra (o reemplaza) un complemento; ver Complemento para los argumentos"""
+        complemento = Complemento(nombre, cargador, dependencias, extensiones, descripcion)
+        self._complementos[nombre] = complemento
+        for extension in complemento.extensiones:
+            self._por_extension[extension] = nombre
+        return complemento
+
+    def complemento(self, nombre: str) -> Complemento:
+        return self._complementos[nombre]
+
+    def obtener(self, nombre: str) -> Any:
+        """Carga (si hace falta) y retorna el complemento por nombre"""
+        return self._complementos[nombre].cargar()
+
+    def para_extension(self, extension: str) -> Optional[Complemento]:
+        nombre = self._por_extension.get(extension.lower())
+        return self._complementos[nombre] if nombre else None
+
+    def disponibilidad(self) -> Dict[str, bool]:
+        """{nombre: disponible} sin importar ningún complemento"""
+        return {nombre: c.disponible for nombre, c in self._complementos.items()}
+
+    def cargados(self) -> List[str]:
+        return [nombre for nombre, c in self._complementos.items() if c.cargado]
+
+    def __getitem__(self, extension: str) -> Any:
+        complemento = self.para_extension(extension)
+        if complemento is None:
+            raise KeyError(extension)
+        return complemento.cargar()
+
+    def __iter__(self):
+        return iter(self._por_extension)
+
+    def __len__(self):
+        return len(self._por_extension)
+
+    def __contains__(self, extension) -> bool:
+        return isinstance(extension, str) and extension.lower() in self._por_extension
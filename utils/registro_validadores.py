@@ -0,0 +1,105 @@
+"""
+Registro de validadores jsonschema compartido por todo el proceso.
+
+Construir un Draft7Validator implica comprobar el esquema (check_schema) y
+resolver sus referencias; validar un millón de registros contra el mismo
+esquema no debe repetir ese trabajo. El registro guarda los validadores ya
+construidos por hash del esquema, con expulsión LRU y contadores de aciertos
+y fallos, y todos comparten un único FormatChecker.
+"""
+from collections import OrderedDict
+from typing import Any, Dict
+import hashlib
+import json
+import threading
+from .registro_complementos import importar_diferido
+
+# jsonschema se importa al construir el primer validador
+jsonschema = importar_diferido('jsonschema')
+
+
+def hash_esquema(schema: Dict[str, Any]) -> str:
+    """Hash estable del esquema (independiente del orden de las claves)"""
+    texto = json.dumps(schema, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class RegistroValidadores:
+    """Caché LRU de Draft7Validator por hash de esquema"""
+
+    def __init__(self, capacidad: int = 128):
+        """
+        Args:
+            capacidad: Validadores distintos que se mantienen antes de expulsar el menos usado
+        """
+        self.capacidad = max(1, capacidad)
+        self._validadores: "OrderedDict[tuple, jsonschema.Draft7Validator]" = OrderedDict()
+        self._format_checker = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, schema: Dict[str, Any], format_check: bool = True) -> 'jsonschema.Draft7Validator':
+        """
+        Retorna el validador del esquema, construyéndolo solo la primera vez
+
+        Args:
+            schema: Esquema JSON
+            format_check: Si es True, valida también los 'format' (date, email...)
+
+        Returns:
+            jsonschema.Draft7Validator: Validador reutilizable
+
+        Raises:
+            SchemaError: Si el esquema no es válido (no se guarda en el registro)
+        """
+        clave = (hash_esquema(schema), format_check)
+        with self._lock:
+            validador = self._validadores.get(clave)
+            if validador is not None:
+                self._validadores.move_to_end(clave)
+                self.aciertos += 1
+                return validador
+            self.fallos += 1
+
+        jsonschema.Draft7Validator.check_schema(schema)
+        if format_check and self._format_checker is None:
+            self._format_checker = jsonschema.FormatChecker()
+        validador = jsonschema.Draft7Validator(
+            schema, format_checker=self._format_checker if format_check else None
+        )
+
+        with self._lock:
+            self._validadores[clave] = validador
+            self._validadores.move_to_end(clave)
+            while len(self._validadores) > self.capacidad:
+                self._validadores.popitem(last=False)
+                self.expulsiones += 1
+        return validador
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores de uso del registro"""
+        with self._lock:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'expulsiones': self.expulsiones,
+                'validadores': len(self._validadores),
+                'capacidad': self.capacidad
+            }
+
+    def limpiar(self) -> None:
+        """Vacía el registro y reinicia los contadores"""
+        with self._lock:
+            self._validadores.clear()
+            self.aciertos = self.fallos = self.expulsiones = 0
+
+
+# Registro único del proceso
+REGISTRO_VALIDADORES = RegistroValidadores()
+
+
+def obtener_validador(schema: Dict[str, Any], format_check: bool = True) -> 'jsonschema.Draft7Validator':
+    """Retorna el validador del esquema desde el registro del proceso"""
+    return REGISTRO_VALIDADORES.obtener(schema, format_check)
@@ -1,55 +1,193 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
+import os
+import time
+from datetime import datetime
 from .logging_config import setup_logging
 from .performance_monitor import PerformanceMonitor
 
+# Coordinador reutilizado por cada proceso del pool
+_COORDINATOR = None
+
+
+def _procesar_documento(file_path: str, template_id: str) -> Dict[str, Any]:
+    """
+    Ejecuta ProcessingCoordinator.process_document en un proceso del pool.
+
+    Se define a nivel de módulo para que pueda enviarse al ProcessPoolExecutor;
+    el coordinador se crea una sola vez por proceso.
+    """
+    global _COORDINATOR
+    if _COORDINATOR is None:
+        from .processing_coordinator import ProcessingCoordinator
+        _COORDINATOR = ProcessingCoordinator()
+    return _COORDINATOR.process_document(Path(file_path), template_id)
+
+
 class BatchProcessor:
     """Procesador de documentos en lote"""
 
-    def __init__(self):
+    def __init__(self, batch_size: int = 50, max_workers: Optional[int] = None,
+                 timeout: Optional[float] = 300,
+                 procesador: Callable[[str, str], Dict[str, Any]] = None):
+        """
+        Args:
+            batch_size: Máximo de documentos en proceso o pendientes de consumir
+            max_workers: Procesos del pool (por defecto os.cpu_count())
+            timeout: Segundos máximos por archivo (None para no limitar)
+            procesador: Función (ruta, template_id) a ejecutar en el pool;
+                        por defecto ProcessingCoordinator.process_document
+        """
         self.logger = setup_logging('batch_processor')
         self.monitor = PerformanceMonitor()
-        self.batch_size = 50
-        self.results = []
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.procesador = procesador or _procesar_documento
+
+    async def process_batch(self, files: List[Path], template_id: str,
+                            on_result: Callable[[Dict[str, Any]], Any] = None) -> Dict[str, Any]:
+        """
+        Procesa un lote de documentos
 
-    async def process_batch(self, files: List[Path], template_id: str) -> Dict[str, Any]:
-        """Procesa un lote de documentos"""
+        Los resultados no se acumulan: se entregan a on_result a medida que
+        terminan y solo se conservan los contadores y los errores.
+
+        Args:
+            files: Archivos a procesar
+            template_id: Plantilla a aplicar
+            on_result: Función (síncrona o corrutina) que recibe cada resultado
+        """
         self.logger.info(f"Procesando lote de {len(files)} archivos")
         self.monitor.start_monitoring()
+        inicio = time.perf_counter()
+
+        stats = {'processed': 0, 'successful': 0, 'failed': 0, 'timeouts': 0}
+        errors = []
+        try:
+            async for result in self.iter_batch(files, template_id):
+                stats['processed'] += 1
+                if result['status'] == 'success':
+                    stats['successful'] += 1
+                else:
+                    stats['failed'] += 1
+                    if result['status'] == 'timeout':
+                        stats['timeouts'] += 1
+                    errors.append({'file': result['file'], 'error': result['error']})
+
+                if on_result is not None:
+                    retorno = on_result(result)
+                    if asyncio.iscoroutine(retorno):
+                        await retorno
+        finally:
+            performance = self.monitor.stop_monitoring()
+
+        stats['total_time'] = round(time.perf_counter() - inicio, 3)
+        stats['files_per_second'] = round(stats['processed'] / stats['total_time'], 2) if stats['total_time'] else 0.0
 
-        tasks = [self._process_file(file, template_id) for file in files]
-        results = await asyncio.gather(*tasks)
-        
-        stats = self._generate_batch_stats(results)
-        self.monitor.stop_monitoring()
-        
         return {
-            'processed': len(results),
+            'status': 'success' if not stats['failed'] else 'error',
+            'processed': stats['processed'],
             'successful': stats['successful'],
             'failed': stats['failed'],
-            'results': results,
-            'stats': stats
+            'errors': errors,
+            'stats': stats,
+            'performance': performance
         }
 
-    async def _process_file(self, file: Path, template_id: str) -> Dict[str, Any]:
-        """Procesa un archivo individual"""
+    async def iter_batch(self, files: List[Path], template_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Procesa los archivos y entrega cada resultado en cuanto termina
+
+        Como máximo batch_size documentos están en proceso o esperando a ser
+        consumidos: si quien consume se retrasa, se deja de lanzar trabajo
+        nuevo hasta que libere espacio.
+        """
+        semaphore = asyncio.Semaphore(self.batch_size)
+        workers = min(self.max_workers, self.batch_size)
+        # Al pool solo se envían tantos trabajos como procesos tiene, para que
+        # el tiempo límite de cada archivo no incluya la espera en su cola
+        en_pool = asyncio.Semaphore(workers)
+        queue: asyncio.Queue = asyncio.Queue()
+        fin = object()
+
+        async def procesar(file: Path):
+            try:
+                result = await self._process_file(executor, file, template_id, en_pool)
+                await queue.put(result)
+            except asyncio.CancelledError:
+                semaphore.release()
+                raise
+
+        async def productor():
+            tareas = []
+            for file in files:
+                await semaphore.acquire()
+                tareas.append(asyncio.ensure_future(procesar(file)))
+            await asyncio.gather(*tareas)
+            await queue.put(fin)
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        tarea_productor = asyncio.ensure_future(productor())
         try:
-            # Procesamiento asíncrono
-            return {
-                'file': str(file),
-                'status': 'success',
-                'template': template_id,
-                'timestamp': self.monitor.get_timestamp()
-            }
+            while True:
+                result = await queue.get()
+                if result is fin:
+                    break
+                # El resultado ya salió del pipeline: liberar su plaza
+                semaphore.release()
+                yield result
+            await tarea_productor
+        finally:
+            if not tarea_productor.done():
+                tarea_productor.cancel()
+                await asyncio.gather(tarea_productor, return_exceptions=True)
+            # No esperar a procesos que siguen ocupados con archivos que agotaron el tiempo
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _process_file(self, executor: ProcessPoolExecutor, file: Path,
+                            template_id: str,
+                            en_pool: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """
+        Procesa un archivo individual en el pool de procesos
+
+        Args:
+            en_pool: Plazas libres del pool; el tiempo límite empieza a contar
+                     cuando el archivo obtiene una, es decir, cuando un proceso
+                     puede tomarlo
+        """
+        loop = asyncio.get_running_loop()
+        base = {'file': str(file), 'template': template_id}
+
+        if en_pool is not None:
+            await en_pool.acquire()
+        inicio = time.perf_counter()
+        futuro = loop.run_in_executor(executor, self.procesador, str(file), template_id)
+        if en_pool is not None:
+            # La plaza se libera cuando el proceso termina de verdad, aunque el
+            # archivo ya se haya dado por agotado: hasta entonces sigue ocupado
+            futuro.add_done_callback(lambda _: en_pool.release())
+
+        try:
+            output = await asyncio.wait_for(asyncio.shield(futuro), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # El proceso no puede interrumpirse: el resultado tardío se descarta
+            self.logger.error(f"Tiempo agotado procesando {file} ({self.timeout}s)")
+            return {**base, 'status': 'timeout', 'error': f"Tiempo agotado ({self.timeout}s)",
+                    'duration': round(time.perf_counter() - inicio, 3),
+                    'timestamp': datetime.now().isoformat()}
         except Exception as e:
             self.logger.error(f"Error procesando {file}: {str(e)}")
-            return {'file': str(file), 'error': str(e)}
+            return {**base, 'status': 'error', 'error': str(e),
+                    'duration': round(time.perf_counter() - inicio, 3),
+                    'timestamp': datetime.now().isoformat()}
 
-    def _generate_batch_stats(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Genera estadísticas del lote"""
-        return {
-            'successful': sum(1 for r in results if 'error' not in r),
-            'failed': sum(1 for r in results if 'error' in r),
-            'total_time': self.monitor.get_total_time()
-        }
+        result = {**base, 'duration': round(time.perf_counter() - inicio, 3),
+                  'timestamp': datetime.now().isoformat(), 'output': output}
+        if isinstance(output, dict) and 'error' in output:
+            result.update({'status': 'error', 'error': output['error']})
+        else:
+            result['status'] = 'success'
+        return result
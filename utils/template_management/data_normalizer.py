@@ -1,6 +1,8 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import re
 from datetime import datetime
+import numpy as np
+import pandas as pd
 from .logging_config import setup_logging
 
 class DataNormalizer:
@@ -22,14 +24,154 @@ class DataNormalizer:
             return normalizer(value)
         return value
 
-    def normalize_document(self, data: Dict[str, Any], 
+    def normalize_document(self, data: Union[Dict[str, Any], pd.DataFrame], 
                          field_types: Dict[str, str]) -> Dict[str, Any]:
-        """Normaliza todos los campos de un documento"""
+        """
+        Normaliza todos los campos de un documento
+
+        Si data es un DataFrame se normaliza por columnas (ver normalize_dataframe)
+        y se retorna {'data': DataFrame, 'failures': {columna: n}}.
+        """
+        if isinstance(data, pd.DataFrame):
+            return self.normalize_dataframe(data, field_types)
         return {
             field: self.normalize_field(value, field_types.get(field, 'text'))
             for field, value in data.items()
         }
 
+    def normalize_dataframe(self, df: pd.DataFrame, field_types: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Normaliza un lote tabular columna a columna
+
+        Produce los mismos valores que normalize_field aplicado a cada celda,
+        pero trabaja sobre los valores distintos de cada columna con operaciones
+        de pandas: las fechas se convierten con to_datetime formato a formato y
+        solo los valores que ninguno resuelve pasan por strptime uno a uno.
+
+        Args:
+            df: Datos a normalizar
+            field_types: Tipo de cada columna (text, date, number, code);
+                         las columnas sin tipo se tratan como text
+
+        Returns:
+            dict: 'data' (DataFrame normalizado; las fechas y textos quedan como
+                  object con None en los fallos, los números como float con NaN)
+                  y 'failures' ({columna: valores no nulos que no se pudieron
+                  normalizar})
+        """
+        self.logger.info(f"Normalizando {len(df)} filas en {len(df.columns)} columnas")
+        columns = {}
+        failures = {}
+        for column in df.columns:
+            field_type = field_types.get(column, 'text')
+            columns[column], failures[column] = self._normalize_column(df[column], field_type)
+
+        return {
+            'data': pd.DataFrame(columns, index=df.index),
+            'failures': failures
+        }
+
+    def _normalize_column(self, series: pd.Series, field_type: str) -> Tuple[pd.Series, int]:
+        """Normaliza una columna; retorna la columna y el número de fallos"""
+        if field_type not in self.rules:
+            return series.copy(), 0
+
+        if field_type == 'number' and (pd.api.types.is_numeric_dtype(series) or
+                                       pd.api.types.is_bool_dtype(series)):
+            # float(valor) para cada celda numérica
+            return series.astype('float64'), 0
+
+        # Las celdas de texto se resuelven por valores distintos y en bloque;
+        # el resto (nulos, números en columnas object...) con el normalizador escalar
+        values = series.to_numpy(dtype=object)
+        is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        out = np.empty(len(values), dtype=object)
+
+        if is_str.any():
+            codes, uniques = pd.factorize(values[is_str])
+            bulk = {
+                'text': self._normalize_text_values,
+                'code': self._normalize_code_values,
+                'date': self._normalize_date_values,
+                'number': self._normalize_number_values
+            }[field_type]
+            out[is_str] = bulk(np.asarray(uniques, dtype=object))[codes]
+
+        scalar = self.rules[field_type]
+        for pos in np.flatnonzero(~is_str):
+            out[pos] = scalar(values[pos])
+
+        if field_type == 'number':
+            result = pd.Series(out, index=series.index, dtype=object).astype('float64')
+            failed = result.isna() & series.notna()
+        else:
+            result = pd.Series(out, index=series.index, dtype=object)
+            failed = result.isna() & series.notna() if field_type == 'date' else None
+        return result, int(failed.sum()) if failed is not None else 0
+
+    def _normalize_text_values(self, values: np.ndarray) -> np.ndarray:
+        """Versión en bloque de _normalize_text para cadenas"""
+        strings = pd.Series(values, dtype=object)
+        return strings.str.replace(r'\s+', ' ', regex=True).str.strip().to_numpy(dtype=object)
+
+    def _normalize_code_values(self, values: np.ndarray) -> np.ndarray:
+        """Versión en bloque de _normalize_code para cadenas"""
+        strings = pd.Series(values, dtype=object)
+        return strings.str.replace(r'\s+', '', regex=True).str.upper().to_numpy(dtype=object)
+
+    def _normalize_number_values(self, values: np.ndarray) -> np.ndarray:
+        """Versión en bloque de _normalize_number para cadenas"""
+        cleaned = pd.Series(values, dtype=object).str.replace(r'[^\d.-]', '', regex=True)
+        # Lo que float() acepta con solo dígitos, puntos y guiones
+        valid = cleaned.str.fullmatch(r'-?(?:\d+\.?\d*|\.\d+)').to_numpy(dtype=bool)
+        out = np.full(len(values), None, dtype=object)
+        out[valid] = cleaned[valid].to_numpy(dtype=object).astype('float64')
+        return out
+
+    def _normalize_date_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Versión en bloque de _normalize_date para cadenas distintas
+
+        Cada formato se prueba con to_datetime sobre todos los valores pendientes.
+        Solo se acepta un resultado si el valor es exactamente la representación
+        del formato (strptime también lo aceptaría con la misma fecha) y ningún
+        formato anterior lo interpreta; lo demás se resuelve con _normalize_date.
+        """
+        out = np.full(len(values), None, dtype=object)
+        pending = np.ones(len(values), dtype=bool)
+
+        for i, fmt in enumerate(self.date_formats):
+            if not pending.any():
+                break
+            candidates = pd.Series(values[pending], dtype=object)
+            parsed = pd.to_datetime(candidates, format=fmt, errors='coerce')
+            exact = parsed.notna() & (parsed.dt.strftime(fmt) == candidates)
+            if not exact.any():
+                continue
+
+            positions = np.flatnonzero(pending)[exact.to_numpy()]
+            iso = parsed[exact].dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+            for pos, iso_value in zip(positions, iso):
+                if i and self._parses_with(values[pos], self.date_formats[:i]):
+                    continue  # Un formato anterior tiene prioridad
+                out[pos] = iso_value
+                pending[pos] = False
+
+        # Residuo: valores que ningún formato resolvió en bloque
+        for pos in np.flatnonzero(pending):
+            out[pos] = self._normalize_date(values[pos])
+        return out
+
+    @staticmethod
+    def _parses_with(value: str, formats: List[str]) -> bool:
+        for fmt in formats:
+            try:
+                datetime.strptime(value, fmt)
+                return True
+            except ValueError:
+                continue
+        return False
+
     def _normalize_text(self, value: str) -> str:
         """Normaliza texto"""
         if not isinstance(value, str):
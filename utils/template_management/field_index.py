@@ -0,0 +1,116 @@
+from typing import Dict, Any, List, Callable, Hashable, Iterable, Tuple
+from collections import Counter, defaultdict
+
+class FieldIndex:
+    """
+    Índice invertido de nombres de campos para acotar las comparaciones.
+
+    Los nombres se normalizan una sola vez y se indexan por nombre completo,
+    por palabra y por n-gramas de caracteres. Al buscar solo se puntúan los
+    campos que comparten alguna palabra (o que pueden contener / estar
+    contenidos en el nombre buscado), más un representante de cada grupo de
+    atributos (tipo, formato, validadores): un campo sin nada en común con el
+    nombre solo puede puntuar por esos atributos, y dentro de un grupo ninguno
+    supera al primero. Así el mejor resultado coincide con el de comparar
+    contra todos los campos, incluido el desempate por orden de aparición.
+    """
+
+    def __init__(self, fields: Dict[str, Any], normalize: Callable[[str], str],
+                 group_key: Callable[[Any], Hashable] = None, ngram: int = 3):
+        """
+        Args:
+            fields: Campos a indexar {nombre: info}
+            normalize: Normalización de nombres (la misma que usa la puntuación)
+            group_key: Atributos de la info que, sin coincidencia de nombre,
+                       determinan la puntuación
+            ngram: Longitud de los n-gramas para búsquedas por contención
+        """
+        self.names = list(fields)
+        self.infos = [fields[name] for name in self.names]
+        self.normalized = [normalize(name) for name in self.names]
+        self.words = [set(name.split()) for name in self.normalized]
+        self.ngram = ngram
+
+        self._exact = defaultdict(list)
+        self._tokens = defaultdict(list)
+        self._ngrams = defaultdict(list)
+        self._ngram_counts = []
+        self._short = []
+        for pos, (name, words) in enumerate(zip(self.normalized, self.words)):
+            self._exact[name].append(pos)
+            for word in words:
+                self._tokens[word].append(pos)
+            grams = self._grams(name)
+            self._ngram_counts.append(len(grams))
+            for gram in grams:
+                self._ngrams[gram].append(pos)
+            if len(name) < ngram:
+                self._short.append(pos)
+
+        # Primer campo de cada grupo de atributos
+        self._groups = {}
+        if group_key:
+            for pos, info in enumerate(self.infos):
+                self._groups.setdefault(group_key(info), pos)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _grams(self, name: str) -> set:
+        return {name[i:i + self.ngram] for i in range(len(name) - self.ngram + 1)}
+
+    def candidates(self, normalized: str, containment: bool = False) -> List[int]:
+        """
+        Posiciones de los campos que pueden puntuar por nombre, más los
+        representantes de grupo, en orden de aparición
+
+        Args:
+            normalized: Nombre ya normalizado a buscar
+            containment: Incluir campos cuyo nombre contiene al buscado o está
+                         contenido en él (aunque no compartan palabras)
+        """
+        found = set(self._exact.get(normalized, ()))
+        for word in set(normalized.split()):
+            found.update(self._tokens.get(word, ()))
+
+        if containment:
+            if len(normalized) < self.ngram:
+                # Sin n-gramas: comprobar la contención directamente
+                found.update(pos for pos, name in enumerate(self.normalized) if normalized in name)
+            else:
+                grams = self._grams(normalized)
+                shared = Counter(pos for gram in grams for pos in self._ngrams.get(gram, ()))
+                # Contener un texto implica contener todos sus n-gramas
+                found.update(pos for pos, count in shared.items()
+                             if count == len(grams) or count == self._ngram_counts[pos])
+            found.update(self._short)
+
+        found.update(self._groups.values())
+        return sorted(found)
+
+    def rank(self, normalized: str, score: Callable[[int], float], k: int = 1,
+             containment: bool = False, min_score: float = None) -> List[Tuple[float, int]]:
+        """
+        Puntúa los candidatos y retorna los k mejores
+
+        Args:
+            normalized: Nombre ya normalizado a buscar
+            score: Función que puntúa la posición de un campo indexado
+            k: Número de resultados
+            containment: Ver candidates()
+            min_score: Descarta puntuaciones menores
+
+        Returns:
+            list: (puntuación, posición) de mayor a menor puntuación; a igual
+                  puntuación, en orden de aparición
+        """
+        scored = [(score(pos), pos) for pos in self.candidates(normalized, containment)]
+        if min_score is not None:
+            scored = [item for item in scored if item[0] >= min_score]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:k]
+
+    @staticmethod
+    def constraint_key(values: Iterable[Any]) -> frozenset:
+        """Validadores de un campo como conjunto comparable"""
+        return frozenset(str(v) for v in values or [])
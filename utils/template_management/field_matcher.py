@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
+from functools import lru_cache
 from .logging_config import setup_logging
 from .field_analyzer import FieldAnalyzer
+from .field_index import FieldIndex
 
 class FieldMatcher:
     """Analizador de coincidencia de campos entre PDF y plantilla"""
@@ -9,41 +11,51 @@ class FieldMatcher:
         self.logger = setup_logging()
         self.field_analyzer = FieldAnalyzer()
         
-    def find_matches(self, pdf_fields: Dict[str, Any], template_fields: Dict[str, Any]) -> Dict[str, Any]:
+    def find_matches(self, pdf_fields: Dict[str, Any], template_fields: Dict[str, Any],
+                     top_k: int = 3) -> Dict[str, Any]:
         """
         Encuentra coincidencias entre campos del PDF y la plantilla.
         Mantiene compatibilidad con el sistema existente.
+
+        Los nombres del PDF se normalizan una vez y se indexan (FieldIndex);
+        cada campo de la plantilla solo se compara con los campos que comparten
+        alguna palabra con él, con el mismo resultado que compararlos todos.
+
+        Args:
+            pdf_fields: Campos extraídos del PDF
+            template_fields: Campos de la plantilla
+            top_k: Alternativas a conservar por campo de la plantilla
         """
         self.logger.info("Iniciando búsqueda de coincidencias")
         
         matches = {}
-        template_field_scores = {}
+        index = FieldIndex(pdf_fields, self._normalize_field_name, group_key=self._content_key)
 
-        # Primera pasada: coincidencias exactas
         for template_name, template_info in template_fields.items():
-            for pdf_name, pdf_info in pdf_fields.items():
-                score = self._calculate_field_similarity(
-                    template_name, template_info,
-                    pdf_name, pdf_info
-                )
-                template_field_scores.setdefault(template_name, []).append({
-                    'pdf_field': pdf_name,
-                    'score': score,
-                    'info': pdf_info
-                })
+            normalized = self._normalize_field_name(template_name)
+            words = set(normalized.split())
+            ranked = index.rank(
+                normalized,
+                lambda pos: self._score_normalized(
+                    normalized, words, template_info,
+                    index.normalized[pos], index.words[pos], index.infos[pos]
+                ),
+                k=max(1, top_k)
+            )
 
-        # Asignar mejores coincidencias
-        for template_name, scores in template_field_scores.items():
-            if scores:
-                best_match = max(scores, key=lambda x: x['score'])
-                if best_match['score'] >= 0.5:  # Umbral mínimo de confianza
-                    matches[template_name] = {
-                        'pdf_field': best_match['pdf_field'],
-                        'confidence': round(best_match['score'] * 100, 2),
-                        'type_match': template_fields[template_name].get('type') == 
-                                    best_match['info'].get('type'),
-                        'value': best_match['info'].get('value')
-                    }
+            # Asignar mejor coincidencia
+            if ranked and ranked[0][0] >= 0.5:  # Umbral mínimo de confianza
+                score, pos = ranked[0]
+                matches[template_name] = {
+                    'pdf_field': index.names[pos],
+                    'confidence': round(score * 100, 2),
+                    'type_match': template_info.get('type') == index.infos[pos].get('type'),
+                    'value': index.infos[pos].get('value'),
+                    'alternatives': [
+                        {'pdf_field': index.names[alt], 'confidence': round(alt_score * 100, 2)}
+                        for alt_score, alt in ranked[1:] if alt_score >= 0.5
+                    ]
+                }
 
         return {
             'matches': matches,
@@ -62,8 +74,16 @@ class FieldMatcher:
     def _calculate_field_similarity(self, template_name: str, template_info: Dict[str, Any],
                                  pdf_name: str, pdf_info: Dict[str, Any]) -> float:
         """Calcula la similitud entre campos usando múltiples criterios"""
+        n1 = self._normalize_field_name(template_name)
+        n2 = self._normalize_field_name(pdf_name)
+        return self._score_normalized(n1, set(n1.split()), template_info,
+                                      n2, set(n2.split()), pdf_info)
+
+    def _score_normalized(self, n1: str, words1: set, template_info: Dict[str, Any],
+                          n2: str, words2: set, pdf_info: Dict[str, Any]) -> float:
+        """Similitud entre campos con los nombres ya normalizados"""
         # Similitud de nombre (50%)
-        name_score = self._calculate_name_similarity(template_name, pdf_name) * 0.5
+        name_score = self._words_similarity(n1, words1, n2, words2) * 0.5
         
         # Similitud de tipo (30%)
         type_score = (0.3 if template_info.get('type') == pdf_info.get('type') else 0.0)
@@ -73,26 +93,35 @@ class FieldMatcher:
         
         return name_score + type_score + content_score
 
+    @staticmethod
+    def _content_key(info: Dict[str, Any]) -> tuple:
+        """Atributos que puntúan sin coincidencia de nombre (tipo, formato, validadores)"""
+        return (repr(info.get('type')), repr(info.get('format')),
+                FieldIndex.constraint_key(info.get('validators', [])))
+
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calcula similitud entre nombres normalizados"""
         # Normalizar nombres
         n1 = self._normalize_field_name(name1)
         n2 = self._normalize_field_name(name2)
-        
+        return self._words_similarity(n1, set(n1.split()), n2, set(n2.split()))
+
+    @staticmethod
+    def _words_similarity(n1: str, words1: set, n2: str, words2: set) -> float:
+        """Similitud entre nombres ya normalizados y sus conjuntos de palabras"""
         # Coincidencia exacta
         if n1 == n2:
             return 1.0
             
         # Coincidencia parcial
-        words1 = set(n1.split())
-        words2 = set(n2.split())
-        
         if common_words := words1.intersection(words2):
             return len(common_words) / max(len(words1), len(words2))
             
         return 0.0
 
-    def _normalize_field_name(self, name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_field_name(name: str) -> str:
         """Normaliza el nombre de un campo para comparación"""
         replacements = {
             'first': 'nombre',
@@ -3,8 +3,17 @@ from pathlib import Path
 import os
 from datetime import datetime
 
-def setup_logging():
-    """Configura el sistema de logging básico"""
+def setup_logging(name: str = 'template_analyzer'):
+    """
+    Configura el sistema de logging básico
+
+    Args:
+        name: Nombre del logger (cada componente usa el suyo)
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
@@ -28,7 +37,6 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
 
     # Configurar logger
-    logger = logging.getLogger('template_analyzer')
     logger.setLevel(logging.DEBUG)
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
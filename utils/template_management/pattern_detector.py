@@ -3,6 +3,91 @@ import re
 from datetime import datetime
 from .logging_config import setup_logging
 
+class PatternBank:
+    """
+    Banco de patrones compilados que recorre el documento una sola vez.
+
+    Los patrones conocidos empiezan por una etiqueta ((?:nombre|name)...), así
+    que las etiquetas se combinan en una sola alternancia con grupos con nombre
+    y se localizan en una pasada; cada patrón solo se prueba (match) donde
+    aparece una de sus etiquetas. La búsqueda es de ancho cero, por lo que se
+    encuentran también las coincidencias solapadas y la primera de cada patrón
+    es la misma que daría re.search sobre todo el texto. Los patrones que no
+    empiezan por una etiqueta se buscan por separado.
+    """
+
+    LABEL_PREFIX = re.compile(r'^\(\?:([^()]*)\)')
+
+    def __init__(self, known_patterns: Dict[str, Dict[str, List[str]]], flags: int = re.IGNORECASE):
+        self.entries = []  # (categoría, tipo de campo, patrón, regex compilada)
+        labels = {}  # etiqueta -> posiciones en entries de los patrones que empiezan por ella
+        self.unlabeled = []
+        for category, field_types in known_patterns.items():
+            for field_type, patterns in field_types.items():
+                for pattern in patterns:
+                    idx = len(self.entries)
+                    self.entries.append((category, field_type, pattern, re.compile(pattern, flags)))
+                    if prefix := self.LABEL_PREFIX.match(pattern):
+                        labels.setdefault(prefix.group(1), []).append(idx)
+                    else:
+                        self.unlabeled.append(idx)
+
+        self.labels = [(re.compile(label, flags), indexes) for label, indexes in labels.items()]
+        alternation = '|'.join(f'(?P<l{i}>{label})' for i, label in enumerate(labels))
+        self.scanner = re.compile(f'(?=(?:{alternation}))', flags) if labels else None
+
+    def scan(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Retorna todas las coincidencias de todos los patrones con su posición
+
+        Returns:
+            list: Dicts con category, field_type, pattern, value, text, start,
+                  end y order (posición del patrón en el banco), ordenados por
+                  start y, a igual posición, por order
+        """
+        found = []
+        if self.scanner:
+            for label_match in self.scanner.finditer(content):
+                start = label_match.start()
+                # La alternancia se detiene en la primera etiqueta que coincide;
+                # las siguientes pueden empezar en la misma posición (tel / teléfono)
+                first = int(label_match.lastgroup[1:])
+                for label_regex, indexes in self.labels[first:]:
+                    if label_regex is not self.labels[first][0] and not label_regex.match(content, start):
+                        continue
+                    for idx in indexes:
+                        if match := self.entries[idx][3].match(content, start):
+                            found.append(self._candidate(idx, match))
+        for idx in self.unlabeled:
+            found.extend(self._candidate(idx, match) for match in self.entries[idx][3].finditer(content))
+
+        found.sort(key=lambda candidate: (candidate['start'], candidate['order']))
+        return found
+
+    def first_matches(self, content: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Primera coincidencia de cada patrón, agrupadas por categoría en el orden del banco"""
+        first = {}
+        for candidate in self.scan(content):
+            first.setdefault(candidate['order'], candidate)
+        by_category = {}
+        for idx in sorted(first):
+            by_category.setdefault(first[idx]['category'], []).append(first[idx])
+        return by_category
+
+    def _candidate(self, idx: int, match) -> Dict[str, Any]:
+        category, field_type, pattern, _ = self.entries[idx]
+        return {
+            'category': category,
+            'field_type': field_type,
+            'pattern': pattern,
+            'value': match.group(1).strip(),
+            'text': match.group(0),
+            'start': match.start(),
+            'end': match.end(),
+            'order': idx
+        }
+
+
 class PatternDetector:
     """Sistema de detección de patrones para mapeo PDF-Plantilla"""
 
@@ -44,15 +129,24 @@ class PatternDetector:
                 ]
             }
         }
+        self._bank = None
+        self._bank_signature = None
 
     def detect_patterns(self, content: str, template_fields: Dict[str, Any]) -> Dict[str, Any]:
-        """Detecta patrones en el contenido basado en campos de la plantilla"""
+        """
+        Detecta patrones en el contenido basado en campos de la plantilla
+
+        El documento se recorre una sola vez con el banco de patrones; después
+        cada campo solo consulta las coincidencias de su categoría.
+        """
         self.logger.info("Iniciando detección de patrones")
         
+        matches_by_category = self._pattern_bank().first_matches(content)
+
         results = {}
         for field_name, field_info in template_fields.items():
             # Buscar coincidencias basadas en tipo y nombre
-            matches = self._find_field_matches(field_name, field_info, content)
+            matches = self._find_field_matches(field_name, field_info, content, matches_by_category)
             
             if matches:
                 best_match = self._select_best_match(matches)
@@ -60,7 +154,8 @@ class PatternDetector:
                     'value': best_match['value'],
                     'confidence': best_match['confidence'],
                     'pattern_used': best_match['pattern'],
-                    'type': field_info.get('type', 'string')
+                    'type': field_info.get('type', 'string'),
+                    'offset': best_match['offset']
                 }
             else:
                 self.logger.debug(f"No se encontraron coincidencias para: {field_name}")
@@ -74,27 +169,37 @@ class PatternDetector:
             }
         }
 
+    def scan_document(self, content: str) -> List[Dict[str, Any]]:
+        """Todas las coincidencias de los patrones conocidos con su posición (ver PatternBank.scan)"""
+        return self._pattern_bank().scan(content)
+
+    def _pattern_bank(self) -> PatternBank:
+        """Banco compilado de known_patterns; se recompila si los patrones cambian"""
+        signature = repr(self.known_patterns)
+        if self._bank is None or self._bank_signature != signature:
+            self._bank = PatternBank(self.known_patterns)
+            self._bank_signature = signature
+        return self._bank
+
     def _find_field_matches(self, field_name: str, field_info: Dict[str, Any], 
-                           content: str) -> List[Dict[str, Any]]:
+                           content: str,
+                           matches_by_category: Optional[Dict[str, List[Dict[str, Any]]]] = None
+                           ) -> List[Dict[str, Any]]:
         """Encuentra todas las posibles coincidencias para un campo"""
-        matches = []
-        
-        # Buscar en patrones conocidos
+        if matches_by_category is None:
+            matches_by_category = self._pattern_bank().first_matches(content)
+
+        # Primera coincidencia de cada patrón de la categoría del campo
         category = self._determine_field_category(field_name)
-        if category in self.known_patterns:
-            for field_type, patterns in self.known_patterns[category].items():
-                for pattern in patterns:
-                    if found := re.search(pattern, content, re.IGNORECASE):
-                        matches.append({
-                            'value': found.group(1).strip(),
-                            'confidence': self._calculate_match_confidence(
-                                found.group(0),
-                                field_info
-                            ),
-                            'pattern': pattern
-                        })
-
-        return matches
+        return [
+            {
+                'value': found['value'],
+                'confidence': self._calculate_match_confidence(found['text'], field_info),
+                'pattern': found['pattern'],
+                'offset': (found['start'], found['end'])
+            }
+            for found in matches_by_category.get(category, [])
+        ]
 
     def _determine_field_category(self, field_name: str) -> str:
         """Determina la categoría de un campo basado en su nombre"""
@@ -131,3 +236,36 @@ class PatternDetector:
     def _select_best_match(self, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Selecciona la mejor coincidencia basada en confianza"""
         return max(matches, key=lambda x: x['confidence'])
+
+
+    def _validate_field_type(self, text: str, field_type: str) -> bool:
+        """Comprueba si el texto contiene un valor del tipo indicado"""
+        checks = {
+            'number': r'\d',
+            'integer': r'\d',
+            'float': r'\d',
+            'date': r'\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}',
+            'email': r'[^\s@]+@[^\s@]+\.[^\s@]+',
+            'phone': r'(?:\d[\s-]?){7,}'
+        }
+        pattern = checks.get(field_type)
+        return True if pattern is None else re.search(pattern, text) is not None
+
+    def _validate_format(self, text: str, field_format: str) -> bool:
+        """Comprueba el formato esperado (p. ej. YYYY-MM-DD, %d/%m/%Y o una regex)"""
+        if '%' in field_format:
+            tokens = {'%Y': r'\d{4}', '%y': r'\d{2}', '%m': r'\d{1,2}', '%d': r'\d{1,2}',
+                      '%H': r'\d{1,2}', '%M': r'\d{2}', '%S': r'\d{2}'}
+            pattern = re.escape(field_format)
+            for token, regex in tokens.items():
+                pattern = pattern.replace(re.escape(token), regex)
+        elif re.fullmatch(r'[YMDhms/\-.: ]+', field_format):
+            pattern = re.escape(field_format)
+            for letter in 'YMDhms':
+                pattern = pattern.replace(letter, r'\d')
+        else:
+            pattern = field_format
+        try:
+            return re.search(pattern, text) is not None
+        except re.error:
+            return False
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from .field_analyzer import FieldAnalyzer
 from .logging_config import setup_logging
+from .field_index import FieldIndex
 
 class PDFTemplateMapper:
     """Mapea contenido de PDF a plantillas existentes"""
@@ -18,15 +19,21 @@ class PDFTemplateMapper:
         self.current_template = template
         self.current_pdf_content = pdf_content
 
+        mapping = self._create_initial_mapping()
+        confidence_scores = self._calculate_confidence_scores(mapping)
+
         return {
-            'mapping_result': self._create_initial_mapping(),
-            'confidence_scores': self._calculate_confidence_scores(),
-            'missing_fields': self._identify_missing_fields(),
+            'mapping_result': mapping,
+            'confidence_scores': confidence_scores,
+            'missing_fields': self._identify_missing_fields(mapping),
             'metadata': {
                 'template_name': template.get('nombre', 'unknown'),
                 'total_fields': len(template.get('campos', {})),
-                'mapped_fields': 0,  # Se actualizará durante el mapeo
-                'quality_score': 0.0  # Se actualizará durante el mapeo
+                'mapped_fields': len(mapping),
+                'quality_score': (
+                    round(sum(confidence_scores.values()) / len(confidence_scores), 4)
+                    if confidence_scores else 0.0
+                )
             }
         }
 
@@ -36,8 +43,11 @@ class PDFTemplateMapper:
         template_fields = self.current_template.get('campos', {})
         pdf_fields = self.current_pdf_content.get('fields', {})
 
+        # Índice de los campos del PDF, construido una vez para toda la plantilla
+        index = FieldIndex(pdf_fields, self._normalize_name, group_key=self._validation_key)
+
         for template_field, template_info in template_fields.items():
-            match = self._find_best_match(template_field, template_info, pdf_fields)
+            match = self._find_best_match(template_field, template_info, pdf_fields, index)
             if match:
                 mapping[template_field] = {
                     'pdf_field': match['field'],
@@ -48,36 +58,52 @@ class PDFTemplateMapper:
         return mapping
 
     def _find_best_match(self, template_field: str, template_info: Dict[str, Any], 
-                        pdf_fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Encuentra la mejor correspondencia para un campo de la plantilla"""
-        best_match = None
-        highest_confidence = 0.0
-
-        for pdf_field, pdf_info in pdf_fields.items():
-            confidence = self._calculate_field_similarity(
-                template_field, template_info,
-                pdf_field, pdf_info
-            )
-
-            if confidence > highest_confidence:
-                highest_confidence = confidence
-                transformations = self._identify_needed_transformations(
-                    template_info, pdf_info
-                )
-                
-                best_match = {
-                    'field': pdf_field,
-                    'confidence': confidence,
-                    'transformations': transformations
-                }
+                        pdf_fields: Dict[str, Any],
+                        index: Optional[FieldIndex] = None) -> Optional[Dict[str, Any]]:
+        """
+        Encuentra la mejor correspondencia para un campo de la plantilla
+
+        Solo se puntúan los campos del PDF que comparten palabras con el campo,
+        que lo contienen o están contenidos en él (ver FieldIndex); el resultado
+        es el mismo que comparando todos.
+        """
+        if index is None:
+            index = FieldIndex(pdf_fields, self._normalize_name, group_key=self._validation_key)
+
+        name = self._normalize_name(template_field)
+        words = set(name.split())
+        ranked = index.rank(
+            name,
+            lambda pos: self._score_normalized(
+                name, words, template_info,
+                index.normalized[pos], index.words[pos], index.infos[pos]
+            ),
+            containment=True
+        )
 
-        return best_match
+        if not ranked or ranked[0][0] <= 0.0:
+            return None
+
+        confidence, pos = ranked[0]
+        return {
+            'field': index.names[pos],
+            'confidence': confidence,
+            'transformations': self._identify_needed_transformations(template_info, index.infos[pos])
+        }
 
     def _calculate_field_similarity(self, template_field: str, template_info: Dict[str, Any],
                                  pdf_field: str, pdf_info: Dict[str, Any]) -> float:
         """Calcula la similitud entre campos"""
+        name1 = self._normalize_name(template_field)
+        name2 = self._normalize_name(pdf_field)
+        return self._score_normalized(name1, set(name1.split()), template_info,
+                                      name2, set(name2.split()), pdf_info)
+
+    def _score_normalized(self, name1: str, words1: set, template_info: Dict[str, Any],
+                          name2: str, words2: set, pdf_info: Dict[str, Any]) -> float:
+        """Similitud entre campos con los nombres ya normalizados"""
         # Puntaje base por coincidencia de nombres
-        name_similarity = self._calculate_name_similarity(template_field, pdf_field)
+        name_similarity = self._names_similarity(name1, words1, name2, words2)
         
         # Puntaje por tipo de dato
         type_match = template_info.get('type') == pdf_info.get('type')
@@ -91,12 +117,25 @@ class PDFTemplateMapper:
 
         return (name_similarity * 0.5) + type_score + (validation_score * 0.2)
 
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        return name.lower().replace('_', ' ')
+
+    @staticmethod
+    def _validation_key(info: Dict[str, Any]) -> tuple:
+        """Atributos que puntúan sin coincidencia de nombre (tipo y validadores)"""
+        return (repr(info.get('type')), FieldIndex.constraint_key(info.get('validators', [])))
+
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calcula la similitud entre nombres de campos"""
         # Normalizar nombres
-        name1 = name1.lower().replace('_', ' ')
-        name2 = name2.lower().replace('_', ' ')
+        name1 = self._normalize_name(name1)
+        name2 = self._normalize_name(name2)
+        return self._names_similarity(name1, set(name1.split()), name2, set(name2.split()))
 
+    @staticmethod
+    def _names_similarity(name1: str, words1: set, name2: str, words2: set) -> float:
+        """Similitud entre nombres ya normalizados y sus conjuntos de palabras"""
         # Exacta
         if name1 == name2:
             return 1.0
@@ -106,11 +145,42 @@ class PDFTemplateMapper:
             return 0.8
 
         # Similitud de palabras
-        words1 = set(name1.split())
-        words2 = set(name2.split())
         common_words = words1.intersection(words2)
         
         if common_words:
             return len(common_words) / max(len(words1), len(words2))
 
         return 0.0
+
+    def _compare_validations(self, validators1: List[Any], validators2: List[Any]) -> float:
+        """Proporción de validadores en común"""
+        set1 = FieldIndex.constraint_key(validators1)
+        set2 = FieldIndex.constraint_key(validators2)
+        common = set1.intersection(set2)
+        return len(common) / max(len(set1), len(set2), 1) if common else 0.0
+
+    def _identify_needed_transformations(self, template_info: Dict[str, Any],
+                                         pdf_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Transformaciones para llevar el valor del PDF al tipo/formato de la plantilla"""
+        transformations = []
+        if pdf_info.get('type') and template_info.get('type') and pdf_info.get('type') != template_info.get('type'):
+            transformations.append({
+                'type': 'convert_type',
+                'from': pdf_info.get('type'),
+                'to': template_info.get('type')
+            })
+        if template_info.get('format') and pdf_info.get('format') != template_info.get('format'):
+            transformations.append({
+                'type': 'format',
+                'from': pdf_info.get('format'),
+                'to': template_info.get('format')
+            })
+        return transformations
+
+    def _calculate_confidence_scores(self, mapping: Dict[str, Any]) -> Dict[str, float]:
+        """Confianza de cada campo mapeado"""
+        return {field: info['confidence'] for field, info in mapping.items()}
+
+    def _identify_missing_fields(self, mapping: Dict[str, Any]) -> List[str]:
+        """Campos de la plantilla sin correspondencia en el PDF"""
+        return [field for field in self.current_template.get('campos', {}) if field not in mapping]
@@ -8,12 +8,14 @@ from .validation_reporter import ValidationReporter
 from .conflict_resolver import ConflictResolver
 from .state_synchronizer import StateSynchronizer
 from .logging_config import setup_logging
+from ..cache_plantillas import obtener_plantilla
 
 class ProcessingCoordinator:
     """Coordinador central del sistema de procesamiento"""
 
-    def __init__(self):
+    def __init__(self, templates_dir: Path = None):
         self.logger = setup_logging('processing_coordinator')
+        self.templates_dir = templates_dir or Path("storage") / "templates"
         self.structure_analyzer = PDFStructureAnalyzer()
         self.field_reconciliation = FieldReconciliation()
         self.content_validator = ContentValidator()
@@ -88,10 +90,24 @@ class ProcessingCoordinator:
             return {'error': str(e)}
 
     def _load_template(self, template_id: str) -> Optional[Dict[str, Any]]:
-        """Carga y verifica una plantilla"""
+        """
+        Carga y verifica una plantilla
+
+        Args:
+            template_id: Ruta de la plantilla o su identificador en templates_dir
+
+        Returns:
+            Vista de solo lectura de la caché de plantillas, o None si no existe
+        """
         try:
-            # Implementar carga de plantilla según sistema existente
-            return {}
+            candidatos = [Path(template_id)] + [
+                self.templates_dir / f"{template_id}{ext}" for ext in ('.json', '.yaml', '.yml')
+            ]
+            ruta = next((c for c in candidatos if c.is_file()), None)
+            if ruta is None:
+                self.logger.warning(f"Plantilla no encontrada: {template_id}")
+                return None
+            return obtener_plantilla(ruta)
         except Exception as e:
             self.logger.error(f"Error cargando plantilla: {str(e)}")
             return None
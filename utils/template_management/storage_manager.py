@@ -1,11 +1,10 @@
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Mapping, Optional, List
 import json
 import yaml
 import sqlite3
-from datetime import datetime
-import threading
 from .logging_config import setup_logging
+from ..cache_plantillas import CACHE_PLANTILLAS
 
 class StorageManager:
     """Gestor de almacenamiento para plantillas"""
@@ -13,8 +12,8 @@ class StorageManager:
     def __init__(self, base_dir: Path = None):
         self.logger = setup_logging()
         self.base_dir = base_dir or Path("storage")
-        self.cache = {}
-        self.cache_lock = threading.Lock()
+        # Caché de plantillas compartida (LRU, invalidada si el archivo cambia en disco)
+        self.cache = CACHE_PLANTILLAS
         self._init_storage()
 
     def _init_storage(self):
@@ -58,12 +57,8 @@ class StorageManager:
             # Actualizar índice
             self._update_index(template_id, data)
             
-            # Actualizar caché
-            with self.cache_lock:
-                self.cache[template_id] = {
-                    'data': data,
-                    'timestamp': datetime.now().timestamp()
-                }
+            # La próxima lectura debe ver el archivo recién guardado
+            self.cache.invalidar(file_path)
 
             self.logger.info(f"Plantilla almacenada: {template_id}")
             return True
@@ -71,29 +66,20 @@ class StorageManager:
             self.logger.error(f"Error almacenando plantilla {template_id}: {str(e)}")
             return False
 
-    def retrieve(self, template_id: str) -> Optional[Dict[str, Any]]:
-        """Recupera una plantilla del almacenamiento"""
-        # Verificar caché
-        with self.cache_lock:
-            if template_id in self.cache:
-                return self.cache[template_id]['data']
+    def retrieve(self, template_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Recupera una plantilla del almacenamiento
 
-        # Buscar en almacenamiento
+        Returns:
+            Vista de solo lectura compartida por la caché de plantillas
+            (usar cache_plantillas.descongelar para obtener un dict modificable)
+        """
         file_path = self._get_storage_path(template_id)
         if not file_path.exists():
             return None
 
         try:
-            data = self._load_file(file_path)
-            
-            # Actualizar caché
-            with self.cache_lock:
-                self.cache[template_id] = {
-                    'data': data,
-                    'timestamp': datetime.now().timestamp()
-                }
-            
-            return data
+            return self.cache.obtener(file_path)
         except Exception as e:
             self.logger.error(f"Error recuperando plantilla {template_id}: {str(e)}")
             return None
@@ -110,14 +96,6 @@ class StorageManager:
             elif format == 'yaml':
                 yaml.dump(data, f, allow_unicode=True)
 
-    def _load_file(self, path: Path) -> Dict[str, Any]:
-        """Carga datos desde un archivo"""
-        with open(path, 'r', encoding='utf-8') as f:
-            if path.suffix == '.json':
-                return json.load(f)
-            elif path.suffix in ['.yaml', '.yml']:
-                return yaml.safe_load(f)
-
     def _update_index(self, template_id: str, data: Dict[str, Any]):
         """Actualiza el índice de la plantilla"""
         db_path = self.base_dir / "indexes" / "template_index.db"
@@ -137,11 +115,4 @@ class StorageManager:
 
     def cleanup_cache(self, max_age: int = 3600):
         """Limpia entradas antiguas del caché"""
-        current_time = datetime.now().timestamp()
-        with self.cache_lock:
-            expired = [
-                k for k, v in self.cache.items()
-                if current_time - v['timestamp'] > max_age
-            ]
-            for k in expired:
-                self.cache.pop(k)
+        return self.cache.expirar(max_age)
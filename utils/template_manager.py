@@ -7,14 +7,19 @@ import ast
 from typing import Dict, Any, List, Optional, Tuple, Union
 from .advanced_content_analyzer import AdvancedContentAnalyzer
 from datetime import datetime
-from google.cloud import vision
-from google.oauth2 import service_account
 import os
 from typing import get_type_hints
-import pytesseract
-from PIL import Image
-from pdf2image import convert_from_path
 import tempfile
+from .registro_complementos import importar_diferido
+from .catalogo_plantillas import obtener_catalogo
+from .cache_plantillas import copiar_plantilla
+
+# Vision y OCR solo se usan al analizar imágenes o PDF escaneados: se importan en el primer uso
+vision = importar_diferido('google.cloud.vision')
+service_account = importar_diferido('google.oauth2.service_account')
+pytesseract = importar_diferido('pytesseract')
+Image = importar_diferido('PIL.Image')
+pdf2image = importar_diferido('pdf2image')
 
 class TemplateManager:
     """Gestor de plantillas de importación con validación estricta"""
@@ -524,7 +529,7 @@ class TemplateManager:
             
             # Convertir a imagen si es PDF
             if file_path.suffix.lower() == '.pdf':
-                images = convert_from_path(file_path)
+                images = pdf2image.convert_from_path(file_path)
                 print(f"Convertido PDF a {len(images)} imágenes")
             else:
                 images = [Image.open(file_path)]
@@ -1649,147 +1654,31 @@ class TemplateManager:
         except Exception:
             return None
 
-    def listar_plantillas(self, tipo: str = "global") -> List[Dict[str, Any]]:
-        """Lista las plantillas disponibles del tipo especificado"""
-        plantillas = []
-        
-        try:
-            # Definir la ruta base para buscar plantillas según el tipo
-            if tipo == "global":
-                base_dir = self.templates_base / "Campos Master Global"
-            elif tipo == "codigo":
-                base_dir = self.templates_base / "Campos Codigos"
-            else:
-                print(f"[DEBUG-PLANTILLAS] Tipo de plantilla no reconocido: {tipo}")
-                return plantillas
-            
-            # Verificar que el directorio existe
-            if not base_dir.exists():
-                print(f"[DEBUG-PLANTILLAS] Directorio no encontrado: {base_dir}")
-                return plantillas
-            
-            print(f"[DEBUG-PLANTILLAS] Buscando plantillas en: {base_dir}")
-            
-            # Listar todos los archivos en el directorio para diagnóstico
-            todos_archivos = list(base_dir.iterdir())
-            print(f"[DEBUG-PLANTILLAS] Total de archivos en directorio: {len(todos_archivos)}")
-            for archivo in todos_archivos:
-                print(f"[DEBUG-PLANTILLAS] Archivo detectado: {archivo.name} (Extensión: {archivo.suffix})")
-            
-            # Buscar archivos con extensiones compatibles (.json, .yaml, .yml)
-            archivos_template = []
-            for extension in ["*.json", "*.yaml", "*.yml"]:
-                archivos_template.extend(base_dir.glob(extension))
-            
-            print(f"[DEBUG-PLANTILLAS] Archivos con extensión compatible: {len(archivos_template)}")
-            
-            # Procesar cada archivo compatible
-            for archivo in archivos_template:
-                try:
-                    # Cargar datos según la extensión del archivo
-                    data = None
-                    if archivo.suffix.lower() == '.json':
-                        with open(archivo, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                    elif archivo.suffix.lower() in ['.yaml', '.yml']:
-                        with open(archivo, 'r', encoding='utf-8') as f:
-                            data = yaml.safe_load(f)
-                    
-                    if data is None:
-                        print(f"[DEBUG-PLANTILLAS] No se pudo cargar archivo: {archivo.name}")
-                        continue
-                        
-                    # Procesar los datos de la plantilla
-                    num_campos = 0
-                    campos = data.get('campos', {})
-                    
-                    # Contar campos según formato (pueden ser dict o list)
-                    if isinstance(campos, dict):
-                        num_campos = len(campos)
-                    elif isinstance(campos, list):
-                        num_campos = len(campos)
-                    
-                    # Extraer información relevante para la lista
-                    plantillas.append({
-                        'nombre': archivo.stem,
-                        'ruta': archivo,
-                        'fecha_creacion': datetime.fromtimestamp(archivo.stat().st_ctime).strftime('%Y-%m-%d %H:%M'),
-                        'num_campos': num_campos,
-                        'descripcion': data.get('descripcion', 'Sin descripción')
-                    })
-                    print(f"[DEBUG-PLANTILLAS] Plantilla procesada: {archivo.name} ({num_campos} campos)")
-                except Exception as e:
-                    print(f"[DEBUG-ERROR] Error procesando plantilla {archivo.name}: {e}")
-                    continue
-            
-            print(f"[DEBUG-PLANTILLAS] Total de plantillas procesadas correctamente: {len(plantillas)}")
-            
-        except Exception as e:
-            print(f"[DEBUG-ERROR] Error general al listar plantillas: {e}")
-        
-        return plantillas
-
     def _load_master_template(self) -> Optional[Dict[str, Any]]:
         """Carga la plantilla master de importación"""
         # Directorio específico de templates (ahora solo Campos Master Global)
-        template_base = Path("C:/Users/pepec/Documents/Notefy IA/Data synthetic/templates/Campos Master Global")
-        
+        template_base = self.global_templates
+
         print(f"\n[DEBUG] Buscando templates en: {template_base}")
-        
+
         if not template_base.exists():
             print(f"\n❌ No se encontró el directorio de templates: {template_base}")
             return None
 
-        # Listar todos los archivos en el directorio para diagnóstico
-        try:
-            todos_archivos = list(template_base.iterdir())
-            print(f"\n[DEBUG] Total archivos en directorio: {len(todos_archivos)}")
-            for archivo in todos_archivos:
-                print(f"[DEBUG] Archivo en directorio: {archivo.name}")
-        except Exception as e:
-            print(f"\n[DEBUG] Error al listar archivos: {e}")
-
-        # Buscar archivos compatibles (JSON, YAML, YML)
-        templates_encontrados = []
-        for extension in ["*.json", "*.yaml", "*.yml"]:
-            for template_path in template_base.glob(extension):
-                try:
-                    print(f"\n[DEBUG] Intentando procesar: {template_path.name}")
-                    
-                    # Cargar datos según extensión
-                    metadata = None
-                    if template_path.suffix.lower() == '.json':
-                        with open(template_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                    elif template_path.suffix.lower() in ['.yaml', '.yml']:
-                        with open(template_path, 'r', encoding='utf-8') as f:
-                            metadata = yaml.safe_load(f)
-                            
-                    if metadata is None:
-                        print(f"[DEBUG] No se pudo cargar {template_path.name}")
-                        continue
-                    
-                    # Determinar cantidad de campos
-                    campos = metadata.get('campos', {})
-                    num_campos = 0
-                    if isinstance(campos, dict):
-                        num_campos = len(campos)
-                    elif isinstance(campos, list):
-                        num_campos = len(campos)
-                    
-                    # Solo los archivos que tienen la estructura esperada
-                    templates_encontrados.append({
-                        'path': template_path,
-                        'nombre': template_path.name,
-                        'tipo': metadata.get('tipo', metadata.get('type', 'desconocido')),
-                        'num_campos': num_campos,
-                        'fecha': metadata.get('fecha_generacion', ''),
-                        'campos': list(campos.keys()) if isinstance(campos, dict) else [c.get('nombre', f'campo_{i}') for i, c in enumerate(campos)] if isinstance(campos, list) else []
-                    })
-                    print(f"[DEBUG] Template procesado: {template_path.name} ({num_campos} campos)")
-                except Exception as e:
-                    print(f"\n⚠️ Error procesando template {template_path.name}: {str(e)}")
-                    continue
+        # El catálogo solo vuelve a leer las plantillas nuevas o modificadas
+        catalogo = obtener_catalogo(template_base)
+        templates_encontrados = [
+            {
+                'path': plantilla['ruta'],
+                'nombre': plantilla['archivo'],
+                'tipo': plantilla['tipo'],
+                'num_campos': plantilla['num_campos'],
+                'fecha': plantilla['fecha_generacion'],
+                'campos': plantilla['campos']
+            }
+            for plantilla in catalogo.listar()
+        ]
+        print(f"[DEBUG] Catálogo de templates: {catalogo.ultima_actualizacion}")
 
         if not templates_encontrados:
             print("\n❌ No se encontraron templates disponibles")
@@ -1825,13 +1714,7 @@ class TemplateManager:
                     print(f"\n✅ Template seleccionado: {template_seleccionado['nombre']}")
                     
                     # Cargar template completo según su extensión
-                    template_path = template_seleccionado['path']
-                    if template_path.suffix.lower() == '.json':
-                        with open(template_path, 'r', encoding='utf-8') as f:
-                            return json.load(f)
-                    elif template_path.suffix.lower() in ['.yaml', '.yml']:
-                        with open(template_path, 'r', encoding='utf-8') as f:
-                            return yaml.safe_load(f)
+                    return copiar_plantilla(template_seleccionado['path'])
                 else:
                     print("❌ Selección no válida")
             except ValueError:
@@ -1841,50 +1724,46 @@ class TemplateManager:
                 return None
 
     def listar_plantillas(self, tipo: str = "global") -> List[Dict[str, Any]]:
-        """Lista las plantillas disponibles del tipo especificado"""
+        """
+        Lista las plantillas disponibles del tipo especificado
+
+        Los datos salen del catálogo de la carpeta (ver utils.catalogo_plantillas),
+        por lo que solo se abren las plantillas nuevas o modificadas desde la
+        última vez.
+        """
         plantillas = []
-        
+
         try:
             # Definir la ruta base para buscar plantillas según el tipo
-            if (tipo == "global"):
-                base_dir = self.templates_base / "Campos Master Global"
-            elif (tipo == "codigo"):
-                base_dir = self.templates_base / "Campos Codigos"
+            if tipo == "global":
+                base_dir = self.global_templates
+            elif tipo == "codigo":
+                base_dir = self.code_templates
             else:
                 print(f"[DEBUG-PLANTILLAS] Tipo de plantilla no reconocido: {tipo}")
                 return plantillas
-            
+
             # Verificar que el directorio existe
             if not base_dir.exists():
                 print(f"[DEBUG-PLANTILLAS] Directorio no encontrado: {base_dir}")
                 return plantillas
-            
-            print(f"[DEBUG-PLANTILLAS] Buscando plantillas en: {base_dir}")
-            
-            # Buscar archivos .json en el directorio
-            for archivo in base_dir.glob("*.json"):
-                try:
-                    with open(archivo, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                    # Extraer información relevante para la lista
-                    plantillas.append({
-                        'nombre': archivo.stem,
-                        'ruta': archivo,
-                        'fecha_creacion': datetime.fromtimestamp(archivo.stat().st_ctime).strftime('%Y-%m-%d %H:%M'),
-                        'num_campos': len(data.get('campos', [])),
-                        'descripcion': data.get('descripcion', 'Sin descripción')
-                    })
-                    print(f"[DEBUG-PLANTILLAS] Plantilla encontrada: {archivo.name}")
-                except Exception as e:
-                    print(f"[DEBUG-ERROR] Error leyendo plantilla {archivo.name}: {e}")
-                    continue
-            
-            print(f"[DEBUG-PLANTILLAS] Total de plantillas encontradas: {len(plantillas)}")
-            
+
+            catalogo = obtener_catalogo(base_dir)
+            for plantilla in catalogo.listar():
+                plantillas.append({
+                    'nombre': plantilla['nombre'],
+                    'ruta': plantilla['ruta'],
+                    'fecha_creacion': plantilla['fecha_creacion'],
+                    'num_campos': plantilla['num_campos'],
+                    'descripcion': plantilla['descripcion']
+                })
+
+            print(f"[DEBUG-PLANTILLAS] {len(plantillas)} plantillas en {base_dir} "
+                  f"(catálogo: {catalogo.ultima_actualizacion})")
+
         except Exception as e:
             print(f"[DEBUG-ERROR] Error al listar plantillas: {e}")
-        
+
         return plantillas
 
     def crear_plantilla(self, nombre: str, tipo: str, campos: List[Dict[str, Any]], 
@@ -1932,7 +1811,12 @@ class TemplateManager:
             return None
 
     def cargar_plantilla(self, nombre: str, tipo: str = "global") -> Optional[Dict[str, Any]]:
-        """Carga una plantilla existente por nombre y tipo"""
+        """
+        Carga una plantilla existente por nombre y tipo
+
+        La plantilla analizada se comparte a través de la caché de plantillas
+        (ver utils.cache_plantillas); se retorna una copia para poder editarla.
+        """
         # Determinar directorio
         if tipo == "global":
             base_dir = self.global_templates
@@ -1943,15 +1827,15 @@ class TemplateManager:
             return None
         
         # Buscar archivo
-        archivo = base_dir / f"{nombre}.json"
-        if not archivo.exists():
+        archivo = next((base_dir / f"{nombre}{ext}" for ext in ('.json', '.yaml', '.yml')
+                        if (base_dir / f"{nombre}{ext}").exists()), None)
+        if archivo is None:
             print(f"Plantilla '{nombre}' no encontrada")
             return None
         
         # Cargar contenido
         try:
-            with open(archivo, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return copiar_plantilla(archivo)
         except Exception as e:
             print(f"Error al cargar plantilla: {str(e)}")
             return None